@@ -0,0 +1,105 @@
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Union, Optional
+
+from msgspec import msgpack
+from msgspec import json as msgjson
+from gsuid_core.logger import logger
+
+from .resource.RESOURCE_PATH import ANN_CARD_PATH
+
+ANN_DETAIL_FILE = ANN_CARD_PATH / "ann_detail.json"
+ANN_RENDER_PATH = ANN_CARD_PATH / "render"
+# 公告详情缓存数量
+ANN_DETAIL_NUM = 100
+# 公告详情缓存时间(秒)，过期后重新拉取，公告被修改时能拿到新内容
+ANN_DETAIL_TTL = 3600
+# 公告图片缓存数量
+ANN_RENDER_NUM = 50
+
+
+class AnnDetailCache:
+    """
+    公告详情缓存，按 postId 做 LRU 淘汰，写入时持久化到磁盘
+    每条记录保存拉取时间，超过`ANN_DETAIL_TTL`视为过期
+    """
+
+    def __init__(self):
+        self._data: Optional[OrderedDict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> OrderedDict:
+        if self._data is None:
+            self._data = OrderedDict()
+            if ANN_DETAIL_FILE.exists():
+                try:
+                    self._data.update(msgjson.decode(ANN_DETAIL_FILE.read_bytes()))
+                except Exception as e:
+                    logger.exception(f"[鸣潮公告] 读取公告缓存失败: {e}")
+        return self._data
+
+    def _save(self):
+        try:
+            ANN_DETAIL_FILE.write_bytes(msgjson.encode(self._load()))
+        except Exception as e:
+            logger.exception(f"[鸣潮公告] 写入公告缓存失败: {e}")
+
+    def get(
+        self, post_id: str, allow_expired: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """`allow_expired`为真时返回过期的记录，用于重新拉取失败时兜底"""
+        data = self._load()
+        item = data.get(post_id)
+        # 旧版缓存没有拉取时间，按过期处理
+        if not item or "detail" not in item:
+            return None
+        if not allow_expired and item["time"] < time.time() - ANN_DETAIL_TTL:
+            return None
+        data.move_to_end(post_id)
+        return item["detail"]
+
+    def set(self, post_id: str, detail: Dict[str, Any]):
+        data = self._load()
+        data[post_id] = {"time": int(time.time()), "detail": detail}
+        data.move_to_end(post_id)
+        while len(data) > ANN_DETAIL_NUM:
+            data.popitem(last=False)
+        self._save()
+
+
+ann_detail_cache = AnnDetailCache()
+
+
+def get_content_hash(detail: Dict[str, Any]) -> str:
+    return hashlib.sha1(
+        msgjson.encode([detail.get("postContent"), detail.get("coverImages")])
+    ).hexdigest()[:16]
+
+
+def _render_file(post_id: str, content_hash: str):
+    return ANN_RENDER_PATH / f"{post_id}_{content_hash}.msgpack"
+
+
+def get_ann_render(post_id: str, content_hash: str) -> Union[bytes, List[bytes], None]:
+    """按 (postId, 内容hash) 读取已绘制的公告图片"""
+    path = _render_file(post_id, content_hash)
+    if not path.exists():
+        return None
+    try:
+        return msgpack.decode(path.read_bytes())
+    except Exception as e:
+        logger.exception(f"[鸣潮公告] 读取公告图片缓存失败: {e}")
+        return None
+
+
+def save_ann_render(post_id: str, content_hash: str, img: Union[bytes, List[bytes]]):
+    try:
+        ANN_RENDER_PATH.mkdir(parents=True, exist_ok=True)
+        _render_file(post_id, content_hash).write_bytes(msgpack.encode(img))
+        files = sorted(
+            ANN_RENDER_PATH.glob("*.msgpack"), key=lambda p: p.stat().st_mtime
+        )
+        for path in files[:-ANN_RENDER_NUM]:
+            path.unlink(missing_ok=True)
+    except Exception as e:
+        logger.exception(f"[鸣潮公告] 写入公告图片缓存失败: {e}")
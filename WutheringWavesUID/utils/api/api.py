@@ -1,4 +1,5 @@
 # waves
+from typing import Dict, Tuple, Optional
 
 GAME_ID = 3
 SERVER_ID = "76402e5b20be2c39f095a152090afddc"
@@ -120,3 +121,30 @@ def get_need_proxy_func():
     if NeedProxyFunc:
         return NeedProxyFunc
     return []
+
+
+class ProxyRoutes:
+    """接口路由名 -> 代理地址，`LocalProxyUrl`或`NeedProxyFunc`变化时重新计算"""
+
+    def __init__(self):
+        self._key: Optional[Tuple[Optional[str], Tuple[str, ...]]] = None
+        self._table: Dict[str, str] = {}
+        self._default: Optional[str] = None
+
+    def get(self, route: Optional[str]) -> Optional[str]:
+        proxy_url = get_local_proxy_url()
+        need_proxy_func = tuple(get_need_proxy_func())
+        if self._key != (proxy_url, need_proxy_func):
+            self._key = (proxy_url, need_proxy_func)
+            self._table = {}
+            self._default = None
+            if proxy_url and "all" in need_proxy_func:
+                self._default = proxy_url
+            elif proxy_url:
+                self._table = {f: proxy_url for f in need_proxy_func}
+        if route is None:
+            return self._default
+        return self._table.get(route, self._default)
+
+
+proxy_routes = ProxyRoutes()
@@ -0,0 +1,159 @@
+import time
+import random
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from gsuid_core.logger import logger
+
+from ...utils.database.models import WavesUser
+from ...wutheringwaves_config import WutheringWavesConfig
+
+# 健康分，校验通过时重置为满分，失败时扣分，扣到0移出池
+MAX_SCORE = 3
+# 单个token的调用次数按分钟统计
+RATE_WINDOW = 60
+
+
+class PoolEntry:
+    __slots__ = ("uid", "cookie", "score", "window_start", "used")
+
+    def __init__(self, uid: str, cookie: str):
+        self.uid = uid
+        self.cookie = cookie
+        self.score = MAX_SCORE
+        self.window_start = 0.0
+        self.used = 0
+
+    def take(self, now: float, limit: int) -> bool:
+        if now - self.window_start >= RATE_WINDOW:
+            self.window_start = now
+            self.used = 0
+        if limit > 0 and self.used >= limit:
+            return False
+        self.used += 1
+        return True
+
+
+class PublicCookiePool:
+    """
+    公共token池
+    后台校验并维护一批可用的公共token，请求时直接按最久未使用的顺序取出，
+    不再逐个调用`login_log`和`refresh_data`探测；
+    请求中发现token失效时扣分，扣到0移出池并在后台补充
+    """
+
+    def __init__(self):
+        # cookie -> PoolEntry，按使用时间排序，最久未使用的在前
+        self._entries: OrderedDict[str, PoolEntry] = OrderedDict()
+        self._refill_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_pool_size() -> int:
+        return WutheringWavesConfig.get_config("PublicCookiePoolNum").data or 0
+
+    @staticmethod
+    def get_rate_limit() -> int:
+        return WutheringWavesConfig.get_config("PublicCookieRateLimit").data or 0
+
+    def acquire(self) -> Optional[str]:
+        now = time.time()
+        limit = self.get_rate_limit()
+        for cookie, entry in self._entries.items():
+            if entry.take(now, limit):
+                self._entries.move_to_end(cookie)
+                return cookie
+        return None
+
+    def add(self, uid: str, cookie: str):
+        entry = self._entries.get(cookie)
+        if entry is not None:
+            entry.score = MAX_SCORE
+        elif len(self._entries) < self.get_pool_size():
+            self._entries[cookie] = PoolEntry(uid, cookie)
+
+    def demote(self, cookie: str, penalty: int = 1):
+        entry = self._entries.get(cookie)
+        if entry is None:
+            return
+        entry.score -= penalty
+        if entry.score <= 0:
+            self._entries.pop(cookie, None)
+            logger.debug(f"[鸣潮][公共token池] 移除 uid: {entry.uid}")
+            self.refill_background()
+
+    def remove(self, cookie: str):
+        self.demote(cookie, MAX_SCORE)
+
+    def discard(self, cookie: str):
+        """token被删除或标记无效时直接移出池"""
+        entry = self._entries.pop(cookie, None)
+        if entry is not None:
+            logger.debug(f"[鸣潮][公共token池] 移除 uid: {entry.uid}")
+            self.refill_background()
+
+    def _drop_stale(self, user_list: List[WavesUser]) -> int:
+        valid_cookies = {user.cookie for user in user_list}
+        stale = [c for c in self._entries if c not in valid_cookies]
+        for cookie in stale:
+            entry = self._entries.pop(cookie)
+            logger.debug(f"[鸣潮][公共token池] 移除失效 uid: {entry.uid}")
+        return len(stale)
+
+    async def prune(self):
+        """移出数据库中已删除或已失效的token"""
+        if not self._entries:
+            return
+        if self._drop_stale(await WavesUser.get_waves_all_user()):
+            self.refill_background()
+
+    def clear(self):
+        self._entries.clear()
+
+    def refill_background(self):
+        """后台补充，同一时间只有一个补充任务"""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self.refill())
+
+    async def refill(self):
+        from ..waves_api import waves_api
+
+        pool_size = self.get_pool_size()
+        if pool_size <= 0 or WutheringWavesConfig.get_config("WavesOnlySelfCk").data:
+            self.clear()
+            return
+
+        user_list = await WavesUser.get_waves_all_user()
+        self._drop_stale(user_list)
+
+        # 复查被扣过分的token
+        for entry in [e for e in self._entries.values() if e.score < MAX_SCORE]:
+            if await waves_api.check_public_cookie(entry.uid, entry.cookie):
+                entry.score = MAX_SCORE
+            else:
+                self.remove(entry.cookie)
+
+        if len(self._entries) >= pool_size:
+            return
+
+        random.shuffle(user_list)
+        for user in user_list:
+            if len(self._entries) >= pool_size:
+                break
+            if user.cookie in self._entries:
+                continue
+            if not await WavesUser.cookie_validate(user.uid):
+                continue
+            if await waves_api.check_public_cookie(user.uid, user.cookie):
+                self.add(user.uid, user.cookie)
+
+        logger.debug(f"[鸣潮][公共token池] 当前数量: {len(self._entries)}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "num": len(self._entries),
+            "degraded": sum(e.score < MAX_SCORE for e in self._entries.values()),
+        }
+
+
+public_cookie_pool = PublicCookiePool()
@@ -0,0 +1,160 @@
+import time
+import asyncio
+from typing import Dict, Deque
+from urllib.parse import urlparse
+from collections import OrderedDict, deque
+
+from gsuid_core.logger import logger
+
+from ...wutheringwaves_config import WutheringWavesConfig
+
+# 单次请求超过该耗时视为拥塞
+LATENCY_TARGET = 3.0
+MIN_CONCURRENCY = 1
+# 拥塞时并发上限乘以该系数
+DECREASE_FACTOR = 0.5
+
+
+def get_max_concurrency() -> int:
+    return WutheringWavesConfig.get_config("KuroApiMaxConcurrency").data or 1
+
+
+def get_rate() -> int:
+    return WutheringWavesConfig.get_config("KuroApiRate").data or 0
+
+
+class TokenBucket:
+    """令牌桶，`rate`为每秒请求数，为0时不限制"""
+
+    def __init__(self):
+        # 初始为满桶
+        self.tokens = float("inf")
+        self.updated_at = time.monotonic()
+
+    async def take(self):
+        while True:
+            rate = get_rate()
+            if rate <= 0:
+                return
+            now = time.monotonic()
+            self.tokens = min(rate, self.tokens + (now - self.updated_at) * rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / rate)
+
+
+class HostLimiter:
+    """
+    单个上游域名的限流器
+    并发上限按 AIMD 调整：请求正常时缓慢增加，繁忙、验证码或高延迟时减半；
+    每次上游请求单独占用名额，减半后在此之前发出的请求不会再次触发减半；
+    等待中的请求按 key(token) 轮流放行，避免单个账号的大量请求占满队列
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.limit = float(get_max_concurrency())
+        self.active = 0
+        self.bucket = TokenBucket()
+        self._queues: OrderedDict[str, Deque[asyncio.Future]] = OrderedDict()
+        # 已放行的请求序号，以及上次减半时最后放行的请求序号
+        self._seq = 0
+        self._recover_seq = 0
+
+    def _has_slot(self) -> bool:
+        return self.active < max(int(self.limit), MIN_CONCURRENCY)
+
+    async def acquire(self, key: str) -> int:
+        """获取名额，返回本次请求的序号，`release`时传回"""
+        if self._has_slot() and not self._queues:
+            self.active += 1
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            self._queues.setdefault(key, deque()).append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # 已经分到名额
+                    self._release_slot()
+                else:
+                    self._discard(key, fut)
+                raise
+        try:
+            await self.bucket.take()
+        except asyncio.CancelledError:
+            self._release_slot()
+            raise
+        self._seq += 1
+        return self._seq
+
+    def release(
+        self, seq: int, latency: float, congested: bool = False, ok: bool = True
+    ):
+        """
+        `congested`为上游繁忙或验证码，`ok`为假表示没有拿到上游响应，
+        此时只按延迟判断是否拥塞，不增加并发上限
+        """
+        max_limit = get_max_concurrency()
+        if congested or latency > LATENCY_TARGET:
+            self._decrease(seq)
+        elif ok:
+            self.limit = self.limit + 1 / max(self.limit, 1)
+        self.limit = min(self.limit, max_limit)
+        self._release_slot()
+
+    def _decrease(self, seq: int):
+        # 同一批在途请求只减半一次
+        if seq <= self._recover_seq:
+            return
+        self._recover_seq = self._seq
+        self.limit = max(MIN_CONCURRENCY, self.limit * DECREASE_FACTOR)
+        logger.debug(f"[鸣潮][限流] {self.host} 并发上限降为 {int(self.limit)}")
+
+    def _release_slot(self):
+        self.active -= 1
+        self._wake()
+
+    def _discard(self, key: str, fut: asyncio.Future):
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        try:
+            queue.remove(fut)
+        except ValueError:
+            pass
+        if not queue:
+            del self._queues[key]
+
+    def _wake(self):
+        while self._queues and self._has_slot():
+            key, queue = next(iter(self._queues.items()))
+            fut = queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if fut.done():
+                continue
+            fut.set_result(None)
+            self.active += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": int(self.limit),
+            "active": self.active,
+            "waiting": sum(len(q) for q in self._queues.values()),
+        }
+
+
+_limiters: Dict[str, HostLimiter] = {}
+
+
+def get_limiter(url: str) -> HostLimiter:
+    host = urlparse(url).netloc
+    limiter = _limiters.get(host)
+    if limiter is None:
+        limiter = _limiters[host] = HostLimiter(host)
+    return limiter
@@ -17,12 +17,54 @@ from ...utils.util import (
     get_public_ip,
     send_master_info,
 )
+from ..cache import TimedCache
 
 KURO_VERSION = "2.8.0"
 PLATFORM_SOURCE = "ios"
 CONTENT_TYPE = "application/x-www-form-urlencoded; charset=utf-8"
 
 
+# (cookie, uid) -> (did, bat)
+used_headers_cache = TimedCache(timeout=600, maxsize=2000)
+
+
+def invalidate_used_headers(uid: Optional[str] = None, cookie: Optional[str] = None):
+    """`did`/`bat`变化时清除缓存，`uid`和`cookie`都为空时清空全部"""
+    if uid is None and cookie is None:
+        used_headers_cache.clear()
+        return
+    for key in used_headers_cache.keys():
+        if key[0] == cookie or key[1] == uid:
+            used_headers_cache.delete(key)
+
+
+# (uid, cookie) -> token是否有效
+cookie_valid_cache = TimedCache(timeout=600, maxsize=2000)
+# 校验失败的结果只缓存较短时间，避免网络波动导致长时间不可用
+COOKIE_INVALID_CACHE_TIME = 60
+
+
+def get_cookie_valid(uid: str, cookie: str) -> Optional[bool]:
+    return cookie_valid_cache.get((uid, cookie))
+
+
+def set_cookie_valid(uid: str, cookie: str, valid: bool):
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    timeout = WutheringWavesConfig.get_config("CookieValidCacheTime").data
+    if not valid:
+        timeout = min(timeout, COOKIE_INVALID_CACHE_TIME)
+    if timeout <= 0:
+        return
+    cookie_valid_cache.set((uid, cookie), valid, timeout)
+
+
+def invalidate_cookie_valid(uid: Optional[str] = None, cookie: Optional[str] = None):
+    for key in cookie_valid_cache.keys():
+        if key[0] == uid or key[1] == cookie:
+            cookie_valid_cache.delete(key)
+
+
 async def get_base_header(devCode: Optional[str] = None):
     header = {
         "source": PLATFORM_SOURCE,
@@ -155,8 +197,11 @@ class KuroApiResp(BaseModel, Generic[T]):
         if not self.is_token_invalid:
             return
         from ...utils.database.models import WavesUser
+        from .cookie_pool import public_cookie_pool
 
         await WavesUser.mark_cookie_invalid(uid, cookie, "无效")
+        invalidate_used_headers(uid, cookie)
+        public_cookie_pool.discard(cookie)
 
     def throw_msg(self) -> str:
         if isinstance(self.msg, str):
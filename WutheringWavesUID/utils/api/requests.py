@@ -1,7 +1,9 @@
 import asyncio
-import inspect
 import json
 import random
+import time
+from contextvars import ContextVar
+from functools import wraps
 from typing import Any, Dict, List, Literal, Mapping, Optional, Union
 
 import aiohttp
@@ -11,6 +13,8 @@ from gsuid_core.logger import logger
 
 from ...utils.database.models import WavesUser
 from ...wutheringwaves_config import WutheringWavesConfig
+from ..ann_cache import ann_detail_cache
+from ..cache import TimedCache
 from ..error_reply import WAVES_CODE_999
 from ..util import timed_async_cache
 from .api import (
@@ -54,23 +58,69 @@ from .api import (
     WIKI_ENTRY_DETAIL_URL,
     WIKI_HOME_URL,
     WIKI_TREE_URL,
-    get_local_proxy_url,
-    get_need_proxy_func,
+    proxy_routes,
 )
 from .captcha import get_solver
 from .captcha.base import CaptchaResult
 from .captcha.errors import CaptchaError
+from .cookie_pool import public_cookie_pool
+from .limiter import get_limiter
 from .request_util import (
     KURO_VERSION,
     KuroApiResp,
+    ThrowMsg,
     get_base_header,
     get_community_header,
+    get_cookie_valid,
+    invalidate_cookie_valid,
+    invalidate_used_headers,
+    set_cookie_valid,
+    used_headers_cache,
 )
 
+# 当前请求所属的接口路由名，由`api_route`声明
+_api_route: ContextVar[Optional[str]] = ContextVar("waves_api_route", default=None)
+
+
+def is_congested(res: KuroApiResp) -> bool:
+    """上游繁忙或需要验证码"""
+    if res.msg == ThrowMsg.SYSTEM_BUSY:
+        return True
+    return isinstance(res.data, dict) and res.data.get("geeTest") is True
+
+
+# 接口路由名 -> 成功响应的缓存秒数
+ROUTE_CACHE_TTL: Dict[str, int] = {}
+
+
+def api_route(func=None, *, ttl: int = 0):
+    """
+    声明接口路由名(即方法名)，`_waves_request`据此查表选择代理
+    `ttl`大于0时，相同参数的成功响应在`ttl`秒内直接复用
+    """
+
+    def decorator(func):
+        route = func.__name__
+        if ttl > 0:
+            ROUTE_CACHE_TTL[route] = ttl
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = _api_route.set(route)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _api_route.reset(token)
+
+        return wrapper
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
 
 class WavesApi:
     ssl_verify = True
-    ann_map = {}
     ann_list_data = []
     event_type = {"2": "资讯", "3": "公告", "1": "活动"}
 
@@ -79,6 +129,15 @@ class WavesApi:
     _sessions: Dict[str, aiohttp.ClientSession] = {}
     _session_lock = asyncio.Lock()
 
+    # 相同请求合并，进行中的请求只发送一次
+    _inflight: Dict[str, asyncio.Future] = {}
+    _resp_cache = TimedCache(timeout=10, maxsize=1000)
+
+    # 同一账号的b-at刷新合并，并发失效时只刷新一次
+    _bat_refreshing: Dict[str, asyncio.Future] = {}
+    # 旧b-at -> 新b-at，刷新完成后仍带旧b-at返回的请求直接复用
+    _bat_refreshed = TimedCache(timeout=60, maxsize=1000)
+
     def __init__(self):
         self.captcha_solver = get_solver()
         if self.captcha_solver:
@@ -113,13 +172,26 @@ class WavesApi:
         return SERVER_ID
 
     async def refresh_bat_token(self, waves_user: WavesUser):
+        key = f"{waves_user.uid}_{waves_user.cookie}"
+        future = self._bat_refreshing.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._refresh_bat_token(waves_user))
+            self._bat_refreshing[key] = future
+            future.add_done_callback(lambda _: self._bat_refreshing.pop(key, None))
+        bat = await asyncio.shield(future)
+        if bat:
+            waves_user.bat = bat
+        return waves_user
+
+    async def _refresh_bat_token(self, waves_user: WavesUser) -> Optional[str]:
+        """刷新b-at，失败时返回None"""
+        old_bat = waves_user.bat
         success, access_token = await self.get_request_token(
             waves_user.uid, waves_user.cookie, waves_user.did
         )
         if not success:
-            return waves_user
+            return None
 
-        waves_user.bat = access_token
         await WavesUser.update_data_by_data(
             select_data={
                 # "user_id": waves_user.user_id,
@@ -128,7 +200,30 @@ class WavesApi:
             },
             update_data={"bat": access_token},
         )
-        return waves_user
+        invalidate_used_headers(waves_user.uid, waves_user.cookie)
+        if old_bat:
+            self._bat_refreshed.set(old_bat, access_token)
+        return access_token
+
+    async def _refresh_bat_header(
+        self, header: Mapping[str, str]
+    ) -> Optional[Dict[str, str]]:
+        """b-at失效时刷新，返回换上新b-at的请求头"""
+        bat = header.get("b-at")
+        if not bat:
+            return None
+        new_bat = self._bat_refreshed.get(bat)
+        if new_bat is None:
+            waves_user = await WavesUser.select_data_by_bat(bat)
+            if not waves_user or not waves_user.cookie:
+                return None
+            waves_user = await self.refresh_bat_token(waves_user)
+            new_bat = waves_user.bat
+        if not new_bat or new_bat == bat:
+            return None
+        new_header = dict(header)
+        new_header["b-at"] = new_bat
+        return new_header
 
     async def get_used_headers(
         self, cookie: str, uid: str, needToken=False
@@ -140,18 +235,23 @@ class WavesApi:
         }
         if needToken:
             headers["token"] = cookie
-        waves_user: Optional[WavesUser] = await WavesUser.select_data_by_cookie_and_uid(
-            cookie=cookie,
-            uid=uid,
-        ) or await WavesUser.select_data_by_cookie(
-            cookie=cookie,
-        )
 
-        if not waves_user:
-            return headers
+        cached = used_headers_cache.get((cookie, uid))
+        if cached is None:
+            waves_user = await WavesUser.select_data_by_cookie_and_uid(
+                cookie=cookie,
+                uid=uid,
+            ) or await WavesUser.select_data_by_cookie(
+                cookie=cookie,
+            )
 
-        headers["did"] = waves_user.did or ""
-        headers["b-at"] = waves_user.bat or ""
+            if not waves_user:
+                return headers
+
+            cached = (waves_user.did or "", waves_user.bat or "")
+            used_headers_cache.set((cookie, uid), cached)
+
+        headers["did"], headers["b-at"] = cached
         return headers
 
     async def get_ck_result(self, uid, user_id, bot_id) -> tuple[bool, Optional[str]]:
@@ -172,9 +272,14 @@ class WavesApi:
         if waves_user.status == "无效":
             return ""
 
+        valid = get_cookie_valid(uid, waves_user.cookie)
+        if valid is not None:
+            return waves_user.cookie if valid else ""
+
         data = await self.login_log(uid, waves_user.cookie)
         if not data.success:
             await data.mark_cookie_invalid(uid, waves_user.cookie)
+            set_cookie_valid(uid, waves_user.cookie, False)
             return ""
 
         data = await self.refresh_data(uid, waves_user.cookie)
@@ -184,14 +289,34 @@ class WavesApi:
                     return waves_user.cookie
             else:
                 await data.mark_cookie_invalid(uid, waves_user.cookie)
+            set_cookie_valid(uid, waves_user.cookie, False)
             return ""
 
+        set_cookie_valid(uid, waves_user.cookie, True)
         return waves_user.cookie
 
+    async def check_public_cookie(self, uid: str, cookie: str) -> bool:
+        data = await self.login_log(uid, cookie)
+        if not data.success:
+            await data.mark_cookie_invalid(uid, cookie)
+            return False
+
+        data = await self.refresh_data(uid, cookie)
+        if not data.success:
+            await data.mark_cookie_invalid(uid, cookie)
+            return False
+        return True
+
     async def get_waves_random_cookie(self, uid: str, user_id: str) -> Optional[str]:
         if WutheringWavesConfig.get_config("WavesOnlySelfCk").data:
             return None
 
+        # 优先从公共token池取
+        if cookie := public_cookie_pool.acquire():
+            return cookie
+        if public_cookie_pool.get_pool_size() > 0:
+            public_cookie_pool.refill_background()
+
         # 公共ck 随机一个
         user_list = await WavesUser.get_waves_all_user()
         random.shuffle(user_list)
@@ -217,11 +342,13 @@ class WavesApi:
                 continue
 
             ck_list.append(user.cookie)
+            public_cookie_pool.add(user.uid, user.cookie)
             break
 
         if len(ck_list) > 0:
             return random.choices(ck_list, k=1)[0]
 
+    @api_route
     async def get_kuro_role_list(self, token: str, did: str):
         header = await get_base_header()
         header.update(
@@ -234,6 +361,7 @@ class WavesApi:
 
         return await self._waves_request(ROLE_LIST_URL, "POST", header, data=data)
 
+    @api_route(ttl=10)
     async def get_daily_info(
         self, roleId: str, token: str, gameId: Union[str, int] = GAME_ID
     ):
@@ -257,6 +385,7 @@ class WavesApi:
             data=data,
         )
 
+    @api_route
     async def refresh_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -271,6 +400,7 @@ class WavesApi:
         }
         return await self._waves_request(REFRESH_URL, "POST", header, data=data)
 
+    @api_route
     async def login_log(self, roleId: str, token: str):
         """登录校验"""
         header = await get_base_header()
@@ -286,6 +416,7 @@ class WavesApi:
         data = {}
         return await self._waves_request(LOGIN_LOG_URL, "POST", header, data=data)
 
+    @api_route(ttl=10)
     async def get_base_info(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -300,6 +431,7 @@ class WavesApi:
         }
         return await self._waves_request(BASE_DATA_URL, "POST", header, data=data)
 
+    @api_route(ttl=10)
     async def get_role_info(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -314,18 +446,21 @@ class WavesApi:
         }
         return await self._waves_request(ROLE_DATA_URL, "POST", header, data=data)
 
+    @api_route
     async def get_tree(self):
         header = await get_community_header()
         header.update({"wiki_type": "9"})
         data = {"devcode": ""}
         return await self._waves_request(WIKI_TREE_URL, "POST", header, data=data)
 
+    @api_route
     async def get_wiki(self, catalogueId: str):
         header = await get_community_header()
         header.update({"wiki_type": "9"})
         data = {"catalogueId": catalogueId, "limit": 1000}
         return await self._waves_request(WIKI_DETAIL_URL, "POST", header, data=data)
 
+    @api_route(ttl=10)
     async def get_role_detail_info(
         self, charId: str, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -343,6 +478,7 @@ class WavesApi:
         }
         return await self._waves_request(ROLE_DETAIL_URL, "POST", header, data=data)
 
+    @api_route
     async def get_calabash_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -358,6 +494,7 @@ class WavesApi:
         }
         return await self._waves_request(CALABASH_DATA_URL, "POST", header, data=data)
 
+    @api_route
     async def get_explore_data(
         self,
         roleId: str,
@@ -378,6 +515,7 @@ class WavesApi:
         }
         return await self._waves_request(EXPLORE_DATA_URL, "POST", header, data=data)
 
+    @api_route
     async def get_challenge_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -393,6 +531,7 @@ class WavesApi:
         }
         return await self._waves_request(CHALLENGE_DATA_URL, "POST", header, data=data)
 
+    @api_route
     async def get_abyss_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -407,6 +546,7 @@ class WavesApi:
         }
         return await self._waves_request(TOWER_DETAIL_URL, "POST", header, data=data)
 
+    @api_route
     async def get_abyss_index(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -422,6 +562,7 @@ class WavesApi:
         }
         return await self._waves_request(TOWER_INDEX_URL, "POST", header, data=data)
 
+    @api_route
     async def get_slash_index(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -437,6 +578,7 @@ class WavesApi:
         }
         return await self._waves_request(SLASH_INDEX_URL, "POST", header, data=data)
 
+    @api_route
     async def get_slash_detail(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -452,6 +594,7 @@ class WavesApi:
         }
         return await self._waves_request(SLASH_DETAIL_URL, "POST", header, data=data)
 
+    @api_route
     async def get_more_activity(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -467,6 +610,7 @@ class WavesApi:
         }
         return await self._waves_request(MORE_ACTIVITY_URL, "POST", header, data=data)
 
+    @api_route
     async def get_request_token(
         self, roleId: str, token: str, did: str, serverId: Optional[str] = None
     ) -> tuple[bool, str]:
@@ -490,6 +634,7 @@ class WavesApi:
 
         return False, ""
 
+    @api_route
     async def calculator_refresh_data(
         self,
         roleId: str,
@@ -514,6 +659,7 @@ class WavesApi:
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
     )
+    @api_route
     async def get_online_list_role(self, token: str):
         """所有的角色列表"""
         header = await get_base_header()
@@ -525,6 +671,7 @@ class WavesApi:
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
     )
+    @api_route
     async def get_online_list_weapon(self, token: str):
         """所有的武器列表"""
         header = await get_base_header()
@@ -536,6 +683,7 @@ class WavesApi:
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
     )
+    @api_route
     async def get_online_list_phantom(self, token: str):
         """所有的声骸列表"""
         header = await get_base_header()
@@ -543,6 +691,7 @@ class WavesApi:
         data = {}
         return await self._waves_request(ONLINE_LIST_PHANTOM, "POST", header, data=data)
 
+    @api_route
     async def get_owned_role(
         self,
         roleId: str,
@@ -561,6 +710,7 @@ class WavesApi:
         }
         return await self._waves_request(QUERY_OWNED_ROLE, "POST", header, data=data)
 
+    @api_route
     async def get_develop_role_cultivate_status(
         self,
         roleId: str,
@@ -583,6 +733,7 @@ class WavesApi:
             ROLE_CULTIVATE_STATUS, "POST", header, data=data
         )
 
+    @api_route
     async def get_batch_role_cost(
         self,
         roleId: str,
@@ -603,6 +754,7 @@ class WavesApi:
         }
         return await self._waves_request(BATCH_ROLE_COST, "POST", header, data=data)
 
+    @api_route
     async def get_period_list(
         self,
         roleId: str,
@@ -616,6 +768,7 @@ class WavesApi:
         header.update(used_headers)
         return await self._waves_request(PERIOD_LIST_URL, "GET", header)
 
+    @api_route
     async def get_period_detail(
         self,
         type: Literal["month", "week", "version"],
@@ -643,6 +796,7 @@ class WavesApi:
             url = VERSION_LIST_URL
         return await self._waves_request(url, "POST", header, data=data)
 
+    @api_route
     async def get_gacha_log(
         self,
         cardPoolType: str,
@@ -662,6 +816,7 @@ class WavesApi:
         url = GACHA_NET_LOG_URL if self.is_net(roleId) else GACHA_LOG_URL
         return await self._waves_request(url, "POST", header, json_data=data)
 
+    @api_route
     async def get_ann_list_by_type(
         self, eventType: str = "", pageSize: Optional[int] = None
     ):
@@ -674,10 +829,12 @@ class WavesApi:
         headers = await get_community_header()
         return await self._waves_request(ANN_LIST_URL, "POST", headers, data=data)
 
+    @api_route
     async def get_ann_detail(self, post_id: str):
         """获取公告详情"""
-        if post_id in self.ann_map:
-            return self.ann_map[post_id]
+        detail = ann_detail_cache.get(post_id)
+        if detail is not None:
+            return detail
 
         headers = await get_community_header()
         headers.update({"token": "", "devcode": ""})
@@ -685,9 +842,9 @@ class WavesApi:
         res = await self._waves_request(ANN_CONTENT_URL, "POST", headers, data=data)
         if res.success:
             raw_data = res.model_dump()
-            self.ann_map[post_id] = raw_data["data"]["postDetail"]
+            ann_detail_cache.set(post_id, raw_data["data"]["postDetail"])
             return raw_data["data"]["postDetail"]
-        return {}
+        return ann_detail_cache.get(post_id, allow_expired=True) or {}
 
     async def get_ann_list(self, is_cache: bool = False):
         """获取公告列表"""
@@ -704,6 +861,7 @@ class WavesApi:
 
         return self.ann_list_data
 
+    @api_route
     async def get_wiki_home(self):
         """获取wiki首页"""
         headers = await get_community_header()
@@ -713,6 +871,7 @@ class WavesApi:
             return res.model_dump()
         return {}
 
+    @api_route
     async def get_entry_detail(self, entry_id: str):
         """获取entry详情"""
         if entry_id in self.entry_detail_map:
@@ -730,6 +889,7 @@ class WavesApi:
             return raw_data
         return {}
 
+    @api_route
     async def login(self, mobile: Union[int, str], code: str, did: str):
         """登录
         Args:
@@ -755,15 +915,77 @@ class WavesApi:
         data: Optional[Dict[str, Any]] = None,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        refresh_bat: bool = True,
     ) -> KuroApiResp[Union[str, Dict[str, Any], List[Any]]]:
         if header is None:
             header = await get_base_header()
 
-        proxy_func = get_need_proxy_func()
-        if inspect.stack()[1].function in proxy_func or "all" in proxy_func:
-            proxy_url = get_local_proxy_url()
-        else:
-            proxy_url = None
+        # 同一token的相同请求视为同一请求
+        key = json.dumps(
+            [url, method, header.get("token"), params, json_data, data],
+            sort_keys=True,
+            default=str,
+        )
+        ttl = ROUTE_CACHE_TTL.get(_api_route.get() or "", 0)
+        if ttl:
+            cached = self._resp_cache.get(key)
+            if cached is not None:
+                return cached.model_copy(deep=True)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            res = await asyncio.shield(future)
+            return res.model_copy(deep=True)
+
+        future = asyncio.ensure_future(
+            self._do_waves_request(
+                url,
+                method,
+                header,
+                params,
+                json_data,
+                data,
+                max_retries,
+                retry_delay,
+            )
+        )
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 结果与等待中的请求共享，自身同样只使用副本
+        shared = await asyncio.shield(future)
+        res = shared.model_copy(deep=True)
+        if ttl and res.success:
+            self._resp_cache.set(key, shared, ttl)
+
+        # b-at过期时刷新后重试一次，不必等到token有效性缓存过期
+        if refresh_bat and res.is_bat_token_invalid:
+            new_header = await self._refresh_bat_header(header)
+            if new_header:
+                return await self._waves_request(
+                    url,
+                    method,
+                    new_header,
+                    params,
+                    json_data,
+                    data,
+                    max_retries,
+                    retry_delay,
+                    refresh_bat=False,
+                )
+        return res
+
+    async def _do_waves_request(
+        self,
+        url: str,
+        method: Literal["GET", "POST"],
+        header: Mapping[str, str],
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        max_retries: int,
+        retry_delay: float,
+    ) -> KuroApiResp[Union[str, Dict[str, Any], List[Any]]]:
+        proxy_url = proxy_routes.get(_api_route.get())
 
         async def do_request(
             req_data, client_session: aiohttp.ClientSession
@@ -794,7 +1016,30 @@ class WavesApi:
                     f"url:[{url}] params:[{params}] headers:[{header}] data:[{req_data}] raw_data:{raw_data}"
                 )
                 # 统一解析为 KuroApiResp
-                return KuroApiResp[Any].model_validate(raw_data)
+                res = KuroApiResp[Any].model_validate(raw_data)
+                if header and "token" in header:
+                    if res.is_token_invalid:
+                        invalidate_cookie_valid(cookie=header["token"])
+                        public_cookie_pool.remove(header["token"])
+                    elif res.is_bat_token_invalid:
+                        invalidate_cookie_valid(cookie=header["token"])
+                        public_cookie_pool.demote(header["token"])
+                return res
+
+        async def limited_request(
+            req_data, client_session: aiohttp.ClientSession
+        ) -> KuroApiResp[Any]:
+            """每次上游请求单独占用限流名额并计算延迟，重试等待和验证码不计入"""
+            limiter = get_limiter(url)
+            seq = await limiter.acquire(header.get("token") or "")
+            start = time.monotonic()
+            try:
+                res = await do_request(req_data, client_session)
+            except BaseException:
+                limiter.release(seq, time.monotonic() - start, ok=False)
+                raise
+            limiter.release(seq, time.monotonic() - start, is_congested(res))
+            return res
 
         async def solve_captcha():
             if not self.captcha_solver:
@@ -814,7 +1059,7 @@ class WavesApi:
                     logger.warning(f"url:[{url}] 获取session失败")
                     continue
 
-                response = await do_request(data, client)
+                response = await limited_request(data, client)
 
                 res_data = response.data or {}
                 if (
@@ -832,7 +1077,7 @@ class WavesApi:
                     # 重试数据准备
                     retry_data = data.copy() if data else {}
                     retry_data["geeTestData"] = seccode_data
-                    return await do_request(retry_data, client)
+                    return await limited_request(retry_data, client)
 
                 return response
 
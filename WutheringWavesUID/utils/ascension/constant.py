@@ -49,3 +49,30 @@ def percent_to_float(value: Union[str, float]) -> float:
     if isinstance(value, str):
         return float(value.rstrip("%")) * 0.01
     return value
+
+
+# 面板中以固定值展示的属性，其余属性以百分比展示
+FLAT_STAT_NAMES = {"生命", "攻击", "防御"}
+
+
+def stat_to_float(value: Union[str, float, int, None]) -> float:
+    """ "22.3%" -> 22.3, "1234" -> 1234.0"""
+    if value is None:
+        return 0.0
+    if isinstance(value, str):
+        return float(value.rstrip("%") or 0)
+    return float(value)
+
+
+def sum_stats(*args: Union[str, float, int, None]) -> float:
+    """数值版 sum_percentages，保持一位小数的精度"""
+    return round(sum(stat_to_float(v) for v in args), 1)
+
+
+def format_stat(name: str, value: Union[str, float, int]) -> str:
+    """面板数值转为展示文本"""
+    if isinstance(value, str):
+        return value
+    if name in FLAT_STAT_NAMES:
+        return f"{int(value)}"
+    return f"{value:.1f}%"
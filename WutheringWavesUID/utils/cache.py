@@ -8,14 +8,16 @@ class TimedCache:
         self.timeout = timeout
         self.maxsize = maxsize
 
-    def set(self, key, value):
+    def set(self, key, value, timeout=None):
         if len(self.cache) >= self.maxsize:
             self._clean_up()
         if key in self.cache:
             self.cache.move_to_end(key)
         else:
             self._clean_up()
-        self.cache[key] = (value, time.time() + self.timeout)
+        if timeout is None:
+            timeout = self.timeout
+        self.cache[key] = (value, time.time() + timeout)
 
     def get(self, key):
         if key in self.cache:
@@ -29,6 +31,12 @@ class TimedCache:
         if key in self.cache:
             del self.cache[key]
 
+    def keys(self):
+        return list(self.cache.keys())
+
+    def clear(self):
+        self.cache.clear()
+
     def _clean_up(self):
         current_time = time.time()
         keys_to_delete = []
@@ -1,5 +1,4 @@
-import copy
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional
 
 from gsuid_core.logger import logger
 
@@ -12,13 +11,17 @@ from ...utils.damage.utils import (
 )
 from ...utils.map.damage.damage import check_if_ph_3, check_if_ph_5
 from ..ascension.char import WavesCharResult, get_char_detail
-from ..ascension.constant import percent_to_float, sum_numbers, sum_percentages
+from ..ascension.constant import sum_stats
 from ..ascension.sonata import WavesSonataResult, get_sonata_detail
 from ..ascension.weapon import WavesWeaponResult, get_weapon_detail
 from ..damage.abstract import WavesEchoRegister
 from ..damage.damage import DamageAttribute
 from ..resource.constant import card_sort_map as card_sort_map_back
 
+# 面板数值统一为 float，百分比属性以百分数存储(22.3% -> 22.3)
+# 展示时通过 format_stat 转为文本
+card_sort_map_float: Dict[str, float] = {k: 0.0 for k in card_sort_map_back}
+
 
 class WuWaCalc(object):
     def __init__(
@@ -75,7 +78,7 @@ class WuWaCalc(object):
             return
         self.can_calc = True
 
-    def sum_phantom_value(self, result: Dict[str, str], prop_list: List[Props]) -> Dict:
+    def sum_phantom_value(self, result: Dict[str, Any], prop_list: List[Props]) -> Dict:
         name_per = ["攻击", "生命", "防御"]
 
         for prop in prop_list:
@@ -83,18 +86,7 @@ class WuWaCalc(object):
             name = prop.attributeName
             if per and name in name_per:
                 name = f"{name}%"
-            if name not in result:
-                result[name] = prop.attributeValue
-                continue
-
-            if per:
-                old = float(result[name].replace("%", ""))
-                new = float(prop.attributeValue.replace("%", ""))
-                result[name] = f"{old + new:.1f}%"
-            else:
-                old = int(result[name])
-                new = int(prop.attributeValue)
-                result[name] = f"{old + new:d}"
+            result[name] = sum_stats(result.get(name), prop.attributeValue)
 
         return result
 
@@ -134,12 +126,7 @@ class WuWaCalc(object):
                 name: str | Any = two_piece.effect
                 effect = two_piece.param[0]
                 result["ph"] = waves_sonata_result.name
-                if name not in result:
-                    result[name] = effect
-                else:
-                    old = float(result[name].replace("%", ""))
-                    new = float(effect.replace("%", ""))
-                    result[name] = f"{old + new:.1f}%"
+                result[name] = sum_stats(result.get(name), effect)
 
             result["ph_detail"].append(
                 {
@@ -153,7 +140,7 @@ class WuWaCalc(object):
 
     def enhance_summation_phantom_value(
         self,
-        result: Dict[str, Union[str, float]],
+        result: Dict[str, Any],
     ):
         role_id = self.role_detail.role.roleId
         role_level = self.role_detail.role.level
@@ -186,27 +173,24 @@ class WuWaCalc(object):
 
         # 武器基础攻击
         _weapon_atk = weapon_result.stats[0]["value"]
-        result["atk_flat"] = float(result.get("攻击", "0"))
-        result["life_flat"] = float(result.get("生命", "0"))
-        result["def_flat"] = float(result.get("防御", "0"))
+        result["atk_flat"] = float(result.get("攻击", 0))
+        result["life_flat"] = float(result.get("生命", 0))
+        result["def_flat"] = float(result.get("防御", 0))
 
         base_atk = float(_atk) + float(_weapon_atk)
-        per_atk = percent_to_float(result.get("攻击%", "0%"))
+        per_atk = result.get("攻击%", 0) * 0.01
         result["atk_percent"] = per_atk
-        new_atk = int(base_atk * per_atk) + int(result.get("攻击", "0"))
-        result["攻击"] = f"{new_atk}"
+        result["攻击"] = int(base_atk * per_atk) + int(result.get("攻击", 0))
 
         base_life = float(_life)
-        per_life = percent_to_float(result.get("生命%", "0%"))
+        per_life = result.get("生命%", 0) * 0.01
         result["life_percent"] = per_life
-        new_life = int(base_life * per_life) + int(result.get("生命", "0"))
-        result["生命"] = f"{new_life}"
+        result["生命"] = int(base_life * per_life) + int(result.get("生命", 0))
 
         base_def = float(_def)
-        per_def = percent_to_float(result.get("防御%", "0%"))
+        per_def = result.get("防御%", 0) * 0.01
         result["def_percent"] = per_def
-        new_def = int(base_def * per_def) + int(result.get("防御", "0"))
-        result["防御"] = f"{new_def}"
+        result["防御"] = int(base_def * per_def) + int(result.get("防御", 0))
 
         # 声骸首位
         if "echo_id" in result:
@@ -216,14 +200,7 @@ class WuWaCalc(object):
                 temp = e.do_equipment_first(role_id)
                 logger.debug(f"首位声骸数据 {e.name}-{e.id}-{temp}")
                 for key, value in temp.items():
-                    if key not in result:
-                        result[key] = value
-                    else:
-                        _value = result[key]
-                        if isinstance(_value, str):
-                            old = float(_value.replace("%", ""))
-                            new = float(value.replace("%", ""))
-                            result[key] = f"{old + new:.1f}%"
+                    result[key] = sum_stats(result.get(key), value)
 
         return result
 
@@ -242,50 +219,48 @@ class WuWaCalc(object):
         weapon_reson_level = weaponData.resonLevel
 
         shuxing = f"{role_attr}伤害加成"
-        card_sort_map: Dict[str, Any] = copy.deepcopy(card_sort_map_back)
+        card_sort_map: Dict[str, Any] = dict(card_sort_map_float)
         char_result: WavesCharResult = get_char_detail(role_id, role_level, role_breach)
         weapon_result: WavesWeaponResult = get_weapon_detail(
             weapon_id, weapon_level, weapon_breach, weapon_reson_level
         )
 
         # 基础生命
-        _life = char_result.stats["life"]
+        _life = float(char_result.stats["life"])
         # 基础攻击
-        _atk = char_result.stats["atk"]
+        _atk = float(char_result.stats["atk"])
         # 基础防御
-        _def = char_result.stats["def"]
+        _def = float(char_result.stats["def"])
         # 武器基础攻击
-        _weapon_atk = weapon_result.stats[0]["value"]
-        card_sort_map["char_atk"] = float(_atk)
-        card_sort_map["weapon_atk"] = float(_weapon_atk)
-        card_sort_map["char_life"] = float(_life)
-        card_sort_map["char_def"] = float(_def)
+        _weapon_atk = float(weapon_result.stats[0]["value"])
+        card_sort_map["char_atk"] = _atk
+        card_sort_map["weapon_atk"] = _weapon_atk
+        card_sort_map["char_life"] = _life
+        card_sort_map["char_def"] = _def
         # 武器副词条
         weapon_sub_name = weapon_result.stats[1]["name"]
         weapon_sub_value = weapon_result.stats[1]["value"]
-        card_sort_map[weapon_sub_name] = sum_percentages(
-            weapon_sub_value, card_sort_map[weapon_sub_name]
+        card_sort_map[weapon_sub_name] = sum_stats(
+            weapon_sub_value, card_sort_map.get(weapon_sub_name)
         )
 
         # 武器谐振
         if weapon_result.sub_effect:
             # sub_name = ["生命提升", "共鸣效率提升", "攻击提升", "全属性伤害加成提升"]
             sub_effect_name = weapon_result.sub_effect["name"]
-            card_sort_map[sub_effect_name] = sum_percentages(
-                weapon_result.sub_effect["value"], card_sort_map[sub_effect_name]
+            card_sort_map[sub_effect_name] = sum_stats(
+                weapon_result.sub_effect["value"], card_sort_map.get(sub_effect_name)
             )
 
         # 角色固有技能
         for name, value in char_result.fixed_skill.items():
-            if name not in card_sort_map:
-                card_sort_map[name] = "0%"
-            card_sort_map[name] = sum_percentages(value, card_sort_map[name])
+            card_sort_map[name] = sum_stats(value, card_sort_map.get(name))
 
-        char_regen = "100%"
-        card_sort_map["共鸣效率"] = sum_percentages(
-            char_regen, result.get("共鸣效率", "0%"), card_sort_map["共鸣效率"]
+        char_regen = 100
+        card_sort_map["共鸣效率"] = sum_stats(
+            char_regen, result.get("共鸣效率"), card_sort_map["共鸣效率"]
         )
-        card_sort_map["energy_regen"] = percent_to_float(card_sort_map["共鸣效率"])
+        card_sort_map["energy_regen"] = card_sort_map["共鸣效率"] * 0.01
 
         card_sort_map["ph_detail"] = result.get("ph_detail", [])
 
@@ -300,9 +275,8 @@ class WuWaCalc(object):
                 # 角色攻击提升15%，共鸣效率达到250%后，当前角色全属性伤害提升30%
                 result["atk_percent"] += 0.15
                 if card_sort_map["energy_regen"] >= 2.5:
-                    card_sort_map["属性伤害加成"] = sum_percentages(
-                        "30%",
-                        card_sort_map["属性伤害加成"],
+                    card_sort_map["属性伤害加成"] = sum_stats(
+                        30, card_sort_map["属性伤害加成"]
                     )
                 card_sort_map["ph_result"] = True
 
@@ -311,103 +285,67 @@ class WuWaCalc(object):
                 ph_detail["ph_name"], ph_detail["ph_num"], SONATA_ANCIENT
             ):
                 # 角色共鸣能量为0时，暴击率提升35%
-                card_sort_map["暴击"] = sum_percentages(
-                    "20%",
-                    card_sort_map["暴击"],
-                )
+                card_sort_map["暴击"] = sum_stats(20, card_sort_map["暴击"])
                 card_sort_map["ph_result"] = True
 
-        base_atk = float(sum_numbers(_atk, _weapon_atk))
+        base_atk = _atk + _weapon_atk
         # 各种攻击百分比 = 武器副词条+武器谐振+固有技能
-        per_temp = percent_to_float(card_sort_map["攻击"])
+        per_temp = card_sort_map["攻击"] * 0.01
         card_sort_map["atk_percent"] = per_temp + result.get("atk_percent", 0)
         card_sort_map["atk_flat"] = float(result.get("atk_flat", 0))
-        card_sort_map["攻击"] = sum_numbers(
-            base_atk, result.get("攻击", 0), round(base_atk * per_temp)
+        card_sort_map["攻击"] = int(
+            base_atk + result.get("攻击", 0) + round(base_atk * per_temp)
         )
-        card_sort_map["攻击"] = f"{card_sort_map['攻击'].split('.')[0]}"
 
-        base_life = float(_life)
-        per_life = percent_to_float(card_sort_map["生命"])
+        per_life = card_sort_map["生命"] * 0.01
         card_sort_map["life_percent"] = per_life + result.get("life_percent", 0)
         card_sort_map["life_flat"] = float(result.get("life_flat", 0))
-        card_sort_map["生命"] = sum_numbers(
-            _life, result.get("生命", 0), round(base_life * per_life)
+        card_sort_map["生命"] = int(
+            _life + result.get("生命", 0) + round(_life * per_life)
         )
-        card_sort_map["生命"] = f"{card_sort_map['生命'].split('.')[0]}"
 
-        base_def = float(_def)
-        per_def = percent_to_float(card_sort_map["防御"])
+        per_def = card_sort_map["防御"] * 0.01
         card_sort_map["def_percent"] = per_def + result.get("def_percent", 0)
         card_sort_map["def_flat"] = float(result.get("def_flat", 0))
-        card_sort_map["防御"] = sum_numbers(
-            _def, result.get("防御", 0), round(base_def * per_def)
+        card_sort_map["防御"] = int(
+            _def + result.get("防御", 0) + round(_def * per_def)
         )
-        card_sort_map["防御"] = f"{card_sort_map['防御'].split('.')[0]}"
 
         # 固定暴击
-        char_crit_rate = "5%"
+        char_crit_rate = 5
         # 固定爆伤
-        char_crit_dmg = "150%"
+        char_crit_dmg = 150
 
-        card_sort_map["暴击"] = sum_percentages(
-            char_crit_rate, result.get("暴击", "0%"), card_sort_map["暴击"]
+        card_sort_map["暴击"] = sum_stats(
+            char_crit_rate, result.get("暴击"), card_sort_map["暴击"]
         )
-        card_sort_map["crit_rate"] = percent_to_float(card_sort_map["暴击"])
-        card_sort_map["暴击伤害"] = sum_percentages(
-            char_crit_dmg, result.get("暴击伤害", "0%"), card_sort_map["暴击伤害"]
+        card_sort_map["crit_rate"] = card_sort_map["暴击"] * 0.01
+        card_sort_map["暴击伤害"] = sum_stats(
+            char_crit_dmg, result.get("暴击伤害"), card_sort_map["暴击伤害"]
         )
-        card_sort_map["crit_dmg"] = percent_to_float(card_sort_map["暴击伤害"])
+        card_sort_map["crit_dmg"] = card_sort_map["暴击伤害"] * 0.01
 
-        card_sort_map[shuxing] = sum_percentages(
-            result.get(shuxing, "0%"),
-            card_sort_map.get(shuxing, "0%"),
-            card_sort_map.get("属性伤害加成", "0%"),
+        card_sort_map[shuxing] = sum_stats(
+            result.get(shuxing),
+            card_sort_map.get(shuxing),
+            card_sort_map.get("属性伤害加成"),
         )
-        card_sort_map["shuxing_bonus"] = percent_to_float(card_sort_map[shuxing])
+        card_sort_map["shuxing_bonus"] = card_sort_map[shuxing] * 0.01
         card_sort_map["char_attr"] = role_attr
 
         if "属性伤害加成" in card_sort_map:
             del card_sort_map["属性伤害加成"]
 
-        card_sort_map["普攻伤害加成"] = sum_percentages(
-            result.get("普攻伤害加成", "0%"), card_sort_map.get("普攻伤害加成", "0%")
-        )
-        card_sort_map["attack_damage"] = percent_to_float(card_sort_map["普攻伤害加成"])
-
-        card_sort_map["重击伤害加成"] = sum_percentages(
-            result.get("重击伤害加成", "0%"), card_sort_map.get("重击伤害加成", "0%")
-        )
-        card_sort_map["hit_damage"] = percent_to_float(card_sort_map["重击伤害加成"])
-
-        card_sort_map["共鸣技能伤害加成"] = sum_percentages(
-            result.get("共鸣技能伤害加成", "0%"),
-            card_sort_map.get("共鸣技能伤害加成", "0%"),
-        )
-        card_sort_map["skill_damage"] = percent_to_float(
-            card_sort_map["共鸣技能伤害加成"]
-        )
-
-        card_sort_map["共鸣解放伤害加成"] = sum_percentages(
-            result.get("共鸣解放伤害加成", "0%"),
-            card_sort_map.get("共鸣解放伤害加成", "0%"),
-        )
-        card_sort_map["liberation_damage"] = percent_to_float(
-            card_sort_map["共鸣解放伤害加成"]
-        )
-
-        card_sort_map["声骸技能伤害加成"] = sum_percentages(
-            result.get("声骸技能伤害加成", "0%"),
-            card_sort_map.get("声骸技能伤害加成", "0%"),
-        )
-        card_sort_map["phantom_damage"] = percent_to_float(
-            card_sort_map["声骸技能伤害加成"]
-        )
-
-        card_sort_map["治疗效果加成"] = sum_percentages(
-            result.get("治疗效果加成", "0%"), card_sort_map.get("治疗效果加成", "0%")
-        )
-        card_sort_map["heal_bonus"] = percent_to_float(card_sort_map["治疗效果加成"])
+        for name, key in [
+            ("普攻伤害加成", "attack_damage"),
+            ("重击伤害加成", "hit_damage"),
+            ("共鸣技能伤害加成", "skill_damage"),
+            ("共鸣解放伤害加成", "liberation_damage"),
+            ("声骸技能伤害加成", "phantom_damage"),
+            ("治疗效果加成", "heal_bonus"),
+        ]:
+            card_sort_map[name] = sum_stats(result.get(name), card_sort_map.get(name))
+            card_sort_map[key] = card_sort_map[name] * 0.01
 
         card_sort_map["echo_id"] = result.get("echo_id")
         # logger.debug(f"面板数据: {card_sort_map}")
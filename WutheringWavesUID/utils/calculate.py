@@ -1,6 +1,6 @@
 import math
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Tuple, Union
 
 from msgspec import json as msgjson
 
@@ -8,7 +8,11 @@ from gsuid_core.logger import logger
 
 from ..utils.api.model import Props
 from ..utils.ascension.char import get_char_model
-from .expression_evaluator import find_first_matching_expression
+from ..utils.ascension.constant import stat_to_float
+from .expression_evaluator import (
+    compile_expressions,
+    find_first_matching_expression,
+)
 from .image import SPECIAL_GOLD, WAVES_MOLTEN, WAVES_SIERRA, WAVES_VOID
 from .map.calc_score_script import phantom_sub_value_map as ph_sub_map
 from .resource.constant import ATTRIBUTE_NAME_SET, ID_FULL_CHAR_NAME
@@ -18,6 +22,33 @@ MAP_PATH = Path(__file__).parent / "map/character"
 score_interval = ["c", "b", "a", "s", "ss", "sss"]
 fix_max_score = 50
 
+# (path, compiled) -> (mtime_ns, 解析结果)，返回的对象为共享只读数据
+_calc_json_cache: Dict[Tuple[Path, bool], Tuple[int, Any]] = {}
+
+
+def load_calc_json(path: Path, compiled: bool = False) -> Any:
+    """读取并缓存模板json，文件修改后自动失效
+
+    compiled 为 True 时返回编译后的条件表达式
+    """
+    key = (path, compiled)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        _calc_json_cache.pop(key, None)
+        return None
+
+    cached = _calc_json_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = msgjson.decode(f.read())
+    if compiled:
+        data = compile_expressions(data)
+    _calc_json_cache[key] = (mtime, data)
+    return data
+
 
 def get_calc_map(ctx: Dict, char_name: str, char_id: Union[int, str]):
     if str(char_id) in ID_FULL_CHAR_NAME:
@@ -27,10 +58,8 @@ def get_calc_map(ctx: Dict, char_name: str, char_id: Union[int, str]):
         char_path = MAP_PATH / "default"
 
     def check_conditions(file_name):
-        condition_path = char_path / file_name
-        if condition_path.exists():
-            with open(condition_path, "r", encoding="utf-8") as f:
-                expressions = msgjson.decode(f.read())
+        expressions = load_calc_json(char_path / file_name, compiled=True)
+        if expressions is not None:
             return find_first_matching_expression(ctx, expressions)
         return None
 
@@ -41,8 +70,7 @@ def get_calc_map(ctx: Dict, char_name: str, char_id: Union[int, str]):
         or "calc.json"
     )
     logger.debug(f"{char_name} [匹配文件]: {char_path.name}/{calc_json_path}")
-    with open(char_path / calc_json_path, "r", encoding="utf-8") as f:
-        return msgjson.decode(f.read())
+    return load_calc_json(char_path / calc_json_path)
 
 
 def calc_phantom_entry(index, prop, cost: int, calc_map, char_attr: str):
@@ -58,23 +86,20 @@ def calc_phantom_entry(index, prop, cost: int, calc_map, char_attr: str):
     else:
         pros_temp = sub_pros
 
-    value = prop.attributeValue
-    if "%" in prop.attributeValue:
-        value = float(value.replace("%", ""))
-    else:
-        value = float(value)
+    per = "%" in prop.attributeValue
+    value = stat_to_float(prop.attributeValue)
     if prop.attributeName == "攻击":
-        if "%" in prop.attributeValue:
+        if per:
             score += pros_temp.get("攻击%", 0) * value
         else:
             score += pros_temp.get("攻击", 0) * value
     elif prop.attributeName == "生命":
-        if "%" in prop.attributeValue:
+        if per:
             score += pros_temp.get("生命%", 0) * value
         else:
             score += pros_temp.get("生命", 0) * value
     elif prop.attributeName == "防御":
-        if "%" in prop.attributeValue:
+        if per:
             score += pros_temp.get("防御%", 0) * value
         else:
             score += pros_temp.get("防御", 0) * value
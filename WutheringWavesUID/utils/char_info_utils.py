@@ -1,29 +1,247 @@
+import asyncio
 import json
-from typing import Any, Dict, Generator, Union
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
 import aiofiles
+from msgspec import msgpack
 
 from gsuid_core.logger import logger
 
 from ..utils.api.model import RoleDetailData
+from ..utils.database.models import WavesRoleData
+from ..wutheringwaves_config import WutheringWavesConfig
 from .resource.RESOURCE_PATH import PLAYER_PATH
 
+_encoder = msgpack.Encoder()
+_decoder = msgpack.Decoder()
 
-async def get_all_role_detail_info_list(
-    uid: str,
-) -> Union[Generator[RoleDetailData, Any, None], None]:
+
+def get_role_detail_cache_num() -> int:
+    return WutheringWavesConfig.get_config("RoleDetailCacheNum").data or 0
+
+
+class RoleDetailCache:
+    """
+    面板数据解析结果缓存，按缓存的角色总数做 LRU 淘汰
+    面板只经由本模块写入，写入时同步更新缓存
+    缓存中的 RoleDetailData 为共享对象，需要修改时请先复制
+    """
+
+    def __init__(self):
+        self._data: OrderedDict[str, List[RoleDetailData]] = OrderedDict()
+        self._role_num = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, uid: str) -> Optional[List[RoleDetailData]]:
+        roles = self._data.get(uid)
+        if roles is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(uid)
+        self.hits += 1
+        return roles
+
+    def put(self, uid: str, roles: List[RoleDetailData]):
+        self.invalidate(uid)
+        max_num = get_role_detail_cache_num()
+        if max_num <= 0 or len(roles) > max_num:
+            return
+        self._data[uid] = roles
+        self._role_num += len(roles)
+        while self._role_num > max_num:
+            _, old = self._data.popitem(last=False)
+            self._role_num -= len(old)
+
+    def update(self, uid: str, roles: List[RoleDetailData], delete_role_ids: List[int]):
+        """只替换有变化的角色，未缓存时不做处理"""
+        old = self._data.get(uid)
+        if old is None:
+            return
+        temp = {r.role.roleId: r for r in old}
+        for role_id in delete_role_ids:
+            temp.pop(role_id, None)
+        for r in roles:
+            temp[r.role.roleId] = r
+        self.put(uid, list(temp.values()))
+
+    def invalidate(self, uid: str):
+        roles = self._data.pop(uid, None)
+        if roles is not None:
+            self._role_num -= len(roles)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        total = self.hits + self.misses
+        return {
+            "uid_num": len(self._data),
+            "role_num": self._role_num,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0,
+        }
+
+
+role_detail_cache = RoleDetailCache()
+
+
+async def _select_role_data(
+    uid: str, role_ids: Optional[List[int]] = None
+) -> Optional[List[Dict]]:
+    rows = await WavesRoleData.select_role_data(uid, role_ids)
+    if not rows:
+        return None
+    return [_decoder.decode(r.data) for r in rows]
+
+
+_migrate_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _get_migrate_lock(uid: str) -> asyncio.Lock:
+    if uid not in _migrate_locks:
+        _migrate_locks[uid] = asyncio.Lock()
+    return _migrate_locks[uid]
+
+
+async def migrate_raw_data(uid: str) -> Optional[List[Dict]]:
+    """将旧版 rawData.json 导入面板数据表，导入后重命名为 rawData.json.bak"""
     path = PLAYER_PATH / uid / "rawData.json"
     if not path.exists():
         return None
+
+    lock = _get_migrate_lock(uid)
+    async with lock:
+        try:
+            return await _migrate_raw_data(uid, path)
+        finally:
+            # 迁移只会发生一次，用完即释放，等锁的任务仍持有同一把锁
+            if _migrate_locks.get(uid) is lock:
+                del _migrate_locks[uid]
+
+
+async def _migrate_raw_data(uid: str, path: Path) -> Optional[List[Dict]]:
+    # 等锁期间可能已被其他任务迁移，源文件不存在即视为已迁移
     try:
         async with aiofiles.open(path, mode="r", encoding="utf-8") as f:
             player_data = json.loads(await f.read())
+    except FileNotFoundError:
+        return await _select_role_data(uid)
     except Exception as e:
-        logger.exception(f"get role detail info failed {path}:", e)
+        logger.exception(f"migrate raw data failed {path}:", e)
         path.unlink(missing_ok=True)
         return None
 
-    return iter(RoleDetailData(**r) for r in player_data)
+    await WavesRoleData.save_role_data(
+        uid, {r["role"]["roleId"]: _encoder.encode(r) for r in player_data}
+    )
+    try:
+        path.replace(path.with_name("rawData.json.bak"))
+    except FileNotFoundError:
+        pass
+    return player_data
+
+
+async def migrate_all_raw_data() -> int:
+    """迁移 PLAYER_PATH 下全部旧版面板数据"""
+    num = 0
+    for path in PLAYER_PATH.glob("*/rawData.json"):
+        uid = path.parent.name
+        try:
+            if await migrate_raw_data(uid):
+                num += 1
+        except Exception as e:
+            logger.exception(f"migrate raw data failed {uid}:", e)
+    return num
+
+
+async def load_role_data(
+    uid: str, role_ids: Optional[List[int]] = None
+) -> Optional[List[Dict]]:
+    """读取原始面板数据，`role_ids`为空时返回全部角色"""
+    player_data = await _select_role_data(uid, role_ids)
+    if player_data:
+        return player_data
+
+    player_data = await migrate_raw_data(uid)
+    if player_data is None or role_ids is None:
+        return player_data
+    return [r for r in player_data if r["role"]["roleId"] in role_ids]
+
+
+async def save_role_data(
+    uid: str,
+    role_data: List[Dict],
+    delete_role_ids: Optional[List[int]] = None,
+    fingerprints: Optional[Dict[int, str]] = None,
+):
+    """
+    只写入有变化的角色
+    `fingerprints`为本次拉取过详情的角色指纹，未变化的角色只更新指纹和同步时间
+    """
+    delete_role_ids = delete_role_ids or []
+    fingerprints = fingerprints or {}
+    role_data_map = {r["role"]["roleId"]: _encoder.encode(r) for r in role_data}
+    await WavesRoleData.save_role_data(
+        uid, role_data_map, delete_role_ids, fingerprints
+    )
+    unchanged = {k: v for k, v in fingerprints.items() if k not in role_data_map}
+    if unchanged:
+        await WavesRoleData.update_role_sync(uid, unchanged)
+    role_detail_cache.update(
+        uid, [RoleDetailData(**r) for r in role_data], delete_role_ids
+    )
+
+
+async def get_role_sync(uid: str) -> Dict[int, Tuple[str, int]]:
+    """各角色上次拉取详情时的 (指纹, 时间)"""
+    return await WavesRoleData.select_role_sync(uid)
+
+
+async def has_role_data(uids: List[str]) -> List[str]:
+    """返回`uids`中已有面板数据的uid"""
+    stored = set(await WavesRoleData.select_stored_uids(uids))
+    return [
+        uid
+        for uid in uids
+        if uid in stored or (PLAYER_PATH / uid / "rawData.json").exists()
+    ]
+
+
+async def get_role_detail_info(
+    uid: str, role_ids: List[Union[str, int]]
+) -> Optional[RoleDetailData]:
+    """按`role_ids`顺序返回第一个存在的角色面板，只解码该角色的数据"""
+    ids = [int(i) for i in role_ids]
+    roles = role_detail_cache.get(uid)
+    if roles is None:
+        player_data = await load_role_data(uid, ids)
+        if not player_data:
+            return None
+        roles = [RoleDetailData(**r) for r in player_data]
+
+    temp = {r.role.roleId: r for r in roles}
+    return next((temp[i] for i in ids if i in temp), None)
+
+
+async def get_all_role_detail_info_list(
+    uid: str,
+) -> Union[Generator[RoleDetailData, Any, None], None]:
+    role_details = role_detail_cache.get(uid)
+    if role_details is not None:
+        return iter(role_details)
+
+    try:
+        player_data = await load_role_data(uid)
+    except Exception as e:
+        logger.exception(f"get role detail info failed {uid}:", e)
+        return None
+    if not player_data:
+        return None
+
+    role_details = [RoleDetailData(**r) for r in player_data]
+    role_detail_cache.put(uid, role_details)
+    return iter(role_details)
 
 
 async def get_all_role_detail_info(uid: str) -> Union[Dict[str, RoleDetailData], None]:
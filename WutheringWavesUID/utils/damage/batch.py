@@ -0,0 +1,153 @@
+"""
+排行期望伤害的批量计算
+
+同一角色、武器、命座、技能等级且声骸套装相同的多个玩家，伤害脚本走的分支完全一致，
+只有声骸带来的数值不同。把这些数值按列拼成 numpy 数组，脚本对整组只执行一次。
+没有 numpy、分组人数过少、脚本不支持数组或结果与逐个计算不一致时，退回逐个计算。
+"""
+
+import copy
+import math
+from dataclasses import fields
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple, Optional
+
+from gsuid_core.logger import logger
+
+from ..api.model import RoleDetailData
+from .damage import DamageAttribute, DamageBonusPhantom
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+else:
+
+    class _Column(np.ndarray):
+        """按列存放的数值，脚本格式化效果说明时只取第一个玩家的数值"""
+
+        def __format__(self, format_spec):
+            return format(float(self.flat[0]), format_spec)
+
+
+# 少于该人数的分组逐个计算
+BATCH_MIN_SIZE = 3
+# 批量结果与逐个计算的相对误差上限
+BATCH_RTOL = 1e-9
+
+# (排行伤害配置, 伤害属性, 角色面板)
+RankJob = Tuple[Dict, DamageAttribute, RoleDetailData]
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _freeze(value):
+    """把非数值字段转成可比较、可哈希的形式"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if hasattr(value, "__dict__"):
+        return (type(value).__name__, _freeze(vars(value)))
+    return value
+
+
+def _group_key(job: RankJob):
+    """分组键：角色面板(不含声骸)和伤害属性里的非数值字段"""
+    rank_detail, attr, role = job
+    attr_key = []
+    for name, value in vars(attr).items():
+        if name == "role" or _is_number(value):
+            continue
+        if isinstance(value, DamageBonusPhantom):
+            continue
+        attr_key.append((name, _freeze(value)))
+    key = (
+        id(rank_detail["func"]),
+        role.model_dump_json(exclude={"phantomData"}),
+        tuple(attr_key),
+    )
+    hash(key)
+    return key
+
+
+def _column(values: List[Any]):
+    """数值相同则保留标量，否则拼成数组"""
+    if all(v == values[0] for v in values):
+        return values[0]
+    return np.array(values, dtype=np.float64).view(_Column)
+
+
+def _columnize(attrs: List[DamageAttribute]) -> DamageAttribute:
+    """把同组玩家的伤害属性合并为按列存放的伤害属性"""
+    col = copy.deepcopy(attrs[0])
+    for name, value in vars(attrs[0]).items():
+        if _is_number(value):
+            setattr(col, name, _column([getattr(a, name) for a in attrs]))
+        elif isinstance(value, DamageBonusPhantom):
+            bonus = getattr(col, name)
+            for f in fields(DamageBonusPhantom):
+                setattr(
+                    bonus,
+                    f.name,
+                    _column([getattr(getattr(a, name), f.name) for a in attrs]),
+                )
+    return col
+
+
+def _run(job: RankJob) -> Optional[float]:
+    rank_detail, attr, role = job
+    _, expected_damage = rank_detail["func"](attr, role)
+    return expected_damage
+
+
+def _run_group(jobs: List[RankJob]) -> Optional[List[float]]:
+    """整组执行一次脚本，并用第一个玩家的逐个计算结果校验"""
+    rank_detail, _, role = jobs[0]
+    col = _columnize([job[1] for job in jobs])
+    try:
+        _, result = rank_detail["func"](col, role)
+        result = np.broadcast_to(np.asarray(result, dtype=np.float64), len(jobs))
+    except Exception:
+        return None
+
+    # 脚本会修改传入的伤害属性，校验用副本计算，失败时原属性仍可逐个计算
+    expected = _run((rank_detail, copy.deepcopy(jobs[0][1]), role))
+    if not _is_number(expected) or not math.isclose(
+        float(result[0]), expected, rel_tol=BATCH_RTOL
+    ):
+        return None
+    return [expected] + [float(v) for v in result[1:]]
+
+
+def calc_rank_damage_batch(jobs: List[RankJob]) -> List[Optional[float]]:
+    """
+    计算多个玩家的排行期望伤害，返回与`jobs`顺序一致的结果
+    脚本会修改传入的伤害属性，计算后不可再使用
+    """
+    results: List[Optional[float]] = [None] * len(jobs)
+    groups: Dict[Any, List[int]] = defaultdict(list)
+    for i, job in enumerate(jobs):
+        try:
+            key = _group_key(job) if np is not None else i
+        except TypeError:
+            key = i
+        groups[key].append(i)
+
+    batched = 0
+    for index in groups.values():
+        if len(index) >= BATCH_MIN_SIZE:
+            values = _run_group([jobs[i] for i in index])
+            if values is not None:
+                for i, v in zip(index, values):
+                    results[i] = v
+                batched += len(index)
+                continue
+        for i in index:
+            results[i] = _run(jobs[i])
+
+    if batched:
+        logger.debug(f"[calc_rank_damage_batch] 批量计算 {batched}/{len(jobs)}")
+    return results
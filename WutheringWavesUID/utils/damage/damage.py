@@ -92,6 +92,15 @@ class DamageBonusPhantom:
         return res
 
 
+def _is_empty(effect_value) -> bool:
+    """未传入有效数值，批量计算时effect_value可能为数组"""
+    if effect_value is None:
+        return True
+    if isinstance(effect_value, (int, float)):
+        return not effect_value
+    return False
+
+
 class DamageAttribute:
     def __init__(
         self,
@@ -691,7 +700,7 @@ class DamageAttribute:
 
         :return: 暴击伤害值
         """
-        if not effect_value:
+        if _is_empty(effect_value):
             effect_value = self.effect_attack
         # 计算暴击伤害
         return (
@@ -713,10 +722,15 @@ class DamageAttribute:
 
         :return: 期望伤害值
         """
-        if self.crit_rate > 1:
-            return self.calculate_crit_damage(effect_value)
+        crit_rate = self.crit_rate
+        if isinstance(crit_rate, (int, float)):
+            if crit_rate > 1:
+                return self.calculate_crit_damage(effect_value)
+        else:
+            # 批量计算时为数组，暴击率超过1按1计算
+            crit_rate = crit_rate.clip(max=1)
 
-        if not effect_value:
+        if _is_empty(effect_value):
             effect_value = self.effect_attack
 
         return (
@@ -729,7 +743,7 @@ class DamageAttribute:
             * (1 + self.easy_damage)
             * self.valid_enemy_resistance
             * self.defense_ratio
-            * (self.crit_rate * (self.crit_dmg - 1) + 1)
+            * (crit_rate * (self.crit_dmg - 1) + 1)
         )
 
     def calculate_healing(self, effect_value):
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, Literal, Optional
+from typing import Dict, Union, Literal, Optional, Sequence
 
 SONATA_FREEZING = "凝夜白霜"
 SONATA_MOLTEN = "熔山裂谷"
@@ -136,14 +136,12 @@ def parse_skill_multi(temp):
     return 0, 0
 
 
-def add_comma_separated_numbers(*nums: str) -> str:
+def format_damage(damage: Union[float, Sequence[float], None]) -> str:
     """
-    接受多个带逗号的数字字符串，去除逗号后进行加法计算，并返回结果，结果也带逗号。
-    :return: 计算后的整数和，格式化为带逗号的字符串
+    将伤害数值格式化为带逗号的整数字符串，多段伤害以 + 连接
     """
-    total = sum(float(num.replace(",", "")) for num in nums)
-    return f"{total:,.0f}"
-
-
-def comma_separated_number(num: str):
-    return float(num.replace(",", ""))
\ No newline at end of file
+    if damage is None:
+        return ""
+    if isinstance(damage, (tuple, list)):
+        return " + ".join(format_damage(d) for d in damage)
+    return f"{damage:,.0f}"
@@ -1,6 +1,7 @@
-from typing import Any, Dict, List, Optional, Type, TypeVar
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 
-from sqlalchemy import delete, null, update
+from sqlalchemy import Column, LargeBinary, delete, func, null, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import and_, or_
 from sqlmodel import Field, col, select
@@ -9,6 +10,7 @@ from gsuid_core.utils.database.base_models import (
     Bind,
     Push,
     User,
+    BaseIDModel,
     with_session,
 )
 from gsuid_core.utils.database.startup import exec_list
@@ -21,11 +23,16 @@ exec_list.extend(
         'ALTER TABLE WavesUser ADD COLUMN bbs_sign_switch TEXT DEFAULT "off"',
         'ALTER TABLE WavesUser ADD COLUMN bat TEXT DEFAULT ""',
         'ALTER TABLE WavesUser ADD COLUMN did TEXT DEFAULT ""',
+        'ALTER TABLE WavesRoleData ADD COLUMN fingerprint TEXT DEFAULT ""',
+        "ALTER TABLE WavesRoleData ADD COLUMN sync_time INTEGER DEFAULT 0",
+        'ALTER TABLE WavesRoleRank ADD COLUMN calc_version TEXT DEFAULT ""',
     ]
 )
 
 T_WavesBind = TypeVar("T_WavesBind", bound="WavesBind")
 T_WavesUser = TypeVar("T_WavesUser", bound="WavesUser")
+T_WavesRoleRank = TypeVar("T_WavesRoleRank", bound="WavesRoleRank")
+T_WavesRoleData = TypeVar("T_WavesRoleData", bound="WavesRoleData")
 
 
 class WavesBind(Bind, table=True):
@@ -196,6 +203,16 @@ class WavesUser(User, table=True):
         data = result.scalars().all()
         return data[0] if data else None
 
+    @classmethod
+    @with_session
+    async def select_data_by_bat(
+        cls: Type[T_WavesUser], session: AsyncSession, bat: str
+    ) -> Optional[T_WavesUser]:
+        sql = select(cls).where(cls.bat == bat)
+        result = await session.execute(sql)
+        data = result.scalars().all()
+        return data[0] if data else None
+
     @classmethod
     @with_session
     async def select_data_by_cookie_and_uid(
@@ -283,6 +300,242 @@ class WavesPush(Push, table=True):
     resin_is_push: Optional[str] = Field(title="体力是否已推送", default="off")
 
 
+class WavesRoleRank(BaseIDModel, table=True):
+    """角色排行索引，由`save_card_info`在面板变化时写入"""
+
+    __table_args__: Dict[str, Any] = {"extend_existing": True}
+    uid: str = Field(default="", title="鸣潮UID", index=True)
+    role_id: int = Field(default=0, title="角色ID", index=True)
+    role_name: str = Field(default="", title="角色名字")
+    attribute_name: str = Field(default="", title="角色属性")
+    level: int = Field(default=0, title="角色等级")
+    chain: int = Field(default=0, title="共鸣链")
+    chain_name: str = Field(default="", title="共鸣链名字")
+    score: float = Field(default=0, title="声骸评分", index=True)
+    score_bg: str = Field(default="c", title="评分背景")
+    expected_damage: float = Field(default=0, title="期望伤害", index=True)
+    expected_name: str = Field(default="", title="期望伤害名字")
+    weapon_id: int = Field(default=0, title="武器ID")
+    weapon_name: str = Field(default="", title="武器名字")
+    weapon_star_level: int = Field(default=3, title="武器星级")
+    weapon_level: int = Field(default=0, title="武器等级")
+    weapon_reson_level: int = Field(default=1, title="武器谐振")
+    sonata_name: str = Field(default="", title="合鸣效果")
+    calc_version: str = Field(default="", title="计算版本")
+
+    @classmethod
+    def rank_order(cls, rank_type: str) -> List[Any]:
+        if rank_type == "评分":
+            return [cls.score, cls.expected_damage, cls.level, cls.chain]
+        return [cls.expected_damage, cls.score, cls.level, cls.chain]
+
+    @classmethod
+    @with_session
+    async def upsert_rank_list(
+        cls: Type[T_WavesRoleRank],
+        session: AsyncSession,
+        uid: str,
+        rank_list: List[Dict[str, Any]],
+    ):
+        """覆盖写入`uid`下的全部角色排行数据"""
+        sql = delete(cls).where(col(cls.uid) == uid)
+        await session.execute(sql)
+        session.add_all([cls(uid=uid, **r) for r in rank_list])
+        return len(rank_list)
+
+    @classmethod
+    @with_session
+    async def select_indexed_uids(
+        cls: Type[T_WavesRoleRank],
+        session: AsyncSession,
+        uids: List[str],
+        calc_version: str,
+    ) -> List[str]:
+        """返回`uids`中已经按`calc_version`建立过索引的uid"""
+        if not uids:
+            return []
+        sql = (
+            select(cls.uid)
+            .where(
+                and_(
+                    col(cls.uid).in_(uids),
+                    col(cls.calc_version) == calc_version,
+                )
+            )
+            .distinct()
+        )
+        result = await session.execute(sql)
+        return list(result.scalars().all())
+
+    @classmethod
+    @with_session
+    async def select_role_rank(
+        cls: Type[T_WavesRoleRank],
+        session: AsyncSession,
+        uid: str,
+        role_ids: List[int],
+    ) -> Optional[T_WavesRoleRank]:
+        sql = select(cls).where(
+            and_(col(cls.uid) == uid, col(cls.role_id).in_(role_ids))
+        )
+        result = await session.execute(sql)
+        data = result.scalars().all()
+        return data[0] if data else None
+
+    @classmethod
+    @with_session
+    async def select_rank_list(
+        cls: Type[T_WavesRoleRank],
+        session: AsyncSession,
+        uids: List[str],
+        role_ids: List[int],
+        rank_type: str,
+        limit: int,
+    ) -> List[T_WavesRoleRank]:
+        """按排行类型排序，取前`limit`名"""
+        if not uids:
+            return []
+        sql = (
+            select(cls)
+            .where(
+                and_(
+                    col(cls.uid).in_(uids),
+                    col(cls.role_id).in_(role_ids),
+                    col(cls.score) > 0,
+                )
+            )
+            .order_by(*[col(c).desc() for c in cls.rank_order(rank_type)])
+            .limit(limit)
+        )
+        result = await session.execute(sql)
+        return list(result.scalars().all())
+
+    @classmethod
+    @with_session
+    async def count_rank_before(
+        cls: Type[T_WavesRoleRank],
+        session: AsyncSession,
+        uids: List[str],
+        role_ids: List[int],
+        rank_type: str,
+        rank: "WavesRoleRank",
+    ) -> int:
+        """统计排在`rank`之前的数量"""
+        order = cls.rank_order(rank_type)
+        sql = select(func.count()).where(
+            and_(
+                col(cls.uid).in_(uids),
+                col(cls.role_id).in_(role_ids),
+                col(cls.score) > 0,
+                tuple_(*order) > tuple_(*[getattr(rank, c.key) for c in order]),
+            )
+        )
+        result = await session.execute(sql)
+        return result.scalar_one()
+
+
+class WavesRoleData(BaseIDModel, table=True):
+    """角色面板数据，每个角色一行，`data`为msgpack编码的原始面板"""
+
+    __table_args__: Dict[str, Any] = {"extend_existing": True}
+    uid: str = Field(default="", title="鸣潮UID", index=True)
+    role_id: int = Field(default=0, title="角色ID", index=True)
+    data: bytes = Field(default=b"", sa_column=Column(LargeBinary), title="面板数据")
+    fingerprint: str = Field(default="", title="角色指纹")
+    sync_time: int = Field(default=0, title="详情同步时间")
+
+    @classmethod
+    @with_session
+    async def select_role_data(
+        cls: Type[T_WavesRoleData],
+        session: AsyncSession,
+        uid: str,
+        role_ids: Optional[List[int]] = None,
+    ) -> List[T_WavesRoleData]:
+        """查询`uid`的面板数据，`role_ids`为空时返回全部角色"""
+        sql = select(cls).where(col(cls.uid) == uid)
+        if role_ids is not None:
+            sql = sql.where(col(cls.role_id).in_(role_ids))
+        result = await session.execute(sql.order_by(col(cls.id)))
+        return list(result.scalars().all())
+
+    @classmethod
+    @with_session
+    async def save_role_data(
+        cls: Type[T_WavesRoleData],
+        session: AsyncSession,
+        uid: str,
+        role_data: Dict[int, bytes],
+        delete_role_ids: Optional[List[int]] = None,
+        fingerprints: Optional[Dict[int, str]] = None,
+    ):
+        """只写入有变化的角色，并删除`delete_role_ids`中的角色"""
+        role_ids = list(role_data.keys()) + list(delete_role_ids or [])
+        if not role_ids:
+            return 0
+        sql = delete(cls).where(
+            and_(col(cls.uid) == uid, col(cls.role_id).in_(role_ids))
+        )
+        await session.execute(sql)
+        fingerprints = fingerprints or {}
+        now = int(time.time())
+        session.add_all(
+            [
+                cls(
+                    uid=uid,
+                    role_id=k,
+                    data=v,
+                    fingerprint=fingerprints.get(k, ""),
+                    sync_time=now if k in fingerprints else 0,
+                )
+                for k, v in role_data.items()
+            ]
+        )
+        return len(role_data)
+
+    @classmethod
+    @with_session
+    async def update_role_sync(
+        cls: Type[T_WavesRoleData],
+        session: AsyncSession,
+        uid: str,
+        fingerprints: Dict[int, str],
+    ):
+        """面板未变化时只更新角色指纹和同步时间"""
+        now = int(time.time())
+        for role_id, fingerprint in fingerprints.items():
+            sql = (
+                update(cls)
+                .where(and_(col(cls.uid) == uid, col(cls.role_id) == role_id))
+                .values(fingerprint=fingerprint, sync_time=now)
+            )
+            await session.execute(sql)
+
+    @classmethod
+    @with_session
+    async def select_role_sync(
+        cls: Type[T_WavesRoleData], session: AsyncSession, uid: str
+    ) -> Dict[int, Tuple[str, int]]:
+        """返回`uid`各角色的 (指纹, 同步时间)"""
+        sql = select(cls.role_id, cls.fingerprint, cls.sync_time).where(
+            col(cls.uid) == uid
+        )
+        result = await session.execute(sql)
+        return {r[0]: (r[1], r[2]) for r in result.all()}
+
+    @classmethod
+    @with_session
+    async def select_stored_uids(
+        cls: Type[T_WavesRoleData], session: AsyncSession, uids: List[str]
+    ) -> List[str]:
+        """返回`uids`中已有面板数据的uid"""
+        if not uids:
+            return []
+        sql = select(cls.uid).where(col(cls.uid).in_(uids)).distinct()
+        result = await session.execute(sql)
+        return list(result.scalars().all())
+
+
 @site.register_admin
 class WavesBindAdmin(GsAdminModel):
     pk_name = "id"
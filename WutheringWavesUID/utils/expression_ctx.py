@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from pydantic import BaseModel
 
@@ -7,12 +7,14 @@ from .calc import WuWaCalc
 from .calculate import calc_phantom_score, get_calc_map, get_total_score_bg
 from .char_info_utils import get_all_role_detail_info
 from .damage.abstract import DamageRankRegister
-from .damage.utils import comma_separated_number
+from .damage.batch import RankJob, calc_rank_damage_batch
+from .util import get_version
 
 
 class WavesCharRank(BaseModel):
     roleId: int  # 角色id
     roleName: str  # 角色名字
+    attributeName: Optional[str] = None  # 角色属性
     starLevel: int  # 角色星级
     level: int  # 角色等级
     chain: int  # 命座
@@ -22,6 +24,8 @@ class WavesCharRank(BaseModel):
     expected_damage: Optional[float]  # 期望伤害
 
     weaponId: int  # 武器id
+    weaponName: str = ""  # 武器名字
+    weaponStarLevel: int = 3  # 武器星级
     weaponLevel: int  # 武器等级
     weaponResonLevel: int  # 武器共鸣等级
     sonataName: str  # 合鸣效果
@@ -42,6 +46,27 @@ class WavesCharRank(BaseModel):
             "expected_name": self.expected_name if self.expected_name else "",
         }
 
+    def to_index_dict(self):
+        return {
+            "role_id": self.roleId,
+            "role_name": self.roleName,
+            "attribute_name": self.attributeName or "",
+            "level": self.level,
+            "chain": self.chain,
+            "chain_name": self.chainName,
+            "score": self.score,
+            "score_bg": self.score_bg,
+            "expected_damage": self.expected_damage if self.expected_damage else 0,
+            "expected_name": self.expected_name if self.expected_name else "",
+            "weapon_id": self.weaponId,
+            "weapon_name": self.weaponName,
+            "weapon_star_level": self.weaponStarLevel,
+            "weapon_level": self.weaponLevel,
+            "weapon_reson_level": self.weaponResonLevel,
+            "sonata_name": self.sonataName,
+            "calc_version": get_version(),
+        }
+
 
 async def get_waves_char_rank(uid, all_role_detail, need_expected_damage=False):
     if not all_role_detail:
@@ -50,81 +75,106 @@ async def get_waves_char_rank(uid, all_role_detail, need_expected_damage=False):
         temp = all_role_detail.values()
     else:
         temp = all_role_detail if all_role_detail else []
-    waves_char_rank = []
-    for role_detail in temp:
-        if not isinstance(role_detail, RoleDetailData):
-            role_detail = RoleDetailData(**role_detail)
-
-        phantom_score = 0
-        calc: WuWaCalc = WuWaCalc(role_detail)
-        # calc_temp = None
-        expected_damage = None
-
-        sonataName = ""
-        expected_name = ""
-        if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
-            equipPhantomList = role_detail.phantomData.equipPhantomList
-
-            calc.phantom_pre = calc.prepare_phantom()
-            calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-            calc.calc_temp = get_calc_map(
-                calc.phantom_card,
-                role_detail.role.roleName,
-                role_detail.role.roleId,
-            )
-            for i, _phantom in enumerate(equipPhantomList):
-                if _phantom and _phantom.phantomProp:
-                    props = _phantom.get_props()
-                    _score, _bg = calc_phantom_score(
-                        role_detail.role.roleId, props, _phantom.cost, calc.calc_temp
-                    )
-                    phantom_score += _score
-
-            if need_expected_damage:
-                rankDetail = DamageRankRegister.find_class(str(role_detail.role.roleId))
-                if rankDetail:
-                    calc.role_card = calc.enhance_summation_card_value(
-                        calc.phantom_card
-                    )
-                    calc.damageAttribute = calc.card_sort_map_to_attribute(
-                        calc.role_card
-                    )
-                    _, expected_damage = rankDetail["func"](
-                        calc.damageAttribute, role_detail
-                    )
-                    expected_damage = comma_separated_number(expected_damage)
-                    expected_name = rankDetail["title"]
-
-            for ph_detail in calc.phantom_pre.get("ph_detail", []):
-                if ph_detail.get("ph_name") and ph_detail.get("ph_num") == 5:
-                    sonataName = ph_detail["ph_name"]
-                    break
-
-                if ph_detail.get("ph_name") and ph_detail.get("isFull"):
-                    sonataName = ph_detail["ph_name"]
-                    break
-
-        phantom_score = round(phantom_score, 2)
-        wcr = WavesCharRank(
-            **{
-                "roleId": role_detail.role.roleId,
-                "roleName": role_detail.role.roleName,
-                "starLevel": role_detail.role.starLevel,
-                "level": role_detail.level,
-                "chain": role_detail.get_chain_num(),
-                "chainName": role_detail.get_chain_name(),
-                "score": phantom_score,
-                "score_bg": get_total_score_bg(
-                    role_detail.role.roleName, phantom_score, calc.calc_temp
-                ),
-                "expected_damage": expected_damage,
-                "weaponId": role_detail.weaponData.weapon.weaponId,
-                "weaponLevel": role_detail.weaponData.level,
-                "weaponResonLevel": role_detail.weaponData.resonLevel,
-                "sonataName": sonataName,
-                "expected_name": expected_name,
-            }
-        )
-        waves_char_rank.append(wcr)
-
+    return build_waves_char_rank({uid: temp}, need_expected_damage)[uid]
+
+
+def build_waves_char_rank(
+    all_role_details: Dict[str, Iterable], need_expected_damage=False
+) -> Dict[str, List[WavesCharRank]]:
+    """
+    计算多个uid的角色排行数据
+    多个uid一起计算时，同一角色的期望伤害批量计算
+    """
+    items = []
+    jobs: List[RankJob] = []
+    for uid, role_details in all_role_details.items():
+        for role_detail in role_details:
+            if not isinstance(role_detail, RoleDetailData):
+                role_detail = RoleDetailData(**role_detail)
+            item, job = _prepare_char_rank(role_detail, need_expected_damage)
+            if job:
+                item["job_index"] = len(jobs)
+                jobs.append(job)
+            items.append((uid, item))
+
+    damages = calc_rank_damage_batch(jobs)
+    waves_char_rank: Dict[str, List[WavesCharRank]] = {
+        uid: [] for uid in all_role_details
+    }
+    for uid, item in items:
+        job_index = item.pop("job_index", None)
+        if job_index is not None:
+            item["expected_damage"] = damages[job_index]
+        waves_char_rank[uid].append(WavesCharRank(**item))
     return waves_char_rank
+
+
+def _prepare_char_rank(
+    role_detail: RoleDetailData, need_expected_damage: bool
+) -> Tuple[Dict, Optional[RankJob]]:
+    """计算声骸评分，返回排行数据和待计算的期望伤害"""
+    phantom_score = 0
+    calc: WuWaCalc = WuWaCalc(role_detail)
+    # calc_temp = None
+    job = None
+
+    sonataName = ""
+    expected_name = ""
+    if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
+        equipPhantomList = role_detail.phantomData.equipPhantomList
+
+        calc.phantom_pre = calc.prepare_phantom()
+        calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
+        calc.calc_temp = get_calc_map(
+            calc.phantom_card,
+            role_detail.role.roleName,
+            role_detail.role.roleId,
+        )
+        for i, _phantom in enumerate(equipPhantomList):
+            if _phantom and _phantom.phantomProp:
+                props = _phantom.get_props()
+                _score, _bg = calc_phantom_score(
+                    role_detail.role.roleId, props, _phantom.cost, calc.calc_temp
+                )
+                phantom_score += _score
+
+        if need_expected_damage:
+            rankDetail = DamageRankRegister.find_class(str(role_detail.role.roleId))
+            if rankDetail:
+                calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
+                calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
+                job = (rankDetail, calc.damageAttribute, role_detail)
+                expected_name = rankDetail["title"]
+
+        for ph_detail in calc.phantom_pre.get("ph_detail", []):
+            if ph_detail.get("ph_name") and ph_detail.get("ph_num") == 5:
+                sonataName = ph_detail["ph_name"]
+                break
+
+            if ph_detail.get("ph_name") and ph_detail.get("isFull"):
+                sonataName = ph_detail["ph_name"]
+                break
+
+    phantom_score = round(phantom_score, 2)
+    item = {
+        "roleId": role_detail.role.roleId,
+        "roleName": role_detail.role.roleName,
+        "attributeName": role_detail.role.attributeName,
+        "starLevel": role_detail.role.starLevel,
+        "level": role_detail.level,
+        "chain": role_detail.get_chain_num(),
+        "chainName": role_detail.get_chain_name(),
+        "score": phantom_score,
+        "score_bg": get_total_score_bg(
+            role_detail.role.roleName, phantom_score, calc.calc_temp
+        ),
+        "expected_damage": None,
+        "weaponId": role_detail.weaponData.weapon.weaponId,
+        "weaponName": role_detail.weaponData.weapon.weaponName,
+        "weaponStarLevel": role_detail.weaponData.weapon.weaponStarLevel,
+        "weaponLevel": role_detail.weaponData.level,
+        "weaponResonLevel": role_detail.weaponData.resonLevel,
+        "sonataName": sonataName,
+        "expected_name": expected_name,
+    }
+    return item, job
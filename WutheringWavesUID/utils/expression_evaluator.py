@@ -1,27 +1,38 @@
+from typing import Any, Dict, List, Tuple, Union, Callable
+
 from gsuid_core.logger import logger
 
 
-def convert_wrapper(func):
-    def wrapper(a, b):
-        def convert(value):
-            if isinstance(value, str):
-                if "%" in value:
-                    value.replace("%", "")
-                try:
-                    value = float(value)
-                except ValueError as _:
-                    pass
-            elif isinstance(value, list):
-                return [convert(item) for item in value]
+def convert_value(value):
+    if isinstance(value, str):
+        try:
+            return float(value.replace("%", ""))
+        except ValueError as _:
             return value
+    elif isinstance(value, list):
+        return [convert_value(item) for item in value]
+    return value
 
-        a = convert(a)
-        b = convert(b)
-        return func(a, b)
+
+def convert_wrapper(func):
+    def wrapper(a, b):
+        return func(convert_value(a), convert_value(b))
 
     return wrapper
 
 
+def _func_in(a, b):
+    if isinstance(a, list):
+        return any(i in b for i in a)
+    return a in b
+
+
+def _func_not_in(a, b):
+    if isinstance(a, list):
+        return all(i not in b for i in a)
+    return a not in b
+
+
 class ExpressionFunc:
     @staticmethod
     def func_equal(a, b):
@@ -54,17 +65,12 @@ class ExpressionFunc:
     @staticmethod
     @convert_wrapper
     def func_in(a, b):
-        if isinstance(a, list):
-            return any(i in b for i in a)
-
-        return a in b
+        return _func_in(a, b)
 
     @staticmethod
     @convert_wrapper
     def func_not_in(a, b):
-        if isinstance(a, list):
-            return all(i not in b for i in a)
-        return a not in b
+        return _func_not_in(a, b)
 
 
 class ExpressionEvaluator:
@@ -104,12 +110,69 @@ class ExpressionEvaluator:
         return operations[op](self.ctx.get(key), value)
 
 
-def find_first_matching_expression(ctx, expressions, default="calc.json"):
-    evaluator = ExpressionEvaluator(ctx)
+Predicate = Callable[[Dict], bool]
+CompiledExpressions = List[Tuple[Predicate, Any]]
+
+
+def _compile_comparison(key: str, op: str, value) -> Predicate:
+    if op == "=":
+        return lambda ctx: ctx.get(key) == value
+    if op == "!=":
+        return lambda ctx: ctx.get(key) != value
+
+    # 常量一侧只转换一次
+    b = convert_value(value)
+    if op == "<":
+        return lambda ctx: convert_value(ctx.get(key)) < b
+    if op == ">":
+        return lambda ctx: convert_value(ctx.get(key)) > b
+    if op == "<=":
+        return lambda ctx: convert_value(ctx.get(key)) <= b
+    if op == ">=":
+        return lambda ctx: convert_value(ctx.get(key)) >= b
+    if op == "in":
+        return lambda ctx: _func_in(convert_value(ctx.get(key)), b)
+    if op == "!in":
+        return lambda ctx: _func_not_in(convert_value(ctx.get(key)), b)
+    raise KeyError(op)
+
+
+def compile_expression(expression: Dict) -> Predicate:
+    """将条件表达式树编译为闭包"""
+    op = expression["op"]
+    if op == "&&":
+        subs = [compile_expression(child) for child in expression["sub"]]
+        return lambda ctx: all(f(ctx) for f in subs)
+    if op == "||":
+        subs = [compile_expression(child) for child in expression["sub"]]
+        return lambda ctx: any(f(ctx) for f in subs)
+    if op == "!":
+        first = compile_expression(expression["sub"][0])
+        return lambda ctx: not first(ctx)
+    return _compile_comparison(expression["key"], op, expression["value"])
+
+
+def compile_expressions(expressions: List[Dict]) -> CompiledExpressions:
+    compiled = []
     for expr in expressions:
         try:
-            if evaluator.evaluate(expr):
-                return expr["choose"]
+            compiled.append((compile_expression(expr), expr["choose"]))
+        except Exception as e:
+            logger.exception(e)
+    return compiled
+
+
+def find_first_matching_expression(
+    ctx,
+    expressions: Union[List[Dict], CompiledExpressions],
+    default="calc.json",
+):
+    if expressions and isinstance(expressions[0], dict):
+        expressions = compile_expressions(expressions)  # type: ignore
+    for predicate, choose in expressions:
+        try:
+            if predicate(ctx):
+                return choose
         except Exception as e:
             logger.exception(e)
     return default
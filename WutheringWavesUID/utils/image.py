@@ -1,8 +1,11 @@
 import os
 import random
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Literal, Optional, Tuple, Union
+from typing import Dict, Literal, Optional, Tuple, Union
 
 from PIL import (
     Image,
@@ -106,6 +109,111 @@ from .resource.RESOURCE_PATH import CUSTOM_MR_CARD_PATH,CUSTOM_MR_CARD_PATH2
 import colorsys
 from gsuid_core.logger import logger
 
+
+AssetKey = Tuple[str, Optional[str], Optional[Tuple[int, int]]]
+
+
+def get_asset_cache_size() -> int:
+    from ..wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("AssetCacheSize").data or 0
+
+
+class AssetCache:
+    """
+    贴图缓存，按 (路径, 模式, 尺寸) 缓存解码后的图片，按占用内存做 LRU 淘汰
+    缓存中的图片只读，需要修改时使用`open_asset`取得副本
+    """
+
+    def __init__(self):
+        self._data: OrderedDict[AssetKey, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _load(
+        path: Union[str, Path], mode: Optional[str], size: Optional[Tuple[int, int]]
+    ) -> Image.Image:
+        with Image.open(path) as f:
+            img = f.convert(mode) if mode else f.copy()
+        if size and img.size != size:
+            img = img.resize(size)
+        return img
+
+    def get(
+        self,
+        path: Union[str, Path],
+        mode: Optional[str] = "RGBA",
+        size: Optional[Tuple[int, int]] = None,
+    ) -> Image.Image:
+        key = (str(path), mode, size)
+        with self._lock:
+            img = self._data.get(key)
+            if img is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+
+        img = self._load(path, mode, size)
+        nbytes = img.width * img.height * len(img.getbands())
+        max_bytes = get_asset_cache_size() * 1024 * 1024
+        if nbytes > max_bytes:
+            return img
+
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = img
+                self._bytes += nbytes
+            while self._bytes > max_bytes:
+                _, old = self._data.popitem(last=False)
+                self._bytes -= old.width * old.height * len(old.getbands())
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        total = self.hits + self.misses
+        return {
+            "num": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0,
+        }
+
+
+asset_cache = AssetCache()
+
+
+def open_asset(
+    path: Union[str, Path],
+    mode: Optional[str] = "RGBA",
+    size: Optional[Tuple[int, int]] = None,
+) -> Image.Image:
+    """从贴图缓存中取得图片副本"""
+    return asset_cache.get(path, mode, size).copy()
+
+
+def preload_assets():
+    """预加载常用贴图：属性图标、星级背景、页脚、logo"""
+    for pattern in [
+        "attribute/*.png",
+        "attribute_prop/*.png",
+        "weapon_type/*.png",
+    ]:
+        for path in TEXT_PATH.glob(pattern):
+            asset_cache.get(path)
+    for pattern in ["star_*.png", "footer_*.png", "logo_small_*.png"]:
+        for path in TEXT_PATH.glob(pattern):
+            asset_cache.get(path, None)
+
+
 def get_ICON():
     return Image.open(ICON)
 
@@ -163,10 +271,15 @@ async def get_role_pile_old(
 async def get_square_avatar(resource_id: Union[int, str]) -> Image.Image:
     name = f"role_head_{resource_id}.png"
     path = AVATAR_PATH / name
-    return Image.open(path).convert("RGBA")
+    return open_asset(path)
 
 
 async def cropped_square_avatar(item_icon: Image.Image, size: int) -> Image.Image:
+    return cropped_square_avatar_sync(item_icon, size)
+
+
+def cropped_square_avatar_sync(item_icon: Image.Image, size: int) -> Image.Image:
+    """同`cropped_square_avatar`，供渲染线程中的绘图函数调用"""
     # 目标尺寸
     target_width, target_height = size, size
     # 原始尺寸
@@ -194,9 +307,9 @@ async def get_square_weapon(resource_id: Union[int, str]) -> Image.Image:
     name = f"weapon_{resource_id}.png"
     path = WEAPON_PATH / name
     if os.path.exists(path):
-        return Image.open(path).convert("RGBA")
+        return open_asset(path)
     else:
-        return Image.open(WEAPON_PATH / "weapon_21010063.png").convert("RGBA")
+        return open_asset(WEAPON_PATH / "weapon_21010063.png")
 
 
 async def get_attribute(name: str = "", is_simple: bool = False) -> Image.Image:
@@ -204,30 +317,28 @@ async def get_attribute(name: str = "", is_simple: bool = False) -> Image.Image:
         name = f"attribute/attr_simple_{name}.png"
     else:
         name = f"attribute/attr_{name}.png"
-    return Image.open(TEXT_PATH / name).convert("RGBA")
+    return open_asset(TEXT_PATH / name)
 
 
 async def get_attribute_prop(name: str = "") -> Image.Image:
-    return Image.open(TEXT_PATH / f"attribute_prop/attr_prop_{name}.png").convert(
-        "RGBA"
-    )
+    return open_asset(TEXT_PATH / f"attribute_prop/attr_prop_{name}.png")
 
 
 async def get_attribute_effect(name: str = "") -> Image.Image:
-    return Image.open(TEXT_PATH / f"attribute_effect/attr_{name}.png").convert("RGBA")
+    return open_asset(TEXT_PATH / f"attribute_effect/attr_{name}.png")
 
 
 async def get_weapon_type(name: str = "") -> Image.Image:
-    return Image.open(TEXT_PATH / f"weapon_type/weapon_type_{name}.png").convert("RGBA")
+    return open_asset(TEXT_PATH / f"weapon_type/weapon_type_{name}.png")
 
 
 def get_waves_bg(w: int, h: int, bg: str = "bg") -> Image.Image:
-    img = Image.open(TEXT_PATH / f"{bg}.jpg").convert("RGBA")
+    img = asset_cache.get(TEXT_PATH / f"{bg}.jpg")
     return crop_center_img(img, w, h)
 
 
 def get_crop_waves_bg(w: int, h: int, bg: str = "bg") -> Image.Image:
-    img = Image.open(TEXT_PATH / f"{bg}.jpg").convert("RGBA")
+    img = asset_cache.get(TEXT_PATH / f"{bg}.jpg")
 
     width, height = img.size
 
@@ -298,11 +409,11 @@ async def get_event_avatar(
 
 
 def get_small_logo(logo_num=1):
-    return Image.open(TEXT_PATH / f"logo_small_{logo_num}.png")
+    return open_asset(TEXT_PATH / f"logo_small_{logo_num}.png", None)
 
 
 def get_footer(color: Literal["white", "black", "hakush"] = "white"):
-    return Image.open(TEXT_PATH / f"footer_{color}.png")
+    return open_asset(TEXT_PATH / f"footer_{color}.png", None)
 
 
 def add_footer(
@@ -340,6 +451,16 @@ async def change_color(
     w: Optional[int] = None,
     h: Optional[int] = None,
 ):
+    return change_color_sync(chain, color, w, h)
+
+
+def change_color_sync(
+    chain,
+    color: tuple = (255, 255, 255),
+    w: Optional[int] = None,
+    h: Optional[int] = None,
+):
+    """同`change_color`，供渲染线程中的绘图函数调用"""
     # 获取图像数据
     pixels = chain.load()  # 加载像素数据
     if w is None:
@@ -442,7 +563,7 @@ async def draw_avatar_with_star(
         img = Image.new("RGBA", (item_width, item_width), img_color)
 
     # 144*144
-    star_bg = Image.open(TEXT_PATH / f"star_{star_level}.png")
+    star_bg = asset_cache.get(TEXT_PATH / f"star_{star_level}.png", None)
     avatar = avatar.resize((item_width, item_width))
 
     img.alpha_composite(avatar, (0, 0))
@@ -451,7 +572,7 @@ async def draw_avatar_with_star(
 
 
 async def get_star_bg(star_level: int = 5) -> Image.Image:
-    return Image.open(TEXT_PATH / f"star_{star_level}.png")
+    return open_asset(TEXT_PATH / f"star_{star_level}.png", None)
 
 
 async def pic_download_from_url(
@@ -470,14 +591,24 @@ async def pic_download_from_url(
     return Image.open(_path).convert("RGBA")
 
 
+def _gaussian_blur(
+    img: Image.Image, radius: int, brightness: float, contrast: float
+) -> Image.Image:
+    # 应用高斯模糊
+    img = img.filter(ImageFilter.GaussianBlur(radius=radius))
+    # 调整亮度和对比度
+    img = ImageEnhance.Brightness(img).enhance(brightness)
+    # 调整对比度
+    img = ImageEnhance.Contrast(img).enhance(contrast)
+    return img
+
+
 async def get_custom_gaussian_blur(img: Image.Image) -> Image.Image:
     from ..wutheringwaves_config.wutheringwaves_config import ShowConfig
+    from .render import run_render
 
     radius = ShowConfig.get_config("BlurRadius").data
     if radius > 0:
-        # 应用高斯模糊
-        img = img.filter(ImageFilter.GaussianBlur(radius=radius))
-        # 调整亮度和对比度
         brightness = ShowConfig.get_config("BlurBrightness").data
         try:
             brightness = float(brightness)
@@ -489,13 +620,17 @@ async def get_custom_gaussian_blur(img: Image.Image) -> Image.Image:
         except Exception:
             contrast = 1
 
-        img = ImageEnhance.Brightness(img).enhance(brightness)
-        # 调整对比度
-        img = ImageEnhance.Contrast(img).enhance(contrast)
+        img = await run_render(_gaussian_blur, img, radius, brightness, contrast)
     return img
 
 async def adapt_bg_image(
     img: Image.Image, target_w: int, target_h: int
+) -> Image.Image:
+    return adapt_bg_image_sync(img, target_w, target_h)
+
+
+def adapt_bg_image_sync(
+    img: Image.Image, target_w: int, target_h: int
 ) -> Image.Image:
     """
     将任意尺寸的背景图自适应处理为目标尺寸。
@@ -598,4 +733,52 @@ def is_color_light(rgb_color):
     # 计算加权亮度，这个公式更符合人眼对不同颜色的敏感度
     luminance = 0.299 * r + 0.587 * g + 0.114 * b
     # 140是一个比较适中的阈值，可以根据需要微调
-    return luminance > 140
\ No newline at end of file
+    return luminance > 140
+
+
+@lru_cache(maxsize=32)
+def _build_center_gradient_mask(
+    size: Tuple[int, int],
+    bbox: Tuple[int, int, int, int],
+    curve: float,
+    alpha: float,
+) -> Image.Image:
+    left, top, right, bottom = bbox
+    mask = Image.new("L", size, 0)
+    height = bottom - top
+    if right <= left or height <= 0:
+        return mask
+
+    # 渐变只随纵向变化，只需计算一列，再横向拉伸到bar的宽度
+    half = height / 2.0
+    center_y = top + half
+    column = Image.new("L", (1, height))
+    column.putdata(
+        [
+            int(int(255 * pow(1.0 - abs(y - center_y) / half, curve)) * alpha)
+            for y in range(top, bottom)
+        ]
+    )
+    mask.paste(
+        column.resize((right - left, height), Image.Resampling.NEAREST), (left, top)
+    )
+    return mask
+
+
+def get_center_gradient_mask(
+    size: Tuple[int, int],
+    bbox: Optional[Tuple[int, int, int, int]] = None,
+    curve: float = 1.0,
+    alpha: float = 1.0,
+) -> Image.Image:
+    """
+    中心向外的纵向渐变蒙版，按 (size, bbox, curve, alpha) 缓存
+    :param bbox: 渐变区域 (left, top, right, bottom)，区域外为0，默认整张图
+    :param curve: 渐变曲线，小于1.0过渡更平缓
+    :param alpha: 整体透明度因子，中心点的不透明度
+    """
+    if bbox is None:
+        bbox = (0, 0, size[0], size[1])
+    return _build_center_gradient_mask(
+        tuple(size), tuple(bbox), float(curve), float(alpha)
+    ).copy()
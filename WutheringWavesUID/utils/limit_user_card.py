@@ -3,7 +3,7 @@ from pathlib import Path
 
 import aiofiles
 
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.char_info_utils import load_role_data, save_role_data
 
 MAP_PATH = Path(__file__).parent / "map"
 LIMIT_PATH = MAP_PATH / "1.json"
@@ -13,13 +13,12 @@ async def load_limit_user_card():
     async with aiofiles.open(LIMIT_PATH, "r", encoding="UTF-8") as f:
         data = json.loads(await f.read())
 
-    LIMIT_USER_PATH = PLAYER_PATH / "1"
-    if not LIMIT_USER_PATH.exists():
-        LIMIT_USER_PATH.mkdir(parents=True, exist_ok=True)
-
-    async with aiofiles.open(
-        LIMIT_USER_PATH / "rawData.json", "w", encoding="UTF-8"
-    ) as f:
-        await f.write(json.dumps(data, ensure_ascii=False))
+    # 只写入与库中不同的角色，并删除已不在模板中的角色
+    old_data = {r["role"]["roleId"]: r for r in await load_role_data("1") or []}
+    role_ids = {r["role"]["roleId"] for r in data}
+    changed = [r for r in data if old_data.get(r["role"]["roleId"]) != r]
+    delete_role_ids = [i for i in old_data if i not in role_ids]
+    if changed or delete_role_ids:
+        await save_role_data("1", changed, delete_role_ids)
 
     return data
@@ -20,7 +20,7 @@ from ...damage.utils import (
 
 def calc_damage_0(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(hit_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -85,15 +85,15 @@ def calc_damage_0(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -158,15 +158,15 @@ def calc_damage_1(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -240,15 +240,15 @@ def calc_damage_2(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_3(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(liberation_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -308,15 +308,15 @@ def calc_damage_3(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_4(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -390,15 +390,15 @@ def calc_damage_4(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_10(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> (str, str):
+) -> (float, float):
     attr.set_char_damage(liberation_damage)
     attr.set_char_template("temp_atk")
     # 守岸人buff
@@ -21,7 +21,7 @@ from ...damage.utils import (
 
 def calc_damage(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     attr1 = copy.deepcopy(attr)
     crit_damage1, expected_damage1 = calc_damage_1(attr1, role, isGroup)
 
@@ -39,9 +39,9 @@ def calc_damage(
         expected_damage1 + expected_damage2 + expected_damage3 + expected_damage4
     )
     # 暴击伤害
-    crit_damage = f"{crit_damage:,.0f}"
+    crit_damage = crit_damage
     # 期望伤害
-    expected_damage = f"{expected_damage:,.0f}"
+    expected_damage = expected_damage
 
     attr.add_effect(" ", " ")
     attr.effect.extend(attr1.effect[2:])
@@ -56,7 +56,7 @@ def calc_damage(
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(liberation_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -120,7 +120,7 @@ def calc_damage_1(
 
 def calc_damage_a(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -186,7 +186,7 @@ def calc_damage_a(
 
 def calc_damage_ea(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -266,7 +266,7 @@ def calc_damage_ea(
 
 def calc_damage_e(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -19,7 +19,7 @@ from ...damage.utils import (
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -71,15 +71,15 @@ def calc_damage_1(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(hit_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -131,15 +131,15 @@ def calc_damage_2(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_3(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -200,15 +200,15 @@ def calc_damage_3(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_4(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -269,15 +269,15 @@ def calc_damage_4(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_5(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -343,15 +343,15 @@ def calc_damage_5(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_6(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -413,9 +413,9 @@ def calc_damage_6(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
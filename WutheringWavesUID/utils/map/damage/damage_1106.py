@@ -40,7 +40,7 @@ def calc_damage_1(
     role: RoleDetailData,
     isGroup: bool = False,
     skill_name: Union[str, List[str]] = "",
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -111,9 +111,9 @@ def calc_damage_1(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -164,7 +164,7 @@ def calc_damage_2(
 
     healing_bonus = attr.calculate_healing(attr.effect_attack)
 
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
@@ -203,7 +203,7 @@ def calc_damage_3(
 
     healing_bonus = attr.calculate_healing(attr.effect_attack)
 
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
@@ -15,13 +15,12 @@ from ...damage.utils import (
     cast_hit,
     skill_damage,
     cast_liberation,
-    add_comma_separated_numbers,
 )
 
 
 def calc_damage(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     title = "默认手法"
     if isGroup:
         msg = "变奏入场 ee aa aaa z qr aaaaa"
@@ -32,26 +31,26 @@ def calc_damage(
     init_len = len(attr.effect)
     attr1 = copy.deepcopy(attr)
     crit_damage1, expected_damage1 = calc_damage_r(attr1, role, isGroup)
-    attr1.add_effect("r伤害", f"期望伤害:{crit_damage1}; 暴击伤害:{expected_damage1}")
+    attr1.add_effect(
+        "r伤害", f"期望伤害:{crit_damage1:,.0f}; 暴击伤害:{expected_damage1:,.0f}"
+    )
 
     attr2 = copy.deepcopy(attr)
     crit_damage2, expected_damage2 = calc_damage_3(
         attr2, role, isGroup, trigger_times=4
     )
     attr2.add_effect(
-        "死兆*4伤害", f"期望伤害:{crit_damage2}; 暴击伤害:{expected_damage2}"
+        "死兆*4伤害", f"期望伤害:{crit_damage2:,.0f}; 暴击伤害:{expected_damage2:,.0f}"
     )
 
     attr3 = copy.deepcopy(attr)
     crit_damage3, expected_damage3 = calc_damage_2(attr3, role, isGroup)
     attr3.add_effect(
-        "r尾刀伤害", f"期望伤害:{crit_damage3}; 暴击伤害:{expected_damage3}"
+        "r尾刀伤害", f"期望伤害:{crit_damage3:,.0f}; 暴击伤害:{expected_damage3:,.0f}"
     )
 
-    crit_damage = add_comma_separated_numbers(crit_damage1, crit_damage2, crit_damage3)
-    expected_damage = add_comma_separated_numbers(
-        expected_damage1, expected_damage2, expected_damage3
-    )
+    crit_damage = crit_damage1 + crit_damage2 + crit_damage3
+    expected_damage = expected_damage1 + expected_damage2 + expected_damage3
 
     attr.add_effect(" ", " ")
     attr.effect.extend(attr1.effect[init_len + 1 :])
@@ -65,7 +64,7 @@ def calc_damage(
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -139,15 +138,15 @@ def calc_damage_1(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -226,15 +225,15 @@ def calc_damage_2(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_3(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False, trigger_times=1
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -313,15 +312,15 @@ def calc_damage_3(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage() * trigger_times:,.0f}"
+    crit_damage = attr.calculate_crit_damage() * trigger_times
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage() * trigger_times:,.0f}"
+    expected_damage = attr.calculate_expected_damage() * trigger_times
     return crit_damage, expected_damage
 
 
 def calc_damage_33(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False, trigger_times=1
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -415,25 +414,25 @@ def calc_damage_33(
     attr1.add_skill_multi(s1)
     attr1.add_skill_ratio(s1_ratio)
     # 暴击伤害
-    s1_crit_damage = f"{attr1.calculate_crit_damage():,.0f}"
+    s1_crit_damage = attr1.calculate_crit_damage()
     # 期望伤害
-    s1_expected_damage = f"{attr1.calculate_expected_damage():,.0f}"
+    s1_expected_damage = attr1.calculate_expected_damage()
 
     attr2.add_skill_multi(s2)
     attr2.add_skill_ratio(s2_ratio)
     # 暴击伤害
-    s2_crit_damage = f"{attr2.calculate_crit_damage():,.0f}"
+    s2_crit_damage = attr2.calculate_crit_damage()
     # 期望伤害
-    s2_expected_damage = f"{attr2.calculate_expected_damage():,.0f}"
+    s2_expected_damage = attr2.calculate_expected_damage()
 
-    crit_damage = f"{s1_crit_damage} + {s2_crit_damage}"
-    expected_damage = f"{s1_expected_damage} + {s2_expected_damage}"
+    crit_damage = (s1_crit_damage, s2_crit_damage)
+    expected_damage = (s1_expected_damage, s2_expected_damage)
     return crit_damage, expected_damage
 
 
 def calc_damage_r(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -507,15 +506,15 @@ def calc_damage_r(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_10(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> (str, str):
+) -> (float, float):
     """
     0+1守/0折枝/致死以终伤害
     """
@@ -533,7 +532,7 @@ def calc_damage_10(
 
 def calc_damage_11(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> (str, str):
+) -> (float, float):
     """
     6+5守/6折/致死以终伤害
     """
@@ -7,7 +7,6 @@ from ...damage.damage import DamageAttribute
 from ...damage.utils import (
     SkillTreeMap,
     SkillType,
-    add_comma_separated_numbers,
     cast_attack,
     cast_liberation,
     cast_skill,
@@ -67,7 +66,7 @@ def calc_damage_0(
     role: RoleDetailData,
     isGroup: bool = False,
     is_lianzhao: bool = False,
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     """
     焚身以火
     """
@@ -124,15 +123,15 @@ def calc_damage_0(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     """
     离火照丹心
     """
@@ -181,34 +180,32 @@ def calc_damage_1(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr1 = copy.deepcopy(attr)
     crit_damage1, expected_damage1 = calc_damage_0(attr1, role, isGroup)
-    attr1.add_effect("焚身以火暴击伤害", f"{crit_damage1}")
-    attr1.add_effect("焚身以火期望伤害", f"{expected_damage1}")
+    attr1.add_effect("焚身以火暴击伤害", f"{crit_damage1:,.0f}")
+    attr1.add_effect("焚身以火期望伤害", f"{expected_damage1:,.0f}")
 
     attr2 = copy.deepcopy(attr)
     crit_damage2, expected_damage2 = calc_damage_1(attr2, role, isGroup)
-    attr2.add_effect("离火照丹心暴击伤害", f"{crit_damage2}")
-    attr2.add_effect("离火照丹心期望伤害", f"{expected_damage2}")
+    attr2.add_effect("离火照丹心暴击伤害", f"{crit_damage2:,.0f}")
+    attr2.add_effect("离火照丹心期望伤害", f"{expected_damage2:,.0f}")
 
     attr3 = copy.deepcopy(attr)
     crit_damage3, expected_damage3 = calc_damage_0(attr3, role, isGroup, True)
-    attr3.add_effect("焚身以火暴击伤害", f"{crit_damage3}")
-    attr3.add_effect("焚身以火期望伤害", f"{expected_damage3}")
+    attr3.add_effect("焚身以火暴击伤害", f"{crit_damage3:,.0f}")
+    attr3.add_effect("焚身以火期望伤害", f"{expected_damage3:,.0f}")
 
-    crit_damage = add_comma_separated_numbers(crit_damage1, crit_damage2, crit_damage3)
-    expected_damage = add_comma_separated_numbers(
-        expected_damage1, expected_damage2, expected_damage3
-    )
+    crit_damage = crit_damage1 + crit_damage2 + crit_damage3
+    expected_damage = expected_damage1 + expected_damage2 + expected_damage3
 
     attr.add_effect(" ", " ")
     attr.effect.extend(attr1.effect[2:])
@@ -221,7 +218,7 @@ def calc_damage_2(
 
 def calc_damage_10(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_char_damage(liberation_damage)
     attr.set_char_template("temp_atk")
 
@@ -236,7 +233,7 @@ def calc_damage_10(
 
 def calc_damage_11(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_char_damage(liberation_damage)
     attr.set_char_template("temp_atk")
 
@@ -251,7 +248,7 @@ def calc_damage_11(
 
 def calc_damage_12(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_char_damage(skill_damage)
     attr.set_char_template("temp_atk")
 
@@ -266,7 +263,7 @@ def calc_damage_12(
 
 def calc_damage_13(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_char_damage(skill_damage)
     attr.set_char_template("temp_atk")
 
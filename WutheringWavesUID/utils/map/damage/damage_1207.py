@@ -36,7 +36,7 @@ def calc_damage_2(
     role: RoleDetailData,
     isGroup: bool = False,
     skill_name: Literal["r1", "r2"] = "r1",
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(liberation_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -153,9 +153,9 @@ def calc_damage_2(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -164,7 +164,7 @@ def calc_damage_3(
     role: RoleDetailData,
     isGroup: bool = False,
     isSingle: bool = True,
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(liberation_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -286,15 +286,15 @@ def calc_damage_3(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_10(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_char_damage(liberation_damage)
     attr.set_char_template("temp_atk")
     # 守岸人buff
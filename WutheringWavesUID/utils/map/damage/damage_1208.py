@@ -25,7 +25,7 @@ def calc_damage_1(
     isGroup: bool = False,
     size: Literal[1, 2, 3, 4, 5] = 1,
     char_damage: Literal["hit_damage", "phantom_damage"] = hit_damage,
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(char_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -108,9 +108,9 @@ def calc_damage_1(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -120,7 +120,7 @@ def calc_damage_2(
     isGroup: bool = False,
     size: Literal[1, 2, 3] = 1,
     char_damage: Literal["hit_damage", "phantom_damage"] = hit_damage,
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(char_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -203,9 +203,9 @@ def calc_damage_2(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -213,7 +213,7 @@ def calc_damage_3(
     attr: DamageAttribute,
     role: RoleDetailData,
     isGroup: bool = False,
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(phantom_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -282,9 +282,9 @@ def calc_damage_3(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
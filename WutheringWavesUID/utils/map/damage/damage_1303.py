@@ -17,7 +17,7 @@ from ...damage.utils import (
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(skill_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -74,15 +74,15 @@ def calc_damage_1(
     effect_value = attr.effect_def
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_value):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_value)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_value):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_value)
     return crit_damage, expected_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(liberation_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -135,9 +135,9 @@ def calc_damage_2(
     effect_value = attr.effect_def
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_value):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_value)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_value):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_value)
     return crit_damage, expected_damage
 
 
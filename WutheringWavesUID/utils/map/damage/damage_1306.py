@@ -103,7 +103,7 @@ def calc_damage_1(
     role: RoleDetailData,
     isGroup: bool = False,
     isSingle: bool = True,
-) -> Tuple[str, str]:
+) -> Tuple[float, float]:
     # 设置角色固有技能
     role_breach = role.role.breach
     if role_breach and role_breach >= 3:
@@ -162,9 +162,9 @@ def calc_damage_1(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -172,7 +172,7 @@ def calc_damage_2(
     attr: DamageAttribute,
     role: RoleDetailData,
     isGroup: bool = False,
-) -> Tuple[str, str]:
+) -> Tuple[float, float]:
     # 设置角色固有技能
     role_breach = role.role.breach
     if role_breach and role_breach >= 3:
@@ -227,9 +227,9 @@ def calc_damage_2(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -238,7 +238,7 @@ def calc_damage_3(
     role: RoleDetailData,
     isGroup: bool = False,
     isSingle: bool = True,
-) -> Tuple[str, str]:
+) -> Tuple[float, float]:
     # 设置角色固有技能
     role_breach = role.role.breach
     if role_breach and role_breach >= 3:
@@ -300,9 +300,9 @@ def calc_damage_3(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -18,7 +18,7 @@ from .damage import echo_damage, phase_damage, weapon_damage
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     """
     召劾鬼神治疗量
     """
@@ -75,13 +75,13 @@ def calc_damage_1(
 
     # 治疗量
     healing_bonus = attr.calculate_healing(attr.effect_attack)
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     """
     三链-五雷荡煞阵触发治疗
     """
@@ -96,7 +96,7 @@ def calc_damage_2(
     # 检查是否有三链
     chain_num = role.get_chain_num()
     if chain_num < 3:
-        return None, "0"
+        return None, 0.0
 
     # 三链
     title = "三链-五雷荡煞阵触发治疗"
@@ -132,13 +132,13 @@ def calc_damage_2(
 
     # 治疗量
     healing_bonus = attr.calculate_healing(attr.effect_attack)
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
 def calc_damage_3(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     """
     飞雷诀·归一伤害
     """
@@ -190,9 +190,9 @@ def calc_damage_3(
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -38,7 +38,7 @@ def calc_damage_1(
         "小卡空中回收2剑",
         "小卡空中回收3剑",
     ] = "小卡普攻1段",
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_env_aero_erosion()
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
@@ -150,15 +150,15 @@ def calc_damage_1(
 
     effect_life = attr.effect_life
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_life):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_life)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_life):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_life)
     return crit_damage, expected_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_env_aero_erosion()
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
@@ -242,9 +242,9 @@ def calc_damage_2(
 
     effect_life = attr.effect_life
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_life):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_life)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_life):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_life)
     return crit_damage, expected_damage
 
 
@@ -264,7 +264,7 @@ def calc_damage_11(
         "大卡空中2段",
         "大卡空中3段",
     ] = "大卡普攻1段",
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_env_aero_erosion()
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
@@ -373,15 +373,15 @@ def calc_damage_11(
 
     effect_life = attr.effect_life
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_life):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_life)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_life):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_life)
     return crit_damage, expected_damage
 
 
 def calc_damage_12(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_env_aero_erosion()
     # 设置角色伤害类型
     attr.set_char_damage(liberation_damage)
@@ -477,15 +477,15 @@ def calc_damage_12(
 
     effect_life = attr.effect_life
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_life):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_life)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_life):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_life)
     return crit_damage, expected_damage
 
 
 def calc_damage_20(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     attr.set_char_damage(liberation_damage)
     attr.set_char_template("temp_life")
 
@@ -23,7 +23,7 @@ def calc_damage_1(
     attr: DamageAttribute,
     role: RoleDetailData,
     isGroup: bool = False,
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(hit_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -111,9 +111,9 @@ def calc_damage_1(
         attr.add_crit_dmg(crit_rate_bonus * 0.02, title, msg)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -121,7 +121,7 @@ def calc_damage_2(
     attr: DamageAttribute,
     role: RoleDetailData,
     isGroup: bool = False,
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     # 设置角色伤害类型
     attr.set_char_damage(phantom_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -214,9 +214,9 @@ def calc_damage_2(
         attr.add_crit_dmg(crit_rate_bonus * 0.02, title, msg)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
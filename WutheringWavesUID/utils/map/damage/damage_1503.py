@@ -17,7 +17,7 @@ from ...damage.utils import (
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(heal_bonus)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -65,13 +65,13 @@ def calc_damage_1(
 
     healing_bonus = attr.calculate_healing(attr.effect_attack)
 
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(heal_bonus)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -120,13 +120,13 @@ def calc_damage_2(
 
     healing_bonus = attr.calculate_healing(attr.effect_attack)
 
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
 def calc_damage_3(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(heal_bonus)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -180,7 +180,7 @@ def calc_damage_3(
 
     healing_bonus = attr.calculate_healing(attr.effect_attack)
 
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
@@ -14,7 +14,7 @@ from ...damage.utils import (
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     damage_func = [cast_skill]
     attr.set_char_damage(heal_bonus)
     attr.set_char_template("temp_life")
@@ -50,13 +50,13 @@ def calc_damage_1(
 
     healing_bonus = attr.calculate_healing(attr.effect_life)
 
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
 def calc_damage_2(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> (str, str):
+) -> (float, float):
     damage_func = [cast_skill]
     attr.set_char_damage(heal_bonus)
     attr.set_char_template("temp_life")
@@ -92,13 +92,13 @@ def calc_damage_2(
 
     healing_bonus = attr.calculate_healing(attr.effect_life)
 
-    crit_damage = f"{healing_bonus:,.0f}"
+    crit_damage = healing_bonus
     return None, crit_damage
 
 
 def calc_damage_3(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> (str, str):
+) -> (float, float):
     attr.set_char_damage(liberation_damage)
     attr.set_char_template("temp_life")
 
@@ -145,7 +145,7 @@ def calc_damage_3(
 
     weapon_damage(attr, role.weaponData, damage_func, isGroup)
 
-    crit_damage = f"{attr.calculate_crit_damage(attr.effect_life):,.0f}"
+    crit_damage = attr.calculate_crit_damage(attr.effect_life)
     return None, crit_damage
 
 
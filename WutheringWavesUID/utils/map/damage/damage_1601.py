@@ -22,7 +22,7 @@ def calc_damage_1(
     role: RoleDetailData,
     isGroup: bool = False,
     isHitCounterattack: bool = False,
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(attack_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -101,9 +101,9 @@ def calc_damage_1(
 
     effect_value = attr.effect_def
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_value):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_value)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_value):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_value)
     return crit_damage, expected_damage
 
 
@@ -112,7 +112,7 @@ def calc_damage_2(
     role: RoleDetailData,
     isGroup: bool = False,
     isHitCounterattack: bool = False,
-) -> (str, str):
+) -> (float, float):
     # 设置角色伤害类型
     attr.set_char_damage(liberation_damage)
     # 设置角色模板  "temp_atk", "temp_life", "temp_def"
@@ -174,9 +174,9 @@ def calc_damage_2(
 
     effect_value = attr.effect_def
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage(effect_value):,.0f}"
+    crit_damage = attr.calculate_crit_damage(effect_value)
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage(effect_value):,.0f}"
+    expected_damage = attr.calculate_expected_damage(effect_value)
     return crit_damage, expected_damage
 
 
@@ -185,7 +185,7 @@ def calc_damage_3(
     role: RoleDetailData,
     isGroup: bool = False,
     isHitCounterattack: bool = False,
-) -> (str, str):
+) -> (float, float):
     damage_func = [cast_attack, cast_skill, cast_hit]
     attr.set_char_damage("")
     attr.set_char_template("temp_def")
@@ -247,7 +247,7 @@ def calc_damage_3(
 
     shield_bonus = attr.calculate_shield(attr.effect_def)
 
-    crit_damage = f"{shield_bonus:,.0f}"
+    crit_damage = shield_bonus
     return None, crit_damage
 
 
@@ -85,7 +85,7 @@ def calc_damage_1(
     role: RoleDetailData,
     isGroup: bool = False,
     skill_type: Union[str, List[str]] = "满能缭乱",
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     """
     满能缭乱伤害
     """
@@ -125,15 +125,15 @@ def calc_damage_1(
 
     calc_damage(attr, role, damage_func, isGroup)
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_4(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     """
     绯红绽放
     """
@@ -172,9 +172,9 @@ def calc_damage_4(
     calc_damage(attr, role, damage_func, isGroup)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
@@ -18,7 +18,7 @@ from ...damage.utils import (
 
 def calc_damage_0(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     title = "默认手法"
     if isGroup:
         msg = "变奏入场 a qr e aaa"
@@ -149,15 +149,15 @@ def calc_damage_0(
     expected_damage = expected_damage1 + expected_damage2 + expected_damage3
 
     # 暴击伤害
-    crit_damage = f"{crit_damage:,.0f}"
+    crit_damage = crit_damage
     # 期望伤害
-    expected_damage = f"{expected_damage:,.0f}"
+    expected_damage = expected_damage
     return crit_damage, expected_damage
 
 
 def calc_damage_1(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     title = "默认手法"
     if isGroup:
         msg = "变奏入场 a qr e aaa"
@@ -246,15 +246,15 @@ def calc_damage_1(
         attr.add_atk_flat(atk_flat, title, msg)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_3(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False
-) -> tuple[str, str]:
+) -> tuple[float, float]:
     title = "默认手法"
     if isGroup:
         msg = "变奏入场 a e aaa qr"
@@ -340,15 +340,15 @@ def calc_damage_3(
         attr.add_atk_flat(atk_flat, title, msg)
 
     # 暴击伤害
-    crit_damage = f"{attr.calculate_crit_damage():,.0f}"
+    crit_damage = attr.calculate_crit_damage()
     # 期望伤害
-    expected_damage = f"{attr.calculate_expected_damage():,.0f}"
+    expected_damage = attr.calculate_expected_damage()
     return crit_damage, expected_damage
 
 
 def calc_damage_10(
     attr: DamageAttribute, role: RoleDetailData, isGroup: bool = True
-) -> (str, str):
+) -> (float, float):
     attr.set_char_damage(hit_damage)
     attr.set_char_template("temp_atk")
     # 守岸人buff
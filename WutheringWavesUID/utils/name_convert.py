@@ -26,6 +26,41 @@ sonata_alias_data: Dict[str, List[str]] = {}
 echo_alias_data: Dict[str, List[str]] = {}
 
 
+class AliasIndex:
+    """
+    别名索引，在加载别名时预先构建
+    把每个名称的所有子串和别名都放进哈希表，值为按原顺序第一个命中的名称，
+    查询只需要一次哈希查找，结果与逐个遍历`query in name`/`query in alias_list`一致
+    """
+
+    def __init__(self, data: Dict[str, List[str]], alias_substring: bool = False):
+        self._index: Dict[str, str] = {}
+        for name, alias_list in data.items():
+            words = set(_substrings(name))
+            words.update(alias_list)
+            if alias_substring:
+                # 声骸额外支持别名的子串匹配
+                for alias in alias_list:
+                    if alias:
+                        words.update(_substrings(alias))
+            for word in words:
+                self._index.setdefault(word, name)
+
+    def get(self, query: str) -> Optional[str]:
+        return self._index.get(query)
+
+
+def _substrings(word: str) -> List[str]:
+    length = len(word)
+    return [""] + [word[i:j] for i in range(length) for j in range(i + 1, length + 1)]
+
+
+char_alias_index = AliasIndex({})
+weapon_alias_index = AliasIndex({})
+sonata_alias_index = AliasIndex({})
+echo_alias_index = AliasIndex({})
+
+
 def add_dictionaries(dict1, dict2):
     all_keys = set(dict1.keys()) | set(dict2.keys())
     return {key: list(set(dict1.get(key, []) + dict2.get(key, []))) for key in all_keys}
@@ -33,6 +68,7 @@ def add_dictionaries(dict1, dict2):
 
 def load_alias_data():
     global char_alias_data, weapon_alias_data, sonata_alias_data, echo_alias_data
+    global char_alias_index, weapon_alias_index, sonata_alias_index, echo_alias_index
     with open(CHAR_ALIAS, "r", encoding="UTF-8") as f:
         char_alias_data = msgjson.decode(f.read(), type=Dict[str, List[str]])
 
@@ -109,6 +145,11 @@ def load_alias_data():
     with open(CUSTOM_ECHO_ALIAS_PATH, "w", encoding="UTF-8") as f:
         f.write(json.dumps(echo_alias_data, indent=2, ensure_ascii=False))
 
+    char_alias_index = AliasIndex(char_alias_data)
+    weapon_alias_index = AliasIndex(weapon_alias_data)
+    sonata_alias_index = AliasIndex(sonata_alias_data)
+    echo_alias_index = AliasIndex(echo_alias_data, alias_substring=True)
+
 
 load_alias_data()
 
@@ -118,28 +159,27 @@ with open(MAP_PATH / "CharId2Data.json", "r", encoding="UTF-8") as f:
 with open(MAP_PATH / "id2name.json", "r", encoding="UTF-8") as f:
     id2name = msgjson.decode(f.read(), type=Dict[str, str])
 
+# 名称 -> id，重名时保留第一个
+name2id: Dict[str, str] = {}
+for _id, _name in id2name.items():
+    name2id.setdefault(_name, _id)
+
 
 def alias_to_char_name(char_name: str) -> str:
-    for i in char_alias_data:
-        if (char_name in i) or (char_name in char_alias_data[i]):
-            return i
-    return char_name
+    return char_alias_index.get(char_name) or char_name
 
 
 def alias_to_char_name_optional(char_name: Optional[str]) -> Optional[str]:
     if not char_name:
         return None
-    for i in char_alias_data:
-        if (char_name in i) or (char_name in char_alias_data[i]):
-            return i
-    return None
+    return char_alias_index.get(char_name)
 
 
 def alias_to_char_name_list(char_name: str) -> List[str]:
-    for i in char_alias_data:
-        if (char_name in i) or (char_name in char_alias_data[i]):
-            return char_alias_data[i]
-    return []
+    name = char_alias_index.get(char_name)
+    if name is None:
+        return []
+    return char_alias_data[name]
 
 
 def char_id_to_char_name(char_id: str) -> Optional[str]:
@@ -151,70 +191,38 @@ def char_id_to_char_name(char_id: str) -> Optional[str]:
 
 
 def char_name_to_char_id(char_name: str) -> Optional[str]:
-    char_name = alias_to_char_name(char_name)
-    for id, name in id2name.items():
-        if char_name == name:
-            return id
-    else:
-        return None
+    return name2id.get(alias_to_char_name(char_name))
 
 
 def alias_to_weapon_name(weapon_name: str) -> str:
-    for i in weapon_alias_data:
-        if (weapon_name in i) or (weapon_name in weapon_alias_data[i]):
-            return i
+    name = weapon_alias_index.get(weapon_name)
+    if name is not None:
+        return name
 
     if "专武" in weapon_name:
         char_name = weapon_name.replace("专武", "")
         name = alias_to_char_name(char_name)
         weapon_name = f"{name}专武"
 
-    for i in weapon_alias_data:
-        if (weapon_name in i) or (weapon_name in weapon_alias_data[i]):
-            return i
-
-    return weapon_name
+    return weapon_alias_index.get(weapon_name) or weapon_name
 
 
 def weapon_name_to_weapon_id(weapon_name: str) -> Optional[str]:
-    weapon_name = alias_to_weapon_name(weapon_name)
-    for id, name in id2name.items():
-        if weapon_name == name:
-            return id
-    else:
-        return None
+    return name2id.get(alias_to_weapon_name(weapon_name))
 
 
 def alias_to_sonata_name(sonata_name: str | None) -> str | None:
     if sonata_name is None:
         return None
-    for i in sonata_alias_data:
-        if (sonata_name in i) or (sonata_name in sonata_alias_data[i]):
-            return i
-    return None
+    return sonata_alias_index.get(sonata_name)
 
 
 def alias_to_echo_name(echo_name: str) -> str:
-    for i, j in echo_alias_data.items():
-        if echo_name == i:
-            return i
-        if echo_name in j:
-            return i
-        for k in j:
-            if k and echo_name in k:
-                return i
-        if echo_name in i:
-            return i
-    return echo_name
+    return echo_alias_index.get(echo_name) or echo_name
 
 
 def echo_name_to_echo_id(echo_name: str) -> Optional[str]:
-    echo_name = alias_to_echo_name(echo_name)
-    for id, name in id2name.items():
-        if echo_name == name:
-            return id
-    else:
-        return None
+    return name2id.get(alias_to_echo_name(echo_name))
 
 
 def easy_id_to_name(id: str, default: str = "") -> str:
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 import httpx
 
@@ -12,37 +12,21 @@ from ..api.wwapi import (
 from .const import QUEUE_ABYSS_RECORD, QUEUE_SCORE_RANK, QUEUE_SLASH_RECORD
 from .queues import register_handler, start_dispatcher
 
+_client: Optional[httpx.AsyncClient] = None
 
-async def send_score_rank(item: Any):
-    if not item:
-        return
-    if not isinstance(item, dict):
-        return
-    from ...wutheringwaves_config import WutheringWavesConfig
 
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
+def get_upload_client() -> httpx.AsyncClient:
+    """上传共用的长连接客户端，只在分发线程的事件循环中使用"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10),
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+        )
+    return _client
 
-    if not WavesToken:
-        return
-
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传面板结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传面板失败: {res.text if res else ''} {e}")
 
-
-async def send_abyss_record(item: Any):
+async def upload_item(url: str, item: Any, name: str):
     if not item:
         return
     if not isinstance(item, dict):
@@ -54,56 +38,47 @@ async def send_abyss_record(item: Any):
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_ABYSS_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传深渊结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传深渊失败: {res.text if res else ''} {e}")
+    res = await get_upload_client().post(
+        url,
+        json=item,
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {WavesToken}",
+        },
+    )
+    logger.info(f"上传{name}结果: {res.status_code} - {res.text}")
+    # 服务端错误交给分发器重试
+    if res.status_code >= 500:
+        res.raise_for_status()
 
 
-async def send_slash_record(item: Any):
-    if not item:
-        return
-    if not isinstance(item, dict):
-        return
-    from ...wutheringwaves_config import WutheringWavesConfig
+async def send_score_rank(item: Any):
+    await upload_item(UPLOAD_URL, item, "面板")
 
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
 
-    if not WavesToken:
-        return
+async def send_abyss_record(item: Any):
+    await upload_item(UPLOAD_ABYSS_RECORD_URL, item, "深渊")
+
 
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_SLASH_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传冥海结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传冥海失败: {res.text if res else ''} {e}")
+async def send_slash_record(item: Any):
+    await upload_item(UPLOAD_SLASH_RECORD_URL, item, "冥海")
 
 
 def init_queues():
-    # 注册处理函数
-    register_handler(QUEUE_SCORE_RANK, send_score_rank)
-    register_handler(QUEUE_ABYSS_RECORD, send_abyss_record)
-    register_handler(QUEUE_SLASH_RECORD, send_slash_record)
+    # 注册处理函数，同一批次内同一玩家的记录只上传最新的一条
+    # 单角色上传不能覆盖全量上传
+    register_handler(
+        QUEUE_SCORE_RANK,
+        send_score_rank,
+        lambda item: f"{item.get('waves_id')}_{item.get('single_refresh', 0)}",
+    )
+    register_handler(
+        QUEUE_ABYSS_RECORD, send_abyss_record, lambda item: item.get("waves_id")
+    )
+    register_handler(
+        QUEUE_SLASH_RECORD,
+        send_slash_record,
+        lambda item: f"{item.get('wavesId')}_{item.get('challengeId')}",
+    )
     # 启动任务分发器
     start_dispatcher(daemon=True)
@@ -1,66 +1,248 @@
 import asyncio
+import json
 import threading
-from typing import Any, Callable, Coroutine, Dict, Union
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
 
 from gsuid_core.logger import logger
 
+from ..resource.RESOURCE_PATH import UPLOAD_SPILL_PATH
+
+# 每个任务类型的队列上限，超出的任务写入溢出文件
+QUEUE_MAX_SIZE = 1000
+# 攒批：最多攒够多少条，或等待多少秒
+BATCH_SIZE = 50
+BATCH_WINDOW = 2.0
+# 同一批次的并发上传数
+BATCH_CONCURRENCY = 4
+# 失败重试
+MAX_RETRIES = 3
+RETRY_DELAY = 1.0
+# 定时补发溢出文件的间隔(秒)
+SPILL_REPLAY_INTERVAL = 300
+# 溢出任务最多补发次数和最长保留时间(秒)，超出后丢弃
+SPILL_MAX_ATTEMPTS = 20
+SPILL_MAX_AGE = 86400
+
+Handler = Callable[[Any], Union[Any, Coroutine[Any, Any, Any]]]
+KeyFunc = Callable[[Any], Optional[str]]
+
+
+class TaskStats:
+    __slots__ = ("sent", "failed", "spilled", "merged", "dropped", "latency")
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.spilled = 0
+        self.merged = 0
+        self.dropped = 0
+        # 单条任务耗时的指数平均，单位秒
+        self.latency = 0.0
+
+    def record(self, cost: float):
+        self.latency = cost if self.sent == 0 else self.latency * 0.9 + cost * 0.1
+        self.sent += 1
+
+
+ENTRY_KEYS = {"item", "attempts", "time"}
+
+
+def new_entry(data: Any) -> Dict[str, Any]:
+    """队列和溢出文件中的任务，记录失败次数和首次入队时间"""
+    return {"item": data, "attempts": 0, "time": int(time.time())}
+
 
 class TaskDispatcher:
+    """
+    任务分发器，在独立线程的事件循环中执行
+    每个任务类型一个有界队列和一个攒批协程：按数量或时间窗口取出一批，
+    批内按`key_func`去重(保留最新)，有限并发执行，失败按指数退避重试；
+    队列满或重试耗尽的任务写入溢出文件，成功执行后或定时补发，
+    补发次数或保留时间超出上限的任务丢弃
+    """
 
     def __init__(self):
-        self.queue = asyncio.Queue()
         self.running = False
-        self.handlers: Dict[str, Callable] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.handlers: Dict[str, Handler] = {}
+        self.key_funcs: Dict[str, Optional[KeyFunc]] = {}
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.stats_map: Dict[str, TaskStats] = {}
+        self._ready = threading.Event()
 
     def register_handler(
         self,
         task_type: str,
-        handler: Callable[[Any], Union[Any, Coroutine[Any, Any, Any]]],
+        handler: Handler,
+        key_func: Optional[KeyFunc] = None,
     ) -> None:
         self.handlers[task_type] = handler
+        self.key_funcs[task_type] = key_func
+        self.stats_map.setdefault(task_type, TaskStats())
         logger.info(f"注册任务处理器: {task_type}")
 
     async def dispatch(self, task_type: str, data: Any) -> None:
-        if not self.running:
+        if not self.running or self.loop is None:
             logger.warning("任务分发器未启动或已关闭")
             return
         if task_type not in self.handlers:
             return
 
-        await self.queue.put((task_type, data))
+        # 调用方在主事件循环中，队列属于分发线程的事件循环
+        self.loop.call_soon_threadsafe(self._enqueue, task_type, new_entry(data))
 
-    async def _process(self) -> None:
-        while True:
-            try:
-                # 如果分发器已关闭，退出循环
-                if not self.running:
-                    break
+    def _enqueue(self, task_type: str, entry: Dict[str, Any]) -> None:
+        queue = self.queues.get(task_type)
+        if queue is None or queue.full():
+            self._spill(task_type, [entry])
+            return
+        queue.put_nowait(entry)
 
-                # 获取队列任务
-                task_type, data = await asyncio.wait_for(self.queue.get(), timeout=3.0)
+    def _spill_file(self, task_type: str):
+        return UPLOAD_SPILL_PATH / f"{task_type}.jsonl"
 
-                # 处理任务
-                handler = self.handlers.get(task_type)
-                if handler:
-                    # 创建异步任务
-                    asyncio.create_task(self._run_task(handler, data, task_type))
+    def _spill(self, task_type: str, entries: List[Dict[str, Any]]) -> None:
+        stats = self.stats_map[task_type]
+        expire_time = time.time() - SPILL_MAX_AGE
+        alive = []
+        for entry in entries:
+            if entry["attempts"] >= SPILL_MAX_ATTEMPTS or entry["time"] < expire_time:
+                stats.dropped += 1
+                continue
+            alive.append(entry)
+        if len(alive) < len(entries):
+            logger.warning(
+                f"丢弃多次失败的任务 ({task_type}): {len(entries) - len(alive)}"
+            )
+        if not alive:
+            return
+        try:
+            with open(self._spill_file(task_type), "a", encoding="utf-8") as f:
+                for entry in alive:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            stats.spilled += len(alive)
+        except Exception as e:
+            logger.exception(f"任务写入溢出文件失败 ({task_type}): {e}")
 
-                # 标记任务完成
-                self.queue.task_done()
+    def _load_spill(self, task_type: str) -> None:
+        """把溢出文件中的任务放回队列，放不下的留在文件中"""
+        path = self._spill_file(task_type)
+        if not path.exists():
+            return
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+            path.unlink()
+        except Exception as e:
+            logger.exception(f"读取溢出文件失败 ({task_type}): {e}")
+            return
 
-            except asyncio.TimeoutError:
+        entries = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except Exception:
                 continue
+            # 旧版溢出文件直接保存任务本身
+            if not isinstance(entry, dict) or entry.keys() != ENTRY_KEYS:
+                entry = new_entry(entry)
+            entries.append(entry)
+        if entries:
+            logger.info(f"补发溢出任务 ({task_type}): {len(entries)}")
+        for entry in entries:
+            self._enqueue(task_type, entry)
+
+    async def _get_batch(self, queue: asyncio.Queue) -> List[Any]:
+        batch = [await queue.get()]
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _merge(
+        self, task_type: str, batch: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        key_func = self.key_funcs.get(task_type)
+        if key_func is None:
+            return batch
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for i, entry in enumerate(batch):
+            key = key_func(entry["item"])
+            merged[i if key is None else key] = entry
+        self.stats_map[task_type].merged += len(batch) - len(merged)
+        return list(merged.values())
+
+    async def _worker(self, task_type: str) -> None:
+        queue = self.queues[task_type]
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        while self.running:
+            try:
+                batch = self._merge(task_type, await self._get_batch(queue))
+                results = await asyncio.gather(
+                    *[
+                        self._run_task(semaphore, task_type, entry["item"])
+                        for entry in batch
+                    ]
+                )
+                failed = [entry for entry, ok in zip(batch, results) if not ok]
+                for entry in failed:
+                    entry["attempts"] += 1
+                if failed:
+                    self._spill(task_type, failed)
+                elif queue.empty():
+                    # 服务恢复后补发
+                    self._load_spill(task_type)
             except Exception as e:
                 logger.exception(f"任务处理异常: {e}")
 
-    async def _run_task(self, handler: Callable, data: Any, task_type: str) -> None:
-        try:
-            result = handler(data)
-            # 如果是协程，等待它完成
-            if asyncio.iscoroutine(result):
-                await result
-        except Exception as e:
-            logger.exception(f"任务执行错误 ({task_type}): {e}")
+    async def _replay_spill(self, task_type: str) -> None:
+        """定时补发，服务恢复后没有新任务时溢出文件也能被处理"""
+        queue = self.queues[task_type]
+        while self.running:
+            await asyncio.sleep(SPILL_REPLAY_INTERVAL)
+            if queue.empty():
+                self._load_spill(task_type)
+
+    async def _run_task(
+        self, semaphore: asyncio.Semaphore, task_type: str, data: Any
+    ) -> bool:
+        handler = self.handlers[task_type]
+        stats = self.stats_map[task_type]
+        async with semaphore:
+            for attempt in range(MAX_RETRIES):
+                start = time.monotonic()
+                try:
+                    result = handler(data)
+                    # 如果是协程，等待它完成
+                    if asyncio.iscoroutine(result):
+                        await result
+                    stats.record(time.monotonic() - start)
+                    return True
+                except Exception as e:
+                    logger.warning(
+                        f"任务执行错误 ({task_type}), 尝试次数 {attempt + 1}: {e}"
+                    )
+                    if attempt < MAX_RETRIES - 1:
+                        await asyncio.sleep(RETRY_DELAY * 2**attempt)
+        stats.failed += 1
+        return False
+
+    async def _process(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        workers = []
+        for task_type in self.handlers:
+            self.queues[task_type] = asyncio.Queue(maxsize=QUEUE_MAX_SIZE)
+            self._load_spill(task_type)
+            workers.append(asyncio.create_task(self._worker(task_type)))
+            workers.append(asyncio.create_task(self._replay_spill(task_type)))
+        self._ready.set()
+        await asyncio.gather(*workers)
 
     def start(self, daemon: bool = True) -> None:
         if self.running:
@@ -72,6 +254,23 @@ class TaskDispatcher:
         threading.Thread(
             target=lambda: asyncio.run(self._process()), daemon=daemon
         ).start()
+        self._ready.wait(timeout=5)
+
+    def stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        return {
+            task_type: {
+                "depth": (
+                    self.queues[task_type].qsize() if task_type in self.queues else 0
+                ),
+                "sent": stats.sent,
+                "failed": stats.failed,
+                "spilled": stats.spilled,
+                "merged": stats.merged,
+                "dropped": stats.dropped,
+                "latency": round(stats.latency, 3),
+            }
+            for task_type, stats in self.stats_map.items()
+        }
 
 
 # 创建全局任务分发器实例
@@ -81,9 +280,10 @@ dispatcher = TaskDispatcher()
 # 工具函数
 def register_handler(
     task_type: str,
-    handler: Callable[[Any], Union[Any, Coroutine[Any, Any, Any]]],
+    handler: Handler,
+    key_func: Optional[KeyFunc] = None,
 ) -> None:
-    dispatcher.register_handler(task_type, handler)
+    dispatcher.register_handler(task_type, handler, key_func)
 
 
 def start_dispatcher(daemon: bool = True) -> None:
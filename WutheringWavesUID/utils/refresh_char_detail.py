@@ -1,19 +1,27 @@
 import asyncio
-import json
+import time
 from typing import Dict, List, Optional, Union
 
-import aiofiles
-
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
 
-from ..utils.api.model import AccountBaseInfo, RoleList
+from ..utils.api.model import AccountBaseInfo, Role, RoleList
+from ..utils.char_info_utils import (
+    get_all_role_detail_info_list,
+    get_role_sync,
+    load_role_data,
+    save_role_data,
+)
+from ..utils.database.models import WavesRoleRank
 from ..utils.error_reply import WAVES_CODE_101, WAVES_CODE_102
-from ..utils.expression_ctx import WavesCharRank, get_waves_char_rank
+from ..utils.expression_ctx import (
+    WavesCharRank,
+    build_waves_char_rank,
+    get_waves_char_rank,
+)
 from ..utils.hint import error_reply
 from ..utils.queues.const import QUEUE_SCORE_RANK
 from ..utils.queues.queues import put_item
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
 from ..utils.util import get_version
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import WutheringWavesConfig
@@ -55,6 +63,67 @@ class SemaphoreManager:
 semaphore_manager = SemaphoreManager()
 
 
+def get_full_sync_hours() -> int:
+    return WutheringWavesConfig.get_config("RefreshFullSyncHours").data or 0
+
+
+def role_fingerprint(role: Role) -> str:
+    """
+    角色列表中可直接得到的角色概要，变化时才需要重新拉取详情
+    角色列表不含武器和声骸，只换武器、声骸不会改变指纹
+    """
+    return f"{role.level}|{role.breach}|{role.chainUnlockNum}"
+
+
+async def filter_changed_roles(
+    uid: str, role_ids: List[str], fingerprints: Dict[int, str]
+) -> List[str]:
+    """只保留指纹变化或超过全量同步间隔的角色"""
+    full_sync_hours = get_full_sync_hours()
+    if full_sync_hours <= 0:
+        return role_ids
+    try:
+        role_sync = await get_role_sync(uid)
+    except Exception as e:
+        logger.exception(f"{uid} 获取角色指纹失败", e)
+        return role_ids
+
+    expire_time = time.time() - full_sync_hours * 3600
+    changed = []
+    for role_id in role_ids:
+        fingerprint, sync_time = role_sync.get(int(role_id), ("", 0))
+        if (
+            not fingerprint
+            or fingerprint != fingerprints.get(int(role_id))
+            or sync_time < expire_time
+        ):
+            changed.append(role_id)
+    return changed
+
+
+async def save_rank_index(uid: str, waves_char_rank: List[WavesCharRank]):
+    try:
+        await WavesRoleRank.upsert_rank_list(
+            uid, [r.to_index_dict() for r in waves_char_rank]
+        )
+    except Exception as e:
+        logger.exception(f"save_rank_index failed {uid}:", e)
+
+
+async def build_rank_index(uids: List[str]):
+    """从面板数据补建排行索引，同一角色的期望伤害批量计算"""
+    all_role_details = {}
+    for uid in uids:
+        role_details = await get_all_role_detail_info_list(uid)
+        if role_details:
+            all_role_details[uid] = list(role_details)
+    if not all_role_details:
+        return
+    waves_char_rank = build_waves_char_rank(all_role_details, True)
+    for uid, ranks in waves_char_rank.items():
+        await save_rank_index(uid, ranks)
+
+
 async def send_card(
     uid: str,
     user_id: str,
@@ -63,14 +132,11 @@ async def send_card(
     token: Optional[str] = "",
     role_info: Optional[RoleList] = None,
     waves_data: Optional[List] = None,
+    waves_char_rank: Optional[List[WavesCharRank]] = None,
+    is_full_refresh: bool = False,
 ):
-    waves_char_rank: Optional[List[WavesCharRank]] = None
-
     WavesToken = WutheringWavesConfig.get_config("WavesToken").data
 
-    if WavesToken:
-        waves_char_rank = await get_waves_char_rank(uid, save_data, True)
-
     if (
         is_self_ck
         and token
@@ -80,8 +146,9 @@ async def send_card(
         and waves_data
         and user_id
     ):
-        # 单角色上传排行
-        if len(waves_data) != 1 and len(role_info.roleList) != len(save_data):
+        # 单角色上传排行，全量刷新时即使只拉取了一个角色也按全量上传
+        single_refresh = not is_full_refresh and len(waves_data) == 1
+        if not single_refresh and len(role_info.roleList) != len(save_data):
             logger.warning(
                 f"角色数量不一致，role_info.roleNum:{len(role_info.roleList)} != waves_char_rank:{len(save_data)}"
             )
@@ -90,7 +157,7 @@ async def send_card(
         if not account_info.success:
             return account_info.throw_msg()
         account_info = AccountBaseInfo.model_validate(account_info.data)
-        if len(waves_data) != 1 and account_info.roleNum != len(save_data):
+        if not single_refresh and account_info.roleNum != len(save_data):
             logger.warning(
                 f"角色数量不一致，role_info.roleNum:{account_info.roleNum} != waves_char_rank:{len(save_data)}"
             )
@@ -102,7 +169,7 @@ async def send_card(
             "version": get_version(),
             "char_info": [r.to_rank_dict() for r in waves_char_rank],
             "role_num": account_info.roleNum,
-            "single_refresh": 1 if len(waves_data) == 1 else 0,
+            "single_refresh": 1 if single_refresh else 0,
         }
         await put_item(QUEUE_SCORE_RANK, metadata)
 
@@ -115,26 +182,23 @@ async def save_card_info(
     is_self_ck: bool = False,
     token: str = "",
     role_info: Optional[RoleList] = None,
+    fingerprints: Optional[Dict[int, str]] = None,
+    is_full_refresh: bool = False,
 ):
     if len(waves_data) == 0:
         return
-    _dir = PLAYER_PATH / uid
-    _dir.mkdir(parents=True, exist_ok=True)
-    path = _dir / "rawData.json"
-
     old_data = {}
-    if path.exists():
-        try:
-            async with aiofiles.open(path, mode="r", encoding="utf-8") as f:
-                old = json.loads(await f.read())
-                old_data = {d["role"]["roleId"]: d for d in old}
-        except Exception as e:
-            logger.exception(f"save_card_info get failed {path}:", e)
-            path.unlink(missing_ok=True)
+    try:
+        old = await load_role_data(uid)
+        if old:
+            old_data = {d["role"]["roleId"]: d for d in old}
+    except Exception as e:
+        logger.exception(f"save_card_info get failed {uid}:", e)
 
     #
     refresh_update = {}
     refresh_unchanged = {}
+    delete_role_ids = []
     for item in waves_data:
         role_id = item["role"]["roleId"]
 
@@ -146,6 +210,7 @@ async def save_card_info(
                     continue
                 if piaobo_id != role_id:
                     del old_data[piaobo_id]
+                    delete_role_ids.append(piaobo_id)
 
         old = old_data.get(role_id)
         if old != item:
@@ -157,13 +222,27 @@ async def save_card_info(
 
     save_data = list(old_data.values())
 
-    await send_card(uid, user_id, save_data, is_self_ck, token, role_info, waves_data)
+    waves_char_rank = await get_waves_char_rank(uid, save_data, True)
+    await save_rank_index(uid, waves_char_rank)
+
+    await send_card(
+        uid,
+        user_id,
+        save_data,
+        is_self_ck,
+        token,
+        role_info,
+        waves_data,
+        waves_char_rank,
+        is_full_refresh,
+    )
 
     try:
-        async with aiofiles.open(path, "w", encoding="utf-8") as file:
-            await file.write(json.dumps(save_data, ensure_ascii=False))
+        await save_role_data(
+            uid, list(refresh_update.values()), delete_role_ids, fingerprints
+        )
     except Exception as e:
-        logger.exception(f"save_card_info save failed {path}:", e)
+        logger.exception(f"save_card_info save failed {uid}:", e)
 
     if waves_map:
         waves_map["refresh_update"] = refresh_update
@@ -202,28 +281,29 @@ async def refresh_char(
         async with semaphore:
             return await waves_api.get_role_detail_info(role_id, uid, ck)
 
-    if is_self_ck:
-        tasks = [
-            limited_get_role_detail_info(f"{r.roleId}", uid, ck)
-            for r in role_info.roleList
-            if refresh_type == "all"
-            or (isinstance(refresh_type, list) and f"{r.roleId}" in refresh_type)
-        ]
+    if is_self_ck or not role_info.showRoleIdList:
+        role_ids = [f"{r.roleId}" for r in role_info.roleList]
     else:
-        if role_info.showRoleIdList:
-            tasks = [
-                limited_get_role_detail_info(f"{r}", uid, ck)
-                for r in role_info.showRoleIdList
-                if refresh_type == "all"
-                or (isinstance(refresh_type, list) and f"{r}" in refresh_type)
-            ]
-        else:
-            tasks = [
-                limited_get_role_detail_info(f"{r.roleId}", uid, ck)
-                for r in role_info.roleList
-                if refresh_type == "all"
-                or (isinstance(refresh_type, list) and f"{r.roleId}" in refresh_type)
-            ]
+        role_ids = [f"{r}" for r in role_info.showRoleIdList]
+    if refresh_type != "all":
+        role_ids = [
+            r for r in role_ids if isinstance(refresh_type, list) and r in refresh_type
+        ]
+
+    fingerprints = {r.roleId: role_fingerprint(r) for r in role_info.roleList}
+    skipped_datas = []
+    if refresh_type == "all":
+        # 只拉取概要变化的角色，其余沿用已保存的面板
+        changed_ids = await filter_changed_roles(uid, role_ids, fingerprints)
+        skipped_ids = [int(r) for r in role_ids if r not in changed_ids]
+        if skipped_ids:
+            skipped_datas = await load_role_data(uid, skipped_ids) or []
+            if len(skipped_datas) == len(skipped_ids):
+                role_ids = changed_ids
+            else:
+                skipped_datas = []
+
+    tasks = [limited_get_role_detail_info(r, uid, ck) for r in role_ids]
     results = await asyncio.gather(*tasks)
 
     charId2chainNum: Dict[int, int] = {
@@ -289,8 +369,20 @@ async def refresh_char(
         is_self_ck=is_self_ck,
         token=ck,
         role_info=role_info,
+        is_full_refresh=refresh_type == "all",
+        fingerprints={
+            r["role"]["roleId"]: fingerprints.get(r["role"]["roleId"], "")
+            for r in waves_datas
+        },
     )
 
+    if skipped_datas:
+        if waves_map is not None:
+            waves_map.setdefault("refresh_unchanged", {}).update(
+                {r["role"]["roleId"]: r for r in skipped_datas}
+            )
+        waves_datas.extend(skipped_datas)
+
     if not waves_datas:
         if refresh_type == "all":
             return error_reply(WAVES_CODE_101)
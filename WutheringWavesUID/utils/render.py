@@ -0,0 +1,101 @@
+import asyncio
+import functools
+from io import BytesIO
+from pathlib import Path
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Union, TypeVar, Callable, Optional
+
+from PIL import Image
+from gsuid_core.logger import logger
+from gsuid_core.utils.image.convert import convert_img as core_convert_img
+
+from ..wutheringwaves_config import WutheringWavesConfig
+
+T = TypeVar("T")
+
+
+def get_render_worker_num() -> int:
+    return WutheringWavesConfig.get_config("RenderWorkerNum").data or 2
+
+
+class RenderPool:
+    """
+    Pillow 渲染线程池
+    Pillow 的 resize/filter/alpha_composite/编码 在 C 层执行时会释放 GIL，
+    放到线程中即可与事件循环并行；绘图函数中穿插着网络和数据库的 await，
+    且字体对象无法跨进程传递，所以这里用线程池而不是进程池
+    """
+
+    def __init__(self):
+        self._worker_num: int = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 已提交但未完成的任务数
+        self.pending = 0
+        self.max_pending = 0
+        self.total = 0
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        worker_num = get_render_worker_num()
+        if self._executor is None or self._worker_num != worker_num:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(
+                max_workers=worker_num, thread_name_prefix="waves_render"
+            )
+            self._worker_num = worker_num
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        self.total += 1
+        if self.pending > self.max_pending:
+            self.max_pending = self.pending
+        if self.pending > self._worker_num > 0:
+            logger.debug(f"[鸣潮][渲染] 排队任务数: {self.pending - self._worker_num}")
+        try:
+            return await loop.run_in_executor(
+                self.get_executor(), functools.partial(func, *args, **kwargs)
+            )
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "worker_num": self._worker_num,
+            "pending": self.pending,
+            "queue_depth": max(self.pending - self._worker_num, 0),
+            "max_pending": self.max_pending,
+            "total": self.total,
+        }
+
+
+render_pool = RenderPool()
+
+
+async def run_render(func: Callable[..., T], *args, **kwargs) -> T:
+    """在渲染线程池中执行同步的 Pillow 绘图函数"""
+    return await render_pool.run(func, *args, **kwargs)
+
+
+def _encode_img(img: Image.Image) -> bytes:
+    img = img.convert("RGB")
+    result_buffer = BytesIO()
+    img.save(result_buffer, format="PNG", quality=80, subsampling=0)
+    return result_buffer.getvalue()
+
+
+async def convert_img(
+    img: Union[Image.Image, str, Path, bytes], is_base64: bool = False
+):
+    """
+    同`gsuid_core`的`convert_img`，图片编码放到渲染线程池中执行
+    传入 Image 时返回 bytes，`is_base64`为真时返回 base64 字符串
+    """
+    if isinstance(img, Image.Image):
+        res = await run_render(_encode_img, img)
+        if is_base64:
+            return f"base64://{b64encode(res).decode()}"
+        return res
+    return await core_convert_img(img, is_base64)
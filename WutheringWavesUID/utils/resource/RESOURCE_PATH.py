@@ -53,6 +53,7 @@ SLASH_PATH = OTHER_PATH / "slash"
 CHALLENGE_PATH = OTHER_PATH / "challenge"
 ANN_CARD_PATH = OTHER_PATH / "ann_card"
 POKER_PATH = OTHER_PATH / "poker"
+UPLOAD_SPILL_PATH = OTHER_PATH / "upload_spill"
 
 
 # 别名
@@ -88,6 +89,7 @@ def init_dir():
         OTHER_PATH,
         CALENDAR_PATH,
         ANN_CARD_PATH,
+        UPLOAD_SPILL_PATH,
         ALIAS_PATH,
         CUSTOM_MR_CARD_PATH,
     ]:
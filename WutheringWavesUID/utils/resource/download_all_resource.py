@@ -1,5 +1,6 @@
 from gsuid_core.utils.download_resource.download_core import download_all_file
 
+from ..image import asset_cache
 from .RESOURCE_PATH import (
     AVATAR_PATH,
     JIEXING_GUIDE_PATH,
@@ -37,3 +38,5 @@ async def download_all_resource():
             "resource/guide/WuHen": WUHEN_GUIDE_PATH,
         },
     )
+    # 资源文件可能已被更新，丢弃旧的贴图缓存
+    asset_cache.clear()
@@ -4,6 +4,7 @@ from PIL import Image
 
 from gsuid_core.utils.download_resource.download_file import download
 
+from ..image import open_asset
 from .RESOURCE_PATH import (
     FETTER_PATH,
     MATERIAL_PATH,
@@ -29,7 +30,7 @@ async def get_skill_img(
             # logger.warning(f"[鸣潮] 角色 {char_id} 的技能图片不存在，使用默认图片")
             _path = ROLE_DETAIL_SKILL_PATH / "1102/skill_1102.png"
 
-    return Image.open(_path).convert("RGBA")
+    return open_asset(_path)
 
 
 async def get_chain_img(
@@ -47,7 +48,7 @@ async def get_chain_img(
             # logger.warning(f"[鸣潮] 角色 {char_id} 的共鸣链图片不存在，使用默认图片")
             _path = ROLE_DETAIL_CHAINS_PATH / f"1102/chain_{order_id}.png"
 
-    return Image.open(_path).convert("RGBA")
+    return open_asset(_path)
 
 
 async def get_phantom_img(phantom_id: int, pic_url: str) -> Image.Image:
@@ -59,7 +60,7 @@ async def get_phantom_img(phantom_id: int, pic_url: str) -> Image.Image:
         else:
             _path = PHANTOM_PATH / "phantom_390070051.png"
 
-    return Image.open(_path).convert("RGBA")
+    return open_asset(_path)
 
 
 async def get_fetter_img(name: str, pic_url: str) -> Image.Image:
@@ -68,10 +69,10 @@ async def get_fetter_img(name: str, pic_url: str) -> Image.Image:
     if not _path.exists():
         await download(pic_url, FETTER_PATH, name, tag="[鸣潮]")
 
-    return Image.open(_path).convert("RGBA")
+    return open_asset(_path)
 
 
 async def get_material_img(material_id: Union[str, int]) -> Image.Image:
     name = f"material_{material_id}.png"
     _path = MATERIAL_PATH / name
-    return Image.open(_path).convert("RGBA")
+    return open_asset(_path)
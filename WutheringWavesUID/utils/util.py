@@ -1,13 +1,24 @@
 import asyncio
 import inspect
+import ipaddress
 import random
 import string
 import time
 from functools import wraps
-from typing import Any, Callable, Coroutine, Dict, List, TypeVar, overload
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+    overload,
+)
 
 import httpx
 
+from gsuid_core.logger import logger
 from gsuid_core.subscribe import gs_subscribe
 
 
@@ -119,36 +130,86 @@ def async_func_lock(
         return decorator(_func)
 
 
-# 使用示例
-@timed_async_cache(86400)
+PUBLIC_IP_URLS = [
+    ("https://event.kurobbs.com/event/ip", lambda r: r.text),
+    ("https://api.ipify.org/?format=json", lambda r: r.json()["ip"]),
+    ("https://httpbin.org/ip", lambda r: r.json()["origin"]),
+]
+
+
+class PublicIpCache:
+    """
+    公网IP缓存
+    过期后先返回旧值并在后台刷新；同一时间只有一个查询请求；
+    查询失败时按指数退避重试，期间直接返回旧值或传入的默认值
+    """
+
+    ttl = 3600
+    min_backoff = 30
+    max_backoff = 1800
+
+    def __init__(self):
+        self.ip: Optional[str] = None
+        self.expire_at = 0.0
+        self.retry_at = 0.0
+        self.backoff = self.min_backoff
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _fetch() -> Optional[str]:
+        async with httpx.AsyncClient(timeout=4) as client:
+            for url, parse in PUBLIC_IP_URLS:
+                try:
+                    r = await client.get(url)
+                    ip = parse(r).strip()
+                    ipaddress.ip_address(ip)
+                    return ip
+                except:  # noqa:E722, B001
+                    pass
+        return None
+
+    async def _refresh(self) -> Optional[str]:
+        ip = await self._fetch()
+        now = time.time()
+        if ip:
+            self.ip = ip
+            self.expire_at = now + self.ttl
+            self.backoff = self.min_backoff
+        else:
+            self.retry_at = now + self.backoff
+            logger.warning(f"[鸣潮] 获取公网IP失败, {self.backoff}秒后重试")
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+        return ip
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh())
+        return self._task
+
+    async def refresh(self) -> Optional[str]:
+        return await asyncio.shield(self._start_refresh())
+
+    def refresh_background(self):
+        """后台刷新，任务由自身持有"""
+        self._start_refresh()
+
+    async def get(self, host: str) -> str:
+        now = time.time()
+        if now < self.expire_at and self.ip:
+            return self.ip
+        if now < self.retry_at:
+            return self.ip or host
+        if self.ip:
+            self._start_refresh()
+            return self.ip
+        return await self.refresh() or host
+
+
+public_ip_cache = PublicIpCache()
+
+
 async def get_public_ip(host="127.127.127.127"):
-    try:
-        async with httpx.AsyncClient() as client:
-            r = await client.get("https://event.kurobbs.com/event/ip", timeout=4)
-            ip = r.text
-            return ip
-    except:  # noqa:E722, B001
-        pass
-
-    # 尝试从 ipify 获取 IP 地址
-    try:
-        async with httpx.AsyncClient() as client:
-            r = await client.get("https://api.ipify.org/?format=json", timeout=4)
-            ip = r.json()["ip"]
-            return ip
-    except:  # noqa:E722, B001
-        pass
-
-    # 尝试从 httpbin.org 获取 IP 地址
-    try:
-        async with httpx.AsyncClient() as client:
-            r = await client.get("https://httpbin.org/ip", timeout=4)
-            ip = r.json()["origin"]
-            return ip
-    except:  # noqa:E722, B001
-        pass
-
-    return host
+    return await public_ip_cache.get(host)
 
 
 def generate_random_string(length=32):
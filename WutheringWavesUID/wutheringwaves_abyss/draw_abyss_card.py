@@ -1,10 +1,9 @@
 from pathlib import Path
-from typing import Union
+from typing import Dict, Optional, Union
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.model import (
     AbyssChallenge,
@@ -31,6 +30,7 @@ from ..utils.image import GOLD, GREY, add_footer, get_waves_bg
 from ..utils.imagetool import draw_pic, draw_pic_with_ring
 from ..utils.queues.const import QUEUE_ABYSS_RECORD
 from ..utils.queues.queues import put_item
+from ..utils.render import convert_img, run_render
 from ..utils.util import get_version
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import PREFIX
@@ -144,6 +144,52 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
         + 50
     )
 
+    # 根据面板数据获取详细信息
+    role_detail_info_map = await get_all_roleid_detail_info(uid)
+
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    role_ids = {role.roleId for role in role_info.roleList}
+    role_avatars = {}
+    for tower in needAbyss.towerAreaList:
+        for floor in tower.floorList or []:
+            for _role in floor.roleList or []:
+                if _role.roleId in role_ids and _role.roleId not in role_avatars:
+                    role_avatars[_role.roleId] = await draw_pic(_role.roleId)
+
+    card_img = await run_render(
+        draw_abyss_card,
+        account_info,
+        role_info,
+        abyss_data,
+        difficultyName,
+        frameHigh,
+        is_self_ck,
+        role_detail_info_map,
+        avatar,
+        avatar_ring,
+        role_avatars,
+    )
+
+    # 上传深渊记录
+    await upload_abyss_record(is_self_ck, uid, difficultyName, abyss_data)
+
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_abyss_card(
+    account_info: AccountBaseInfo,
+    role_info: RoleList,
+    abyss_data: AbyssChallenge,
+    difficultyName: str,
+    frameHigh: int,
+    is_self_ck: bool,
+    role_detail_info_map: Optional[Dict[str, RoleDetailData]],
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    role_avatars: Dict[int, Image.Image],
+) -> Image.Image:
+    """绘制深渊，在渲染线程中执行"""
     h = frameHigh + 220
     card_img = get_waves_bg(950, h, "bg4")
 
@@ -159,7 +205,6 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
     # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (25, 70), avatar)
     card_img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -178,9 +223,6 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
         )
         card_img.paste(title_bar, (-20, 70), title_bar)
 
-    # 根据面板数据获取详细信息
-    role_detail_info_map = await get_all_roleid_detail_info(uid)
-
     # frame
     frame = Image.open(TEXT_PATH / "frame.png")
     frame = frame.resize((frame.size[0], frameHigh))
@@ -258,7 +300,7 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
                         if not role:
                             continue
 
-                        avatar = await draw_pic(role.roleId)
+                        avatar = role_avatars[role.roleId]
                         char_bg = Image.open(TEXT_PATH / f"char_bg{role.starLevel}.png")
                         char_bg_draw = ImageDraw.Draw(char_bg)
                         char_bg_draw.text(
@@ -297,19 +339,10 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
                 yset += 141
             yset += 50
         break
-    else:
-        if not is_self_ck:
-            return ABYSS_ERROR_MESSAGE_LOGIN
-        return ABYSS_ERROR_MESSAGE_NO_DATA
-
-    # 上传深渊记录
-    await upload_abyss_record(is_self_ck, uid, difficultyName, abyss_data)
 
     card_img.paste(frame, (0, 210), frame)
 
-    card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 600, 20)
 
 
 async def upload_abyss_record(
@@ -1,13 +1,12 @@
 from datetime import timedelta
 from pathlib import Path
-from typing import Union
+from typing import Dict, Optional, Union
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
-from ..utils.api.model import AccountBaseInfo, ChallengeArea, RoleList
+from ..utils.api.model import AccountBaseInfo, ChallengeArea, Role, RoleList
 from ..utils.error_reply import WAVES_CODE_102
 from ..utils.fonts.waves_fonts import (
     waves_font_18,
@@ -29,6 +28,7 @@ from ..utils.image import (
 )
 from ..utils.imagetool import draw_pic, draw_pic_with_ring
 from ..utils.name_convert import char_name_to_char_id
+from ..utils.render import convert_img, run_render
 from ..utils.resource.RESOURCE_PATH import CHALLENGE_PATH
 from ..utils.waves_api import waves_api
 
@@ -70,6 +70,63 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> Union[bytes,
 
     role_info = RoleList.model_validate(role_info.data)
 
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    boss_icons = {}
+    role_avatars = {}
+    for _challenge in challenge_data.challengeInfo.values():
+        boss_icon_url = _challenge[0].bossIconUrl
+        if boss_icon_url not in boss_icons:
+            boss_icons[boss_icon_url] = await pic_download_from_url(
+                CHALLENGE_PATH, boss_icon_url
+            )
+        for _temp in reversed(_challenge):
+            if not _temp.roles:
+                continue
+            for _role in _temp.roles:
+                role = find_challenge_role(role_info, _role.roleName)
+                if not role:
+                    roleId = char_name_to_char_id(_role.roleName)
+                else:
+                    roleId = role.roleId
+                if roleId not in role_avatars:
+                    role_avatars[roleId] = await draw_pic(roleId)
+            break
+
+    card_img = await run_render(
+        draw_challenge_card,
+        challenge_data,
+        account_info,
+        role_info,
+        avatar,
+        avatar_ring,
+        boss_icons,
+        role_avatars,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def find_challenge_role(role_info: RoleList, role_name: str) -> Optional[Role]:
+    return next(
+        (
+            role
+            for role in role_info.roleList
+            if role.roleName == role_name or role_name in role.roleName
+        ),
+        None,
+    )
+
+
+def draw_challenge_card(
+    challenge_data: ChallengeArea,
+    account_info: AccountBaseInfo,
+    role_info: RoleList,
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    boss_icons: Dict[str, Image.Image],
+    role_avatars: Dict[Union[int, str, None], Image.Image],
+) -> Image.Image:
+    """绘制全息战略，在渲染线程中执行"""
     num = len(challenge_data.challengeInfo)
     a = num // 2 + (0 if num % 2 == 0 else 1)
     h = 300 + a * 260 + 50
@@ -87,7 +144,6 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> Union[bytes,
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
     # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (25, 70), avatar)
     card_img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -132,9 +188,7 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> Union[bytes,
 
         boss_difficulty = 1
         boss_level = 1
-        boss_icon = await pic_download_from_url(
-            CHALLENGE_PATH, _challenge[0].bossIconUrl
-        )
+        boss_icon = boss_icons[_challenge[0].bossIconUrl]
         boss_icon = boss_icon.resize((242, 156))
         img_temp.alpha_composite(boss_icon, (20, 20))
         for _temp in reversed(_challenge):
@@ -151,21 +205,13 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> Union[bytes,
             )
 
             for role_index, _role in enumerate(_temp.roles):
-                role = next(
-                    (
-                        role
-                        for role in role_info.roleList
-                        if role.roleName == _role.roleName
-                        or _role.roleName in role.roleName
-                    ),
-                    None,
-                )
+                role = find_challenge_role(role_info, _role.roleName)
                 if not role:
                     roleId = char_name_to_char_id(_role.roleName)
-                    avatar = await draw_pic(roleId)
+                    avatar = role_avatars[roleId]
                     char_bg = Image.open(TEXT_PATH / f"char_bg{5}.png")
                 else:
-                    avatar = await draw_pic(role.roleId)
+                    avatar = role_avatars[role.roleId]
                     char_bg = Image.open(TEXT_PATH / f"char_bg{role.starLevel}.png")
 
                 char_bg_draw = ImageDraw.Draw(char_bg)
@@ -215,6 +261,4 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> Union[bytes,
         )
         challenge_index += 1
 
-    card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 600, 20)
@@ -1,10 +1,9 @@
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Union
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.model import (
     AccountBaseInfo,
@@ -36,6 +35,7 @@ from ..utils.image import (
 from ..utils.imagetool import draw_pic, draw_pic_with_ring
 from ..utils.queues.const import QUEUE_SLASH_RECORD
 from ..utils.queues.queues import put_item
+from ..utils.render import convert_img, run_render
 from ..utils.resource.RESOURCE_PATH import SLASH_PATH
 from ..utils.waves_api import waves_api
 
@@ -161,6 +161,60 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
 
     role_info = RoleList.model_validate(role_info.data)
 
+    # 根据面板数据获取详细信息
+    role_detail_info_map = await get_all_roleid_detail_info(uid)
+    role_detail_info_map = role_detail_info_map if role_detail_info_map else {}
+
+    # 倒序
+    slash_detail.difficultyList.reverse()
+
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    slash_imgs = {}
+    role_avatars = {}
+    for difficulty in slash_detail.difficultyList:
+        for challenge in difficulty.challengeList:
+            if challenge.challengeId not in query_challenge_ids:
+                continue
+            for slash_half in challenge.halfList:
+                for icon in (difficulty.teamIcon, slash_half.buffIcon):
+                    if icon not in slash_imgs:
+                        slash_imgs[icon] = await pic_download_from_url(SLASH_PATH, icon)
+                for slash_role in slash_half.roleList:
+                    if slash_role.roleId in role_avatars:
+                        continue
+                    if get_char_model(slash_role.roleId) is None:
+                        continue
+                    role_avatars[slash_role.roleId] = await draw_pic(slash_role.roleId)
+
+    card_img = await run_render(
+        draw_slash_card,
+        slash_detail,
+        query_challenge_ids,
+        account_info,
+        role_detail_info_map,
+        avatar,
+        avatar_ring,
+        slash_imgs,
+        role_avatars,
+    )
+
+    await upload_slash_record(is_self_ck, uid, slash_detail)
+
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_slash_card(
+    slash_detail: SlashDetail,
+    query_challenge_ids: List[int],
+    account_info: AccountBaseInfo,
+    role_detail_info_map: Dict[str, RoleDetailData],
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    slash_imgs: Dict[str, Image.Image],
+    role_avatars: Dict[int, Image.Image],
+) -> Image.Image:
+    """绘制冥歌海墟，在渲染线程中执行"""
     # 绘制图片
     footer_h = 50
     card_h = 300
@@ -188,7 +242,6 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
     # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (25, 70), avatar)
     card_img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -207,14 +260,8 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
         )
         card_img.paste(title_bar, (-20, 70), title_bar)
 
-    # 根据面板数据获取详细信息
-    role_detail_info_map = await get_all_roleid_detail_info(uid)
-    role_detail_info_map = role_detail_info_map if role_detail_info_map else {}
-
     # 绘制挑战信息
-    # 倒序
     index = 0
-    slash_detail.difficultyList.reverse()
     for difficulty in slash_detail.difficultyList:
         for challenge in difficulty.challengeList:
             if challenge.challengeId not in query_challenge_ids:
@@ -277,7 +324,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
                     GOLD,
                     waves_font_25,
                 )
-                team_pic = await pic_download_from_url(SLASH_PATH, difficulty.teamIcon)
+                team_pic = slash_imgs[difficulty.teamIcon]
                 role_hang_bg.alpha_composite(team_pic, (30, 35))
 
                 # buff
@@ -293,7 +340,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
                     [0, 95, 100, 100],
                     fill=buff_color,
                 )
-                buff_pic = await pic_download_from_url(SLASH_PATH, slash_half.buffIcon)
+                buff_pic = slash_imgs[slash_half.buffIcon]
                 buff_pic = buff_pic.resize((100, 100))
                 buff_bg.paste(buff_pic, (0, 0), buff_pic)
 
@@ -303,7 +350,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
                     char_model = get_char_model(slash_role.roleId)
                     if char_model is None:
                         continue
-                    avatar = await draw_pic(slash_role.roleId)
+                    avatar = role_avatars[slash_role.roleId]
                     char_bg = Image.open(
                         TEXT_PATH / f"char_bg{char_model.starLevel}.png"
                     )
@@ -355,11 +402,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> Union[bytes, str]
             )
             index += 1
 
-    await upload_slash_record(is_self_ck, uid, slash_detail)
-
-    card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 600, 20)
 
 
 async def upload_slash_record(
@@ -1,17 +1,18 @@
+import copy
 import time
 from datetime import datetime
-from typing import List, Union
+from typing import Dict, List, Optional, Union
 
 from PIL import Image, ImageDraw, ImageOps
 
 from gsuid_core.logger import logger
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import (
     draw_text_by_line,
     easy_alpha_composite,
     easy_paste,
 )
 
+from ..utils.ann_cache import get_ann_render, get_content_hash, save_ann_render
 from ..utils.fonts.waves_fonts import (
     ww_font_18,
     ww_font_20,
@@ -19,6 +20,7 @@ from ..utils.fonts.waves_fonts import (
     ww_font_26,
 )
 from ..utils.image import add_footer, pic_download_from_url
+from ..utils.render import convert_img, run_render
 from ..utils.resource.RESOURCE_PATH import ANN_CARD_PATH
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import PREFIX
@@ -38,6 +40,19 @@ async def ann_list_card() -> bytes:
     for data in grouped.values():
         data.sort(key=lambda x: x.get("publishTime", 0), reverse=True)
 
+    previews = {}
+    for data in grouped.values():
+        for item in data:
+            url = item.get("coverUrl", "")
+            if url and url not in previews:
+                previews[url] = await get_preview_image(url)
+
+    img = await run_render(draw_ann_list_card, grouped, previews)
+    return await convert_img(img)
+
+
+def draw_ann_list_card(grouped: Dict[int, List[Dict]], previews: Dict) -> Image.Image:
+    """绘制公告列表，在渲染线程中执行"""
     # 配置
     W, H_ITEM, H_SECTION, H_HEADER, H_FOOTER = 750, 100, 60, 80, 30
     CONFIGS = {1: ("活动", "#ff6b6b"), 2: ("资讯", "#45b7d1"), 3: ("公告", "#4ecdc4")}
@@ -93,15 +108,22 @@ async def ann_list_card() -> bytes:
 
         # 条目
         for i, item in enumerate(data):
-            card = await create_item_card(W, H_ITEM, item, color, i < len(data) - 1)
+            card = create_item_card(
+                W,
+                H_ITEM,
+                item,
+                previews.get(item.get("coverUrl", "")),
+                color,
+                i < len(data) - 1,
+            )
             easy_paste(bg, card, (20, y))
             y += H_ITEM
         y += 30
 
-    return await convert_img(add_footer(bg, 600, 20, color="black"))
+    return add_footer(bg, 600, 20, color="black")
 
 
-async def create_item_card(w, h, info, color, sep):
+def create_item_card(w, h, info, preview, color, sep):
     """创建卡片"""
     bg = Image.new("RGBA", (w - 40, h), "#ffffff")
     draw = ImageDraw.Draw(bg)
@@ -139,7 +161,7 @@ async def create_item_card(w, h, info, color, sep):
     draw_text_by_line(bg, (title_x, 75), date, ww_font_18, "#8e8e93", 100)
 
     # 图片
-    await add_preview_image(bg, w, info, color)
+    add_preview_image(bg, w, preview)
 
     # 边框和分隔线
     if sep:
@@ -159,14 +181,18 @@ def format_date(ts):
     return "未知"
 
 
-async def add_preview_image(bg, w, info, color):
-    """添加预览图"""
-    url = info.get("coverUrl", "")
-    if not url:
-        return
+async def get_preview_image(url: str) -> Optional[Image.Image]:
+    """下载预览图"""
+    try:
+        return await pic_download_from_url(ANN_CARD_PATH, url)
+    except Exception as e:
+        logger.debug(f"图片加载失败: {e}")
+    return None
 
+
+def add_preview_image(bg, w, img: Optional[Image.Image]):
+    """添加预览图"""
     try:
-        img = await pic_download_from_url(ANN_CARD_PATH, url)
         if img:
             img = img.resize((100, 70), Image.Resampling.LANCZOS)
             mask = Image.new("L", (100, 70), 0)
@@ -202,7 +228,15 @@ def wrap_text_smart(text, font, max_w):
     return lines or [""]
 
 
-async def ann_batch_card(post_content: List, drow_height: float) -> bytes:
+async def ann_batch_card(post_content: List, drow_height: float, pics: Dict) -> bytes:
+    im = await run_render(draw_ann_batch_card, post_content, drow_height, pics)
+    return await convert_img(im)
+
+
+def draw_ann_batch_card(
+    post_content: List, drow_height: float, pics: Dict
+) -> Image.Image:
+    """绘制公告详情，在渲染线程中执行"""
     im = Image.new("RGB", (1080, drow_height), "#f9f6f2")  # type: ignore
     draw = ImageDraw.Draw(im)
     x, y = 0, 0
@@ -219,7 +253,7 @@ async def ann_batch_card(post_content: List, drow_height: float) -> bytes:
             and "url" in temp
             and temp["url"].endswith(("jpg", "png", "jpeg", "webp"))
         ):
-            img = await pic_download_from_url(ANN_CARD_PATH, temp["url"])
+            img = pics[temp["url"]]
             img_x = 0
             if img.width > im.width:
                 ratio = im.width / img.width
@@ -240,7 +274,7 @@ async def ann_batch_card(post_content: List, drow_height: float) -> bytes:
     else:
         w, h = ww_font_26.getsize("囗")  # type: ignore
         padding = (w, h, w, h)
-    return await convert_img(ImageOps.expand(im, padding, "#f9f6f2"))
+    return ImageOps.expand(im, padding, "#f9f6f2")
 
 
 async def ann_detail_card(
@@ -257,6 +291,8 @@ async def ann_detail_card(
     res = await waves_api.get_ann_detail(postId)
     if not res:
         return "未找到该公告"
+    # 缓存中的详情为共享对象，下面会修改
+    res = copy.deepcopy(res)
 
     if is_check_time:
         post_time = format_post_time(res["postTime"])
@@ -267,6 +303,16 @@ async def ann_detail_card(
         if post_time < now_time - 86400:
             return "该公告已过期"
 
+    content_hash = get_content_hash(res)
+    img = get_ann_render(postId, content_hash)
+    if img is None:
+        img = await draw_ann_detail(res)
+        if not isinstance(img, str):
+            save_ann_render(postId, content_hash, img)
+    return img
+
+
+async def draw_ann_detail(res: Dict) -> Union[bytes, str, List[bytes]]:
     post_content = res["postContent"]
     content_type2_first = [x for x in post_content if x["contentType"] == 2]
     if not content_type2_first and "coverImages" in res:
@@ -281,6 +327,7 @@ async def ann_detail_card(
     index_start = 0
     index_end = 0
     imgs = []
+    pics = {}
     for index, temp in enumerate(post_content):
         content_type = temp["contentType"]
         if content_type == 1:
@@ -301,6 +348,7 @@ async def ann_detail_card(
             # 图片
             _size = (temp["imgWidth"], temp["imgHeight"])
             img = await pic_download_from_url(ANN_CARD_PATH, temp["url"])
+            pics[temp["url"]] = img
             img_height = img.size[1]
             if img.width > 1080:
                 ratio = 1080 / img.width
@@ -309,14 +357,16 @@ async def ann_detail_card(
 
         index_end = index + 1
         if drow_height > 5000:
-            img = await ann_batch_card(post_content[index_start:index_end], drow_height)
+            img = await ann_batch_card(
+                post_content[index_start:index_end], drow_height, pics
+            )
             index_start = index_end
             index_end = index + 1
             drow_height = 0
             imgs.append(img)
 
     if index_start == 0:
-        return await ann_batch_card(post_content[index_start:], drow_height)
+        return await ann_batch_card(post_content[index_start:], drow_height, pics)
     else:
         return imgs
 
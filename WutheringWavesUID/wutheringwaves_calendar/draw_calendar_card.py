@@ -2,12 +2,12 @@ import asyncio
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, List, Optional
 
 from PIL import Image, ImageDraw
 from PIL.ImageFile import ImageFile
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.ascension.char import get_char_id
@@ -20,6 +20,7 @@ from ..utils.image import (
     get_square_weapon,
     pic_download_from_url,
 )
+from ..utils.render import convert_img, run_render
 from ..utils.resource.RESOURCE_PATH import CALENDAR_PATH
 from ..utils.waves_api import waves_api
 from .calendar_model import ImageItem, SpecialImages, VersionActivity
@@ -102,6 +103,36 @@ async def draw_calendar_img(ev: Event, uid: str):
             side_module["content"].insert(1, shenhai_node(now))
             content = VersionActivity(**side_module)
 
+    banner_bg = await get_banner_img(wiki_home)
+    link_imgs = {}
+    for cont in content.content if content else []:
+        if "http" in cont.contentUrl and cont.contentUrl not in link_imgs:
+            link_imgs[cont.contentUrl] = await pic_download_from_url(
+                CALENDAR_PATH, cont.contentUrl
+            )
+
+    img = await run_render(
+        draw_calendar_card,
+        now,
+        content,
+        gacha_char_list,
+        gacha_weapon_list,
+        banner_bg,
+        link_imgs,
+    )
+    img = await convert_img(img)
+    return img
+
+
+def draw_calendar_card(
+    now: datetime,
+    content: Optional[VersionActivity],
+    gacha_char_list: List[Dict],
+    gacha_weapon_list: List[Dict],
+    banner_bg: Image.Image,
+    link_imgs: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制日历卡片，在渲染线程中执行"""
     title_high = 150
     banner_high = 550
     bar1_high = 60
@@ -128,14 +159,14 @@ async def draw_calendar_img(ev: Event, uid: str):
         total_high += bar1_high
 
     bg = f"bg{random.choice([1, 2])}"
-    img = await get_calendar_bg(1200, total_high, bg)
+    img = get_calendar_bg(1200, total_high, bg)
     # title
     title_img = Image.open(TEXT_PATH / "title.png")
 
     img.paste(title_img, (0, 50), title_img)
 
     # banner
-    await draw_banner(wiki_home, img)
+    draw_banner(banner_bg, img)
 
     _high = title_high + banner_high
     # 卡池title
@@ -256,11 +287,7 @@ async def draw_calendar_img(ev: Event, uid: str):
                 )
 
         if "http" in cont.contentUrl:
-            # linkUrl = Image.open(
-            #     BytesIO((await sget(cont.contentUrl)).content)
-            # ).convert("RGBA")
-            #
-            linkUrl = await pic_download_from_url(CALENDAR_PATH, cont.contentUrl)
+            linkUrl = link_imgs[cont.contentUrl]
 
         else:
             linkUrl = Image.open(TEXT_PATH / cont.contentUrl)
@@ -272,9 +299,7 @@ async def draw_calendar_img(ev: Event, uid: str):
         if i % 2 == 1:
             _high += event_high
 
-    img = add_footer(img)
-    img = await convert_img(img)
-    return img
+    return add_footer(img)
 
 
 async def draw_calendar_gacha(side_module, gacha_type):
@@ -334,7 +359,7 @@ async def draw_calendar_gacha(side_module, gacha_type):
     return res_list
 
 
-async def draw_banner(wiki_home, img):
+async def get_banner_img(wiki_home):
     banners = wiki_home.get("data", {}).get("contentJson", {}).get("banner", [])
     banner_bg = banners[0]["url"]
     for banner in banners:
@@ -347,7 +372,10 @@ async def draw_banner(wiki_home, img):
 
     # banner_bg = Image.open(BytesIO((await sget(banner_bg)).content)).convert("RGBA")
     banner_bg = await pic_download_from_url(CALENDAR_PATH, banner_bg)
+    return banner_bg
+
 
+def draw_banner(banner_bg, img):
     banner_bg = banner_bg.resize((1200, 675))  # type: ignore
     banner_mask = Image.open(TEXT_PATH / "banner_mask.png")
     banner_bg = crop_center_img(banner_bg, banner_mask.size[0], banner_mask.size[1])
@@ -360,7 +388,7 @@ async def draw_banner(wiki_home, img):
     img.paste(banner_frame_img, (0, 150), banner_frame_img)
 
 
-async def get_calendar_bg(w: int, h: int, bg: str = "bg1") -> Image.Image:
+def get_calendar_bg(w: int, h: int, bg: str = "bg1") -> Image.Image:
     img = Image.open(TEXT_PATH / f"{bg}.jpg").convert("RGBA")
     return crop_center_img(img, w, h)
 
@@ -6,13 +6,14 @@ from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
 from gsuid_core.sv import SV
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.at_help import is_valid_at, ruser_id
+from ..utils.char_info_utils import migrate_all_raw_data
 from ..utils.database.models import WavesBind
 from ..utils.error_reply import WAVES_CODE_103
 from ..utils.hint import error_reply
 from ..utils.name_convert import char_name_to_char_id
+from ..utils.render import convert_img
 from ..utils.resource.constant import SPECIAL_CHAR
 from .draw_char_card import draw_char_detail_img, draw_char_score_img
 from .upload_card import (
@@ -42,6 +43,7 @@ waves_char_card_list = SV("waves面板图列表", priority=5, pm=1)
 waves_delete_char_card = SV("waves删除面板图", priority=5, pm=1)
 waves_delete_all_card = SV("waves删除全部面板图", priority=5, pm=1)
 waves_compress_card = SV("waves面板图压缩", priority=5, pm=1)
+waves_migrate_raw_data = SV("waves迁移面板数据", priority=5, pm=1)
 
 waves_upload_mr_char = SV("waves上传体力背景图", priority=5, pm=1)
 waves_mr_char_card_list = SV("waves体力背景图列表", priority=5, pm=1)
@@ -473,6 +475,12 @@ async def delete_all_char_card(bot: Bot, ev: Event):
 async def compress_char_card(bot: Bot, ev: Event):
     await compress_all_custom_card(bot, ev)
 
+@waves_migrate_raw_data.on_fullmatch("迁移面板数据", block=True)
+async def send_migrate_raw_data_msg(bot: Bot, ev: Event):
+    await bot.send("[鸣潮] 开始迁移旧版面板数据, 请稍后...")
+    num = await migrate_all_raw_data()
+    await bot.send(f"[鸣潮] 面板数据迁移完成, 共迁移【{num}】个特征码")
+
 @waves_upload_mr_char.on_regex(r"^上传[\u4e00-\u9fa5]+(体力背景图|mr背景图)$", block=True)
 async def upload_mr_char_img(bot: Bot, ev: Event):
     match = re.search(r"上传(?P<char>[\u4e00-\u9fa5]+)(体力背景图|mr背景图)", ev.raw_text)
@@ -1,14 +1,13 @@
 import copy
 import re
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import httpx
 from PIL import Image, ImageDraw, ImageEnhance
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img, get_qq_avatar
 
 from ..utils import hint
@@ -21,6 +20,7 @@ from ..utils.api.model import (
 from ..utils.api.model_other import EnemyDetailData
 from ..utils.api.wwapi import ONE_RANK_URL, OneRankRequest, OneRankResponse
 from ..utils.ascension.char import get_char_model
+from ..utils.ascension.constant import format_stat
 from ..utils.ascension.template import get_template_data
 from ..utils.ascension.weapon import (
     WavesWeaponResult,
@@ -29,6 +29,7 @@ from ..utils.ascension.weapon import (
     get_weapon_model,
 )
 from ..utils.calc import WuWaCalc
+from ..utils.damage.utils import format_damage
 from ..utils.calculate import (
     calc_phantom_entry,
     calc_phantom_score,
@@ -37,7 +38,7 @@ from ..utils.calculate import (
     get_total_score_bg,
     get_valid_color,
 )
-from ..utils.char_info_utils import get_all_roleid_detail_info
+from ..utils.char_info_utils import get_role_detail_info
 from ..utils.damage.abstract import DamageDetailRegister
 from ..utils.error_reply import WAVES_CODE_102
 from ..utils.fonts.waves_fonts import (
@@ -63,7 +64,7 @@ from ..utils.image import (
     WAVES_SHUXING_MAP,
     WEAPON_RESONLEVEL_COLOR,
     add_footer,
-    change_color,
+    change_color_sync,
     draw_text_with_shadow,
     get_attribute,
     get_attribute_effect,
@@ -78,6 +79,7 @@ from ..utils.image import (
     get_weapon_type,
 )
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import (
     ATTRIBUTE_ID_MAP,
     DEAFAULT_WEAPON_ID,
@@ -200,6 +202,53 @@ def parse_text_and_number(text):
         return text, None
 
 
+def prepare_phantom_calc(calc: WuWaCalc):
+    """计算声骸合计属性和评分模板"""
+    role_detail = calc.role_detail
+    if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
+        calc.phantom_pre = calc.prepare_phantom()
+        calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
+        calc.calc_temp = get_calc_map(
+            calc.phantom_card,
+            role_detail.role.roleName,
+            role_detail.role.roleId,
+        )
+
+
+async def get_phantom_imgs(
+    role_detail: RoleDetailData,
+) -> Tuple[Dict[int, Image.Image], Dict[str, Image.Image]]:
+    """下载声骸图标和合鸣图标，返回 (位置->声骸图标, 合鸣名->合鸣图标)"""
+    phantom_imgs: Dict[int, Image.Image] = {}
+    fetter_imgs: Dict[str, Image.Image] = {}
+    if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
+        return phantom_imgs, fetter_imgs
+
+    for i, _phantom in enumerate(role_detail.phantomData.equipPhantomList):
+        if _phantom and _phantom.phantomProp:
+            phantom_imgs[i] = await get_phantom_img(
+                _phantom.phantomProp.phantomId, _phantom.phantomProp.iconUrl
+            )
+            name = _phantom.fetterDetail.name
+            if name not in fetter_imgs:
+                fetter_imgs[name] = await get_attribute_effect(name)
+    return phantom_imgs, fetter_imgs
+
+
+async def get_prop_imgs(role_detail: RoleDetailData, *names: str):
+    """取得面板上用到的属性图标，返回 属性名->图标"""
+    prop_names = {f"{role_detail.role.attributeName}伤害加成", *names}
+    prop_names.update(name for m in ph_sort_name for name, _ in m)
+    prop_names.update(name for name, _ in card_sort_name)
+    # 占位名，绘制时替换为角色属性的伤害加成
+    prop_names.discard("属性伤害加成")
+    if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
+        for _phantom in role_detail.phantomData.equipPhantomList:
+            if _phantom and _phantom.phantomProp:
+                prop_names.update(p.attributeName for p in _phantom.get_props())
+    return {name: await get_attribute_prop(name) for name in prop_names}
+
+
 async def ph_card_draw(
     ph_sum_value,
     role_detail: RoleDetailData,
@@ -207,6 +256,34 @@ async def ph_card_draw(
     change_command="",
     enemy_detail: Optional[EnemyDetailData] = None,
 ):
+    calc = WuWaCalc(role_detail, enemy_detail)
+    prepare_phantom_calc(calc)
+    phantom_imgs, fetter_imgs = await get_phantom_imgs(role_detail)
+    prop_imgs = await get_prop_imgs(role_detail)
+    phantom_temp = await run_render(
+        draw_ph_card,
+        ph_sum_value,
+        calc,
+        phantom_imgs,
+        fetter_imgs,
+        prop_imgs,
+        is_draw,
+        change_command,
+    )
+    return calc, phantom_temp
+
+
+def draw_ph_card(
+    ph_sum_value,
+    calc: WuWaCalc,
+    phantom_imgs: Dict[int, Image.Image],
+    fetter_imgs: Dict[str, Image.Image],
+    prop_imgs: Dict[str, Image.Image],
+    is_draw=True,
+    change_command="",
+) -> Image.Image:
+    """绘制声骸部分，在渲染线程中执行"""
+    role_detail = calc.role_detail
     char_name = role_detail.role.roleName
 
     phantom_temp = Image.new("RGBA", (1200, 1280 + ph_sum_value))
@@ -216,19 +293,10 @@ async def ph_card_draw(
     ph_0 = Image.open(TEXT_PATH / "ph_0.png")
     ph_1 = Image.open(TEXT_PATH / "ph_1.png")
     #  phantom_sum_value = {}
-    calc = WuWaCalc(role_detail, enemy_detail)
     if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
         equipPhantomList = role_detail.phantomData.equipPhantomList
         phantom_score = 0
 
-        calc.phantom_pre = calc.prepare_phantom()
-        calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-        calc.calc_temp = get_calc_map(
-            calc.phantom_card,
-            role_detail.role.roleName,
-            role_detail.role.roleId,
-        )
-
         for i, _phantom in enumerate(equipPhantomList):
             sh_temp = Image.new("RGBA", (350, 550))
             sh_temp_draw = ImageDraw.Draw(sh_temp)
@@ -245,10 +313,8 @@ async def ph_card_draw(
 
                 sh_temp.alpha_composite(sh_title, dest=(0, 0))
 
-                phantom_icon = await get_phantom_img(
-                    _phantom.phantomProp.phantomId, _phantom.phantomProp.iconUrl
-                )
-                fetter_icon = await get_attribute_effect(_phantom.fetterDetail.name)
+                phantom_icon = phantom_imgs[i]
+                fetter_icon = fetter_imgs[_phantom.fetterDetail.name]
                 fetter_icon = fetter_icon.resize((50, 50))
                 phantom_icon.alpha_composite(fetter_icon, dest=(205, 0))
                 phantom_icon = phantom_icon.resize((100, 100))
@@ -292,7 +358,7 @@ async def ph_card_draw(
 
                 for index, _prop in enumerate(props):
                     oset = 55
-                    prop_img = await get_attribute_prop(_prop.attributeName)
+                    prop_img = prop_imgs[_prop.attributeName]
                     prop_img = prop_img.resize((40, 40))
                     sh_temp.alpha_composite(prop_img, (15, 167 + index * oset))
                     sh_temp_draw = ImageDraw.Draw(sh_temp)
@@ -356,13 +422,17 @@ async def ph_card_draw(
             for ni, name_default in enumerate(m):
                 name, default_value = name_default
                 if name == "属性伤害加成":
-                    value = calc.phantom_card.get(shuxing, default_value)
-                    prop_img = await get_attribute_prop(shuxing)
+                    value = format_stat(
+                        shuxing, calc.phantom_card.get(shuxing, default_value)
+                    )
+                    prop_img = prop_imgs[shuxing]
                     name_color, _ = get_valid_color(shuxing, value, calc.calc_temp)
                     name = shuxing
                 else:
-                    value = calc.phantom_card.get(name, default_value)
-                    prop_img = await get_attribute_prop(name)
+                    value = format_stat(
+                        name, calc.phantom_card.get(name, default_value)
+                    )
+                    prop_img = prop_imgs[name]
                     name_color, _ = get_valid_color(name, value, calc.calc_temp)
                 prop_img = prop_img.resize((40, 40))
                 ph_bg = ph_0.copy() if ni % 2 == 0 else ph_1.copy()
@@ -393,7 +463,7 @@ async def ph_card_draw(
             )
 
     # img.paste(phantom_temp, (0, 1320 + jineng_len), phantom_temp)
-    return calc, phantom_temp
+    return phantom_temp
 
 
 async def get_role_need(
@@ -443,20 +513,13 @@ async def get_role_need(
             )
     else:
         avatar = await draw_pic_with_ring(ev, is_force_avatar, force_resource_id)
-        all_role_detail: Optional[Dict[str, RoleDetailData]] = (
-            await get_all_roleid_detail_info(uid)
-        )
-
         if char_id in SPECIAL_CHAR:
             query_list = SPECIAL_CHAR.copy()[char_id]
         else:
             query_list = [char_id]
 
-        for temp_char_id in query_list:
-            if all_role_detail and temp_char_id in all_role_detail:
-                role_detail: RoleDetailData = all_role_detail[temp_char_id]
-                break
-        else:
+        role_detail = await get_role_detail_info(uid, query_list)
+        if not role_detail:
             if is_limit_query:
                 return (
                     None,
@@ -480,7 +543,17 @@ async def get_role_need(
     return avatar, role_detail
 
 
-async def draw_fixed_img(img, avatar, account_info, role_detail):
+async def get_fixed_imgs(role_detail: RoleDetailData):
+    """取得`draw_fixed_img`用到的立绘、属性和武器类型图标"""
+    is_custom, role_pile = await get_role_pile(role_detail.role.roleId, True)
+    role_attribute = await get_attribute(role_detail.role.attributeName)
+    weapon_type = await get_weapon_type(role_detail.role.weaponTypeName)
+    return is_custom, role_pile, role_attribute, weapon_type
+
+
+def draw_fixed_img(img, avatar, account_info, role_detail, fixed_imgs):
+    """绘制头像、账号信息和左侧立绘，在渲染线程中执行"""
+    is_custom, role_pile, role_attribute, weapon_type = fixed_imgs
     # 头像部分
     avatar_ring = Image.open(TEXT_PATH / "avatar_ring.png")
 
@@ -516,14 +589,11 @@ async def draw_fixed_img(img, avatar, account_info, role_detail):
         img.paste(title_bar, (200, 15), title_bar)
 
     # 左侧pile部分
-    is_custom, role_pile = await get_role_pile(role_detail.role.roleId, True)
     char_mask = Image.open(TEXT_PATH / "char_mask.png")
     char_fg = Image.open(TEXT_PATH / "char_fg.png")
 
-    role_attribute = await get_attribute(role_detail.role.attributeName)
     role_attribute = role_attribute.resize((50, 50)).convert("RGBA")
     char_fg.paste(role_attribute, (434, 112), role_attribute)
-    weapon_type = await get_weapon_type(role_detail.role.weaponTypeName)
     weapon_type = weapon_type.resize((40, 40)).convert("RGBA")
     char_fg.paste(weapon_type, (439, 182), weapon_type)
 
@@ -697,10 +767,11 @@ async def draw_char_detail_img(
     oneRank: Optional[OneRankResponse] = None
     enemy_detail: Optional[EnemyDetailData] = EnemyDetailData()
     if change_list_regex:
-        temp = copy.deepcopy(role_detail)
+        # 面板数据可能来自缓存，修改前先复制
+        temp = role_detail
         try:
             role_detail, change_command = await change_role_detail(
-                uid, ck, role_detail, enemy_detail, change_list_regex
+                uid, ck, copy.deepcopy(role_detail), enemy_detail, change_list_regex
             )
         except Exception as e:
             logger.exception("角色数据转换错误", e)
@@ -720,7 +791,9 @@ async def draw_char_detail_img(
     )
     calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
 
-    damage_calc_img = None
+    # 单项伤害 (伤害类型, 暴击伤害, 期望伤害) 和buff列表
+    damage_calc_result = None
+    damage_calc_effect = []
     if (
         damage_calc
         and damageDetail
@@ -738,7 +811,113 @@ async def draw_char_detail_img(
         logger.debug(f"{char_name}-{damage_title} 期望伤害: {expected_damage}")
         logger.debug(f"{char_name}-{damage_title} 属性值: {damageAttributeTemp}")
 
-        damage_high = 100 + (len(damageAttributeTemp.effect) + 3) * 60
+        damage_calc_result = (damage_title, crit_damage, expected_damage)
+        damage_calc_effect = damageAttributeTemp.effect
+        dd_len += 100 + (len(damage_calc_effect) + 3) * 60
+
+    # 伤害列表 [(伤害类型, 暴击伤害, 期望伤害)]
+    damage_list = []
+    if (
+        isDraw
+        and damageDetail
+        and role_detail.phantomData
+        and role_detail.phantomData.equipPhantomList
+    ):
+        # damageAttribute = card_sort_map_to_attribute(card_map)
+        calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
+        for damage_temp in damageDetail:
+            damage_title = damage_temp["title"]
+            damageAttributeTemp = copy.deepcopy(calc.damageAttribute)
+            crit_damage, expected_damage = damage_temp["func"](
+                damageAttributeTemp, role_detail
+            )
+            logger.debug(f"{char_name}-{damage_title} 暴击伤害: {crit_damage}")
+            logger.debug(f"{char_name}-{damage_title} 期望伤害: {expected_damage}")
+            logger.debug(f"{char_name}-{damage_title} 属性值: {damageAttributeTemp}")
+            damage_list.append((damage_title, crit_damage, expected_damage))
+
+    weaponData: WeaponData = role_detail.weaponData
+    weapon_detail: WavesWeaponResult = get_weapon_detail(
+        weaponData.weapon.weaponId,
+        weaponData.level,
+        weaponData.breach,
+        weaponData.resonLevel,
+    )
+    weapon_icon = await get_square_weapon(weaponData.weapon.weaponId)
+    prop_imgs = await get_prop_imgs(
+        role_detail, weapon_detail.stats[0]["name"], weapon_detail.stats[1]["name"]
+    )
+    chain_imgs = [
+        await get_chain_img(role_detail.role.roleId, _mz.order, _mz.iconUrl)  # type: ignore
+        for _mz in role_detail.chainList
+    ]
+    skill_imgs = [
+        (
+            _skill,
+            await get_skill_img(
+                role_detail.role.roleId, _skill.skill.name, _skill.skill.iconUrl
+            ),
+        )
+        for _skill in role_detail.get_skill_list()
+        if _skill.skill.type != "延奏技能"
+    ]
+    fixed_imgs = await get_fixed_imgs(role_detail)
+
+    # 创建背景
+    img = await get_card_bg(
+        1200, 1250 + echo_list + ph_sum_value + jineng_len + dd_len, "bg3"
+    )
+    img = await run_render(
+        draw_char_detail,
+        img,
+        avatar,
+        account_info,
+        role_detail,
+        calc,
+        phantom_temp,
+        damage_calc_result,
+        damage_calc_effect,
+        damage_list,
+        oneRank,
+        weapon_detail,
+        weapon_icon,
+        prop_imgs,
+        chain_imgs,
+        skill_imgs,
+        fixed_imgs,
+        ph_sum_value,
+        jineng_len,
+    )
+    if need_convert_img:
+        img = await convert_img(img)
+    return img
+
+
+def draw_char_detail(
+    img: Image.Image,
+    avatar: Image.Image,
+    account_info: AccountBaseInfo,
+    role_detail: RoleDetailData,
+    calc: WuWaCalc,
+    phantom_temp: Image.Image,
+    damage_calc_result,
+    damage_calc_effect,
+    damage_list,
+    oneRank: Optional[OneRankResponse],
+    weapon_detail: WavesWeaponResult,
+    weapon_icon: Image.Image,
+    prop_imgs: Dict[str, Image.Image],
+    chain_imgs,
+    skill_imgs,
+    fixed_imgs,
+    ph_sum_value: int,
+    jineng_len: int,
+) -> Image.Image:
+    """绘制角色面板，在渲染线程中执行"""
+    damage_calc_img = None
+    if damage_calc_result:
+        damage_title, crit_damage, expected_damage = damage_calc_result
+        damage_high = 100 + (len(damage_calc_effect) + 3) * 60
         damage_calc_img = Image.new("RGBA", (1200, damage_high))
 
         damage_title_bg = damage_bar1.copy()
@@ -757,16 +936,20 @@ async def draw_char_detail_img(
         damage_bar = damage_bar2.copy()
         damage_bar_draw = ImageDraw.Draw(damage_bar)
         damage_bar_draw.text((400, 50), f"{damage_title}", "white", waves_font_24, "rm")
-        if crit_damage and expected_damage:
+        if crit_damage is not None and expected_damage is not None:
             damage_bar_draw.text(
-                (700, 50), f"{crit_damage}", "white", waves_font_24, "mm"
+                (700, 50), format_damage(crit_damage), "white", waves_font_24, "mm"
             )
             damage_bar_draw.text(
-                (1000, 50), f"{expected_damage}", "white", waves_font_24, "mm"
+                (1000, 50),
+                format_damage(expected_damage),
+                "white",
+                waves_font_24,
+                "mm",
             )
         else:
             damage_bar_draw.text(
-                (850, 50), f"{expected_damage}", "white", waves_font_24, "mm"
+                (850, 50), format_damage(expected_damage), "white", waves_font_24, "mm"
             )
         damage_calc_img.alpha_composite(damage_bar, dest=(0, 70))
 
@@ -775,7 +958,7 @@ async def draw_char_detail_img(
         damage_title_bg_draw.text((600, 50), "buff列表", "white", waves_font_24, "mm")
         damage_calc_img.alpha_composite(damage_title_bg, dest=(0, 130))
 
-        for dindex, effect in enumerate(damageAttributeTemp.effect):
+        for dindex, effect in enumerate(damage_calc_effect):
             buff_name = effect.element_msg
             buff_value = effect.element_value
             damage_bar = damage_bar2.copy() if dindex % 2 == 0 else damage_bar1.copy()
@@ -790,14 +973,8 @@ async def draw_char_detail_img(
                 damage_bar, dest=(0, 10 + (dindex + 3) * 60)
             )
 
-        dd_len += damage_calc_img.size[1]
-
-    # 创建背景
-    img = await get_card_bg(
-        1200, 1250 + echo_list + ph_sum_value + jineng_len + dd_len, "bg3"
-    )
     # 固定位置
-    await draw_fixed_img(img, avatar, account_info, role_detail)
+    draw_fixed_img(img, avatar, account_info, role_detail, fixed_imgs)
 
     # 声骸
     img.paste(phantom_temp, (0, 1320 + jineng_len), phantom_temp)
@@ -821,7 +998,6 @@ async def draw_char_detail_img(
 
     weaponData: WeaponData = role_detail.weaponData
 
-    weapon_icon = await get_square_weapon(weaponData.weapon.weaponId)
     weapon_icon = crop_center_img(weapon_icon, 110, 110)
     weapon_icon_bg = get_weapon_icon_bg(weaponData.weapon.weaponStarLevel)
     weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
@@ -852,13 +1028,7 @@ async def draw_char_detail_img(
 
     weapon_bg_temp.alpha_composite(weapon_icon_bg, dest=(45, 0))
 
-    weapon_detail: WavesWeaponResult = get_weapon_detail(
-        weaponData.weapon.weaponId,
-        weaponData.level,
-        weaponData.breach,
-        weaponData.resonLevel,
-    )
-    stats_main = await get_attribute_prop(weapon_detail.stats[0]["name"])
+    stats_main = prop_imgs[weapon_detail.stats[0]["name"]]
     stats_main = stats_main.resize((40, 40))
     weapon_bg_temp.alpha_composite(stats_main, (65, 187))
     weapon_bg_temp_draw.text(
@@ -867,7 +1037,7 @@ async def draw_char_detail_img(
     weapon_bg_temp_draw.text(
         (500, 207), f"{weapon_detail.stats[0]['value']}", "white", waves_font_30, "rm"
     )
-    stats_sub = await get_attribute_prop(weapon_detail.stats[1]["name"])
+    stats_sub = prop_imgs[weapon_detail.stats[1]["name"]]
     stats_sub = stats_sub.resize((40, 40))
     weapon_bg_temp.alpha_composite(stats_sub, (65, 237))
     weapon_bg_temp_draw.text(
@@ -883,16 +1053,15 @@ async def draw_char_detail_img(
     mz_temp = Image.new("RGBA", (1200, 300))
 
     shuxing_color = WAVES_SHUXING_MAP[role_detail.role.attributeName]  # type: ignore
-    for i, _mz in enumerate(role_detail.chainList):
+    for i, (_mz, chain) in enumerate(zip(role_detail.chainList, chain_imgs)):
         mz_bg = Image.open(TEXT_PATH / "mz_bg.png")
         mz_bg_temp = Image.new("RGBA", mz_bg.size)
         mz_bg_temp_draw = ImageDraw.Draw(mz_bg_temp)
-        chain = await get_chain_img(role_detail.role.roleId, _mz.order, _mz.iconUrl)  # type: ignore
         chain = chain.resize((100, 100))
         mz_bg.paste(chain, (95, 75), chain)
         mz_bg_temp.alpha_composite(mz_bg, dest=(0, 0))
         if _mz.unlocked:
-            mz_bg_temp = await change_color(mz_bg_temp, shuxing_color)
+            mz_bg_temp = change_color_sync(mz_bg_temp, shuxing_color)
 
         name = re.sub(r'[",，]+', "", _mz.name) if _mz.name else ""
         if len(name) >= 8:
@@ -906,14 +1075,7 @@ async def draw_char_detail_img(
 
     img.paste(mz_temp, (0, 1080 + jineng_len), mz_temp)
 
-    if (
-        isDraw
-        and damageDetail
-        and role_detail.phantomData
-        and role_detail.phantomData.equipPhantomList
-    ):
-        # damageAttribute = card_sort_map_to_attribute(card_map)
-        calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
+    if damage_list:
         damage_title_bg = damage_bar1.copy()
         damage_title_bg_draw = ImageDraw.Draw(damage_title_bg)
         damage_title_bg_draw.text(
@@ -926,31 +1088,32 @@ async def draw_char_detail_img(
             (1000, 50), "期望伤害", SPECIAL_GOLD, waves_font_24, "mm"
         )
         img.alpha_composite(damage_title_bg, dest=(0, 2600 + ph_sum_value + jineng_len))
-        for dindex, damage_temp in enumerate(damageDetail):
-            damage_title = damage_temp["title"]
-            damageAttributeTemp = copy.deepcopy(calc.damageAttribute)
-            crit_damage, expected_damage = damage_temp["func"](
-                damageAttributeTemp, role_detail
-            )
-            logger.debug(f"{char_name}-{damage_title} 暴击伤害: {crit_damage}")
-            logger.debug(f"{char_name}-{damage_title} 期望伤害: {expected_damage}")
-            logger.debug(f"{char_name}-{damage_title} 属性值: {damageAttributeTemp}")
-
+        for dindex, (damage_title, crit_damage, expected_damage) in enumerate(
+            damage_list
+        ):
             damage_bar = damage_bar2.copy() if dindex % 2 == 0 else damage_bar1.copy()
             damage_bar_draw = ImageDraw.Draw(damage_bar)
             damage_bar_draw.text(
                 (400, 50), f"{damage_title}", "white", waves_font_24, "rm"
             )
-            if crit_damage and expected_damage:
+            if crit_damage is not None and expected_damage is not None:
                 damage_bar_draw.text(
-                    (700, 50), f"{crit_damage}", "white", waves_font_24, "mm"
+                    (700, 50), format_damage(crit_damage), "white", waves_font_24, "mm"
                 )
                 damage_bar_draw.text(
-                    (1000, 50), f"{expected_damage}", "white", waves_font_24, "mm"
+                    (1000, 50),
+                    format_damage(expected_damage),
+                    "white",
+                    waves_font_24,
+                    "mm",
                 )
             else:
                 damage_bar_draw.text(
-                    (850, 50), f"{expected_damage}", "white", waves_font_24, "mm"
+                    (850, 50),
+                    format_damage(expected_damage),
+                    "white",
+                    waves_font_24,
+                    "mm",
                 )
             img.alpha_composite(
                 damage_bar,
@@ -1013,13 +1176,13 @@ async def draw_char_detail_img(
     for index, name_default in enumerate(card_sort_name):
         name, default_value = name_default
         if name == "属性伤害加成":
-            value = calc.role_card.get(shuxing, default_value)
-            prop_img = await get_attribute_prop(shuxing)
+            value = format_stat(shuxing, calc.role_card.get(shuxing, default_value))
+            prop_img = prop_imgs[shuxing]
             name_color, _ = get_valid_color(shuxing, value, calc.calc_temp)
             name = shuxing
         else:
-            value = calc.role_card.get(name, default_value)
-            prop_img = await get_attribute_prop(name)
+            value = format_stat(name, calc.role_card.get(name, default_value))
+            prop_img = prop_imgs[name]
             name_color, _ = get_valid_color(name, value, calc.calc_temp)
 
         prop_img = prop_img.resize((40, 40))
@@ -1039,14 +1202,8 @@ async def draw_char_detail_img(
     skill_bg_1 = Image.open(TEXT_PATH / "skill_bg.png")
 
     temp_i = 0
-    for _, _skill in enumerate(role_detail.get_skill_list()):
-        if _skill.skill.type == "延奏技能":
-            continue
+    for _skill, skill_img in skill_imgs:
         skill_bg = skill_bg_1.copy()
-        # logger.debug(f"{char_name}-{_skill.skill.name}")
-        skill_img = await get_skill_img(
-            role_detail.role.roleId, _skill.skill.name, _skill.skill.iconUrl
-        )
         skill_img = skill_img.resize((70, 70))
         skill_bg.paste(skill_img, (57, 65), skill_img)
 
@@ -1067,10 +1224,7 @@ async def draw_char_detail_img(
         temp_i += 1
     img.alpha_composite(skill_bar, dest=(0, 1150))
 
-    img = add_footer(img)
-    if need_convert_img:
-        img = await convert_img(img)
-    return img
+    return add_footer(img)
 
 
 async def draw_char_score_img(
@@ -1100,10 +1254,43 @@ async def draw_char_score_img(
     if isinstance(role_detail, str):
         return role_detail
 
+    calc: WuWaCalc = WuWaCalc(role_detail)
+    prepare_phantom_calc(calc)
+    phantom_imgs, fetter_imgs = await get_phantom_imgs(role_detail)
+    prop_imgs = await get_prop_imgs(role_detail)
+    fixed_imgs = await get_fixed_imgs(role_detail)
+
     # 创建背景
     img = await get_card_bg(1200, 3380, "bg3")
+    img = await run_render(
+        draw_char_score,
+        img,
+        avatar,
+        account_info,
+        calc,
+        phantom_imgs,
+        fetter_imgs,
+        prop_imgs,
+        fixed_imgs,
+    )
+    img = await convert_img(img)
+    return img
+
+
+def draw_char_score(
+    img: Image.Image,
+    avatar: Image.Image,
+    account_info: AccountBaseInfo,
+    calc: WuWaCalc,
+    phantom_imgs: Dict[int, Image.Image],
+    fetter_imgs: Dict[str, Image.Image],
+    prop_imgs: Dict[str, Image.Image],
+    fixed_imgs,
+) -> Image.Image:
+    """绘制声骸评分面板，在渲染线程中执行"""
+    role_detail = calc.role_detail
     # 固定位置
-    await draw_fixed_img(img, avatar, account_info, role_detail)
+    draw_fixed_img(img, avatar, account_info, role_detail, fixed_imgs)
 
     # 声骸属性
     char_id = role_detail.role.roleId
@@ -1116,19 +1303,10 @@ async def draw_char_score_img(
     ph_0 = Image.open(TEXT_PATH / "ph_0.png")
     ph_1 = Image.open(TEXT_PATH / "ph_1.png")
     # phantom_sum_value = {}
-    calc: WuWaCalc = WuWaCalc(role_detail)
     if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
         equipPhantomList = role_detail.phantomData.equipPhantomList
         phantom_score = 0
 
-        calc.phantom_pre = calc.prepare_phantom()
-        calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-        calc.calc_temp = get_calc_map(
-            calc.phantom_card,
-            role_detail.role.roleName,
-            role_detail.role.roleId,
-        )
-
         for i, _phantom in enumerate(equipPhantomList):
             sh_temp = Image.new("RGBA", (600, 1100))
             sh_temp_draw = ImageDraw.Draw(sh_temp)
@@ -1145,10 +1323,8 @@ async def draw_char_score_img(
 
                 sh_temp.alpha_composite(sh_title, dest=(0, 0))
 
-                phantom_icon = await get_phantom_img(
-                    _phantom.phantomProp.phantomId, _phantom.phantomProp.iconUrl
-                )
-                fetter_icon = await get_attribute_effect(_phantom.fetterDetail.name)
+                phantom_icon = phantom_imgs[i]
+                fetter_icon = fetter_imgs[_phantom.fetterDetail.name]
                 fetter_icon = fetter_icon.resize((50, 50))
                 phantom_icon.alpha_composite(fetter_icon, dest=(205, 0))
                 phantom_icon = phantom_icon.resize((100, 100))
@@ -1192,7 +1368,7 @@ async def draw_char_score_img(
 
                 for index, _prop in enumerate(props):
                     oset = 55
-                    prop_img = await get_attribute_prop(_prop.attributeName)
+                    prop_img = prop_imgs[_prop.attributeName]
                     prop_img = prop_img.resize((40, 40))
                     # sh_temp.alpha_composite(prop_img, (15, 167 + index * oset))
                     sh_temp_draw = ImageDraw.Draw(sh_temp)
@@ -1278,13 +1454,17 @@ async def draw_char_score_img(
             for ni, name_default in enumerate(m):
                 name, default_value = name_default
                 if name == "属性伤害加成":
-                    value = calc.phantom_card.get(shuxing, default_value)
-                    prop_img = await get_attribute_prop(shuxing)
+                    value = format_stat(
+                        shuxing, calc.phantom_card.get(shuxing, default_value)
+                    )
+                    prop_img = prop_imgs[shuxing]
                     name_color, _ = get_valid_color(shuxing, value, calc.calc_temp)
                     name = shuxing
                 else:
-                    value = calc.phantom_card.get(name, default_value)
-                    prop_img = await get_attribute_prop(name)
+                    value = format_stat(
+                        name, calc.phantom_card.get(name, default_value)
+                    )
+                    prop_img = prop_imgs[name]
                     name_color, _ = get_valid_color(name, value, calc.calc_temp)
                 prop_img = prop_img.resize((40, 40))
                 ph_bg = ph_0.copy() if ni % 2 == 0 else ph_1.copy()
@@ -1347,7 +1527,7 @@ async def draw_char_score_img(
                 entry_list.append(value)
             weight_list_temp[i] = ",".join(entry_list)
 
-        await draw_weight(
+        draw_weight(
             introduce_temp, role_detail.role.roleName, weight_list_temp, calc.calc_temp
         )
 
@@ -1357,12 +1537,10 @@ async def draw_char_score_img(
     img.paste(right_image_temp, (605, 225), right_image_temp)
     img.alpha_composite(introduce_temp, (0, 2400))
 
-    img = add_footer(img)
-    img = await convert_img(img)
-    return img
+    return add_footer(img)
 
 
-async def draw_weight(image, role_name, weight_list_temp, calc_temp):
+def draw_weight(image, role_name, weight_list_temp, calc_temp):
     draw = ImageDraw.Draw(image)
     draw.rectangle([10, 10, 1490, 870], fill=(0, 0, 0, int(0.7 * 255)))
 
@@ -1539,10 +1717,10 @@ async def get_card_bg(
         bg_path = Path(ShowConfig.get_config("CardBgPath").data)
         if bg_path.exists():
             img = Image.open(bg_path).convert("RGBA")
-            img = crop_center_img(img, w, h)
+            img = await run_render(crop_center_img, img, w, h)
 
     if not img:
-        img = get_waves_bg(w, h, bg)
+        img = await run_render(get_waves_bg, w, h, bg)
 
     img = await get_custom_gaussian_blur(img)
     return img
@@ -1,12 +1,11 @@
 import time
 from pathlib import Path
-from typing import List, Union
+from typing import Dict, List, Tuple, Union
 
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
 
 from gsuid_core.bot import Bot
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.api.model import AccountBaseInfo, RoleDetailData
@@ -38,6 +37,7 @@ from ..utils.image import (
 )
 from ..utils.imagetool import draw_pic_with_ring
 from ..utils.refresh_char_detail import refresh_char
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import NAME_ALIAS, SPECIAL_CHAR_NAME
 from ..utils.util import async_func_lock
 from ..utils.waves_api import waves_api
@@ -91,8 +91,7 @@ def get_refresh_interval_notify(time_stamp: int):
         return "请等待{0}s后尝试刷新面板！".format(time_stamp)
 
 
-async def get_refresh_role_img(width: int, height: int):
-    path = await get_random_share_bg_path()
+def _draw_refresh_role_img(path: Path, width: int, height: int):
     img = Image.open(path).convert("RGBA")
     if path.name in refresh_role_map:
         img = img.crop(refresh_role_map[path.name])
@@ -163,10 +162,83 @@ async def draw_refresh_char_detail_img(
         for r in waves_map[key].values()
     ]
 
-    # 总角色个数
-    role_len = len(role_detail_list)
     # 刷新个数
     role_update = len(waves_map["refresh_update"])
+
+    waves_char_rank = await get_waves_char_rank(uid, role_detail_list)
+
+    map_update = []
+    map_unchanged = []
+    for _, char_rank in enumerate(waves_char_rank):
+        isUpdate = True if char_rank.roleId in waves_map["refresh_update"] else False
+        if isUpdate:
+            map_update.append(char_rank)
+        else:
+            map_unchanged.append(char_rank)
+
+    map_update.sort(key=lambda x: x.score if x.score else 0, reverse=True)
+    map_unchanged.sort(key=lambda x: x.score if x.score else 0, reverse=True)
+
+    rIndex = 0
+    for char_rank in map_update:
+        rIndex += 1
+        if rIndex <= 5:
+            name = SPECIAL_CHAR_NAME.get(str(char_rank.roleId), char_rank.roleName)
+            b = WavesButton(name, f"{name}面板")  # type: ignore
+            buttons.append(b)
+
+    for char_rank in map_unchanged:
+        rIndex += 1
+
+        if len(map_update) == 0 and rIndex <= 5:
+            name = SPECIAL_CHAR_NAME.get(str(char_rank.roleId), char_rank.roleName)
+            b = WavesButton(name, f"{name}面板")  # type: ignore
+            buttons.append(b)
+
+    buttons.append(WavesButton("练度统计", "练度统计"))
+
+    bg_path = await get_random_share_bg_path()
+    avatars = {}
+    for char_rank in waves_char_rank:
+        avatars[char_rank.roleId] = (
+            await get_square_avatar(char_rank.roleId),
+            await get_star_bg(char_rank.starLevel),
+        )
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+
+    img = await run_render(
+        draw_refresh_char_card,
+        bg_path,
+        account_info,
+        role_detail_list,
+        role_update,
+        map_update,
+        map_unchanged,
+        avatars,
+        avatar,
+        avatar_ring,
+        self_ck,
+    )
+    img = await convert_img(img)
+    set_cache_refresh_card(user_id, uid)
+    return img
+
+
+def draw_refresh_char_card(
+    bg_path: Path,
+    account_info: AccountBaseInfo,
+    role_detail_list: List[RoleDetailData],
+    role_update: int,
+    map_update: List[WavesCharRank],
+    map_unchanged: List[WavesCharRank],
+    avatars: Dict[int, Tuple[Image.Image, Image.Image]],
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    self_ck: bool,
+) -> Image.Image:
+    """绘制刷新面板结果，在渲染线程中执行"""
+    # 总角色个数
+    role_len = len(role_detail_list)
     shadow_title = "刷新成功!"
     shadow_color = GOLD
     if role_update == 0:
@@ -178,7 +250,7 @@ async def draw_refresh_char_detail_img(
     width = 2000
     # img = get_waves_bg(width, height, "bg3")
     img = Image.new("RGBA", (width, height))
-    img.alpha_composite(await get_refresh_role_img(width, height), (0, 0))
+    img.alpha_composite(_draw_refresh_role_img(bg_path, width, height), (0, 0))
 
     # 提示文案
     title = f"共刷新{role_update}个角色，可以使用"
@@ -204,42 +276,17 @@ async def draw_refresh_char_detail_img(
     )
     img.alpha_composite(info_block, (500, 400))
 
-    waves_char_rank = await get_waves_char_rank(uid, role_detail_list)
-
-    map_update = []
-    map_unchanged = []
-    for _, char_rank in enumerate(waves_char_rank):
-        isUpdate = True if char_rank.roleId in waves_map["refresh_update"] else False
-        if isUpdate:
-            map_update.append(char_rank)
-        else:
-            map_unchanged.append(char_rank)
-
-    map_update.sort(key=lambda x: x.score if x.score else 0, reverse=True)
-    map_unchanged.sort(key=lambda x: x.score if x.score else 0, reverse=True)
-
     rIndex = 0
     for char_rank in map_update:
-        pic = await draw_pic(char_rank, True)  # type: ignore
+        pic = draw_pic(char_rank, avatars[char_rank.roleId], True)
         img.alpha_composite(pic, (80 + 300 * (rIndex % 6), 470 + (rIndex // 6) * 330))
         rIndex += 1
-        if rIndex <= 5:
-            name = SPECIAL_CHAR_NAME.get(str(char_rank.roleId), char_rank.roleName)
-            b = WavesButton(name, f"{name}面板")  # type: ignore
-            buttons.append(b)
 
     for char_rank in map_unchanged:
-        pic = await draw_pic(char_rank, False)  # type: ignore
+        pic = draw_pic(char_rank, avatars[char_rank.roleId], False)
         img.alpha_composite(pic, (80 + 300 * (rIndex % 6), 470 + (rIndex // 6) * 330))
         rIndex += 1
 
-        if len(map_update) == 0 and rIndex <= 5:
-            name = SPECIAL_CHAR_NAME.get(str(char_rank.roleId), char_rank.roleName)
-            b = WavesButton(name, f"{name}面板")  # type: ignore
-            buttons.append(b)
-
-    buttons.append(WavesButton("练度统计", "练度统计"))
-
     # 基础信息 名字 特征码
     base_info_bg = Image.open(TEXT_PATH / "base_info_bg.png")
     base_info_draw = ImageDraw.Draw(base_info_bg)
@@ -252,7 +299,6 @@ async def draw_refresh_char_detail_img(
     img.paste(base_info_bg, (15, 20), base_info_bg)
 
     # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     img.paste(avatar, (25, 70), avatar)
     img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -300,19 +346,17 @@ async def draw_refresh_char_detail_img(
         refresh_bar.alpha_composite(refresh_no.resize((60, 60)), (1800, -8))
 
     img.paste(refresh_bar, (0, 300), refresh_bar)
-    img = add_footer(img)
-    img = await convert_img(img)
-    set_cache_refresh_card(user_id, uid)
-    return img
+    return add_footer(img)
 
 
-async def draw_pic(char_rank: WavesCharRank, isUpdate=False):
-    pic = await get_square_avatar(char_rank.roleId)
+def draw_pic(
+    char_rank: WavesCharRank, pics: Tuple[Image.Image, Image.Image], isUpdate=False
+):
+    pic, star_bg = pics
     resize_pic = pic.resize((200, 200))
     img = refresh_char_bg.copy()
     img_draw = ImageDraw.Draw(img)
     img.alpha_composite(resize_pic, (50, 50))
-    star_bg = await get_star_bg(char_rank.starLevel)
     star_bg = star_bg.resize((220, 220))
     img.alpha_composite(star_bg, (40, 30))
 
@@ -42,6 +42,9 @@ async def get_remote_role_detail_info(
             (role for role in gen_temp if str(role.role.roleId) in find_char_id),
             None,
         )
+        # 缓存中的面板数据为共享对象，换声骸会修改它
+        if role_detail_info:
+            role_detail_info = role_detail_info.model_copy(deep=True)
 
     if not role_detail_info:
         for char_id in find_char_id:
@@ -13,10 +13,10 @@ from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
 from gsuid_core.utils.download_resource.download_file import download
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.image import compress_to_webp
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
+from ..utils.render import convert_img
 from ..utils.resource.constant import SPECIAL_CHAR, SPECIAL_CHAR_ID
 from ..utils.resource.RESOURCE_PATH import CUSTOM_CARD_PATH
 
@@ -1,10 +1,9 @@
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Tuple, Union
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.api.model import AccountBaseInfo, RoleDetailData, WeaponData
@@ -41,6 +40,7 @@ from ..utils.image import (
     get_waves_bg,
 )
 from ..utils.refresh_char_detail import refresh_char
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import NORMAL_LIST
 from ..utils.resource.download_file import get_skill_img
 from ..utils.waves_api import waves_api
@@ -119,6 +119,56 @@ async def draw_char_list_img(
         key=lambda i: (i.score, i.starLevel, i.level, i.chain, i.roleId), reverse=True
     )
 
+    avatar = await draw_pic_with_ring(ev, is_peek)
+    role_avatars = {}
+    attr_imgs = {}
+    skill_imgs = {}
+    weapon_imgs = {}
+    for _rank in waves_char_rank:
+        role_detail: RoleDetailData = all_role_detail[_rank.roleId]
+        role_id = role_detail.role.roleId
+        role_avatars[role_id] = await draw_pic(role_id)
+        attribute_name = role_detail.role.attributeName
+        if attribute_name not in attr_imgs:
+            attr_imgs[attribute_name] = await get_attribute(
+                attribute_name, is_simple=True  # type: ignore
+            )
+        for _skill in role_detail.get_skill_list():
+            if _skill.skill.type == "延奏技能":
+                continue
+            skill_imgs[(role_id, _skill.skill.name)] = await get_skill_img(
+                role_id, _skill.skill.name, _skill.skill.iconUrl
+            )
+        weapon_id = role_detail.weaponData.weapon.weaponId
+        if weapon_id not in weapon_imgs:
+            weapon_imgs[weapon_id] = await get_square_weapon(weapon_id)
+
+    card_img = await run_render(
+        draw_char_list_card,
+        account_info,
+        all_role_detail,
+        waves_char_rank,
+        avatar,
+        role_avatars,
+        attr_imgs,
+        skill_imgs,
+        weapon_imgs,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_char_list_card(
+    account_info: AccountBaseInfo,
+    all_role_detail: Dict[int, RoleDetailData],
+    waves_char_rank: List[WavesCharRank],
+    avatar: Image.Image,
+    role_avatars: Dict[int, Image.Image],
+    attr_imgs: Dict[str, Image.Image],
+    skill_imgs: Dict[Tuple[int, str], Image.Image],
+    weapon_imgs: Dict[int, Image.Image],
+) -> Image.Image:
+    """绘制练度统计，在渲染线程中执行"""
     avatar_h = 230
     info_bg_h = 260
     bar_star_h = 110
@@ -137,7 +187,6 @@ async def draw_char_list_img(
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
     # 头像 头像环
-    avatar = await draw_pic_with_ring(ev, is_peek)
     avatar_ring = Image.open(TEXT_PATH / "avatar_ring.png")
     card_img.paste(avatar, (25, 70), avatar)
     avatar_ring = avatar_ring.resize((180, 180))
@@ -178,13 +227,11 @@ async def draw_char_list_img(
         role_detail: RoleDetailData = all_role_detail[_rank.roleId]
         bar_star = Image.open(TEXT_PATH / f"bar_{_rank.starLevel}star.png")
         bar_star_draw = ImageDraw.Draw(bar_star)
-        role_avatar = await draw_pic(role_detail.role.roleId)
+        role_avatar = role_avatars[role_detail.role.roleId]
 
         bar_star.paste(role_avatar, (60, 0), role_avatar)
 
-        role_attribute = await get_attribute(
-            role_detail.role.attributeName, is_simple=True  # type: ignore
-        )
+        role_attribute = attr_imgs[role_detail.role.attributeName]
         role_attribute = role_attribute.resize((40, 40)).convert("RGBA")
         bar_star.alpha_composite(role_attribute, (170, 20))
         bar_star_draw.text((180, 83), f"Lv.{_rank.level}", GREY, waves_font_22, "mm")
@@ -221,9 +268,7 @@ async def draw_char_list_img(
             skill_bg = Image.open(TEXT_PATH / "skill_bg.png")
             temp.alpha_composite(skill_bg)
 
-            skill_img = await get_skill_img(
-                role_detail.role.roleId, _skill.skill.name, _skill.skill.iconUrl
-            )
+            skill_img = skill_imgs[(role_detail.role.roleId, _skill.skill.name)]
             skill_img = skill_img.resize((70, 70))
             # skill_img = ImageEnhance.Brightness(skill_img).enhance(0.3)
             temp.alpha_composite(skill_img, (25, 25))
@@ -253,7 +298,7 @@ async def draw_char_list_img(
         weapon_bg_temp = Image.new("RGBA", (600, 300))
 
         weaponData: WeaponData = role_detail.weaponData
-        weapon_icon = await get_square_weapon(weaponData.weapon.weaponId)
+        weapon_icon = weapon_imgs[weaponData.weapon.weaponId]
         weapon_icon = crop_center_img(weapon_icon, 110, 110)
         weapon_icon_bg = get_weapon_icon_bg(weaponData.weapon.weaponStarLevel)
         weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
@@ -336,9 +381,7 @@ async def draw_char_list_img(
 
     card_img.paste(info_bg, (0, avatar_h), info_bg)
 
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img)
 
 
 async def draw_pic_with_ring(ev: Event, is_peek: bool = False):
@@ -190,6 +190,60 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         "开启后刷新角色面板并发数为全局共享",
         False,
     ),
+    "RefreshFullSyncHours": GsIntConfig(
+        "刷新面板全量同步间隔(小时)",
+        "刷新面板时只拉取等级、突破、共鸣链有变化的角色，超过该间隔的角色重新拉取；只换武器、声骸不会被检测到；设置为0则每次都全量拉取",
+        0,
+        720,
+    ),
+    "KuroApiMaxConcurrency": GsIntConfig(
+        "库街区接口最大并发数",
+        "所有请求共享，上游繁忙或出现验证码时自动降低，恢复后逐步回升",
+        20,
+        100,
+    ),
+    "KuroApiRate": GsIntConfig(
+        "库街区接口每秒请求数",
+        "所有请求共享的令牌桶速率，设置为0则不限制",
+        20,
+        200,
+    ),
+    "RoleDetailCacheNum": GsIntConfig(
+        "面板数据缓存角色数（0为关闭）",
+        "内存中缓存已解析的面板数据，按角色总数淘汰",
+        2000,
+        50000,
+    ),
+    "RenderWorkerNum": GsIntConfig(
+        "图片渲染线程数",
+        "绘图和图片编码在独立线程中执行，避免阻塞其他指令",
+        4,
+        32,
+    ),
+    "CookieValidCacheTime": GsIntConfig(
+        "token校验结果缓存时间(秒)",
+        "有效期内不再重复校验token，设置为0则每次都校验",
+        600,
+        86400,
+    ),
+    "PublicCookiePoolNum": GsIntConfig(
+        "公共token池数量",
+        "后台预先校验的公共token数量，未登录用户查询时直接从池中取用，设置为0则不使用",
+        5,
+        50,
+    ),
+    "PublicCookieRateLimit": GsIntConfig(
+        "公共token每分钟调用次数",
+        "单个公共token每分钟最多被取用的次数，设置为0则不限制",
+        30,
+        600,
+    ),
+    "AssetCacheSize": GsIntConfig(
+        "贴图缓存大小(MB)",
+        "常用贴图解码后缓存在内存中，设置为0则不缓存",
+        256,
+        4096,
+    ),
     "CaptchaProvider": GsStrConfig(
         "验证码提供方（重启生效）",
         "验证码提供方（重启生效）",
@@ -5,7 +5,6 @@ from typing import Dict, List
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.model import (
     BatchRoleCostResponse,
@@ -41,6 +40,7 @@ from ..utils.name_convert import (
     weapon_name_to_weapon_id,
 )
 from ..utils.refresh_char_detail import refresh_char
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import SPECIAL_CHAR
 from ..utils.resource.download_file import get_material_img
 from ..utils.waves_api import waves_api
@@ -255,11 +255,65 @@ async def calc_develop_cost(ev: Event, develop_list: List[str], is_flush=False):
 
     batch_role_cost_res = BatchRoleCostResponse.model_validate(develop_cost.data)
 
+    avatars = {}
+    weapon_imgs = {}
+    material_imgs = {}
+    for cost in batch_role_cost_res.costList:
+        content = content_map.get(f"{cost.roleId}")
+        if not cost.roleId or not content:
+            continue
+        avatars[cost.roleId] = await get_square_avatar(cost.roleId)
+        if content.get("weaponId", None) and cost.weaponId:
+            weapon_id = content["weaponId"]
+            weapon_imgs[weapon_id] = await get_square_weapon(weapon_id)
+        for cultivate_cost_list in (
+            cost.allCost,
+            cost.missingCost,
+            cost.missingRoleCost,
+            cost.missingSkillCost,
+            cost.missingWeaponCost,
+        ):
+            for cultivate_cost in cultivate_cost_list or []:
+                if cultivate_cost.id not in material_imgs:
+                    material_imgs[cultivate_cost.id] = await get_material_img(
+                        cultivate_cost.id
+                    )
+
+    card_img = await run_render(
+        draw_develop_card,
+        batch_role_cost_res,
+        online_role_map,
+        online_weapon_map,
+        content_map,
+        avatars,
+        weapon_imgs,
+        material_imgs,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_develop_card(
+    batch_role_cost_res: BatchRoleCostResponse,
+    online_role_map: Dict[str, OnlineRole],
+    online_weapon_map: Dict[str, OnlineWeapon],
+    content_map: Dict[str, Dict],
+    avatars: Dict,
+    weapon_imgs: Dict,
+    material_imgs: Dict,
+) -> Image.Image:
+    """绘制养成计算卡片，在渲染线程中执行"""
     all_card = []
     # batch_preview: RoleCostDetail = batch_role_cost_res.preview
     for cost in batch_role_cost_res.costList:
-        role_detail_card = await calc_role_need_card(
-            cost, online_role_map, online_weapon_map, content_map
+        role_detail_card = calc_role_need_card(
+            cost,
+            online_role_map,
+            online_weapon_map,
+            content_map,
+            avatars,
+            weapon_imgs,
+            material_imgs,
         )
         all_card.extend(role_detail_card)
 
@@ -275,12 +329,12 @@ async def calc_develop_cost(ev: Event, develop_list: List[str], is_flush=False):
     for img in all_card:
         card_img.alpha_composite(img, (20, temp_height))
         temp_height += img.size[1] + height_block
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img)
 
 
-async def draw_material_card(cultivate_cost_list: List[CultivateCost], title: str):
+def draw_material_card(
+    cultivate_cost_list: List[CultivateCost], title: str, material_imgs: Dict
+):
     line_item_num = 6
     material_header_height = 120
     material_header_block_height = 20
@@ -325,7 +379,7 @@ async def draw_material_card(cultivate_cost_list: List[CultivateCost], title: st
         )
 
         material_star_img = copy.deepcopy(material_star_img_map[cultivate_cost.quality])
-        material_item_img = await get_material_img(cultivate_cost.id)
+        material_item_img = material_imgs[cultivate_cost.id]
         material_item_img = material_item_img.resize(
             (material_item_width, material_item_width)
         )
@@ -355,11 +409,14 @@ async def draw_material_card(cultivate_cost_list: List[CultivateCost], title: st
     return cultivate_cost_img
 
 
-async def calc_role_need_card(
+def calc_role_need_card(
     role_cost_detail: RoleCostDetail,
     online_role_map: Dict[str, OnlineRole],
     online_weapon_map: Dict[str, OnlineWeapon],
     content_map: Dict[str, Dict],
+    avatars: Dict,
+    weapon_imgs: Dict,
+    material_imgs: Dict,
 ):
     img_cards = []
     if not role_cost_detail.roleId:
@@ -378,7 +435,7 @@ async def calc_role_need_card(
     top_bg_img_draw = ImageDraw.Draw(top_bg_img)
 
     # 角色头像
-    square_avatar = await get_square_avatar(role_cost_detail.roleId)
+    square_avatar = avatars[role_cost_detail.roleId]
     square_avatar = square_avatar.resize((180, 180))
     star_img = copy.deepcopy(star_img_map[online_role.starLevel])
     top_bg_img.alpha_composite(square_avatar, (70, 40))
@@ -400,7 +457,7 @@ async def calc_role_need_card(
     if content.get("weaponId", None) and role_cost_detail.weaponId:
         online_weapon = online_weapon_map[f"{role_cost_detail.weaponId}"]
         weapon_id = content["weaponId"]
-        square_weapon = await get_square_weapon(weapon_id)
+        square_weapon = weapon_imgs[weapon_id]
         square_weapon = square_weapon.resize((180, 180))
         star_img = copy.deepcopy(star_img_map[online_weapon.weaponStarLevel])
         top_bg_img.alpha_composite(square_weapon, (530, 40))
@@ -467,32 +524,32 @@ async def calc_role_need_card(
     img_cards.append(temp_img)
 
     if role_cost_detail.allCost:
-        all_cost_img = await draw_material_card(
-            role_cost_detail.allCost, "所需材料总览"
+        all_cost_img = draw_material_card(
+            role_cost_detail.allCost, "所需材料总览", material_imgs
         )
         img_cards.append(all_cost_img)
 
     if role_cost_detail.missingCost:
-        missing_cost_img = await draw_material_card(
-            role_cost_detail.missingCost, "仍需材料总览"
+        missing_cost_img = draw_material_card(
+            role_cost_detail.missingCost, "仍需材料总览", material_imgs
         )
         img_cards.append(missing_cost_img)
 
     if role_cost_detail.missingRoleCost:
-        missing_role_cost_img = await draw_material_card(
-            role_cost_detail.missingRoleCost, "角色升级"
+        missing_role_cost_img = draw_material_card(
+            role_cost_detail.missingRoleCost, "角色升级", material_imgs
         )
         img_cards.append(missing_role_cost_img)
 
     if role_cost_detail.missingSkillCost:
-        missing_skill_cost_img = await draw_material_card(
-            role_cost_detail.missingSkillCost, "技能升级"
+        missing_skill_cost_img = draw_material_card(
+            role_cost_detail.missingSkillCost, "技能升级", material_imgs
         )
         img_cards.append(missing_skill_cost_img)
 
     if role_cost_detail.missingWeaponCost:
-        missing_weapon_cost_img = await draw_material_card(
-            role_cost_detail.missingWeaponCost, "武器升级"
+        missing_weapon_cost_img = draw_material_card(
+            role_cost_detail.missingWeaponCost, "武器升级", material_imgs
         )
         img_cards.append(missing_weapon_cost_img)
 
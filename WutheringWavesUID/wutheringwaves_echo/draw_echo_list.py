@@ -5,7 +5,6 @@ from PIL import Image, ImageDraw
 from pydantic import BaseModel
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils import hint
 from ..utils.api.model import (
@@ -38,6 +37,7 @@ from ..utils.image import (
     get_waves_bg,
 )
 from ..utils.imagetool import draw_pic_with_ring
+from ..utils.render import convert_img, run_render
 from ..utils.resource.download_file import get_phantom_img
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import PREFIX
@@ -129,12 +129,61 @@ async def get_draw_list(ev: Event, uid: str, user_id: str) -> Union[str, bytes]:
         return "[鸣潮] 未找到角色的声骸评分! 请检查角色声骸是否在库街区正确显示"
 
     waves_echo_rank.sort(key=lambda i: (i.score, i.roleId), reverse=True)
+    waves_echo_rank = waves_echo_rank[:20]
 
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    role_avatars = {}
+    phantom_icons = []
+    fetter_imgs = {}
+    prop_imgs = {}
+    for _echo in waves_echo_rank:
+        if _echo.roleId not in role_avatars:
+            role_avatars[_echo.roleId] = await draw_pic(_echo.roleId)
+        phantom = _echo.phantom
+        phantom_icons.append(
+            await get_phantom_img(
+                phantom.phantomProp.phantomId, phantom.phantomProp.iconUrl
+            )
+        )
+        fetter_name = phantom.fetterDetail.name
+        if fetter_name not in fetter_imgs:
+            fetter_imgs[fetter_name] = await get_attribute_effect(fetter_name)
+        for _prop in _echo.props:
+            if _prop.attributeName not in prop_imgs:
+                prop_imgs[_prop.attributeName] = await get_attribute_prop(
+                    _prop.attributeName
+                )
+
+    img = await run_render(
+        draw_echo_list,
+        account_info,
+        waves_echo_rank,
+        avatar,
+        avatar_ring,
+        role_avatars,
+        phantom_icons,
+        fetter_imgs,
+        prop_imgs,
+    )
+    img = await convert_img(img)
+    return img
+
+
+def draw_echo_list(
+    account_info: AccountBaseInfo,
+    waves_echo_rank: List[WavesEchoRank],
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    role_avatars: Dict[int, Image.Image],
+    phantom_icons: List[Image.Image],
+    fetter_imgs: Dict[str, Image.Image],
+    prop_imgs: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制声骸评分列表，在渲染线程中执行"""
     # img = get_waves_bg(1200, 2650, 'bg3')
     img = get_waves_bg(1600, 3230, "bg3")
 
     # 头像部分
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     img.paste(avatar, (45, 20), avatar)
     img.paste(avatar_ring, (55, 30), avatar_ring)
 
@@ -169,7 +218,7 @@ async def get_draw_list(ev: Event, uid: str, user_id: str) -> Union[str, bytes]:
 
     promote_icon = Image.open(TEXT_PATH / "promote_icon.png")
     promote_icon = promote_icon.resize((30, 30))
-    for index, _echo in enumerate(waves_echo_rank[:20]):
+    for index, _echo in enumerate(waves_echo_rank):
         sh_bg = _sh_bg.copy()
         head_high = 50
         sh_temp = Image.new("RGBA", (350, 550 + head_high))
@@ -180,15 +229,13 @@ async def get_draw_list(ev: Event, uid: str, user_id: str) -> Union[str, bytes]:
         sh_temp.alpha_composite(sh_title, dest=(0, head_high))
 
         # 角色头像
-        role_avatar = await draw_pic(_echo.roleId)
+        role_avatar = role_avatars[_echo.roleId]
         sh_temp.paste(role_avatar, (230, -40 + head_high), role_avatar)
 
         # 声骸
         phantom: EquipPhantom = _echo.phantom
-        phantom_icon = await get_phantom_img(
-            phantom.phantomProp.phantomId, phantom.phantomProp.iconUrl
-        )
-        fetter_icon = await get_attribute_effect(phantom.fetterDetail.name)
+        phantom_icon = phantom_icons[index]
+        fetter_icon = fetter_imgs[phantom.fetterDetail.name]
         fetter_icon = fetter_icon.resize((50, 50))
         phantom_icon.alpha_composite(fetter_icon, dest=(205, 0))
         phantom_icon = phantom_icon.resize((100, 100))
@@ -231,7 +278,7 @@ async def get_draw_list(ev: Event, uid: str, user_id: str) -> Union[str, bytes]:
         for i, temp in enumerate(zip(_echo.props, _echo.name_colors, _echo.num_colors)):
             _prop, name_color, num_color = temp
             oset = 55
-            prop_img = await get_attribute_prop(_prop.attributeName)
+            prop_img = prop_imgs[_prop.attributeName]
             prop_img = prop_img.resize((40, 40))
             sh_temp.alpha_composite(prop_img, (15, 167 + i * oset + head_high))
             sh_temp_draw = ImageDraw.Draw(sh_temp)
@@ -256,9 +303,7 @@ async def get_draw_list(ev: Event, uid: str, user_id: str) -> Union[str, bytes]:
 
         img.alpha_composite(sh_temp, (_x, _y))
 
-    img = add_footer(img)
-    img = await convert_img(img)
-    return img
+    return add_footer(img)
 
 
 async def draw_pic(roleId):
@@ -1,11 +1,11 @@
 import math
 from io import BytesIO
 from pathlib import Path
+from typing import Dict
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.utils import sget
 
 from ..utils import hint
@@ -37,10 +37,11 @@ from ..utils.image import (
     WAVES_VOID,
     YELLOW,
     add_footer,
-    change_color,
+    change_color_sync,
     get_waves_bg,
 )
 from ..utils.imagetool import draw_pic_with_ring
+from ..utils.render import convert_img, run_render
 from ..utils.waves_api import waves_api
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
@@ -96,6 +97,38 @@ async def draw_explore_img(ev: Event, uid: str, user_id: str):
     if not is_self_ck and not explore_data.open:
         return hint.error_reply(msg="探索数据未开启")
 
+    if not explore_data.exploreList:
+        return hint.error_reply(msg="探索数据为空")
+
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    country_imgs = {}
+    for _explore in explore_data.exploreList:
+        icon = _explore.country.homePageIcon
+        if icon not in country_imgs:
+            country_imgs[icon] = Image.open(
+                BytesIO((await sget(icon)).content)
+            ).convert("RGBA")
+
+    img = await run_render(
+        draw_explore_card,
+        account_info,
+        explore_data,
+        avatar,
+        avatar_ring,
+        country_imgs,
+    )
+    img = await convert_img(img)
+    return img
+
+
+def draw_explore_card(
+    account_info: AccountBaseInfo,
+    explore_data: ExploreList,
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    country_imgs: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制探索度卡片，在渲染线程中执行"""
     # 计算总高度
     base_info_h = 250
     footer_h = 70
@@ -103,9 +136,6 @@ async def draw_explore_img(ev: Event, uid: str, user_id: str):
     explore_title_h = 200
     explore_frame_h = 500
 
-    if not explore_data.exploreList:
-        return hint.error_reply(msg="探索数据为空")
-
     for mi, _explore in enumerate(explore_data.exploreList):
         h += explore_title_h
         if _explore.areaInfoList:
@@ -114,7 +144,6 @@ async def draw_explore_img(ev: Event, uid: str, user_id: str):
     img = get_waves_bg(2000, h, "bg3")
 
     # 头像部分
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     img.paste(avatar, (85, 70), avatar)
     img.paste(avatar_ring, (95, 80), avatar_ring)
 
@@ -153,13 +182,11 @@ async def draw_explore_img(ev: Event, uid: str, user_id: str):
     for mi, _explore in enumerate(explore_data.exploreList):
         _explore: ExploreArea
         _explore_title = explore_title.copy()
-        _explore_title = await change_color(
+        _explore_title = change_color_sync(
             _explore_title, country_color_map.get(_explore.country.countryName, YELLOW)
         )
         # 大区域探索度
-        content_img = Image.open(
-            BytesIO((await sget(_explore.country.homePageIcon)).content)
-        ).convert("RGBA")
+        content_img = country_imgs[_explore.country.homePageIcon]
         _explore_title.alpha_composite(content_img, (150, 30))
         _explore_title_draw = ImageDraw.Draw(_explore_title)
         _explore_title_draw.text(
@@ -180,7 +207,7 @@ async def draw_explore_img(ev: Event, uid: str, user_id: str):
         for ni, _subArea in enumerate(_explore.areaInfoList or []):
             _subArea: AreaInfo
             _explore_frame = explore_frame.copy()
-            _explore_frame = await change_color(
+            _explore_frame = change_color_sync(
                 _explore_frame, get_progress_color(_subArea.areaProgress), h=83
             )
             _explore_frame_draw = ImageDraw.Draw(_explore_frame)
@@ -247,6 +274,4 @@ async def draw_explore_img(ev: Event, uid: str, user_id: str):
             + explore_title_h
         )
 
-    img = add_footer(img)
-    img = await convert_img(img)
-    return img
+    return add_footer(img)
@@ -1,5 +1,7 @@
 import random
 import json
+import bisect
+from itertools import accumulate
 from collections import defaultdict
 import statistics
 import asyncio
@@ -19,6 +21,9 @@ except NameError:
 PROB_DIST_FILENAME = os.path.join(script_dir_for_json, "pity_distribution.json")
 
 PROB_DIST_NORMALIZED = []
+# 累积分布，用于逆CDF采样
+PROB_CDF = []
+PULLS = []
 EMOJI_NUMS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"] 
 
 # --- 用户状态管理 (会话隔离) ---
@@ -51,6 +56,8 @@ def load_probability_distribution(json_file_path=PROB_DIST_FILENAME):
             logger.error(f"ww_gacha_simulator: {json_file_path} 数据格式不正确或长度不为80。")
             PROB_DIST_NORMALIZED = []
             return False
+        PROB_CDF[:] = accumulate(PROB_DIST_NORMALIZED)
+        PULLS[:] = range(1, len(PROB_DIST_NORMALIZED) + 1)
         return True
     except FileNotFoundError:
         logger.error(f"ww_gacha_simulator: 概率分布文件 {json_file_path} 未找到。")
@@ -73,12 +80,7 @@ def get_pulls_for_next_5star():
         logger.error("ww_gacha_simulator: 严重错误: 概率分布未加载 (get_pulls_for_next_5star)。")
         raise ValueError("概率分布未加载，无法进行模拟。")
     u = random.random()
-    cumulative_prob = 0
-    for i, prob in enumerate(PROB_DIST_NORMALIZED):
-        cumulative_prob += prob
-        if u < cumulative_prob:
-            return i + 1
-    return len(PROB_DIST_NORMALIZED)
+    return min(bisect.bisect_right(PROB_CDF, u) + 1, len(PROB_DIST_NORMALIZED))
 
 def simulate_one_featured_character(current_is_guaranteed):
     total_pulls = 0
@@ -98,88 +100,77 @@ def simulate_one_featured_weapon():
     return get_pulls_for_next_5star()
 
 
+# --- 批量采样 ---
+def sample_5star_pulls(n):
+    """批量采样n次出5星所需抽数 (逆CDF, 每次采样二分查找累积分布)"""
+    if not PROB_CDF:
+        logger.error("ww_gacha_simulator: 严重错误: 概率分布未加载 (sample_5star_pulls)。")
+        raise ValueError("概率分布未加载，无法进行模拟。")
+    return random.choices(PULLS, cum_weights=PROB_CDF, k=n)
+
+def sample_character_pulls(n):
+    """批量采样n次获得UP角色所需抽数 (不在大保底时均从小保底开始)"""
+    first = sample_5star_pulls(n)
+    extra = sample_5star_pulls(n)
+    return [a if random.random() < 0.5 else a + b for a, b in zip(first, extra)]
+
+
 # --- 核心模拟逻辑 ---
 def calculate_expected_pulls(target_featured_chars, target_featured_weapons, num_simulations):
-    total_pulls_across_simulations = 0
-    for _ in range(num_simulations):
-        sim_total_pulls = 0
-        current_fc = 0 
-        current_fw = 0 
-        char_is_guaranteed = False
-        
-        if target_featured_chars > 0 and current_fc < 1 :
-            pulls, char_is_guaranteed = simulate_one_featured_character(char_is_guaranteed)
-            sim_total_pulls += pulls
-            current_fc += 1
-        
-        if target_featured_weapons > 0 and current_fw < 1:
-            pulls = simulate_one_featured_weapon()
-            sim_total_pulls += pulls
-            current_fw += 1
-            
-        while current_fc < target_featured_chars:
-            pulls, char_is_guaranteed = simulate_one_featured_character(char_is_guaranteed)
-            sim_total_pulls += pulls
-            current_fc += 1
-            
-        while current_fw < target_featured_weapons:
-            pulls = simulate_one_featured_weapon()
-            sim_total_pulls += pulls
-            current_fw += 1
-            
-        total_pulls_across_simulations += sim_total_pulls
     if num_simulations == 0: return 0.0
+    # 每次模拟的各个角色、武器互相独立，总抽数即所有采样之和
+    total_pulls_across_simulations = sum(sample_character_pulls(target_featured_chars * num_simulations))
+    total_pulls_across_simulations += sum(sample_5star_pulls(target_featured_weapons * num_simulations))
     return total_pulls_across_simulations / num_simulations
 
-def _get_outcome_for_budget(pull_budget):
+def _outcome_from_costs(pull_budget, char_costs, weapon_costs):
+    """
+    按预先采样的抽数计算预算内的结果
+    char_costs: 7个角色的抽数; weapon_costs: 6把武器的抽数 (第一把放不下时会重新采样)
+    """
     pulls_remaining = pull_budget
-    current_fc = 0  
-    current_fw = 0  
-    char_is_guaranteed = False
-
-    if pulls_remaining > 0 and current_fc == 0:
-        cost_c0, guaranteed_after_c0 = simulate_one_featured_character(char_is_guaranteed)
-        if pulls_remaining >= cost_c0:
-            pulls_remaining -= cost_c0
-            current_fc = 1 
-            char_is_guaranteed = guaranteed_after_c0
-        else:
-            return current_fc, current_fw 
-
-    if current_fc >= 1 and pulls_remaining > 0 and current_fw == 0:
-        cost_r1 = simulate_one_featured_weapon()
-        if pulls_remaining >= cost_r1:
-            pulls_remaining -= cost_r1
-            current_fw = 1 
-
-    if current_fc >= 1: 
-        while current_fc < 7 and pulls_remaining > 0: 
-            cost_next_char, guaranteed_after_next_char = simulate_one_featured_character(char_is_guaranteed)
-            if pulls_remaining >= cost_next_char:
-                pulls_remaining -= cost_next_char
-                current_fc += 1
-                char_is_guaranteed = guaranteed_after_next_char
-            else:
-                break 
-
-    if current_fc >= 1: 
-        while current_fw < 5 and pulls_remaining > 0: 
-            cost_next_weapon = simulate_one_featured_weapon()
-            if pulls_remaining >= cost_next_weapon:
-                pulls_remaining -= cost_next_weapon
-                current_fw += 1
-            else:
-                break 
-                
+    current_fc = 0
+    current_fw = 0
+
+    if pulls_remaining <= 0 or char_costs[0] > pulls_remaining:
+        return current_fc, current_fw
+    pulls_remaining -= char_costs[0]
+    current_fc = 1
+
+    if pulls_remaining > 0 and weapon_costs[0] <= pulls_remaining:
+        pulls_remaining -= weapon_costs[0]
+        current_fw = 1
+
+    for cost in char_costs[1:7]:
+        if pulls_remaining <= 0 or cost > pulls_remaining:
+            break
+        pulls_remaining -= cost
+        current_fc += 1
+
+    for cost in weapon_costs[1:6 - current_fw]:
+        if pulls_remaining <= 0 or cost > pulls_remaining:
+            break
+        pulls_remaining -= cost
+        current_fw += 1
+
     return current_fc, current_fw
 
-def get_top_outcomes(total_pull_budget, num_simulations):
+def _get_outcome_for_budget(pull_budget):
+    return _outcome_from_costs(pull_budget, sample_character_pulls(7), sample_5star_pulls(6))
+
+def simulate_budget_outcomes(pull_budget, num_simulations):
+    """批量模拟预算内的结果，返回 {(FC, FW): 次数}"""
+    char_costs = sample_character_pulls(7 * num_simulations)
+    weapon_costs = sample_5star_pulls(6 * num_simulations)
     outcomes_counter = defaultdict(int)
-    for _ in range(num_simulations):
-        fc, fw = _get_outcome_for_budget(total_pull_budget)
-        outcomes_counter[(fc, fw)] += 1
-        
-    if num_simulations == 0: return [] 
+    for i in range(num_simulations):
+        outcome = _outcome_from_costs(pull_budget, char_costs[i * 7:i * 7 + 7], weapon_costs[i * 6:i * 6 + 6])
+        outcomes_counter[outcome] += 1
+    return outcomes_counter
+
+def get_top_outcomes(total_pull_budget, num_simulations):
+    if num_simulations == 0: return []
+    outcomes_counter = simulate_budget_outcomes(total_pull_budget, num_simulations)
     sorted_outcomes = sorted(outcomes_counter.items(), key=lambda item: item[1], reverse=True)
     top_5 = []
     for i in range(min(len(EMOJI_NUMS), len(sorted_outcomes))): 
@@ -188,10 +179,127 @@ def get_top_outcomes(total_pull_budget, num_simulations):
         top_5.append({'outcome (FC, FW)': outcome_tuple, 'probability': probability, 'count': count})
     return top_5
 
+def get_success_count(pull_budget, target_tc, target_tw, num_simulations):
+    outcomes_counter = simulate_budget_outcomes(pull_budget, num_simulations)
+    return sum(count for (fc, fw), count in outcomes_counter.items() if fc >= target_tc and fw >= target_tw)
+
 def simulate_for_budget_outcome(pull_budget):
     return _get_outcome_for_budget(pull_budget)
 
 
+# --- 精确计算 (卷积保底分布, 不采样) ---
+def _five_star_dist():
+    """下标为抽数的出5星概率，未归一的剩余概率计入最后一抽 (与采样一致)"""
+    dist = [0.0] + list(PROB_DIST_NORMALIZED)
+    dist[-1] += max(0.0, 1.0 - sum(PROB_DIST_NORMALIZED))
+    return dist
+
+def _convolve(a, b):
+    result = [0.0] * (len(a) + len(b) - 1)
+    for i, pa in enumerate(a):
+        if not pa: continue
+        for j, pb in enumerate(b):
+            result[i + j] += pa * pb
+    return result
+
+def _char_dist(five_star):
+    """获得UP角色所需抽数的分布: 50%一次5星, 50%两次5星"""
+    two = _convolve(five_star, five_star)
+    return [0.5 * (five_star[k] if k < len(five_star) else 0.0) + 0.5 * p for k, p in enumerate(two)]
+
+def _tail(dist, budget):
+    """tail[r] = P(抽数 > r), r 取 0..budget"""
+    tail = [0.0] * (budget + 1)
+    acc = sum(dist[budget + 1:])
+    for r in range(min(budget, len(dist) - 1), -1, -1):
+        tail[r] = acc
+        acc += dist[r]
+    return tail
+
+def _step(spent, cost, tail, budget):
+    """已花费抽数的分布再抽一次，返回 (放得下时的新分布, 放不下而停止时的分布)"""
+    moved = [0.0] * (budget + 1)
+    stopped = [0.0] * (budget + 1)
+    for s, p in enumerate(spent):
+        if not p: continue
+        r = budget - s
+        stopped[s] = p * tail[r]
+        for k in range(1, min(r, len(cost) - 1) + 1):
+            moved[s + k] += p * cost[k]
+    return moved, stopped
+
+def exact_expected_pulls(target_featured_chars, target_featured_weapons):
+    if not PROB_DIST_NORMALIZED:
+        raise ValueError("概率分布未加载，无法进行计算。")
+    five_star = _five_star_dist()
+    mean = sum(k * p for k, p in enumerate(five_star))
+    # 每个UP角色期望1.5个5星，每把武器1个5星
+    return (1.5 * target_featured_chars + target_featured_weapons) * mean
+
+def exact_budget_outcomes(pull_budget):
+    """预算内各结果的精确概率，返回 {(FC, FW): 概率}，抽取顺序与模拟一致"""
+    if not PROB_DIST_NORMALIZED:
+        raise ValueError("概率分布未加载，无法进行计算。")
+    budget = max(pull_budget, 0)
+    weapon = _five_star_dist()
+    char = _char_dist(weapon)
+    char_tail = _tail(char, budget)
+    weapon_tail = _tail(weapon, budget)
+
+    outcomes = defaultdict(float)
+    start = [0.0] * (budget + 1)
+    start[0] = 1.0
+    # 第一个角色
+    spent, stopped = _step(start, char, char_tail, budget)
+    outcomes[(0, 0)] = stopped[0]
+    # 第一把武器，放不下时不消耗抽数
+    with_weapon, without_weapon = _step(spent, weapon, weapon_tail, budget)
+
+    # 后续角色，第一次放不下时停止
+    char_layers = {}
+    for fw, spent in ((0, without_weapon), (1, with_weapon)):
+        for fc in range(1, 7):
+            spent, stopped = _step(spent, char, char_tail, budget)
+            char_layers[(fc, fw)] = stopped
+        char_layers[(7, fw)] = spent
+
+    # 剩余r抽时恰好还能放下k把武器的概率 = P(k把之和<=r) - P(k+1把之和<=r)
+    fit = []
+    total = [1.0]
+    for _ in range(6):
+        cdf = list(accumulate(total))
+        fit.append([cdf[min(r, len(cdf) - 1)] for r in range(budget + 1)])
+        total = _convolve(total, weapon)
+
+    for (fc, fw), spent in char_layers.items():
+        max_more = 5 - fw
+        for s, p in enumerate(spent):
+            if not p: continue
+            r = budget - s
+            for k in range(max_more + 1):
+                prob = fit[k][r] - (fit[k + 1][r] if k < max_more else 0.0)
+                outcomes[(fc, fw + k)] += p * prob
+    return outcomes
+
+def get_exact_top_outcomes(pull_budget):
+    outcomes = exact_budget_outcomes(pull_budget)
+    sorted_outcomes = sorted(outcomes.items(), key=lambda item: item[1], reverse=True)
+    return [
+        {'outcome (FC, FW)': outcome_tuple, 'probability': probability}
+        for outcome_tuple, probability in sorted_outcomes[:len(EMOJI_NUMS)]
+    ]
+
+def get_exact_success_rate(pull_budget, target_tc, target_tw):
+    outcomes = exact_budget_outcomes(pull_budget)
+    return sum(p for (fc, fw), p in outcomes.items() if fc >= target_tc and fw >= target_tw)
+
+def format_outcome(outcome_tuple):
+    fc_total, fw_total = outcome_tuple
+    if fc_total > 0:
+        return f"{fc_total - 1}+{fw_total}"
+    return f"0角色, {fw_total}武器"
+
+
 # --- 分析结果格式化函数 ---
 def format_mode1_analysis_results(history_list_mode1, num_sim_per_run):
     num_reruns = len(history_list_mode1)
@@ -499,19 +607,21 @@ async def handle_gacha_simulator_sub_command(bot: Bot, ev: Event):
     final_output_message = ""
     try:
         if action_mode_to_run == '1':
-            expected_pulls = calculate_expected_pulls(params_to_run['target_fc'], params_to_run['target_fw'], num_sims_to_run)
+            expected_pulls = await asyncio.to_thread(calculate_expected_pulls, params_to_run['target_fc'], params_to_run['target_fw'], num_sims_to_run)
+            exact_pulls = exact_expected_pulls(params_to_run['target_fc'], params_to_run['target_fw'])
             current_user_state['rerun_history_mode1'].append(expected_pulls)
             
             a_val = params_to_run['target_fc'] - 1 
             b_val = params_to_run['target_fw']
             target_display_str = f"{a_val}+{b_val}"
-            result_message = f"✨ 目标 {target_display_str} 期望 ≈ {expected_pulls:.2f}抽"
+            result_message = f"✨ 目标 {target_display_str} 期望 ≈ {expected_pulls:.2f}抽 (精确值 {exact_pulls:.2f}抽)"
             
             analysis_message = format_mode1_analysis_results(current_user_state['rerun_history_mode1'], num_sims_to_run)
             final_output_message = f"{result_message}\n{analysis_message}"
 
         elif action_mode_to_run == '2':
-            current_run_top_5 = get_top_outcomes(params_to_run['pull_budget'], num_sims_to_run)
+            current_run_top_5 = await asyncio.to_thread(get_top_outcomes, params_to_run['pull_budget'], num_sims_to_run)
+            exact_top_5 = await asyncio.to_thread(get_exact_top_outcomes, params_to_run['pull_budget'])
             current_user_state['rerun_history_mode2'].append(current_run_top_5) 
             
             current_run_output_lines = [f"✨ {params_to_run['pull_budget']:,}抽 Top 5 结果 (当前运行):"]
@@ -535,6 +645,10 @@ async def handle_gacha_simulator_sub_command(bot: Bot, ev: Event):
                     emoji_num = EMOJI_NUMS[idx]
                     current_run_output_lines.append(f"   {emoji_num} {outcome_display_str}: 概率 {prob:.2%}")
             
+            current_run_output_lines.append("精确概率 Top 5:")
+            for idx, res_dict in enumerate(exact_top_5):
+                current_run_output_lines.append(f"   {EMOJI_NUMS[idx]} {format_outcome(res_dict['outcome (FC, FW)'])}: 概率 {res_dict['probability']:.2%}")
+            
             current_run_formatted_string = '\n'.join(current_run_output_lines)
             analysis_message = format_mode2_analysis_results(current_user_state['rerun_history_mode2'], num_sims_to_run)
             final_output_message = f"{current_run_formatted_string}{analysis_message}"
@@ -544,11 +658,8 @@ async def handle_gacha_simulator_sub_command(bot: Bot, ev: Event):
             target_tc = params_to_run['target_tc'] 
             target_tw = params_to_run['target_tw'] 
 
-            success_count = 0
-            for _ in range(num_sims_to_run): 
-                obtained_tc, obtained_tw = simulate_for_budget_outcome(budget)
-                if obtained_tc >= target_tc and obtained_tw >= target_tw:
-                    success_count += 1
+            success_count = await asyncio.to_thread(get_success_count, budget, target_tc, target_tw, num_sims_to_run)
+            exact_success_rate = await asyncio.to_thread(get_exact_success_rate, budget, target_tc, target_tw)
             
             success_rate = (success_count / num_sims_to_run) * 100
             
@@ -556,7 +667,7 @@ async def handle_gacha_simulator_sub_command(bot: Bot, ev: Event):
             target_b_display = target_tw
             target_str_display = f"{target_a_display}+{target_b_display}"
 
-            result_message = f"✨ {budget:,}抽预算, 目标 {target_str_display}:\n达成成功率: {success_rate:.2f}% ({success_count:,}/{num_sims_to_run:,}次)"
+            result_message = f"✨ {budget:,}抽预算, 目标 {target_str_display}:\n达成成功率: {success_rate:.2f}% ({success_count:,}/{num_sims_to_run:,}次)\n精确成功率: {exact_success_rate:.2%}"
             final_output_message = result_message
         
         else: 
@@ -634,6 +745,7 @@ async def handle_gacha_simulator_help(bot: Bot, ev: Event):
         " ",
         "--------------",
         f"所有模拟均基于 {_sim_count:,} 次运算；",
+        "同时给出按保底分布卷积得到的精确值；",
         "考虑大小保底，不考虑珊瑚换抽和换共鸣链；",
         "概率分布来源\"wuwa tracker\"约20,000,000次唤取记录统计", # Literal quotes around "wuwa tracker"
         "",  # Blank line
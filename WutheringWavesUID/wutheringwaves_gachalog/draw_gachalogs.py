@@ -1,20 +1,15 @@
-import json
 import os
 import random
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-import aiofiles
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
-from ..utils import hint
 from ..utils.api.model import AccountBaseInfo
-from ..utils.error_reply import WAVES_CODE_102
 from ..utils.fonts.waves_fonts import (
     waves_font_18,
     waves_font_20,
@@ -28,16 +23,17 @@ from ..utils.fonts.waves_fonts import (
 from ..utils.image import (
     GOLD,
     add_footer,
-    cropped_square_avatar,
+    cropped_square_avatar_sync,
     get_event_avatar,
     get_square_avatar,
     get_square_weapon,
     get_waves_bg,
 )
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import NORMAL_LIST
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import PREFIX
+from .get_gachalogs import gacha_type_meta_data, load_gacha_store
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
 HOMO_TAG = ["非到极致", "运气不好", "平稳保底", "小欧一把", "欧狗在此"]
@@ -138,14 +134,15 @@ async def draw_card_help():
 
 
 async def draw_card(uid: str, ev: Event):
-    # 获取数据
-    gacha_log_path = PLAYER_PATH / str(uid) / "gacha_logs.json"
-    if not gacha_log_path.exists():
+    # 获取数据，只读取预先统计好的索引
+    store = await load_gacha_store(uid)
+    if not store.exists():
         return f"[鸣潮] 你还没有抽卡记录噢!\n 请发送 {PREFIX}导入抽卡链接 后重试!"
-    async with aiofiles.open(gacha_log_path, "r", encoding="UTF-8") as f:
-        raw_data: Dict = json.loads(await f.read())
 
-    gachalogs = raw_data["data"]
+    gachalogs = {
+        gacha_name: store.get_pool_index(card_pool_type)
+        for gacha_name, card_pool_type in gacha_type_meta_data.items()
+    }
     title_num = len([1 for i in gachalogs.keys() if "新手" not in i])
 
     total_data = {}
@@ -166,41 +163,29 @@ async def draw_card(uid: str, ev: Event):
         }
 
     for gacha_name in gachalogs:
-        num = 1
-        gacha_data = gachalogs[gacha_name]
+        pool = gachalogs[gacha_name]
         current_data = total_data[gacha_name]
-        for index, data in enumerate(gacha_data[::-1]):
-            if index == 0:
-                current_data["time_range"] = data["time"]
-            if index == len(gacha_data) - 1:
-                time_1 = datetime.strptime(data["time"], "%Y-%m-%d %H:%M:%S")
-                time_2 = datetime.strptime(
-                    current_data["time_range"], "%Y-%m-%d %H:%M:%S"
-                )
-                current_data["all_time"] = (time_1 - time_2).total_seconds()
-
-                current_data["time_range"] += "~" + data["time"]
-
-            if data["qualityLevel"] == 5:
-                data["gacha_num"] = num
-
-                # 判断是否是UP
-                if data["name"] in NORMAL_LIST:
-                    data["is_up"] = False
-                else:
-                    data["is_up"] = True
-
-                current_data["r_num"].append(num)
-                current_data["rank_s_list"].append(data)
-                if data["is_up"]:
-                    current_data["up_list"].append(data)
-
-                num = 1
+        if pool["count"]:
+            time_1 = datetime.strptime(pool["last_time"], "%Y-%m-%d %H:%M:%S")
+            time_2 = datetime.strptime(pool["first_time"], "%Y-%m-%d %H:%M:%S")
+            current_data["all_time"] = (time_1 - time_2).total_seconds()
+            current_data["time_range"] = f"{pool['first_time']}~{pool['last_time']}"
+
+        for data in pool["five_stars"]:
+            data = dict(data)
+            # 判断是否是UP
+            if data["name"] in NORMAL_LIST:
+                data["is_up"] = False
             else:
-                num += 1
-            current_data["total"] += 1
+                data["is_up"] = True
 
-        current_data["remain"] = num - 1
+            current_data["r_num"].append(data["gacha_num"])
+            current_data["rank_s_list"].append(data)
+            if data["is_up"]:
+                current_data["up_list"].append(data)
+
+        current_data["total"] = pool["count"]
+        current_data["remain"] = pool["pity"]
         if len(current_data["rank_s_list"]) == 0:
             current_data["avg"] = "-"
         else:
@@ -242,6 +227,52 @@ async def draw_card(uid: str, ev: Event):
                         current_data["avg"], [10, 20, 30, 40, 45]
                     )
 
+    item_icons = {}
+    for gacha_name, gacha_data in total_data.items():
+        s_list = gacha_data["rank_s_list"]
+        if "新手" in gacha_name:
+            s_list = s_list[:1]
+        for item in s_list:
+            if item["resourceId"] in item_icons:
+                continue
+            if item["resourceType"] == "武器":
+                item_icon = await get_square_weapon(item["resourceId"])
+            else:
+                item_icon = await get_square_avatar(item["resourceId"])
+            item_icons[item["resourceId"]] = item_icon
+
+    is_net = waves_api.is_net(uid)
+    account_info = None
+    if not is_net:
+        account_info = await get_account_info(uid, ev)
+    avatar = None
+    if is_net or account_info:
+        avatar = await draw_pic_with_ring(ev)
+
+    card_img = await run_render(
+        draw_gacha_card,
+        uid,
+        total_data,
+        title_num,
+        item_icons,
+        is_net,
+        account_info,
+        avatar,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_gacha_card(
+    uid: str,
+    total_data: Dict,
+    title_num: int,
+    item_icons: Dict[str, Image.Image],
+    is_net: bool,
+    account_info: Optional[AccountBaseInfo],
+    avatar: Optional[Image.Image],
+) -> Image.Image:
+    """绘制抽卡记录卡片，在渲染线程中执行"""
     oset = 280
     bset = 170
 
@@ -271,19 +302,18 @@ async def draw_card(uid: str, ev: Event):
     up_icon = Image.open(TEXT_PATH / "up_tag.png")
     up_icon = up_icon.resize((68, 52))
 
-    async def draw_pic(item) -> Image.Image:
+    def draw_pic(item) -> Image.Image:
         item_bg = Image.new("RGBA", (167, 170))
         item_fg_cp = item_fg.copy()
         item_bg.paste(item_fg_cp, (0, 0), item_fg_cp)
 
         item_temp = Image.new("RGBA", (167, 170))
+        item_icon = item_icons[item["resourceId"]]
         if item["resourceType"] == "武器":
-            item_icon = await get_square_weapon(item["resourceId"])
             item_icon = item_icon.resize((130, 130)).convert("RGBA")
             item_temp.paste(item_icon, (22, 0), item_icon)
         else:
-            item_icon = await get_square_avatar(item["resourceId"])
-            item_icon = await cropped_square_avatar(item_icon, 130)
+            item_icon = cropped_square_avatar_sync(item_icon, 130)
             item_temp.paste(item_icon, (22, 0), item_icon)
 
         item_bg.paste(item_temp, (-2, -2), item_temp)
@@ -359,7 +389,7 @@ async def draw_card(uid: str, ev: Event):
         s_list = gacha_data["rank_s_list"]
         s_list.reverse()
         for index, item in enumerate(s_list):
-            item_bg = await draw_pic(item)
+            item_bg = draw_pic(item)
 
             _x = 95 + 162 * (index % 5)
             _y = _header + bset * (index // 5) + y + gindex * oset
@@ -391,7 +421,7 @@ async def draw_card(uid: str, ev: Event):
         s_list = gacha_data["rank_s_list"]
         if not s_list:
             continue
-        item_bg = await draw_pic(s_list[0])
+        item_bg = draw_pic(s_list[0])
 
         newbie_bg_cp = newbie_bg.copy()
         newbie_bg_cp_draw = ImageDraw.Draw(newbie_bg_cp)
@@ -422,11 +452,9 @@ async def draw_card(uid: str, ev: Event):
         )
         nindex += 1
 
-    await draw_uid_avatar(uid, ev, card_img)
+    draw_uid_avatar(uid, is_net, account_info, avatar, card_img)
 
-    card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 600, 20)
 
 
 async def draw_pic_with_ring(ev: Event):
@@ -440,12 +468,11 @@ async def draw_pic_with_ring(ev: Event):
     return img
 
 
-async def get_random_card_polygon(ev: Event):
+def get_random_card_polygon(avatar: Image.Image):
     CARD_POLYGON_PATH = TEXT_PATH / "card_polygon"
     path = random.choice(os.listdir(f"{CARD_POLYGON_PATH}"))
     card_img = Image.open(f"{CARD_POLYGON_PATH}/{path}").convert("RGBA")
 
-    avatar = await draw_pic_with_ring(ev)
     avatar = avatar.resize((500, 500))
     card_img.paste(avatar, (-10, 150), avatar)
 
@@ -456,13 +483,28 @@ async def get_random_card_polygon(ev: Event):
     return card_img.resize((280, 400))
 
 
-async def draw_uid_avatar(uid, ev, card_img):
-    if waves_api.is_net(uid):
+async def get_account_info(uid: str, ev: Event) -> Optional[AccountBaseInfo]:
+    _, ck = await waves_api.get_ck_result(uid, ev.user_id, ev.bot_id)
+    if not ck:
+        return None
+    account_info = await waves_api.get_base_info(uid, ck)
+    if not account_info.success:
+        return None
+    return AccountBaseInfo.model_validate(account_info.data)
+
+
+def draw_uid_avatar(
+    uid: str,
+    is_net: bool,
+    account_info: Optional[AccountBaseInfo],
+    avatar: Optional[Image.Image],
+    card_img: Image.Image,
+):
+    if is_net:
         title = Image.open(TEXT_PATH / "title.png")
         base_info_draw = ImageDraw.Draw(title)
         base_info_draw.text((346, 370), f"特征码:  {uid}", GOLD, waves_font_25, "lm")
 
-        avatar = await draw_pic_with_ring(ev)
         avatar_ring = Image.open(TEXT_PATH / "avatar_ring.png")
 
         card_img.paste(avatar, (346, 40), avatar)
@@ -471,15 +513,7 @@ async def draw_uid_avatar(uid, ev, card_img):
 
         card_img.paste(title, (0, 0), title)
 
-    else:
-        _, ck = await waves_api.get_ck_result(uid, ev.user_id, ev.bot_id)
-        if not ck:
-            return hint.error_reply(WAVES_CODE_102)
-        account_info = await waves_api.get_base_info(uid, ck)
-        if not account_info.success:
-            return account_info.throw_msg()
-        account_info = AccountBaseInfo.model_validate(account_info.data)
-
+    elif account_info:
         base_info_bg = Image.open(TEXT_PATH / "base_info_bg.png")
         base_info_draw = ImageDraw.Draw(base_info_bg)
         base_info_draw.text(
@@ -491,5 +525,5 @@ async def draw_uid_avatar(uid, ev, card_img):
         base_info_bg = base_info_bg.resize((900, 450))
         card_img.alpha_composite(base_info_bg, (110, 30))
         #
-        card_polygon = await get_random_card_polygon(ev)
+        card_polygon = get_random_card_polygon(avatar)
         card_img.alpha_composite(card_polygon, (80, 0))
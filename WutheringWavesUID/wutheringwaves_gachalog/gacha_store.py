@@ -0,0 +1,208 @@
+import os
+import json
+import asyncio
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+
+STORE_DIR = "gacha"
+INDEX_FILE = "index.json"
+BACKUP_DIR = "backups"
+MANIFEST_FILE = "manifest.jsonl"
+# 从文件末尾读取时每次读取的字节数
+TAIL_CHUNK = 64 * 1024
+# 索引中五星记录保留的字段
+FIVE_STAR_KEYS = ("resourceId", "resourceType", "name", "time")
+
+_store_locks: Dict[str, asyncio.Lock] = {}
+
+
+def get_store_lock(uid: str) -> asyncio.Lock:
+    """同一个UID的抽卡记录同时只允许一个写入"""
+    uid = str(uid)
+    if uid not in _store_locks:
+        _store_locks[uid] = asyncio.Lock()
+    return _store_locks[uid]
+
+
+def _new_pool_index() -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "first_time": "",
+        "last_time": "",
+        "last_id": 0,
+        # 已xx抽未出金
+        "pity": 0,
+        # 五星记录，按时间正序，gacha_num 为出金所用抽数
+        "five_stars": [],
+    }
+
+
+def _update_pool_index(pool: Dict[str, Any], records: List[Dict]) -> Dict[str, Any]:
+    """records 按时间正序"""
+    for record in records:
+        if record["qualityLevel"] == 5:
+            five_star = {k: record[k] for k in FIVE_STAR_KEYS}
+            five_star["gacha_num"] = pool["pity"] + 1
+            pool["five_stars"].append(five_star)
+            pool["pity"] = 0
+        else:
+            pool["pity"] += 1
+
+    if records:
+        pool["count"] += len(records)
+        if not pool["first_time"]:
+            pool["first_time"] = records[0]["time"]
+        pool["last_time"] = records[-1]["time"]
+        pool["last_id"] = records[-1]["resourceId"]
+    return pool
+
+
+def _dump_lines(records: List[Dict]) -> str:
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+
+def _atomic_write(path: Path, content: str):
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(content, encoding="UTF-8")
+    os.replace(tmp_path, path)
+
+
+class GachaStore:
+    """
+    单个UID的抽卡记录存储
+    每个卡池(cardPoolType)一个只追加的jsonl分段，记录按时间正序；
+    index.json 保存每个卡池的数量、最后一条记录、保底计数和五星列表，
+    抽卡记录卡片只读索引；备份按分段内容hash去重
+    """
+
+    def __init__(self, uid: str):
+        self.uid = str(uid)
+        self.path = PLAYER_PATH / self.uid / STORE_DIR
+        self.backup_path = self.path / BACKUP_DIR
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def exists(self) -> bool:
+        return (self.path / INDEX_FILE).exists()
+
+    def _segment(self, pool_type: str) -> Path:
+        return self.path / f"{pool_type}.jsonl"
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            index_path = self.path / INDEX_FILE
+            if index_path.exists():
+                self._index = json.loads(index_path.read_text(encoding="UTF-8"))[
+                    "pools"
+                ]
+            else:
+                self._index = {}
+        return self._index
+
+    def save_index(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        _atomic_write(
+            self.path / INDEX_FILE,
+            json.dumps({"pools": self.load_index()}, ensure_ascii=False),
+        )
+
+    def get_pool_index(self, pool_type: str) -> Dict[str, Any]:
+        return self.load_index().get(pool_type) or _new_pool_index()
+
+    def read_pool(self, pool_type: str) -> List[Dict]:
+        """读取整个卡池，按时间倒序(与接口返回的顺序一致)"""
+        path = self._segment(pool_type)
+        if not path.exists():
+            return []
+        with open(path, "r", encoding="UTF-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return records[::-1]
+
+    def read_tail(self, pool_type: str, num: int) -> List[Dict]:
+        """只从文件末尾读取最新的num条记录，按时间倒序"""
+        path = self._segment(pool_type)
+        if num <= 0 or not path.exists():
+            return []
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            data = b""
+            # 多读一个换行，保证最后num行都是完整的
+            while pos > 0 and data.count(b"\n") <= num:
+                step = min(TAIL_CHUNK, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        return [json.loads(line) for line in lines[-num:]][::-1]
+
+    def append(self, pool_type: str, logs: List[Dict]):
+        """追加新记录(按时间倒序传入)，并增量更新索引"""
+        if not logs:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        records = logs[::-1]
+        with open(self._segment(pool_type), "a", encoding="UTF-8") as f:
+            f.write(_dump_lines(records))
+
+        index = self.load_index()
+        index[pool_type] = _update_pool_index(self.get_pool_index(pool_type), records)
+        self.save_index()
+
+    def rewrite(self, pool_type: str, logs: List[Dict]):
+        """重写整个卡池(按时间倒序传入)"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        records = logs[::-1]
+        _atomic_write(self._segment(pool_type), _dump_lines(records))
+
+        index = self.load_index()
+        index[pool_type] = _update_pool_index(_new_pool_index(), records)
+        self.save_index()
+
+    def save_pool(self, pool_type: str, logs: List[Dict]):
+        """
+        保存合并后的整个卡池(按时间倒序传入)
+        已有记录原样位于最早的部分时只追加新记录，否则(导入了更早的记录)重写
+        """
+        count = self.get_pool_index(pool_type)["count"]
+        new_num = len(logs) - count
+        if new_num >= 0 and (count == 0 or logs[new_num:] == self.read_pool(pool_type)):
+            self.append(pool_type, logs[:new_num])
+        else:
+            self.rewrite(pool_type, logs)
+
+    def backup(self, type: str):
+        """按分段内容hash备份，内容没有变化的分段不会重复保存"""
+        segments = sorted(self.path.glob("*.jsonl"))
+        if not segments:
+            return
+        self.backup_path.mkdir(parents=True, exist_ok=True)
+
+        pools = {}
+        for segment in segments:
+            content = segment.read_bytes()
+            digest = hashlib.sha1(content).hexdigest()
+            backup_file = self.backup_path / f"{digest}.jsonl"
+            if not backup_file.exists():
+                backup_file.write_bytes(content)
+            pools[segment.stem] = digest
+
+        manifest_path = self.backup_path / MANIFEST_FILE
+        if manifest_path.exists():
+            lines = manifest_path.read_text(encoding="UTF-8").splitlines()
+            if lines and json.loads(lines[-1])["pools"] == pools:
+                return
+        with open(manifest_path, "a", encoding="UTF-8") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "type": type,
+                        "pools": pools,
+                    },
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
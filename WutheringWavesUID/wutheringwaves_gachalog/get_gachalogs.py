@@ -7,7 +7,6 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 import aiofiles
-import msgspec
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
@@ -18,6 +17,7 @@ from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
 from ..utils.waves_api import waves_api
 from ..version import WutheringWavesUID_version
 from ..wutheringwaves_config import PREFIX
+from .gacha_store import GachaStore, get_store_lock
 from .model import WWUIDGacha
 from .model_for_waves_plugin import WavesPluginGacha
 
@@ -109,9 +109,39 @@ def merge_gacha_logs_by_common_subarray(
     return prefix + common_subarray + suffix
 
 
+def _group_by_time(logs: List[GachaLog]) -> Dict[str, List[GachaLog]]:
+    groups: Dict[str, List[GachaLog]] = {}
+    for log in logs:
+        groups.setdefault(log.time, []).append(log)
+    return groups
+
+
+# 按time分组后合并两个GachaLog列表，不去重，按time倒序
+def merge_gacha_logs(a: List[GachaLog], b: List[GachaLog]) -> List[GachaLog]:
+    """
+    相同的记录一定有相同的time，所以按time分组后只需逐组合并：
+    只有一方有的组直接保留，两边相同的组保留一份，
+    两边不同的组(一般不超过一次十连)再用最长公共子串合并
+    """
+    a_groups = _group_by_time(a)
+    b_groups = _group_by_time(b)
+
+    result = []
+    # time格式固定为 %Y-%m-%d %H:%M:%S，可以直接按字符串排序
+    for time in sorted(a_groups.keys() | b_groups.keys(), reverse=True):
+        a_group = a_groups.get(time)
+        b_group = b_groups.get(time)
+        if a_group and b_group and a_group != b_group:
+            result.extend(merge_gacha_logs_by_common_subarray(a_group, b_group))
+        else:
+            result.extend(a_group or b_group or [])
+    return result
+
+
 async def get_new_gachalog(
-    uid: str, record_id: str, full_data: Dict[str, List[GachaLog]], is_force: bool
+    uid: str, record_id: str, store: GachaStore, is_force: bool
 ) -> tuple[Union[str, None], Dict[str, List[GachaLog]], Dict[str, int]]:
+    """返回每个卡池新增的记录"""
     new = {}
     new_count = {}
     for gacha_name, card_pool_type in gacha_type_meta_data.items():
@@ -130,9 +160,13 @@ async def get_new_gachalog(
         for log in gacha_log:
             if log.cardPoolType != card_pool_type:
                 log.cardPoolType = card_pool_type
-        old_length = find_length(full_data[gacha_name], gacha_log)
+        # 重叠部分只会在已有记录中最新的那一段
+        old_gacha_log = [
+            GachaLog(**log) for log in store.read_tail(card_pool_type, len(gacha_log))
+        ]
+        old_length = find_length(old_gacha_log, gacha_log)
         _add = gacha_log if old_length == 0 else gacha_log[:-old_length]
-        new[gacha_name] = _add + copy.deepcopy(full_data[gacha_name])
+        new[gacha_name] = _add
         new_count[gacha_name] = len(_add)
         await asyncio.sleep(1)
 
@@ -140,9 +174,10 @@ async def get_new_gachalog(
 
 
 async def get_new_gachalog_for_file(
-    full_data: Dict[str, List[GachaLog]],
+    store: GachaStore,
     import_data: Dict[str, List[GachaLog]],
 ) -> tuple[Union[str, None], Dict[str, List[GachaLog]], Dict[str, int]]:
+    """返回每个卡池合并后的全部记录"""
     new = {}
     new_count = {}
 
@@ -152,24 +187,61 @@ async def get_new_gachalog_for_file(
             continue
         gacha_name = cardPoolType
         gacha_log = [GachaLog(**log.dict()) for log in item]
-        new_gacha_log = merge_gacha_logs_by_common_subarray(
-            full_data[gacha_name], gacha_log
-        )
+        full_data = [
+            GachaLog(**log) for log in store.read_pool(gacha_type_meta_data[gacha_name])
+        ]
+        new_gacha_log = merge_gacha_logs(full_data, gacha_log)
         new[gacha_name] = new_gacha_log
         new_count[gacha_name] = len(new_gacha_log)
     return None, new, new_count
 
 
-async def backup_gachalogs(uid: str, gachalogs_history: Dict, type: str):
-    path = PLAYER_PATH / str(uid)
-    if not path.exists():
-        path.mkdir(parents=True, exist_ok=True)
-    # 备份
-    backup_path = (
-        path / f"{type}_gacha_logs_{datetime.now().strftime('%Y-%m-%d.%H%M%S')}.json"
-    )
-    async with aiofiles.open(backup_path, "w", encoding="UTF-8") as file:
-        await file.write(json.dumps(gachalogs_history, ensure_ascii=False))
+async def load_gacha_store(uid: str) -> GachaStore:
+    """获取抽卡记录存储，旧版的 gacha_logs.json 会在第一次使用时迁移"""
+    store = GachaStore(uid)
+    legacy_path = PLAYER_PATH / str(uid) / "gacha_logs.json"
+    if store.exists() or not legacy_path.exists():
+        return store
+
+    async with get_store_lock(uid):
+        if store.exists():
+            return store
+
+        with Path.open(legacy_path, encoding="UTF-8") as f:
+            gachalogs_history: Dict = json.load(f)["data"]
+
+        temp = copy.deepcopy(gachalogs_history_meta)
+        temp.update(gachalogs_history)
+        gachalogs_history = temp
+
+        for gacha_name, card_pool_type in gacha_type_meta_data.items():
+            for log in range(len(gachalogs_history[gacha_name]) - 1, -1, -1):
+                pool_type = gachalogs_history[gacha_name][log]["cardPoolType"]
+                if pool_type == card_pool_type:
+                    continue
+                if card_pool_type == "武器精准调谐" and pool_type == "角色精准调谐-2":
+                    del gachalogs_history[gacha_name][log]
+                elif (
+                    card_pool_type == "角色调谐（常驻池）"
+                    and pool_type == "武器精准调谐"
+                ):
+                    del gachalogs_history[gacha_name][log]
+                elif card_pool_type == "武器调谐（常驻池）" and pool_type == "全频调谐":
+                    del gachalogs_history[gacha_name][log]
+                else:
+                    gachalogs_history[gacha_name][log]["cardPoolType"] = card_pool_type
+
+            store.rewrite(
+                card_pool_type,
+                [GachaLog(**log).dict() for log in gachalogs_history[gacha_name]],
+            )
+        store.save_index()
+
+        # 旧文件保留在备份目录中
+        store.backup_path.mkdir(parents=True, exist_ok=True)
+        legacy_path.rename(store.backup_path / "gacha_logs.json")
+        logger.info(f"[鸣潮] UID{uid} 抽卡记录已迁移为分段存储")
+    return store
 
 
 async def save_gachalogs(
@@ -179,91 +251,35 @@ async def save_gachalogs(
     is_force: bool = False,
     import_data: Optional[Dict[str, List[GachaLog]]] = None,
 ) -> str:
-    path = PLAYER_PATH / str(uid)
-    if not path.exists():
-        path.mkdir(parents=True, exist_ok=True)
+    store = await load_gacha_store(uid)
 
-    # 抽卡记录json路径
-    gachalogs_path = path / "gacha_logs.json"
-
-    temp_gachalogs_history = {}
-    if gachalogs_path.exists():
-        with Path.open(gachalogs_path, encoding="UTF-8") as f:
-            gachalogs_history: Dict = json.load(f)
-
-        # import 时备份
-        if not record_id:
-            await backup_gachalogs(uid, gachalogs_history, type="import")
-
-        # update 时备份
-        temp_gachalogs_history = copy.deepcopy(gachalogs_history)
-
-        gachalogs_history = gachalogs_history["data"]
-    else:
-        gachalogs_history = copy.deepcopy(gachalogs_history_meta)
-
-    temp = copy.deepcopy(gachalogs_history_meta)
-    temp.update(gachalogs_history)
-    gachalogs_history = temp
-
-    is_need_backup = False
-    for gacha_name, card_pool_type in gacha_type_meta_data.items():
-        for log in range(len(gachalogs_history[gacha_name]) - 1, -1, -1):
-            pool_type = gachalogs_history[gacha_name][log]["cardPoolType"]
-            if pool_type == card_pool_type:
-                continue
-            if card_pool_type == "武器精准调谐" and pool_type == "角色精准调谐-2":
-                del gachalogs_history[gacha_name][log]
-            elif card_pool_type == "角色调谐（常驻池）" and pool_type == "武器精准调谐":
-                del gachalogs_history[gacha_name][log]
-            elif card_pool_type == "武器调谐（常驻池）" and pool_type == "全频调谐":
-                del gachalogs_history[gacha_name][log]
+    async with get_store_lock(uid):
+        if record_id:
+            code, gachalogs_new, gachalogs_count_add = await get_new_gachalog(
+                uid, record_id, store, is_force
+            )
+        else:
+            # import 时备份，内容相同的分段不会重复保存
+            store.backup("import")
+            code, gachalogs_new, gachalogs_count_add = await get_new_gachalog_for_file(
+                store, import_data  # type: ignore
+            )
+
+        if isinstance(code, str) or not gachalogs_new:
+            return code or ERROR_MSG_INVALID_LINK
+
+        if record_id:
+            await save_record_id(ev.user_id, ev.bot_id, uid, record_id)
+
+        for gacha_name, gacha_log in gachalogs_new.items():
+            card_pool_type = gacha_type_meta_data[gacha_name]
+            logs = [log.dict() for log in gacha_log]
+            if record_id:
+                # 链接更新时只有新增记录，直接追加
+                store.append(card_pool_type, logs)
             else:
-                gachalogs_history[gacha_name][log]["cardPoolType"] = card_pool_type
-
-            is_need_backup = True
-
-    if is_need_backup:
-        await backup_gachalogs(uid, temp_gachalogs_history, type="update")
-
-    for gacha_name in gacha_type_meta_data.keys():
-        gachalogs_history[gacha_name] = [
-            GachaLog(**log) for log in gachalogs_history[gacha_name]
-        ]
-
-    if record_id:
-        code, gachalogs_new, gachalogs_count_add = await get_new_gachalog(
-            uid, record_id, gachalogs_history, is_force
-        )
-    else:
-        code, gachalogs_new, gachalogs_count_add = await get_new_gachalog_for_file(
-            gachalogs_history, import_data  # type: ignore
-        )
-
-    if isinstance(code, str) or not gachalogs_new:
-        return code or ERROR_MSG_INVALID_LINK
-
-    if record_id:
-        await save_record_id(ev.user_id, ev.bot_id, uid, record_id)
-
-    # 获取当前时间
-    current_time = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
-
-    # 初始化最后保存的数据
-    result = {"uid": uid, "data_time": current_time}
-
-    # 保存数量
-    for gacha_name in gacha_type_meta_data.keys():
-        result[gacha_name] = len(gachalogs_new.get(gacha_name, []))  # type: ignore
-
-    result["data"] = {  # type: ignore
-        gacha_name: [log.dict() for log in gachalogs_new.get(gacha_name, [])]
-        for gacha_name in gacha_type_meta_data.keys()
-    }
-
-    vo = msgspec.to_builtins(result)
-    async with aiofiles.open(gachalogs_path, "w", encoding="UTF-8") as file:
-        await file.write(json.dumps(vo, ensure_ascii=False))
+                store.save_pool(card_pool_type, logs)
+        store.save_index()
 
     # 计算数据
     all_add = sum(gachalogs_count_add.values())
@@ -353,12 +369,8 @@ async def export_gachalogs(uid: str) -> dict:
     now = datetime.now()
     current_time = now.strftime("%Y-%m-%d %H:%M:%S")
 
-    # 抽卡记录json路径
-    gachalogs_path = path / "gacha_logs.json"
-    if gachalogs_path.exists():
-        async with aiofiles.open(gachalogs_path, "r", encoding="UTF-8") as f:
-            raw_data = json.loads(await f.read())
-
+    store = await load_gacha_store(uid)
+    if store.exists():
         result = {
             "info": {
                 "export_time": current_time,
@@ -370,9 +382,8 @@ async def export_gachalogs(uid: str) -> dict:
             },
             "list": [],
         }
-        gachalogs_history = raw_data["data"]
-        for name, gachalogs in gachalogs_history.items():
-            result["list"].extend(gachalogs)
+        for card_pool_type in gacha_type_meta_data.values():
+            result["list"].extend(store.read_pool(card_pool_type))
 
         async with aiofiles.open(
             path / f"export_{uid}.json", "w", encoding="UTF-8"
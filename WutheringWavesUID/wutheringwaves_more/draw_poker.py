@@ -1,11 +1,11 @@
 from pathlib import Path
+from typing import List, Optional
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
-from ..utils.api.model import AccountBaseInfo, MoreActivity
+from ..utils.api.model import AccountBaseInfo, MoreActivity, PhantomBattle
 from ..utils.error_reply import WAVES_CODE_102
 from ..utils.fonts.waves_fonts import (
     waves_font_25,
@@ -22,6 +22,7 @@ from ..utils.image import (
     pic_download_from_url,
 )
 from ..utils.imagetool import draw_pic_with_ring
+from ..utils.render import convert_img, run_render
 from ..utils.resource.RESOURCE_PATH import POKER_PATH
 from ..utils.waves_api import waves_api
 
@@ -97,6 +98,32 @@ async def draw_poker_img(ev: Event, uid: str, user_id: str):
         return account_info.throw_msg()
     account_info = AccountBaseInfo.model_validate(account_info.data)
 
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    badge_icons = [
+        await pic_download_from_url(POKER_PATH, pic_url=badge.iconUrl)
+        for badge in phantomBattle.badgeList
+    ]
+
+    card_img = await run_render(
+        draw_poker_card,
+        account_info,
+        phantomBattle,
+        avatar,
+        avatar_ring,
+        badge_icons,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_poker_card(
+    account_info: AccountBaseInfo,
+    phantomBattle: PhantomBattle,
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    badge_icons: List[Optional[Image.Image]],
+) -> Image.Image:
+    """绘制卡牌信息，在渲染线程中执行"""
     # 计算徽章行数来调整总高度
     total_badges = len(phantomBattle.badgeList)
     badges_per_row = 4
@@ -118,7 +145,6 @@ async def draw_poker_img(ev: Event, uid: str, user_id: str):
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
     # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (25, 70), avatar)
     card_img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -323,7 +349,7 @@ async def draw_poker_img(ev: Event, uid: str, user_id: str):
                 width=2,
             )
 
-        icon_img = await pic_download_from_url(POKER_PATH, pic_url=badge.iconUrl)
+        icon_img = badge_icons[i]
 
         if icon_img:
             # 图标区域
@@ -385,6 +411,4 @@ async def draw_poker_img(ev: Event, uid: str, user_id: str):
 
     card_img.paste(badge_bg, (15, y_offset), badge_bg)
 
-    card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 600, 20)
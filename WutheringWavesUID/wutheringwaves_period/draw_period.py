@@ -8,7 +8,6 @@ from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
 from gsuid_core.sv import get_plugin_available_prefix
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.api.model import AccountBaseInfo, Period, PeriodDetail, PeriodList
@@ -19,6 +18,7 @@ from ..utils.fonts.waves_fonts import (
     waves_font_36,
 )
 from ..utils.image import add_footer, get_event_avatar, get_waves_bg
+from ..utils.render import convert_img, run_render
 from ..utils.waves_api import waves_api
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
@@ -152,6 +152,19 @@ async def _draw_period_img(ev: Event, valid: Dict):
     account_info: AccountBaseInfo = valid["account_info"]
     period_node: Period = valid["period_node"]
 
+    avatar_img = await draw_pic_with_ring(ev)
+    return await run_render(
+        draw_period_card, account_info, period_detail, period_node, avatar_img
+    )
+
+
+def draw_period_card(
+    account_info: AccountBaseInfo,
+    period_detail: PeriodDetail,
+    period_node: Period,
+    avatar_img: Image.Image,
+) -> Image.Image:
+    """绘制资源简报卡片，在渲染线程中执行"""
     img = get_waves_bg(based_w, based_h, bg="bg10")
 
     # 遮罩
@@ -167,7 +180,6 @@ async def _draw_period_img(ev: Event, valid: Dict):
         (240, 140), f"特征码: {account_info.id}", "black", waves_font_24, "lm"
     )
 
-    avatar_img = await draw_pic_with_ring(ev)
     title_img.paste(avatar_img, (27, 8), avatar_img)
 
     img.paste(title_img, (0, 30), title_img)
@@ -177,7 +189,7 @@ async def _draw_period_img(ev: Event, valid: Dict):
     img.paste(slagon_img, (500, 95), slagon_img)
 
     # 绘制底板
-    home_bg = await crop_home_img()
+    home_bg = crop_home_img()
     # topup
     topup_bg = Image.open(TEXT_PATH / "txt-topup.png")
     home_bg.alpha_composite(topup_bg, (0, 60))
@@ -230,11 +242,10 @@ async def _draw_period_img(ev: Event, valid: Dict):
     draw_legend_on_home_bg(home_bg, pie_data_num_map, 50, 345)
 
     img.paste(home_bg, (30, 235), home_bg)
-    img = add_footer(img, 600, 25)
-    return img
+    return add_footer(img, 600, 25)
 
 
-async def crop_home_img():
+def crop_home_img():
     img = Image.new("RGBA", (718, 650), (0, 0, 0, 0))
     # 绘制底板
     # 718*56
@@ -1,14 +1,13 @@
 import asyncio
 import copy
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, List, Union
 
 import httpx
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.wwapi import GET_HOLD_RATE_URL
 from ..utils.ascension.char import get_char_model
@@ -30,6 +29,7 @@ from ..utils.image import (
     get_square_avatar,
     get_waves_bg,
 )
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import (
     ATTRIBUTE_ID_MAP,
     NORMAL_LIST,
@@ -90,6 +90,44 @@ async def new_draw_char_hold_rate(ev: Event, data, group_id: str = "") -> bytes:
     # 按持有率从高到低排序
     char_list = sorted(char_list, key=lambda x: x["hold_rate"], reverse=True)
 
+    avatars = {}
+    attr_imgs = {}
+    for char_data in char_list:
+        char_id = char_data["char_id"]
+        char_model = get_char_model(char_id)
+        if not char_model:
+            continue
+        if char_id not in avatars:
+            avatars[char_id] = await draw_pic(char_id)
+        attribute_name = ATTRIBUTE_ID_MAP[char_model.attributeId]
+        if attribute_name not in attr_imgs:
+            attr_imgs[attribute_name] = await get_attribute(
+                attribute_name, is_simple=True
+            )
+
+    img = await run_render(
+        draw_char_hold_rate_card,
+        data,
+        char_list,
+        filter_type,
+        group_id,
+        avatars,
+        attr_imgs,
+    )
+
+    # 转换为字节
+    return await convert_img(img)
+
+
+def draw_char_hold_rate_card(
+    data: Dict,
+    char_list: List[Dict],
+    filter_type: str,
+    group_id: str,
+    avatars: Dict[str, Image.Image],
+    attr_imgs: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制角色持有率，在渲染线程中执行"""
     # 设置图像尺寸
     width = 1300
     margin = 30
@@ -161,7 +199,7 @@ async def new_draw_char_hold_rate(ev: Event, data, group_id: str = "") -> bytes:
         # 属性
         attribute_text = char_model.attributeId
         attribute_name = ATTRIBUTE_ID_MAP[attribute_text]
-        role_attribute = await get_attribute(attribute_name, is_simple=True)
+        role_attribute = attr_imgs[attribute_name]
         role_attribute = role_attribute.resize((40, 40)).convert("RGBA")
         bar_bg.alpha_composite(role_attribute, (150, 20))
 
@@ -219,16 +257,13 @@ async def new_draw_char_hold_rate(ev: Event, data, group_id: str = "") -> bytes:
         bar_bg.alpha_composite(hole_progress_bg, (135, 71))
 
         # 绘制角色头像
-        avatar = await draw_pic(char_id)
+        avatar = avatars[char_id]
         bar_bg.paste(avatar, (50, 20), avatar)
 
         img.alpha_composite(bar_bg, (0, header_height + idx * item_spacing))
 
     # 添加页脚
-    img = add_footer(img)
-
-    # 转换为字节
-    return await convert_img(img)
+    return add_footer(img)
 
 
 async def draw_pic(roleId):
@@ -1,12 +1,11 @@
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
 import httpx
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.wwapi import GET_SLASH_APPEAR_RATE
 from ..utils.ascension.char import get_char_model
@@ -18,6 +17,7 @@ from ..utils.fonts.waves_fonts import (
     waves_font_58,
 )
 from ..utils.image import add_footer, get_ICON, get_square_avatar, get_waves_bg
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import NAME_ALIAS
 from ..utils.util import timed_async_cache
 
@@ -92,6 +92,37 @@ async def draw_slash_use_rate(ev: Event):
 
         h = title_h + totalNum * bar_star_h + slash_name_bg_h + footer_h
 
+    avatars = {}
+    for i in show_data:
+        rates = i["rates"]
+        if filter_type is None:
+            rates = rates[: defaule_filter * 4]
+        for rate_temp in rates:
+            char_id = rate_temp["char_id"]
+            if char_id not in avatars and get_char_model(char_id):
+                avatars[char_id] = await get_square_avatar(char_id)
+
+    card_img = await run_render(
+        draw_slash_use_rate_card,
+        show_data,
+        filter_type,
+        defaule_filter,
+        h,
+        avatars,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_slash_use_rate_card(
+    show_data: List[Dict],
+    filter_type: Optional[str],
+    defaule_filter: int,
+    h: int,
+    avatars: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制冥海出场率，在渲染线程中执行"""
+    slash_name_bg_h = 150
     card_img = get_waves_bg(1050, h, "bg9")
 
     # title
@@ -152,7 +183,7 @@ async def draw_slash_use_rate(ev: Event):
             if not char_model:
                 continue
 
-            temp_pic = await get_temp_pic(char_id, char_model, rate)
+            temp_pic = get_temp_pic(avatars[char_id], char_model, rate)
             temp_pic = temp_pic.resize((200, 157))
             card_img.alpha_composite(
                 temp_pic,
@@ -168,13 +199,10 @@ async def draw_slash_use_rate(ev: Event):
         if filter_type is None:
             start_y += 180 * defaule_filter
 
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img)
 
 
-async def get_temp_pic(char_id: str, char_model: CharacterModel, rate: float):
-    avatar = await get_square_avatar(char_id)
+def get_temp_pic(avatar: Image.Image, char_model: CharacterModel, rate: float):
     avatar = avatar.resize((180, 180))
     if char_model.starLevel == 5:
         star_fg = Image.open(TEXT_PATH / "star5_fg.png")
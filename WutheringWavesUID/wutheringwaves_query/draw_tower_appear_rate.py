@@ -1,12 +1,11 @@
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
 import httpx
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.wwapi import ABYSS_TYPE_MAP_REVERSE, GET_TOWER_APPEAR_RATE
 from ..utils.ascension.char import get_char_model
@@ -18,6 +17,7 @@ from ..utils.fonts.waves_fonts import (
     waves_font_58,
 )
 from ..utils.image import add_footer, get_ICON, get_square_avatar, get_waves_bg
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import NAME_ALIAS
 from ..utils.util import timed_async_cache
 
@@ -55,6 +55,25 @@ async def draw_tower_use_rate(ev: Event):
     elif "中" in text or "深境" in text:
         filter_type = "m4"
 
+    avatars = {}
+    for i in data["appear_rate_list"]:
+        if filter_type is not None and i["area_type"] != filter_type:
+            continue
+        rates = i["rates"] if filter_type is not None else i["rates"][:12]
+        for rate_temp in rates:
+            char_id = rate_temp["char_id"]
+            if char_id not in avatars and get_char_model(char_id):
+                avatars[char_id] = await get_square_avatar(char_id)
+
+    card_img = await run_render(draw_tower_use_rate_card, data, filter_type, avatars)
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_tower_use_rate_card(
+    data: Dict, filter_type: Optional[str], avatars: Dict[str, Image.Image]
+) -> Image.Image:
+    """绘制深塔出场率，在渲染线程中执行"""
     title_h = 500
     bar_star_h = 180
     tower_name_bg_h = 100
@@ -122,7 +141,7 @@ async def draw_tower_use_rate(ev: Event):
             if not char_model:
                 continue
 
-            temp_pic = await get_temp_pic(char_id, char_model, rate)
+            temp_pic = get_temp_pic(avatars[char_id], char_model, rate)
             temp_pic = temp_pic.resize((200, 157))
             card_img.alpha_composite(
                 temp_pic,
@@ -138,13 +157,10 @@ async def draw_tower_use_rate(ev: Event):
         if filter_type is None:
             start_y += 180 * 3
 
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img)
 
 
-async def get_temp_pic(char_id: str, char_model: CharacterModel, rate: float):
-    avatar = await get_square_avatar(char_id)
+def get_temp_pic(avatar: Image.Image, char_model: CharacterModel, rate: float):
     avatar = avatar.resize((180, 180))
     if char_model.starLevel == 5:
         star_fg = Image.open(TEXT_PATH / "star5_fg.png")
@@ -1,7 +1,7 @@
 import asyncio
 import time
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from PIL import Image, ImageDraw
 from pydantic import BaseModel
@@ -9,20 +9,12 @@ from pydantic import BaseModel
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
-from ..utils.api.model import RoleDetailData, WeaponData
 from ..utils.cache import TimedCache
-from ..utils.calc import WuWaCalc
-from ..utils.calculate import (
-    calc_phantom_score,
-    get_calc_map,
-    get_total_score_bg,
-)
-from ..utils.char_info_utils import get_all_role_detail_info_list
+from ..utils.char_info_utils import has_role_data
 from ..utils.damage.abstract import DamageRankRegister
-from ..utils.database.models import WavesBind, WavesUser
+from ..utils.database.models import WavesBind, WavesRoleRank, WavesUser
 from ..utils.fonts.waves_fonts import (
     waves_font_14,
     waves_font_16,
@@ -50,8 +42,10 @@ from ..utils.image import (
     get_waves_bg,
 )
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
+from ..utils.refresh_char_detail import build_rank_index
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import SPECIAL_CHAR, SPECIAL_CHAR_NAME
-from ..utils.util import hide_uid
+from ..utils.util import get_version, hide_uid
 from ..wutheringwaves_config import PREFIX, WutheringWavesConfig
 
 rank_length = 20  # 排行长度
@@ -66,12 +60,15 @@ promote_icon = Image.open(TEXT_PATH / "promote_icon.png")
 char_mask = Image.open(TEXT_PATH / "char_mask.png")
 logo_img = Image.open(TEXT_PATH / "logo_small_2.png")
 pic_cache = TimedCache(86400, 200)
+# 补建排行索引时每批的uid数量
+BUILD_RANK_INDEX_BATCH = 100
 
 
 class RankInfo(BaseModel):
-    roleDetail: RoleDetailData  # 角色明细
     qid: str  # qq id
     uid: str  # uid
+    roleId: int  # 角色id
+    attributeName: str  # 角色属性
     level: int  # 角色等级
     chain: int  # 命座
     chainName: str  # 命座
@@ -80,163 +77,108 @@ class RankInfo(BaseModel):
     expected_damage: str  # 期望伤害
     expected_damage_int: int  # 期望伤害
     sonata_name: str  # 合鸣效果
+    weaponId: int  # 武器id
+    weaponName: str  # 武器名字
+    weaponStarLevel: int  # 武器星级
+    weaponLevel: int  # 武器等级
+    weaponResonLevel: int  # 武器谐振
 
 
-async def get_one_rank_info(user_id, uid, role_detail, rankDetail):
-    equipPhantomList = role_detail.phantomData.equipPhantomList
-
-    calc: WuWaCalc = WuWaCalc(role_detail)
-    calc.phantom_pre = calc.prepare_phantom()
-    calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-    calc.calc_temp = get_calc_map(
-        calc.phantom_card,
-        role_detail.role.roleName,
-        role_detail.role.roleId,
-    )
-
-    # 评分
-    phantom_score = 0
-    # calc_temp = get_calc_map(phantom_sum_value, role_detail.role.roleName)
-    for i, _phantom in enumerate(equipPhantomList):
-        if _phantom and _phantom.phantomProp:
-            props = _phantom.get_props()
-            _score, _bg = calc_phantom_score(
-                role_detail.role.roleId, props, _phantom.cost, calc.calc_temp
-            )
-            phantom_score += _score
-
-    if phantom_score == 0:
-        return
-
-    phantom_score = round(phantom_score, 2)
-    phantom_bg = get_total_score_bg(
-        role_detail.role.roleName, phantom_score, calc.calc_temp
-    )
-
-    calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
-    calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
-
-    if rankDetail:
-        crit_damage, expected_damage = rankDetail["func"](
-            calc.damageAttribute, role_detail
-        )
-    else:
-        expected_damage = "0"
-
-    sonata_name = ""
-    ph_detail = calc.phantom_card.get("ph_detail", [])
-    if isinstance(ph_detail, list):
-        for ph in ph_detail:
-            if ph.get("ph_num") == 5:
-                sonata_name = ph.get("ph_name", "")
-                break
-
-            if ph.get("isFull"):
-                sonata_name = ph.get("ph_name", "")
-                break
-
-    rankInfo = RankInfo(
+def get_one_rank_info(user_id: str, rank: WavesRoleRank) -> RankInfo:
+    return RankInfo(
         **{
-            "roleDetail": role_detail,
             "qid": user_id,
-            "uid": uid,
-            "level": role_detail.role.level,
-            "chain": role_detail.get_chain_num(),
-            "chainName": role_detail.get_chain_name(),
-            "score": round(int(phantom_score * 100) / 100, ndigits=2),
-            "score_bg": phantom_bg,
-            "expected_damage": expected_damage,
-            "expected_damage_int": int(expected_damage.replace(",", "")),
-            "sonata_name": sonata_name,
+            "uid": rank.uid,
+            "roleId": rank.role_id,
+            "attributeName": rank.attribute_name,
+            "level": rank.level,
+            "chain": rank.chain,
+            "chainName": rank.chain_name,
+            "score": round(int(rank.score * 100) / 100, ndigits=2),
+            "score_bg": rank.score_bg,
+            "expected_damage": f"{rank.expected_damage:,.0f}",
+            "expected_damage_int": int(rank.expected_damage),
+            "sonata_name": rank.sonata_name,
+            "weaponId": rank.weapon_id,
+            "weaponName": rank.weapon_name,
+            "weaponStarLevel": rank.weapon_star_level,
+            "weaponLevel": rank.weapon_level,
+            "weaponResonLevel": rank.weapon_reson_level,
         }
     )
-    return rankInfo
-
-
-async def find_role_detail(
-    uid: str, char_id: Union[int, str, List[str], List[int]]
-) -> Optional[RoleDetailData]:
-    role_details = await get_all_role_detail_info_list(uid)
-    if role_details is None:
-        return None
-
-    # 将char_id转换为字符串列表进行匹配
-    if isinstance(char_id, (int, str)):
-        char_id_list = [str(char_id)]
-    else:
-        char_id_list = [str(cid) for cid in char_id]
-
-    # 使用生成器来进行过滤
-    return next(
-        (role for role in role_details if str(role.role.roleId) in char_id_list), None
-    )
 
 
-async def get_rank_info_for_user(
-    user: WavesBind,
-    char_id,
-    find_char_id,
-    rankDetail,
-    tokenLimitFlag,
-    wavesTokenUsersMap,
-):
-    rankInfoList = []
-    if not user.uid:
-        return rankInfoList
-
-    tasks = [find_role_detail(uid, find_char_id) for uid in user.uid.split("_")]
-    role_details = await asyncio.gather(*tasks)
-
-    for uid, role_detail in zip(user.uid.split("_"), role_details):
-        if (
-            tokenLimitFlag
-            and (
-                user.user_id,
-                uid,
-            )
-            not in wavesTokenUsersMap
-        ):
-            continue
-        if not role_detail:
-            continue
-        if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
-            continue
-
-        rankInfo = await get_one_rank_info(user.user_id, uid, role_detail, rankDetail)
-        if not rankInfo:
-            continue
-        rankInfoList.append(rankInfo)
+async def build_missing_rank_index(uids: List[str]):
+    """
+    为尚未建立排行索引、但已有面板数据的uid补建索引
+    索引的计算版本与当前版本不一致时同样重建
+    """
+    indexed = set(await WavesRoleRank.select_indexed_uids(uids, get_version()))
+    missing = await has_role_data([uid for uid in uids if uid not in indexed])
+    if not missing:
+        return
 
-    return rankInfoList
+    logger.info(f"[build_missing_rank_index] 补建排行索引: {len(missing)}")
+    # 分批计算，同一批内相同角色的期望伤害一起计算
+    for i in range(0, len(missing), BUILD_RANK_INDEX_BATCH):
+        await build_rank_index(missing[i : i + BUILD_RANK_INDEX_BATCH])
+        await asyncio.sleep(0)
 
 
 async def get_all_rank_info(
     users: List[WavesBind],
-    char_id,
     find_char_id,
-    rankDetail,
+    rank_type: str,
     tokenLimitFlag,
     wavesTokenUsersMap,
+    self_user_id: str,
+    self_uid: Optional[str],
 ):
-    semaphore = asyncio.Semaphore(50)
-
-    async def process_user(user):
-        async with semaphore:
-            return await get_rank_info_for_user(
-                user,
-                char_id,
-                find_char_id,
-                rankDetail,
-                tokenLimitFlag,
-                wavesTokenUsersMap,
-            )
+    # uid -> qid
+    uid_qid_map: Dict[str, str] = {}
+    for user in users:
+        if not user.uid:
+            continue
+        for uid in user.uid.split("_"):
+            if not uid:
+                continue
+            if tokenLimitFlag and (user.user_id, uid) not in wavesTokenUsersMap:
+                continue
+            if user.user_id == self_user_id or uid not in uid_qid_map:
+                uid_qid_map[uid] = user.user_id
+
+    uids = list(uid_qid_map.keys())
+    await build_missing_rank_index(uids)
+
+    role_ids = [int(i) for i in find_char_id]
+    rank_list = await WavesRoleRank.select_rank_list(
+        uids, role_ids, rank_type, rank_length
+    )
+    rankInfoList = [get_one_rank_info(uid_qid_map[r.uid], r) for r in rank_list]
 
-    tasks = [process_user(user) for user in users]
-    results = await asyncio.gather(*tasks)
+    rankId = None
+    rankInfo = None
+    if self_uid and uid_qid_map.get(self_uid) == self_user_id:
+        rankId, rankInfo = next(
+            (
+                (rankId, rankInfo)
+                for rankId, rankInfo in enumerate(rankInfoList, start=1)
+                if rankInfo.uid == self_uid
+            ),
+            (None, None),
+        )
+        if not rankId:
+            self_rank = await WavesRoleRank.select_role_rank(self_uid, role_ids)
+            if self_rank and self_rank.score > 0:
+                rankInfo = get_one_rank_info(self_user_id, self_rank)
+                rankId = (
+                    await WavesRoleRank.count_rank_before(
+                        uids, role_ids, rank_type, self_rank
+                    )
+                    + 1
+                )
 
-    # Flatten the results list
-    rankInfoList = [rank_info for result in results for rank_info in result]
-    return rankInfoList
+    return rankInfoList, rankId, rankInfo
 
 
 async def get_waves_token_condition(ev):
@@ -283,7 +225,7 @@ async def draw_rank_img(
     if char_id in SPECIAL_CHAR:
         find_char_id = SPECIAL_CHAR[char_id]
     else:
-        find_char_id = char_id
+        find_char_id = [char_id]
 
     start_time = time.time()
     logger.info(f"[get_rank_info_for_user] start: {start_time}")
@@ -303,24 +245,20 @@ async def draw_rank_img(
         return "\n".join(msg)
 
     self_uid = None
-    role_detail = None
     try:
         self_uid = await WavesBind.get_uid_by_game(ev.user_id, ev.bot_id)
-        if self_uid:
-            role_detail = await find_role_detail(self_uid, find_char_id)
-            if role_detail:
-                char_id = str(role_detail.role.roleId)
-    except Exception as _:
+    except Exception:
         pass
 
     damage_title = (rankDetail and rankDetail["title"]) or "无"
-    rankInfoList = await get_all_rank_info(
+    rankInfoList, rankId, rankInfo = await get_all_rank_info(
         list(users),
-        char_id,
         find_char_id,
-        rankDetail,
+        rank_type,
         tokenLimitFlag,
         wavesTokenUsersMap,
+        ev.user_id,
+        self_uid,
     )
     if len(rankInfoList) == 0:
         msg = []
@@ -333,34 +271,72 @@ async def draw_rank_img(
         msg.append("")
         return "\n".join(msg)
 
-    if rank_type == "评分":
-        rankInfoList.sort(
-            key=lambda i: (i.score, i.expected_damage_int, i.level, i.chain),
-            reverse=True,
-        )
-    else:
-        rankInfoList.sort(
-            key=lambda i: (i.expected_damage_int, i.score, i.level, i.chain),
-            reverse=True,
-        )
-
-    rankId = None
-    rankInfo = None
-
-    if not rankId:
-        rankId, rankInfo = next(
-            (
-                (rankId, rankInfo)
-                for rankId, rankInfo in enumerate(rankInfoList, start=1)
-                if rankInfo.uid == self_uid and ev.user_id == rankInfo.qid
-            ),
-            (None, None),
-        )
+    try:
+        if self_uid:
+            self_rank = await WavesRoleRank.select_role_rank(
+                self_uid, [int(i) for i in find_char_id]
+            )
+            if self_rank:
+                char_id = str(self_rank.role_id)
+    except Exception:
+        pass
 
-    rankInfoList = rankInfoList[:rank_length]
     if rankId and rankInfo and rankId > rank_length:
         rankInfoList.append(rankInfo)
 
+    tasks = [get_avatar(ev, rank.qid, rank.roleId) for rank in rankInfoList]
+    avatars = await asyncio.gather(*tasks)
+    attr_imgs = {}
+    effect_imgs = {}
+    weapon_imgs = {}
+    for rank in rankInfoList:
+        attribute_name = rank.attributeName or "导电"
+        if attribute_name not in attr_imgs:
+            attr_imgs[attribute_name] = await get_attribute(
+                attribute_name, is_simple=True
+            )
+        if rank.sonata_name and rank.sonata_name not in effect_imgs:
+            effect_imgs[rank.sonata_name] = await get_attribute_effect(rank.sonata_name)
+        if rank.weaponId not in weapon_imgs:
+            weapon_imgs[rank.weaponId] = await get_square_weapon(rank.weaponId)
+    pile = await get_role_pile_old(char_id, custom=True)
+
+    card_img = await run_render(
+        draw_rank_list,
+        rankInfoList,
+        avatars,
+        attr_imgs,
+        effect_imgs,
+        weapon_imgs,
+        pile,
+        rankId,
+        damage_title,
+        char_id,
+        char_name,
+        rank_type,
+        tokenLimitFlag,
+    )
+    card_img = await convert_img(card_img)
+
+    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
+    return card_img
+
+
+def draw_rank_list(
+    rankInfoList: List[RankInfo],
+    avatars: List[Tuple[Image.Image, bool]],
+    attr_imgs: Dict[str, Image.Image],
+    effect_imgs: Dict[str, Image.Image],
+    weapon_imgs: Dict[int, Image.Image],
+    pile: Image.Image,
+    rankId: Optional[int],
+    damage_title: str,
+    char_id: str,
+    char_name: str,
+    rank_type: str,
+    tokenLimitFlag: bool,
+) -> Image.Image:
+    """绘制群排行，在渲染线程中执行"""
     totalNum = len(rankInfoList)
     title_h = 500
     bar_star_h = 110
@@ -372,23 +348,16 @@ async def draw_rank_img(
     total_score = 0
     total_damage = 0
 
-    tasks = [
-        get_avatar(ev, rank.qid, rank.roleDetail.role.roleId) for rank in rankInfoList
-    ]
-    results = await asyncio.gather(*tasks)
-
-    for index, temp in enumerate(zip(rankInfoList, results)):
+    for index, temp in enumerate(zip(rankInfoList, avatars)):
         rank, role_avatar = temp
+        role_avatar = draw_avatar(*role_avatar)
         rank: RankInfo
-        rank_role_detail: RoleDetailData = rank.roleDetail
         bar_bg = bar.copy()
         bar_star_draw = ImageDraw.Draw(bar_bg)
         # role_avatar = await get_avatar(ev, rank.qid, role_detail.role.roleId)
         bar_bg.paste(role_avatar, (100, 0), role_avatar)
 
-        role_attribute = await get_attribute(
-            rank_role_detail.role.attributeName or "导电", is_simple=True
-        )
+        role_attribute = attr_imgs[rank.attributeName or "导电"]
         role_attribute = role_attribute.resize((40, 40)).convert("RGBA")
         bar_bg.alpha_composite(role_attribute, (300, 20))
 
@@ -424,7 +393,7 @@ async def draw_rank_img(
 
         # 合鸣效果
         if rank.sonata_name:
-            effect_image = await get_attribute_effect(rank.sonata_name)
+            effect_image = effect_imgs[rank.sonata_name]
             effect_image = effect_image.resize((50, 50))
             bar_bg.alpha_composite(effect_image, (533, 15))
             sonata_name = rank.sonata_name
@@ -439,34 +408,33 @@ async def draw_rank_img(
         # 武器
         weapon_bg_temp = Image.new("RGBA", (600, 300))
 
-        weaponData: WeaponData = rank_role_detail.weaponData
-        weapon_icon = await get_square_weapon(weaponData.weapon.weaponId)
+        weapon_icon = weapon_imgs[rank.weaponId]
         weapon_icon = crop_center_img(weapon_icon, 110, 110)
-        weapon_icon_bg = get_weapon_icon_bg(weaponData.weapon.weaponStarLevel)
+        weapon_icon_bg = get_weapon_icon_bg(rank.weaponStarLevel)
         weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
 
         weapon_bg_temp_draw = ImageDraw.Draw(weapon_bg_temp)
         weapon_bg_temp_draw.text(
             (200, 30),
-            f"{weaponData.weapon.weaponName}",
+            f"{rank.weaponName}",
             SPECIAL_GOLD,
             waves_font_40,
             "lm",
         )
         weapon_bg_temp_draw.text(
-            (203, 75), f"Lv.{weaponData.level}/90", "white", waves_font_30, "lm"
+            (203, 75), f"Lv.{rank.weaponLevel}/90", "white", waves_font_30, "lm"
         )
 
         _x = 220
         _y = 120
-        wrc_fill = WEAPON_RESONLEVEL_COLOR[weaponData.resonLevel or 0] + (
+        wrc_fill = WEAPON_RESONLEVEL_COLOR[rank.weaponResonLevel or 0] + (
             int(0.8 * 255),
         )
         weapon_bg_temp_draw.rounded_rectangle(
             [_x - 15, _y - 15, _x + 50, _y + 15], radius=7, fill=wrc_fill
         )
         weapon_bg_temp_draw.text(
-            (_x, _y), f"精{weaponData.resonLevel}", "white", waves_font_24, "lm"
+            (_x, _y), f"精{rank.weaponResonLevel}", "white", waves_font_24, "lm"
         )
 
         weapon_bg_temp.alpha_composite(weapon_icon_bg, dest=(45, 0))
@@ -540,7 +508,6 @@ async def draw_rank_img(
     title.alpha_composite(logo_img.copy(), dest=(50, 65))
 
     # 人物bg
-    pile = await get_role_pile_old(char_id, custom=True)
     title.paste(pile, (450, -120), pile)
     title_draw.text((200, 335), f"{avg_score}", "white", waves_font_44, "mm")
     title_draw.text((200, 375), "平均声骸分数", SPECIAL_GOLD, waves_font_20, "mm")
@@ -575,18 +542,15 @@ async def draw_rank_img(
     img_temp = Image.new("RGBA", char_mask.size)
     img_temp.paste(title, (0, 0), char_mask.copy())
     card_img.alpha_composite(img_temp, (0, 0))
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-
-    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
-    return card_img
+    return add_footer(card_img)
 
 
 async def get_avatar(
     ev: Event,
     qid: Optional[Union[int, str]],
     char_id: Union[int, str],
-) -> Image.Image:
+) -> Tuple[Image.Image, bool]:
+    """获取排行头像原图，QQ 头像标记为 True"""
     if ev.bot_id == "onebot":
         if WutheringWavesConfig.get_config("QQPicCache").data:
             pic = pic_cache.get(qid)
@@ -596,25 +560,29 @@ async def get_avatar(
         else:
             pic = await get_qq_avatar(qid, size=100)
             pic_cache.set(qid, pic)
-        pic_temp = crop_center_img(pic, 120, 120)
+        return pic, True
+
+    pic = await get_square_avatar(char_id)
 
-        img = Image.new("RGBA", (180, 180))
-        avatar_mask_temp = avatar_mask.copy()
+    return pic, False
+
+
+def draw_avatar(pic: Image.Image, is_qq: bool) -> Image.Image:
+    """裁剪排行头像，在渲染线程中执行"""
+    img = Image.new("RGBA", (180, 180))
+    avatar_mask_temp = avatar_mask.copy()
+    if is_qq:
+        pic_temp = crop_center_img(pic, 120, 120)
         mask_pic_temp = avatar_mask_temp.resize((120, 120))
         img.paste(pic_temp, (0, -5), mask_pic_temp)
     else:
-        pic = await get_square_avatar(char_id)
-
         pic_temp = Image.new("RGBA", pic.size)
         pic_temp.paste(pic.resize((160, 160)), (10, 10))
         pic_temp = pic_temp.resize((160, 160))
 
-        avatar_mask_temp = avatar_mask.copy()
         mask_pic_temp = Image.new("RGBA", avatar_mask_temp.size)
         mask_pic_temp.paste(avatar_mask_temp, (-20, -45), avatar_mask_temp)
         mask_pic_temp = mask_pic_temp.resize((160, 160))
-
-        img = Image.new("RGBA", (180, 180))
         img.paste(pic_temp, (0, 0), mask_pic_temp)
 
     return img
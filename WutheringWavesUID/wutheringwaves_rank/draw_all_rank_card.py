@@ -2,7 +2,7 @@ import asyncio
 import copy
 import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import httpx
 from PIL import Image, ImageDraw
@@ -10,7 +10,6 @@ from PIL import Image, ImageDraw
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.wwapi import (
     GET_RANK_URL,
@@ -58,6 +57,7 @@ from ..utils.image import (
     get_waves_bg,
 )
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import ATTRIBUTE_ID_MAP, SPECIAL_CHAR_NAME
 from ..utils.util import get_version
 from ..utils.waves_api import waves_api
@@ -163,7 +163,60 @@ async def draw_all_rank_card(
     if not rankInfoList.data:
         return "获取排行失败"
 
-    totalNum = len(rankInfoList.data.details)
+    tasks = [
+        get_avatar(rank.user_id, rank.char_id) for rank in rankInfoList.data.details
+    ]
+    avatars = await asyncio.gather(*tasks)
+
+    attr_img = await get_attribute(attribute_name, is_simple=True)
+    effect_imgs = {}
+    weapon_imgs = {}
+    for rank in rankInfoList.data.details:
+        if rank.sonata_name and rank.sonata_name not in effect_imgs:
+            effect_imgs[rank.sonata_name] = await get_attribute_effect(rank.sonata_name)
+        if rank.weapon_id not in weapon_imgs and get_weapon_model(rank.weapon_id):
+            weapon_imgs[rank.weapon_id] = await get_square_weapon(rank.weapon_id)
+    pile = await get_role_pile_old(char_id, custom=True)
+
+    card_img = await run_render(
+        draw_all_rank_list,
+        rankInfoList.data.details,
+        avatars,
+        attr_img,
+        effect_imgs,
+        weapon_imgs,
+        pile,
+        char_id,
+        char_name,
+        rank_type,
+        pages,
+        page_num,
+        is_self_ck,
+        self_uid,
+    )
+    card_img = await convert_img(card_img)
+
+    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
+    return card_img
+
+
+def draw_all_rank_list(
+    details: List[RankDetail],
+    avatars: List[Tuple[Image.Image, bool]],
+    attr_img: Image.Image,
+    effect_imgs: Dict[str, Image.Image],
+    weapon_imgs: Dict[int, Image.Image],
+    pile: Image.Image,
+    char_id: str,
+    char_name: str,
+    rank_type: str,
+    pages: int,
+    page_num: int,
+    is_self_ck: bool,
+    self_uid: str,
+) -> Image.Image:
+    """绘制总排行，在渲染线程中执行"""
+    totalNum = len(details)
     title_h = 500
     bar_star_h = 110
     text_bar_h = 130
@@ -205,29 +258,17 @@ async def draw_all_rank_card(
     total_score = 0
     total_damage = 0
 
-    pic = await get_square_avatar(char_id)
-
-    pic_temp = Image.new("RGBA", pic.size)
-    pic_temp.paste(pic.resize((160, 160)), (10, 10))
-    pic_temp = pic_temp.resize((160, 160))
-
-    tasks = [
-        get_avatar(rank.user_id, rank.char_id) for rank in rankInfoList.data.details
-    ]
-    results = await asyncio.gather(*tasks)
-
     bot_color = copy.deepcopy(BOT_COLOR)
     bot_color_map = {}
     avg_num = 0
-    for index, temp in enumerate(zip(rankInfoList.data.details, results)):
+    for index, temp in enumerate(zip(details, avatars)):
         rank: RankDetail = temp[0]
-        role_avatar: Image.Image = temp[1]
+        role_avatar = draw_avatar(*temp[1])
         bar_bg = bar.copy()
         bar_star_draw = ImageDraw.Draw(bar_bg)
         bar_bg.paste(role_avatar, (100, 0), role_avatar)
 
-        role_attribute = await get_attribute(attribute_name, is_simple=True)
-        role_attribute = role_attribute.resize((40, 40)).convert("RGBA")
+        role_attribute = attr_img.resize((40, 40)).convert("RGBA")
         bar_bg.alpha_composite(role_attribute, (300, 20))
 
         # 命座
@@ -264,7 +305,7 @@ async def draw_all_rank_card(
 
         # 合鸣效果
         if rank.sonata_name:
-            effect_image = await get_attribute_effect(rank.sonata_name)
+            effect_image = effect_imgs[rank.sonata_name]
             effect_image = effect_image.resize((50, 50))
             bar_bg.alpha_composite(effect_image, (790, 15))
             sonata_name = rank.sonata_name
@@ -286,7 +327,7 @@ async def draw_all_rank_card(
             )
             continue
 
-        weapon_icon = await get_square_weapon(rank.weapon_id)
+        weapon_icon = weapon_imgs[rank.weapon_id]
         weapon_icon = crop_center_img(weapon_icon, 110, 110)
         weapon_icon_bg = get_weapon_icon_bg(weapon_model.starLevel)
         weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
@@ -432,18 +473,13 @@ async def draw_all_rank_card(
     img_temp = Image.new("RGBA", char_mask2.size)
     img_temp.alpha_composite(title, (-300, 0))
     # 人物bg
-    pile = await get_role_pile_old(char_id, custom=True)
     img_temp.alpha_composite(pile, (600, -120))
 
     img_temp2 = Image.new("RGBA", char_mask2.size)
     img_temp2.paste(img_temp, (0, 0), char_mask2.copy())
 
     card_img.alpha_composite(img_temp2, (0, 0))
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-
-    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
-    return card_img
+    return add_footer(card_img)
 
 
 def get_chain_name(n: int) -> str:
@@ -483,7 +519,8 @@ def get_breach(breach: Union[int, None], level: int):
 async def get_avatar(
     qid: Optional[str],
     char_id: Union[int, str],
-) -> Image.Image:
+) -> Tuple[Image.Image, bool]:
+    """获取排行头像原图，QQ 头像标记为 True"""
     # 检查qid 为纯数字
     if qid and qid.isdigit():
         if WutheringWavesConfig.get_config("QQPicCache").data:
@@ -494,25 +531,29 @@ async def get_avatar(
         else:
             pic = await get_qq_avatar(qid, size=100)
             pic_cache.set(qid, pic)
-        pic_temp = crop_center_img(pic, 120, 120)
+        return pic, True
+
+    pic = await get_square_avatar(char_id)
+
+    return pic, False
 
-        img = Image.new("RGBA", (180, 180))
-        avatar_mask_temp = avatar_mask.copy()
+
+def draw_avatar(pic: Image.Image, is_qq: bool) -> Image.Image:
+    """裁剪排行头像，在渲染线程中执行"""
+    img = Image.new("RGBA", (180, 180))
+    avatar_mask_temp = avatar_mask.copy()
+    if is_qq:
+        pic_temp = crop_center_img(pic, 120, 120)
         mask_pic_temp = avatar_mask_temp.resize((120, 120))
         img.paste(pic_temp, (0, -5), mask_pic_temp)
     else:
-        pic = await get_square_avatar(char_id)
-
         pic_temp = Image.new("RGBA", pic.size)
         pic_temp.paste(pic.resize((160, 160)), (10, 10))
         pic_temp = pic_temp.resize((160, 160))
 
-        avatar_mask_temp = avatar_mask.copy()
         mask_pic_temp = Image.new("RGBA", avatar_mask_temp.size)
         mask_pic_temp.paste(avatar_mask_temp, (-20, -45), avatar_mask_temp)
         mask_pic_temp = mask_pic_temp.resize((160, 160))
-
-        img = Image.new("RGBA", (180, 180))
         img.paste(pic_temp, (0, 0), mask_pic_temp)
 
     return img
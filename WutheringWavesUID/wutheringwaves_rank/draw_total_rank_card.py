@@ -1,7 +1,7 @@
 import asyncio
 import copy
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import httpx
 from PIL import Image, ImageDraw
@@ -9,11 +9,11 @@ from PIL import Image, ImageDraw
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.api.wwapi import (
     GET_TOTAL_RANK_URL,
+    TotalRankDetail,
     TotalRankRequest,
     TotalRankResponse,
 )
@@ -46,6 +46,7 @@ from ..utils.image import (
     get_square_avatar,
     get_waves_bg,
 )
+from ..utils.render import convert_img, run_render
 from ..utils.util import get_version
 from ..wutheringwaves_config import WutheringWavesConfig
 
@@ -113,13 +114,36 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> Union[str, bytes]:
     if not rankInfoList.data:
         return "获取练度总排行失败"
 
+    # 获取头像
+    details = rankInfoList.data.score_details
+    tasks = [get_avatar(detail.user_id) for detail in details]
+    avatars = await asyncio.gather(*tasks)
+    char_avatars = {}
+    for detail in details:
+        for char in detail.char_score_details or []:
+            if char.char_id not in char_avatars:
+                char_avatars[char.char_id] = await get_square_avatar(char.char_id)
+
+    card_img = await run_render(
+        draw_total_rank_list, details, avatars, char_avatars, self_uid
+    )
+    return await convert_img(card_img)
+
+
+def draw_total_rank_list(
+    details: List[TotalRankDetail],
+    avatars: List[Tuple[Image.Image, bool]],
+    char_avatars: Dict[int, Image.Image],
+    self_uid: str,
+) -> Image.Image:
+    """绘制练度总排行，在渲染线程中执行"""
     # 设置图像尺寸
     width = 1300
     text_bar_height = 130
     item_spacing = 120
     header_height = 510
     footer_height = 50
-    char_list_len = len(rankInfoList.data.score_details)
+    char_list_len = len(details)
 
     # 计算所需的总高度
     total_height = (
@@ -163,18 +187,14 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> Union[str, bytes]:
     # 导入必要的图片资源
     bar = Image.open(TEXT_PATH / "bar1.png")
 
-    # 获取头像
-    details = rankInfoList.data.score_details
-    tasks = [get_avatar(detail.user_id) for detail in details]
-    results = await asyncio.gather(*tasks)
-
     # 获取角色信息
     bot_color_map = {}
     bot_color = copy.deepcopy(BOT_COLOR)
 
     # 绘制排行条目
-    for rank_temp_index, temp in enumerate(zip(details, results)):
+    for rank_temp_index, temp in enumerate(zip(details, avatars)):
         detail, role_avatar = temp
+        role_avatar = draw_avatar(*role_avatar)
         y_pos = header_height + 130 + rank_temp_index * item_spacing
 
         # 创建条目背景
@@ -264,7 +284,7 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> Union[str, bytes]:
                 char_x = char_start_x + i * char_spacing
 
                 # 获取角色头像
-                char_avatar = await get_square_avatar(char.char_id)
+                char_avatar = char_avatars[char.char_id]
                 char_avatar = char_avatar.resize((char_size, char_size))
 
                 # 应用圆形遮罩
@@ -321,13 +341,13 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> Union[str, bytes]:
 
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
-    card_img = add_footer(card_img)
-    return await convert_img(card_img)
+    return add_footer(card_img)
 
 
 async def get_avatar(
     qid: Optional[str],
-) -> Image.Image:
+) -> Tuple[Image.Image, bool]:
+    """获取排行头像原图，QQ 头像标记为 True"""
     # 检查qid 为纯数字
     if qid and qid.isdigit():
         if WutheringWavesConfig.get_config("QQPicCache").data:
@@ -338,26 +358,30 @@ async def get_avatar(
         else:
             pic = await get_qq_avatar(qid, size=100)
             pic_cache.set(qid, pic)
-        pic_temp = crop_center_img(pic, 120, 120)
+        return pic, True
+
+    default_avatar_char_id = "1505"
+    pic = await get_square_avatar(default_avatar_char_id)
 
-        img = Image.new("RGBA", (180, 180))
-        avatar_mask_temp = avatar_mask.copy()
+    return pic, False
+
+
+def draw_avatar(pic: Image.Image, is_qq: bool) -> Image.Image:
+    """裁剪排行头像，在渲染线程中执行"""
+    img = Image.new("RGBA", (180, 180))
+    avatar_mask_temp = avatar_mask.copy()
+    if is_qq:
+        pic_temp = crop_center_img(pic, 120, 120)
         mask_pic_temp = avatar_mask_temp.resize((120, 120))
         img.paste(pic_temp, (0, -5), mask_pic_temp)
     else:
-        default_avatar_char_id = "1505"
-        pic = await get_square_avatar(default_avatar_char_id)
-
         pic_temp = Image.new("RGBA", pic.size)
         pic_temp.paste(pic.resize((160, 160)), (10, 10))
         pic_temp = pic_temp.resize((160, 160))
 
-        avatar_mask_temp = avatar_mask.copy()
         mask_pic_temp = Image.new("RGBA", avatar_mask_temp.size)
         mask_pic_temp.paste(avatar_mask_temp, (-20, -45), avatar_mask_temp)
         mask_pic_temp = mask_pic_temp.resize((160, 160))
-
-        img = Image.new("RGBA", (180, 180))
         img.paste(pic_temp, (0, 0), mask_pic_temp)
 
     return img
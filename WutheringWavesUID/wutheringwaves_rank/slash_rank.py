@@ -2,7 +2,7 @@ import asyncio
 import copy
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 from PIL import Image, ImageDraw
@@ -10,7 +10,6 @@ from PIL import Image, ImageDraw
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.api.wwapi import (
@@ -46,6 +45,7 @@ from ..utils.image import (
     get_waves_bg,
     pic_download_from_url,
 )
+from ..utils.render import convert_img, run_render
 from ..utils.resource.RESOURCE_PATH import SLASH_PATH
 from ..utils.util import get_version
 from ..wutheringwaves_abyss.draw_slash_card import COLOR_QUALITY
@@ -134,12 +134,49 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
     if not rankInfoList.data:
         return "获取排行失败"
 
+    rank_list = rankInfoList.data.rank_list
+    tasks = [get_avatar(rank.user_id) for rank in rank_list]
+    avatars = await asyncio.gather(*tasks)
+    char_avatars = {}
+    buff_imgs = {}
+    for rank in rank_list:
+        for slash_half in rank.half_list:
+            for char_detail in slash_half.char_detail:
+                char_id = char_detail.char_id
+                if char_id in char_avatars or get_char_model(char_id) is None:
+                    continue
+                char_avatars[char_id] = await get_square_avatar(char_id)
+            if slash_half.buff_icon not in buff_imgs:
+                buff_imgs[slash_half.buff_icon] = await pic_download_from_url(
+                    SLASH_PATH, slash_half.buff_icon
+                )
+
+    card_img = await run_render(
+        draw_slash_rank_list,
+        rank_list,
+        avatars,
+        char_avatars,
+        buff_imgs,
+        item.waves_id,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_slash_rank_list(
+    rank_list: List[SlashRank],
+    avatars: List[Tuple[Image.Image, bool]],
+    char_avatars: Dict[int, Image.Image],
+    buff_imgs: Dict[str, Image.Image],
+    waves_id: str,
+) -> Image.Image:
+    """绘制无尽总排行，在渲染线程中执行"""
     # 设置图像尺寸
     width = 1300
     item_spacing = 120
     header_height = 510
     footer_height = 50
-    char_list_len = len(rankInfoList.data.rank_list)
+    char_list_len = len(rank_list)
 
     # 计算所需的总高度
     total_height = header_height + item_spacing * char_list_len + footer_height
@@ -171,19 +208,15 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
 
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
-    rank_list = rankInfoList.data.rank_list
-    tasks = [get_avatar(rank.user_id) for rank in rank_list]
-    results = await asyncio.gather(*tasks)
-
     # 获取角色信息
     bot_color_map = {}
     bot_color = copy.deepcopy(BOT_COLOR)
 
     # for rank_temp_index, rank_temp in enumerate(rank_list):
 
-    for rank_temp_index, temp in enumerate(zip(rank_list, results)):
+    for rank_temp_index, temp in enumerate(zip(rank_list, avatars)):
         rank_temp: SlashRank = temp[0]
-        role_avatar: Image.Image = temp[1]
+        role_avatar = draw_avatar(*temp[1])
         role_bg = Image.open(TEXT_PATH / "bar1.png")
         # role_bg = Image.new("RGBA", (width, info_h), (255, 255, 255, 0))
         role_bg.paste(role_avatar, (100, 0), role_avatar)
@@ -223,7 +256,7 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
 
         # uid
         uid_color = "white"
-        if rank_temp.waves_id == item.waves_id:
+        if rank_temp.waves_id == waves_id:
             uid_color = RED
         role_bg_draw.text(
             (350, 40), f"特征码: {rank_temp.waves_id}", uid_color, waves_font_20, "lm"
@@ -268,7 +301,7 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
                 char_model = get_char_model(char_id)
                 if char_model is None:
                     continue
-                char_avatar = await get_square_avatar(char_id)
+                char_avatar = char_avatars[char_id]
                 char_avatar = char_avatar.resize((45, 45))
 
                 if char_chain != -1:
@@ -303,7 +336,7 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
                 [0, 45, 50, 50],
                 fill=buff_color,
             )
-            buff_pic = await pic_download_from_url(SLASH_PATH, slash_half.buff_icon)
+            buff_pic = buff_imgs[slash_half.buff_icon]
             buff_pic = buff_pic.resize((50, 50))
             buff_bg.paste(buff_pic, (0, 0), buff_pic)
 
@@ -320,14 +353,13 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
 
         card_img.paste(role_bg, (0, 510 + rank_temp_index * item_spacing), role_bg)
 
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img)
 
 
 async def get_avatar(
     qid: Optional[str],
-) -> Image.Image:
+) -> Tuple[Image.Image, bool]:
+    """获取排行头像原图，QQ 头像标记为 True"""
     # 检查qid 为纯数字
     if qid and qid.isdigit():
         if WutheringWavesConfig.get_config("QQPicCache").data:
@@ -338,25 +370,29 @@ async def get_avatar(
         else:
             pic = await get_qq_avatar(qid, size=100)
             pic_cache.set(qid, pic)
-        pic_temp = crop_center_img(pic, 120, 120)
+        return pic, True
 
-        img = Image.new("RGBA", (180, 180))
-        avatar_mask_temp = avatar_mask.copy()
+    pic = await get_square_avatar(default_avatar_char_id)
+
+    return pic, False
+
+
+def draw_avatar(pic: Image.Image, is_qq: bool) -> Image.Image:
+    """裁剪排行头像，在渲染线程中执行"""
+    img = Image.new("RGBA", (180, 180))
+    avatar_mask_temp = avatar_mask.copy()
+    if is_qq:
+        pic_temp = crop_center_img(pic, 120, 120)
         mask_pic_temp = avatar_mask_temp.resize((120, 120))
         img.paste(pic_temp, (0, -5), mask_pic_temp)
     else:
-        pic = await get_square_avatar(default_avatar_char_id)
-
         pic_temp = Image.new("RGBA", pic.size)
         pic_temp.paste(pic.resize((160, 160)), (10, 10))
         pic_temp = pic_temp.resize((160, 160))
 
-        avatar_mask_temp = avatar_mask.copy()
         mask_pic_temp = Image.new("RGBA", avatar_mask_temp.size)
         mask_pic_temp.paste(avatar_mask_temp, (-20, -45), avatar_mask_temp)
         mask_pic_temp = mask_pic_temp.resize((160, 160))
-
-        img = Image.new("RGBA", (180, 180))
         img.paste(pic_temp, (0, 0), mask_pic_temp)
 
     return img
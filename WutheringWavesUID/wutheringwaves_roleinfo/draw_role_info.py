@@ -1,10 +1,9 @@
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.model import (
     AccountBaseInfo,
@@ -25,13 +24,14 @@ from ..utils.image import (
     GOLD,
     GREY,
     add_footer,
-    cropped_square_avatar,
+    cropped_square_avatar_sync,
     get_attribute,
     get_square_avatar,
     get_square_weapon,
     get_waves_bg,
 )
 from ..utils.imagetool import draw_pic_with_ring
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import NORMAL_LIST, SPECIAL_CHAR_INT
 from ..utils.waves_api import waves_api
 
@@ -66,6 +66,51 @@ async def draw_role_img(uid: str, ck: str, ev: Event):
         return calabash_data.throw_msg()
     calabash_data = CalabashData.model_validate(calabash_data.data)
 
+    # 根据面板数据获取详细信息
+    role_detail_info_map = await get_all_roleid_detail_info_int(uid)
+
+    attr_imgs = {}
+    role_avatars = {}
+    weapon_imgs = {}
+    if role_detail_info_map:
+        for role in role_info.roleList:
+            if role.attributeName not in attr_imgs:
+                attr_imgs[role.attributeName] = await get_attribute(role.attributeName)
+            role_avatars[role.roleId] = await get_square_avatar(role.roleId)
+        for temp in role_detail_info_map.values():
+            weaponId = temp.weaponData.weapon.weaponId
+            if weaponId not in weapon_imgs:
+                weapon_imgs[weaponId] = await get_square_weapon(weaponId)
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+
+    card_img = await run_render(
+        draw_role_card,
+        role_info,
+        account_info,
+        calabash_data,
+        role_detail_info_map,
+        attr_imgs,
+        role_avatars,
+        weapon_imgs,
+        avatar,
+        avatar_ring,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_role_card(
+    role_info: RoleList,
+    account_info: AccountBaseInfo,
+    calabash_data: CalabashData,
+    role_detail_info_map: Optional[Dict[int, RoleDetailData]],
+    attr_imgs: Dict[str, Image.Image],
+    role_avatars: Dict[int, Image.Image],
+    weapon_imgs: Dict[int, Image.Image],
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+) -> Image.Image:
+    """绘制卡片信息，在渲染线程中执行"""
     # five_num = sum(1 for i in role_info.roleList if i.starLevel == 5)
     up_num = sum(
         1
@@ -154,17 +199,14 @@ async def draw_role_img(uid: str, ck: str, ev: Event):
                 base_info_value_list[_len]["info_block"],
             )
 
-    # 根据面板数据获取详细信息
-    role_detail_info_map = await get_all_roleid_detail_info_int(uid)
-
-    async def calc_role_info(_x: int, _y: int, roleInfo: Role):
+    def calc_role_info(_x: int, _y: int, roleInfo: Role):
         if not role_detail_info_map:
             return
         char_bg = Image.open(TEXT_PATH / "char_bg.png")
-        char_attribute = await get_attribute(roleInfo.attributeName)
+        char_attribute = attr_imgs[roleInfo.attributeName]
         char_attribute = char_attribute.resize((40, 40)).convert("RGBA")
-        role_avatar = await get_square_avatar(roleInfo.roleId)
-        role_avatar = await cropped_square_avatar(role_avatar, 130)
+        role_avatar = role_avatars[roleInfo.roleId]
+        role_avatar = cropped_square_avatar_sync(role_avatar, 130)
         char_bg.paste(role_avatar, (10, 25), role_avatar)
         char_bg.paste(char_attribute, (155, 13), char_attribute)
 
@@ -187,7 +229,7 @@ async def draw_role_img(uid: str, ck: str, ev: Event):
         if temp:
             weapon_bg = Image.open(TEXT_PATH / "weapon_bg.png")
             weaponId = temp.weaponData.weapon.weaponId
-            weapon_icon = await get_square_weapon(weaponId)
+            weapon_icon = weapon_imgs[weaponId]
             weapon_icon = weapon_icon.resize((75, 75)).convert("RGBA")
             weapon_bg.paste(weapon_icon, (123, 73), weapon_icon)
             char_bg.paste(weapon_bg, (0, 5), weapon_bg)
@@ -208,7 +250,7 @@ async def draw_role_img(uid: str, ck: str, ev: Event):
     for index, role in enumerate(role_info.roleList):
         _x = xset + 210 * int(index % 4)
         _y = yset + 200 * int(index / 4)
-        await calc_role_info(_x, _y, role)
+        calc_role_info(_x, _y, role)
 
     # 基础信息 名字 特征码
     base_info_bg = Image.open(TEXT_PATH / "base_info_bg.png")
@@ -222,7 +264,6 @@ async def draw_role_img(uid: str, ck: str, ev: Event):
     card_img.paste(base_info_bg, (35, 170), base_info_bg)
 
     # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (45, 220), avatar)
     card_img.paste(avatar_ring, (55, 230), avatar_ring)
 
@@ -256,6 +297,4 @@ async def draw_role_img(uid: str, ck: str, ev: Event):
     line2_draw.text((475, 30), "角色信息", "white", waves_font_30, "mm")
     card_img.paste(line2, (0, yset - 70), line2)
 
-    card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 600, 20)
@@ -2,14 +2,13 @@ import asyncio
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.api.model import AccountBaseInfo, DailyData
@@ -34,11 +33,13 @@ from ..utils.image import (
     get_event_avatar,
     get_random_waves_role_pile,
     get_random_character_bg,
-    adapt_bg_image,
+    get_center_gradient_mask,
+    adapt_bg_image_sync,
     adjust_color,
     is_color_light,
 )
 from ..utils.name_convert import char_name_to_char_id
+from ..utils.render import convert_img, run_render
 from ..utils.resource.constant import SPECIAL_CHAR
 from ..utils.waves_api import waves_api
 
@@ -48,6 +49,8 @@ YES = YES.resize((40, 40))
 NO = Image.open(TEXT_PATH / "no.png")
 NO = NO.resize((40, 40))
 bar_down = Image.open(TEXT_PATH / "bar_down.png")
+# bar的边界框 (left, top, right, bottom)
+BAR_DOWN_BBOX = bar_down.getchannel("A").getbbox()
 
 based_w = 1150
 based_h = 850
@@ -129,22 +132,6 @@ async def _draw_all_stamina_img(ev: Event, img: Image.Image, valid: Dict, index:
 async def _draw_stamina_img(ev: Event, valid: Dict) -> Image.Image:
     daily_info: DailyData = valid["daily_info"]
     account_info: AccountBaseInfo = valid["account_info"]
-    if daily_info.hasSignIn:
-        sign_in_icon = YES
-        sing_in_text = "签到已完成！"
-    else:
-        sign_in_icon = NO
-        sing_in_text = "今日未签到！"
-
-    if (
-        daily_info.livenessData.total != 0
-        and daily_info.livenessData.cur == daily_info.livenessData.total
-    ):
-        active_icon = YES
-        active_text = "活跃度已满！"
-    else:
-        active_icon = NO
-        active_text = "活跃度未满！"
 
     # 核心逻辑修改：优先加载角色专属背景图
     user = await WavesUser.get_user_by_attr(
@@ -157,16 +144,13 @@ async def _draw_stamina_img(ev: Event, valid: Dict) -> Image.Image:
         # 2. 尝试获取该角色的自定义背景图
         custom_bg_path = await get_random_character_bg(user.stamina_bg_value)
 
+    pile = None
     if custom_bg_path:
         # 3. 如果找到了自定义背景图，则加载并适配它作为背景
         # 这个分支里不再有任何关于 pile 的操作
         logger.info(f"[鸣潮][每日信息] 找到角色 {user.stamina_bg_value} 的自定义背景图: {custom_bg_path}")
-        img = Image.open(custom_bg_path).convert("RGBA")
-        img = await adapt_bg_image(img, based_w, based_h)
     else:
         # 4. 如果没找到，则回退到旧版逻辑：默认背景 + 角色立绘
-        img = Image.open(TEXT_PATH / "bg.jpg").convert("RGBA")
-        
         pile_id = None
         if user and user.stamina_bg_value:
             char_id = char_name_to_char_id(user.stamina_bg_value)
@@ -189,9 +173,46 @@ async def _draw_stamina_img(ev: Event, valid: Dict) -> Image.Image:
                             break
             else:
                 pile_id = char_id
-        
-        # 获取立绘并粘贴到背景上 (这是唯一需要粘贴pile的地方)
+
         pile = await get_random_waves_role_pile(pile_id)
+
+    avatar = await draw_pic_with_ring(ev)
+    return await run_render(
+        draw_stamina_card, daily_info, account_info, custom_bg_path, pile, avatar
+    )
+
+
+def draw_stamina_card(
+    daily_info: DailyData,
+    account_info: AccountBaseInfo,
+    custom_bg_path: Optional[Path],
+    pile: Optional[Image.Image],
+    avatar: Image.Image,
+) -> Image.Image:
+    """绘制每日信息卡片，在渲染线程中执行"""
+    if daily_info.hasSignIn:
+        sign_in_icon = YES
+        sing_in_text = "签到已完成！"
+    else:
+        sign_in_icon = NO
+        sing_in_text = "今日未签到！"
+
+    if (
+        daily_info.livenessData.total != 0
+        and daily_info.livenessData.cur == daily_info.livenessData.total
+    ):
+        active_icon = YES
+        active_text = "活跃度已满！"
+    else:
+        active_icon = NO
+        active_text = "活跃度未满！"
+
+    if custom_bg_path:
+        img = Image.open(custom_bg_path).convert("RGBA")
+        img = adapt_bg_image_sync(img, based_w, based_h)
+    else:
+        img = Image.open(TEXT_PATH / "bg.jpg").convert("RGBA")
+        # 获取立绘并粘贴到背景上 (这是唯一需要粘贴pile的地方)
         img.paste(pile, (550, -150), pile)
 
     # --- 核心优化：动态文本颜色 ---
@@ -215,8 +236,7 @@ async def _draw_stamina_img(ev: Event, valid: Dict) -> Image.Image:
     info = Image.open(TEXT_PATH / "main_bar.png").convert("RGBA")
     base_info_bg = Image.open(TEXT_PATH / "base_info_bg.png")
     avatar_ring = Image.open(TEXT_PATH / "avatar_ring.png")
-    avatar = await draw_pic_with_ring(ev)
-    
+
     base_info_draw = ImageDraw.Draw(base_info_bg)
     base_info_draw.text((275, 120), f"{daily_info.roleName[:7]}", TEXT_MAIN, waves_font_30, "lm")
     base_info_draw.text(
@@ -344,43 +364,12 @@ async def _draw_stamina_img(ev: Event, valid: Dict) -> Image.Image:
     # 4. 创建一个纯色的、完全不透明的图层
     color_layer = Image.new("RGBA", (bar_w, bar_h), adjusted_color_rgb)
 
-    # 5. 【核心修正】创建中心向外渐变蒙版
-    #    获取原始bar的形状（Alpha蒙版）
-    mask = bar_down.getchannel('A').copy()
-
-    #    自动检测bar的边界框 (left, top, right, bottom)
-    bbox = mask.getbbox()
-    if bbox:
-        left, top, right, bottom = bbox
-        bar_actual_height = bottom - top
-        # 计算bar的垂直中心线
-        center_y = top + bar_actual_height / 2.0
-        
-        # 遍历蒙版在bar边界内的每一个像素
-        for y in range(top, bottom):
-            for x in range(left, right):
-                # 计算当前像素离中心线的距离
-                distance_from_center = abs(y - center_y)
-                
-                # 将距离归一化到 0.0 (中心) 到 1.0 (边缘) 的范围
-                normalized_distance = distance_from_center / (bar_actual_height / 2.0)
-                
-                # 将距离反转，得到一个中心为1.0，边缘为0.0的透明度因子
-                alpha_factor_base = 1.0 - normalized_distance
-                
-                # 应用曲线，使渐变过渡更平滑
-                final_alpha_factor = pow(alpha_factor_base, GRADIENT_CURVE)
-                
-                # 计算最终的透明度值
-                gradient_alpha = int(255 * final_alpha_factor)
-                
-                # 将计算出的渐变透明度应用到像素上
-                mask.putpixel((x, y), gradient_alpha)
-
-    # 6. 将生成的渐变蒙版乘以整体透明度因子
-    final_mask = mask.point(lambda p: int(p * ALPHA_FACTOR))
-
-    # 7. 将最终的蒙版应用到颜色图层上
+    # 5. 创建中心向外渐变蒙版，范围为原始bar形状的边界框，并乘以整体透明度因子
+    final_mask = get_center_gradient_mask(
+        bar_down.size, BAR_DOWN_BBOX, GRADIENT_CURVE, ALPHA_FACTOR
+    )
+
+    # 6. 将最终的蒙版应用到颜色图层上
     color_layer.putalpha(final_mask)
     bar_down_modified = color_layer
     # ==========================================================
@@ -390,8 +379,7 @@ async def _draw_stamina_img(ev: Event, valid: Dict) -> Image.Image:
     img.paste(avatar_ring, (40, 620), avatar_ring)
     img.paste(avatar, (40, 620), avatar)
     img.paste(title_bar, (190, 620), title_bar)
-    img = add_footer(img, 600, 25)
-    return img
+    return add_footer(img, 600, 25)
 
 async def draw_pic_with_ring(ev: Event):
     pic = await get_event_avatar(ev, is_valid_at_param=False)
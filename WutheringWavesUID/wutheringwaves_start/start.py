@@ -1,6 +1,9 @@
+from gsuid_core.aps import scheduler
 from gsuid_core.logger import logger
 from gsuid_core.server import on_core_start
 
+from ..utils.api.cookie_pool import public_cookie_pool
+from ..utils.util import public_ip_cache
 from ..wutheringwaves_resource import startup
 
 
@@ -11,9 +14,11 @@ async def all_start():
         from ..utils.damage.register_char import register_char
         from ..utils.damage.register_echo import register_echo
         from ..utils.damage.register_weapon import register_weapon
+        from ..utils.image import preload_assets
         from ..utils.limit_user_card import load_limit_user_card
         from ..utils.map.damage.register import register_damage, register_rank
         from ..utils.queues import init_queues
+        from ..utils.render import run_render
 
         # 注册
         register_weapon()
@@ -25,6 +30,15 @@ async def all_start():
         # 初始化任务队列
         init_queues()
 
+        # 后台获取公网IP
+        public_ip_cache.refresh_background()
+
+        # 后台填充公共token池
+        public_cookie_pool.refill_background()
+
+        # 预加载常用贴图
+        await run_render(preload_assets)
+
         # 加载角色极限面板
         card_list = await load_limit_user_card()
         logger.info(f"[鸣潮][加载角色极限面板] 数量: {len(card_list)}")
@@ -34,3 +48,13 @@ async def all_start():
         logger.exception(e)
 
     logger.success("[鸣潮] 启动完成✅")
+
+
+@scheduler.scheduled_job("interval", seconds=public_ip_cache.ttl)
+async def refresh_public_ip():
+    await public_ip_cache.refresh()
+
+
+@scheduler.scheduled_job("interval", minutes=10)
+async def refill_public_cookie_pool():
+    public_cookie_pool.refill_background()
@@ -1,7 +1,11 @@
 from gsuid_core.status.plugin_status import register_status
 
+from ..utils.render import render_pool
+from ..utils.queues.queues import dispatcher
+from ..utils.image import get_ICON, asset_cache
+from ..utils.char_info_utils import role_detail_cache
+from ..utils.api.cookie_pool import public_cookie_pool
 from ..utils.database.models import WavesBind, WavesUser
-from ..utils.image import get_ICON
 
 
 async def get_user_num():
@@ -14,11 +18,36 @@ async def get_add_num():
     return len(datas)
 
 
+async def get_public_cookie_num():
+    return public_cookie_pool.stats()["num"]
+
+
+async def get_upload_queue_depth():
+    return sum(i["depth"] for i in dispatcher.stats().values())
+
+
+async def get_render_queue_depth():
+    return render_pool.stats()["queue_depth"]
+
+
+async def get_asset_hit_ratio():
+    return f"{asset_cache.stats()['hit_ratio'] * 100:.1f}%"
+
+
+async def get_role_detail_hit_ratio():
+    return f"{role_detail_cache.stats()['hit_ratio'] * 100:.1f}%"
+
+
 register_status(
     get_ICON(),
     "WutheringWavesUID",
     {
         "绑定UID": get_add_num,
         "登录账户": get_user_num,
+        "公共token池": get_public_cookie_num,
+        "上传队列": get_upload_queue_depth,
+        "贴图缓存命中率": get_asset_hit_ratio,
+        "面板缓存命中率": get_role_detail_hit_ratio,
+        "渲染排队数": get_render_queue_depth,
     },
 )
@@ -7,7 +7,6 @@ import httpx
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.wwapi import GET_POOL_LIST
 from ..utils.fonts.waves_fonts import waves_font_30, waves_font_58
@@ -22,6 +21,7 @@ from ..utils.image import (
     get_waves_bg,
 )
 from ..utils.name_convert import easy_id_to_name
+from ..utils.render import convert_img, run_render
 from ..utils.util import timed_async_cache
 from .model import WavesPool
 
@@ -142,15 +142,37 @@ async def get_pool_data_by_type(query_type: str, star: int):
     if len(data_group) == 0:
         return "暂无数据"
 
+    share_bg = await get_random_share_bg()
+    pics = {}
+    for resource_id in data_group:
+        if query_type == "角色":
+            pics[resource_id] = await get_square_avatar(resource_id)
+        else:
+            pics[resource_id] = await get_square_weapon(resource_id)
+
+    card_img = await run_render(
+        draw_pool_card, result, star, query_type, share_bg, pics
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_pool_card(
+    result: Dict[str, Any],
+    star: int,
+    query_type: str,
+    share_bg: Image.Image,
+    pics: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制卡池倒计时，在渲染线程中执行"""
     title_h = 500
     bar_star_h = 110
-    totalNum = len(data_group)
+    totalNum = len(pics)
     h = title_h + totalNum * bar_star_h + 100
 
     card_img = get_waves_bg(1050, h, "bg9")
 
     # title
-    share_bg = await get_random_share_bg()
     share_bg = share_bg.resize((1080, 607))
     share_bg_crop = share_bg.crop((0, 50, 1050, 550))
 
@@ -179,18 +201,17 @@ async def get_pool_data_by_type(query_type: str, star: int):
 
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
-    await draw_pool_char(result, star, query_type, card_img)
+    draw_pool_char(result, star, query_type, card_img, pics)
 
-    card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img)
 
 
-async def draw_pool_char(
+def draw_pool_char(
     result: Dict[str, Any],
     star: int,
     query_type: str,
     card_img: Image.Image,
+    pics: Dict[str, Image.Image],
 ):
     data_group = []
     if star == 5:
@@ -210,10 +231,7 @@ async def draw_pool_char(
         bar_bg = bar.copy()
         bar_star_draw = ImageDraw.Draw(bar_bg)
 
-        if query_type == "角色":
-            pic = await get_square_avatar(resource_id)
-        else:
-            pic = await get_square_weapon(resource_id)
+        pic = pics[resource_id]
 
         pic_temp = Image.new("RGBA", pic.size)
         pic_temp.paste(pic.resize((160, 160)), (10, 10))
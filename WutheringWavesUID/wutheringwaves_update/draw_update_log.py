@@ -6,10 +6,10 @@ from typing import List, Tuple, Union
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.fonts.waves_fonts import emoji_font, waves_font_origin
 from ..utils.image import get_waves_bg
+from ..utils.render import convert_img, run_render
 
 
 def _get_git_logs() -> List[str]:
@@ -94,6 +94,12 @@ async def draw_update_log_img() -> Union[bytes, str]:
     if not _CACHED_LOGS:
         return "获取失败"
 
+    img = await run_render(draw_update_log_card)
+    return await convert_img(img)
+
+
+def draw_update_log_card() -> Image.Image:
+    """绘制更新记录，在渲染线程中执行"""
     log_title = Image.open(TEXT_PATH / "log_title.png")
     img = get_waves_bg(950, 20 + 475 + 80 * len(_CACHED_LOGS))
     img.paste(log_title, (0, 0), log_title)
@@ -141,4 +147,4 @@ async def draw_update_log_img() -> Union[bytes, str]:
         text_x = max(x, 160)
         img_draw.text((text_x, base_y + 40), text, "white", gs_font_30, "lm")
 
-    return await convert_img(img)
+    return img
@@ -8,6 +8,8 @@ from gsuid_core.logger import logger
 from gsuid_core.models import Event
 from gsuid_core.sv import SV
 
+from ..utils.api.cookie_pool import public_cookie_pool
+from ..utils.api.request_util import invalidate_used_headers
 from ..utils.button import WavesButton
 from ..utils.database.models import WavesBind, WavesUser
 from ..wutheringwaves_config import PREFIX, WutheringWavesConfig
@@ -106,6 +108,8 @@ async def send_waves_get_ck_msg(bot: Bot, ev: Event):
 async def delete_all_invalid_cookie(bot: Bot, ev: Event):
     at_sender = True if ev.group_id else False
     del_len = await WavesUser.delete_all_invalid_cookie()
+    invalidate_used_headers()
+    await public_cookie_pool.prune()
     await bot.send(f"[鸣潮] 已删除无效token【{del_len}】个\n", at_sender)
 
 
@@ -115,6 +119,8 @@ async def auto_delete_all_invalid_cookie():
     if not DelInvalidCookie:
         return
     del_len = await WavesUser.delete_all_invalid_cookie()
+    invalidate_used_headers()
+    await public_cookie_pool.prune()
     if del_len == 0:
         return
     msg = f"[鸣潮] 删除无效token【{del_len}】个"
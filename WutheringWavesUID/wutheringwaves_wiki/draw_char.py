@@ -4,7 +4,6 @@ from typing import Dict, Optional
 
 from PIL import Image, ImageDraw
 
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.ascension.char import get_char_model
 from ..utils.ascension.model import (
@@ -27,6 +26,7 @@ from ..utils.image import (
     get_role_pile,
     get_waves_bg,
 )
+from ..utils.render import convert_img, run_render
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
 
@@ -47,6 +47,15 @@ async def draw_char_skill(char_id: str):
 
     _, char_pile = await get_role_pile(char_id)
 
+    card_img = await run_render(draw_char_skill_card, char_model, char_pile)
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_char_skill_card(
+    char_model: CharacterModel, char_pile: Image.Image
+) -> Image.Image:
+    """绘制角色天赋图鉴，在渲染线程中执行"""
     char_pic = char_pile.resize((600, int(600 / char_pile.size[0] * char_pile.size[1])))
 
     char_bg = Image.open(TEXT_PATH / "title_bg.png")
@@ -62,10 +71,10 @@ async def draw_char_skill(char_id: str):
 
     # 90级别数据
     max_stats: Stats = char_model.get_max_level_stat()
-    char_stats = await parse_char_stats(max_stats)
+    char_stats = parse_char_stats(max_stats)
 
     # 技能
-    char_skill = await parse_char_skill(char_model.skillTree)
+    char_skill = parse_char_skill(char_model.skillTree)
 
     card_img = get_waves_bg(1000, char_bg.size[1] + char_skill.size[1] + 50, "bg6")
 
@@ -75,9 +84,7 @@ async def draw_char_skill(char_id: str):
     card_img.paste(char_bg, (0, -5), char_bg)
     card_img.alpha_composite(char_skill, (0, 600))
 
-    card_img = add_footer(card_img, 800, 20, color="hakush")
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 800, 20, color="hakush")
 
 
 async def draw_char_chain(char_id: str):
@@ -87,6 +94,15 @@ async def draw_char_chain(char_id: str):
 
     _, char_pile = await get_role_pile(char_id)
 
+    card_img = await run_render(draw_char_chain_card, char_model, char_pile)
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_char_chain_card(
+    char_model: CharacterModel, char_pile: Image.Image
+) -> Image.Image:
+    """绘制角色命座图鉴，在渲染线程中执行"""
     char_pic = char_pile.resize((600, int(600 / char_pile.size[0] * char_pile.size[1])))
 
     char_bg = Image.open(TEXT_PATH / "title_bg.png")
@@ -102,10 +118,10 @@ async def draw_char_chain(char_id: str):
 
     # 90级别数据
     max_stats: Stats = char_model.get_max_level_stat()
-    char_stats = await parse_char_stats(max_stats)
+    char_stats = parse_char_stats(max_stats)
 
     # 命座
-    char_chain = await parse_char_chain(char_model.chains)
+    char_chain = parse_char_chain(char_model.chains)
 
     card_img = get_waves_bg(1000, char_bg.size[1] + char_chain.size[1] + 50, "bg6")
 
@@ -115,12 +131,10 @@ async def draw_char_chain(char_id: str):
     card_img.paste(char_bg, (0, -5), char_bg)
     card_img.alpha_composite(char_chain, (0, 600))
 
-    card_img = add_footer(card_img, 800, 20, color="hakush")
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 800, 20, color="hakush")
 
 
-async def parse_char_stats(max_stats: Stats):
+def parse_char_stats(max_stats: Stats):
     labels = ["基础生命", "基础攻击", "基础防御"]
     values = [f"{max_stats.life:.0f}", f"{max_stats.atk:.0f}", f"{max_stats.def_:.0f}"]
     rows = [(label, value) for label, value in zip(labels, values)]
@@ -161,7 +175,7 @@ async def parse_char_stats(max_stats: Stats):
     return image
 
 
-async def parse_char_chain(data: Dict[int, Chain]):
+def parse_char_chain(data: Dict[int, Chain]):
     y_padding = 20  # 初始位移
     x_padding = 20  # 初始位移
     line_spacing = 10  # 行间距
@@ -255,7 +269,7 @@ async def parse_char_chain(data: Dict[int, Chain]):
     return final_img
 
 
-async def parse_char_skill(data: Dict[str, Dict[str, Skill]]):
+def parse_char_skill(data: Dict[str, Dict[str, Skill]]):
     y_padding = 20  # 初始位移
     x_padding = 20  # 初始位移
     line_spacing = 10  # 行间距
@@ -362,7 +376,7 @@ async def parse_char_skill(data: Dict[str, Dict[str, Skill]]):
 
         images.append(img)
 
-        skill_rate = await parse_char_skill_rate(item.level)
+        skill_rate = parse_char_skill_rate(item.level)
         if skill_rate:
             images.append(skill_rate)
 
@@ -378,7 +392,7 @@ async def parse_char_skill(data: Dict[str, Dict[str, Skill]]):
     return final_img
 
 
-async def parse_char_skill_rate(skillLevels: Optional[Dict[str, SkillLevel]]):
+def parse_char_skill_rate(skillLevels: Optional[Dict[str, SkillLevel]]):
     if not skillLevels:
         return
     rows = []
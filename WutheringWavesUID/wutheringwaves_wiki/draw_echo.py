@@ -1,10 +1,9 @@
 import textwrap
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from PIL import Image, ImageDraw
 
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.ascension.echo import get_echo_model
@@ -21,17 +20,23 @@ from ..utils.image import (
     get_crop_waves_bg,
 )
 from ..utils.name_convert import alias_to_echo_name, echo_name_to_echo_id
+from ..utils.render import convert_img, run_render
 from ..utils.resource.download_file import get_phantom_img
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
 
 
-async def parse_echo_base_content(echo_id, echo_model: EchoModel, image, card_img):
+def parse_echo_base_content(
+    echo_model: EchoModel,
+    echo_pic: Image.Image,
+    effect_imgs: List[Image.Image],
+    image,
+    card_img,
+):
     # 提取名称
     echo_name = echo_model.name
 
     # echo 图片
-    echo_pic = await get_phantom_img(echo_id, "")
     echo_pic = crop_center_img(echo_pic, 110, 110)
     echo_pic = echo_pic.resize((250, 250))
 
@@ -48,14 +53,12 @@ async def parse_echo_base_content(echo_id, echo_model: EchoModel, image, card_im
     echo_name_width = int(echo_name_width)
 
     # 合鸣效果
-    group_name = echo_model.get_group_name()
-    for index, name in enumerate(group_name):
-        effect_image = await get_attribute_effect(name)
+    for index, effect_image in enumerate(effect_imgs):
         effect_image = effect_image.resize((30, 30))
         card_img.alpha_composite(effect_image, (echo_name_width + index * 35, 40))
 
 
-async def parse_echo_detail_content(echo_model: EchoModel, card_img):
+def parse_echo_detail_content(echo_model: EchoModel, card_img):
     y_padding = 20  # 初始位移
     x_padding = 20  # 初始位移
     line_spacing = 10  # 行间距
@@ -123,7 +126,7 @@ async def parse_echo_detail_content(echo_model: EchoModel, card_img):
     card_img.alpha_composite(image, (330, 80))
 
 
-async def parse_echo_statistic_content(echo_model: EchoModel, echo_image):
+def parse_echo_statistic_content(echo_model: EchoModel, echo_image):
     rows = echo_model.get_intensity()
     echo_bg = Image.open(TEXT_PATH / "weapon_bg.png")
     echo_bg_temp = Image.new("RGBA", echo_bg.size)
@@ -142,16 +145,28 @@ async def parse_echo_statistic_content(echo_model: EchoModel, echo_image):
 
 
 async def create_image(echo_id, echo_model: EchoModel):
+    echo_pic = await get_phantom_img(echo_id, "")
+    effect_imgs = [
+        await get_attribute_effect(name) for name in echo_model.get_group_name()
+    ]
+
+    card_img = await run_render(draw_echo_card, echo_model, echo_pic, effect_imgs)
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_echo_card(
+    echo_model: EchoModel, echo_pic: Image.Image, effect_imgs: List[Image.Image]
+) -> Image.Image:
+    """绘制声骸图鉴，在渲染线程中执行"""
     echo_image = Image.new("RGBA", (350, 400), (255, 255, 255, 0))
 
     card_img = get_crop_waves_bg(1000, 420, "bg5")
-    await parse_echo_base_content(echo_id, echo_model, echo_image, card_img)
-    await parse_echo_statistic_content(echo_model, echo_image)
-    await parse_echo_detail_content(echo_model, card_img)
+    parse_echo_base_content(echo_model, echo_pic, effect_imgs, echo_image, card_img)
+    parse_echo_statistic_content(echo_model, echo_image)
+    parse_echo_detail_content(echo_model, card_img)
     card_img.alpha_composite(echo_image, (0, 0))
-    card_img = add_footer(card_img, 800, 20, color="hakush")
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 800, 20, color="hakush")
 
 
 def wrap_text_with_manual_newlines(
@@ -2,11 +2,12 @@ import copy
 import textwrap
 from pathlib import Path
 from collections import defaultdict
+from typing import Dict, List, Tuple, Optional
 from PIL import Image, ImageDraw
 
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.logger import logger
 
+from ..utils.render import convert_img, run_render
 from ..wutheringwaves_config import PREFIX
 from ..utils.ascension.sonata import sonata_id_data
 from ..utils.ascension.weapon import weapon_id_data
@@ -83,7 +84,29 @@ async def draw_weapon_list(weapon_type: str):
     
     # 按类型从小到大排序
     sorted_groups = sorted(weapon_groups.items(), key=lambda x: x[0])
-    
+
+    weapon_icons = {}
+    for _, weapons in sorted_groups:
+        for weapon in weapons:
+            weapon_icons[weapon["id"]] = await get_square_weapon(weapon["id"])
+
+    img = await run_render(
+        draw_weapon_list_card,
+        sorted_groups,
+        weapon_type_map,
+        target_type,
+        weapon_icons,
+    )
+    return await convert_img(img)
+
+
+def draw_weapon_list_card(
+    sorted_groups: List[Tuple[int, List[Dict]]],
+    weapon_type_map: Dict[int, str],
+    target_type: Optional[int],
+    weapon_icons: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制武器一览，在渲染线程中执行"""
     # 每行武器数量（单类型4列，全部类型9列）
     weapons_per_row = 9 if target_type is None else 4
     # 图标大小
@@ -144,7 +167,7 @@ async def draw_weapon_list(weapon_type: str):
                 x_pos = 40 + col * horizontal_spacing
                 
                 # 获取武器图标
-                weapon_icon = await get_square_weapon(weapon["id"])
+                weapon_icon = weapon_icons[weapon["id"]]
                 weapon_icon = weapon_icon.resize((icon_size, icon_size))
                     
                 # 获取并调整武器背景框
@@ -180,8 +203,7 @@ async def draw_weapon_list(weapon_type: str):
     
     # 裁剪图片到实际高度
     img = img.crop((0, 0, width, y_offset + 50))
-    img = add_footer(img, int(width / 2), 10)  # 页脚居中
-    return await convert_img(img)
+    return add_footer(img, int(width / 2), 10)  # 页脚居中
 
 async def draw_sonata_list():
     # 确保数据已加载
@@ -202,7 +224,21 @@ async def draw_sonata_list():
     
     # 按字数从小到大排序
     sorted_groups = sorted(sonata_groups.items(), key=lambda x: x[0])
-    
+
+    fetter_icons = {}
+    for _, sonatas in sorted_groups:
+        for sonata in sonatas:
+            fetter_icons[sonata["name"]] = await get_attribute_effect(sonata["name"])
+
+    img = await run_render(draw_sonata_list_card, sorted_groups, fetter_icons)
+    return await convert_img(img)
+
+
+def draw_sonata_list_card(
+    sorted_groups: List[Tuple[int, List[Dict]]],
+    fetter_icons: Dict[str, Image.Image],
+) -> Image.Image:
+    """绘制声骸套装一览，在渲染线程中执行"""
     # 创建背景图（高度暂定，后面会调整）
     img = get_waves_bg(900, 3000, "bg6")
     draw = ImageDraw.Draw(img)
@@ -235,7 +271,7 @@ async def draw_sonata_list():
             name_height = 30
             
             # 获取套装图标
-            fetter_icon1 = await get_attribute_effect(sonata1["name"])
+            fetter_icon1 = fetter_icons[sonata1["name"]]
             fetter_icon1 = fetter_icon1.resize((50, 50))
             img.paste(fetter_icon1, (40, current_y), fetter_icon1)
             
@@ -268,7 +304,7 @@ async def draw_sonata_list():
                 sonata2 = sonatas[i + 1]
                 
                 # 获取套装图标
-                fetter_icon2 = await get_attribute_effect(sonata2["name"])
+                fetter_icon2 = fetter_icons[sonata2["name"]]
                 fetter_icon2 = fetter_icon2.resize((50, 50))
                 img.paste(fetter_icon2, (460, current_y), fetter_icon2)
                 
@@ -305,5 +341,4 @@ async def draw_sonata_list():
     
     # 裁剪图片到实际高度
     img = img.crop((0, 0, 900, y_offset + 50))
-    img = add_footer(img, 450, 10)
-    return await convert_img(img)
\ No newline at end of file
+    return add_footer(img, 450, 10)
\ No newline at end of file
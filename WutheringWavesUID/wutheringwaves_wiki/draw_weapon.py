@@ -1,10 +1,9 @@
 import textwrap
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from PIL import Image, ImageDraw
 
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.ascension.model import WeaponModel
@@ -27,27 +26,28 @@ from ..utils.image import (
     get_weapon_type,
 )
 from ..utils.name_convert import alias_to_weapon_name
+from ..utils.render import convert_img, run_render
 from ..utils.resource.download_file import get_material_img
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
 
 
-async def parse_weapon_base_content(
-    weapon_id, weapon_model: WeaponModel, image, card_img
+def parse_weapon_base_content(
+    weapon_model: WeaponModel,
+    weapon_pic: Image.Image,
+    weapon_type: Image.Image,
+    image,
+    card_img,
 ):
     # 提取名称
     weapon_name = weapon_model.name
 
-    # 提取“武器类型”
-    weapon_type = weapon_model.get_weapon_type()
-
     # 提取“稀有度”
     rarity_pic = Image.open(TEXT_PATH / f"rarity_{weapon_model.starLevel}.png")
     rarity_pic = rarity_pic.resize(
         (180, int(180 / rarity_pic.size[0] * rarity_pic.size[1]))
     )
     # weapon 图片
-    weapon_pic = await get_square_weapon(weapon_id)
     weapon_pic = crop_center_img(weapon_pic, 110, 110)
     weapon_pic_bg = get_weapon_icon_bg(get_weapon_star(weapon_name))
     weapon_pic_bg.paste(weapon_pic, (10, 20), weapon_pic)
@@ -58,7 +58,6 @@ async def parse_weapon_base_content(
 
     image.alpha_composite(weapon_pic_bg, (50, 20))
 
-    weapon_type = await get_weapon_type(weapon_type)
     weapon_type = weapon_type.resize((80, 80)).convert("RGBA")
     card_img_draw = ImageDraw.Draw(card_img)
     card_img_draw.text((420, 100), f"{weapon_name}", SPECIAL_GOLD, waves_font_40, "lm")
@@ -66,14 +65,16 @@ async def parse_weapon_base_content(
     card_img.alpha_composite(weapon_type, (340, 40))
 
 
-async def parse_weapon_statistic_content(weapon_model: WeaponModel, weapon_image):
+def parse_weapon_statistic_content(
+    weapon_model: WeaponModel, prop_imgs: Dict[str, Image.Image], weapon_image
+):
     rows = weapon_model.get_max_level_stat_tuple()
     weapon_bg = Image.open(TEXT_PATH / "weapon_bg.png")
     weapon_bg_temp = Image.new("RGBA", weapon_bg.size)
     weapon_bg_temp.alpha_composite(weapon_bg, dest=(0, 0))
     weapon_bg_temp_draw = ImageDraw.Draw(weapon_bg_temp)
     for index, row in enumerate(rows):
-        stats_main = await get_attribute_prop(row[0])
+        stats_main = prop_imgs[row[0]]
         stats_main = stats_main.resize((40, 40))
         weapon_bg_temp.alpha_composite(stats_main, (65, 187 + index * 50))
         weapon_bg_temp_draw.text(
@@ -87,7 +88,7 @@ async def parse_weapon_statistic_content(weapon_model: WeaponModel, weapon_image
     weapon_image.alpha_composite(weapon_bg_temp, (10, 200))
 
 
-async def parse_weapon_material_content(weapon_model: WeaponModel, card_img):
+def parse_weapon_material_content(material_imgs: List[Optional[Image.Image]], card_img):
     material_img = Image.new("RGBA", (300, 150))
     material_img_draw = ImageDraw.Draw(material_img)
     material_img_draw.rounded_rectangle(
@@ -97,8 +98,7 @@ async def parse_weapon_material_content(weapon_model: WeaponModel, card_img):
         (40, 20), "突破材料", SPECIAL_GOLD, waves_font_origin(24), "lm"
     )
     index = 0
-    for material_id in weapon_model.get_ascensions_max_list():
-        material = await get_material_img(material_id)
+    for material in material_imgs:
         if not material:
             continue
         material = material.resize((70, 70))
@@ -108,7 +108,7 @@ async def parse_weapon_material_content(weapon_model: WeaponModel, card_img):
     card_img.alpha_composite(material_img, (680, 15))
 
 
-async def parse_weapon_detail_content(weapon_model: WeaponModel, card_img):
+def parse_weapon_detail_content(weapon_model: WeaponModel, card_img):
     y_padding = 20  # 初始位移
     x_padding = 20  # 初始位移
     line_spacing = 10  # 行间距
@@ -176,17 +176,48 @@ async def parse_weapon_detail_content(weapon_model: WeaponModel, card_img):
 
 
 async def create_image(weapon_id, weapon_model: WeaponModel):
+    weapon_pic = await get_square_weapon(weapon_id)
+    weapon_type = await get_weapon_type(weapon_model.get_weapon_type())
+    prop_imgs = {}
+    for row in weapon_model.get_max_level_stat_tuple():
+        if row[0] not in prop_imgs:
+            prop_imgs[row[0]] = await get_attribute_prop(row[0])
+    material_imgs = [
+        await get_material_img(material_id)
+        for material_id in weapon_model.get_ascensions_max_list()
+    ]
+
+    card_img = await run_render(
+        draw_weapon_card,
+        weapon_model,
+        weapon_pic,
+        weapon_type,
+        prop_imgs,
+        material_imgs,
+    )
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+def draw_weapon_card(
+    weapon_model: WeaponModel,
+    weapon_pic: Image.Image,
+    weapon_type: Image.Image,
+    prop_imgs: Dict[str, Image.Image],
+    material_imgs: List[Optional[Image.Image]],
+) -> Image.Image:
+    """绘制武器图鉴，在渲染线程中执行"""
     weapon_image = Image.new("RGBA", (350, 400), (255, 255, 255, 0))
 
     card_img = get_crop_waves_bg(1000, 420, "bg5")
-    await parse_weapon_base_content(weapon_id, weapon_model, weapon_image, card_img)
-    await parse_weapon_statistic_content(weapon_model, weapon_image)
-    await parse_weapon_detail_content(weapon_model, card_img)
-    await parse_weapon_material_content(weapon_model, card_img)
+    parse_weapon_base_content(
+        weapon_model, weapon_pic, weapon_type, weapon_image, card_img
+    )
+    parse_weapon_statistic_content(weapon_model, prop_imgs, weapon_image)
+    parse_weapon_detail_content(weapon_model, card_img)
+    parse_weapon_material_content(material_imgs, card_img)
     card_img.alpha_composite(weapon_image, (0, 0))
-    card_img = add_footer(card_img, 800, 20, color="hakush")
-    card_img = await convert_img(card_img)
-    return card_img
+    return add_footer(card_img, 800, 20, color="hakush")
 
 
 def get_weapon_icon_bg(star: int = 3) -> Image.Image:
@@ -4,9 +4,9 @@ from pathlib import Path
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.name_convert import alias_to_char_name
+from ..utils.render import convert_img
 from ..utils.resource.RESOURCE_PATH import GUIDE_PATH
 from ..wutheringwaves_config.wutheringwaves_config import WutheringWavesConfig
 
@@ -0,0 +1,106 @@
+"""
+抽卡记录合并的基准测试
+
+用合成的抽卡记录比较按time分组合并(merge_gacha_logs)
+与原来的整段最长公共子串合并(merge_gacha_logs_by_common_subarray)
+
+需要在安装了 gsuid_core 的环境中运行:
+    python scripts/bench_gacha_merge.py --pulls 10000 --old-pulls 2000
+"""
+
+import sys
+import random
+import argparse
+from typing import List
+from pathlib import Path
+from time import perf_counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from WutheringWavesUID.utils.api.model import GachaLog  # noqa: E402
+from WutheringWavesUID.wutheringwaves_gachalog.get_gachalogs import (  # noqa: E402
+    merge_gacha_logs,
+    merge_gacha_logs_by_common_subarray,
+)
+
+# 三星武器重复率高，最容易出现相同的记录
+RESOURCE_IDS = [21010011, 21010011, 21020011, 1102, 1402]
+
+
+def make_history(num: int, seed: int) -> List[GachaLog]:
+    """生成num条左右的抽卡记录，单抽和十连混合，按time倒序"""
+    rng = random.Random(seed)
+    t = datetime(2024, 5, 23)
+    logs = []
+    while len(logs) < num:
+        t += timedelta(seconds=rng.randint(1, 5000))
+        for _ in range(rng.choice([1, 10])):
+            resource_id = rng.choice(RESOURCE_IDS)
+            logs.append(
+                GachaLog(
+                    cardPoolType="1",
+                    resourceId=resource_id,
+                    qualityLevel=3,
+                    resourceType="武器",
+                    name=str(resource_id),
+                    count=1,
+                    time=t.strftime("%Y-%m-%d %H:%M:%S"),
+                )
+            )
+    return logs[::-1]
+
+
+def check_equivalence(rounds: int) -> int:
+    """随机截取两段有重叠的记录，两种合并结果应一致，返回不一致的次数"""
+    mismatch = 0
+    for seed in range(rounds):
+        rng = random.Random(seed)
+        history = make_history(rng.randint(0, 120), seed)
+        x, y = sorted([rng.randint(0, len(history)), rng.randint(0, len(history))])
+        a = history[y:] if rng.random() < 0.5 else history[x:]
+        b = history[:y] if rng.random() < 0.5 else history[x:y]
+        if rng.random() < 0.3:
+            b = make_history(rng.randint(0, 40), seed + rounds)
+        if merge_gacha_logs(a, b) != merge_gacha_logs_by_common_subarray(a, b):
+            mismatch += 1
+    return mismatch
+
+
+def bench(func, num: int) -> float:
+    """本地记录为较早的2/3，新拉取的记录为较晚的2/3，合并后应得到完整记录"""
+    history = make_history(num, 1)
+    a, b = history[len(history) // 3 :], history[: 2 * len(history) // 3]
+    start = perf_counter()
+    result = func(a, b)
+    cost = perf_counter() - start
+    assert result == history, "合并结果不正确"
+    return cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pulls", type=int, default=10000, help="合成记录数量")
+    parser.add_argument(
+        "--old-pulls",
+        type=int,
+        default=2000,
+        help="旧合并方式的记录数量(O(n*m)，过大时非常慢，0为跳过)",
+    )
+    parser.add_argument("--rounds", type=int, default=300, help="一致性检查次数")
+    args = parser.parse_args()
+
+    print(f"一致性检查: {args.rounds}次, 不一致 {check_equivalence(args.rounds)}次")
+    cost = bench(merge_gacha_logs, args.pulls)
+    print(f"merge_gacha_logs {args.pulls}抽: {cost * 1000:.1f}ms")
+    if args.old_pulls > 0:
+        new_cost = bench(merge_gacha_logs, args.old_pulls)
+        old_cost = bench(merge_gacha_logs_by_common_subarray, args.old_pulls)
+        print(
+            f"{args.old_pulls}抽: merge_gacha_logs {new_cost * 1000:.1f}ms, "
+            f"merge_gacha_logs_by_common_subarray {old_cost * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()